@@ -0,0 +1,223 @@
+"""
+Airport Traffic Manager - Analítica
+Almacén columnar del historial de llegadas y consultas vectorizadas
+
+Las llegadas se guardan en arreglos tipados (array) con los identificadores
+codificados por diccionario. Si NumPy está instalado, las consultas se
+resuelven de forma vectorizada sobre esos arreglos sin copiarlos; si no,
+se usa una implementación en Python puro con los mismos resultados.
+"""
+
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from airport_core import Arrival, ArrivalStatus
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+STATUS_CODES: Dict[ArrivalStatus, int] = {status: code for code, status in enumerate(ArrivalStatus)}
+STATUS_BY_CODE: Tuple[ArrivalStatus, ...] = tuple(ArrivalStatus)
+
+
+class StringDictionary:
+    """
+    Codificación por diccionario: asigna a cada cadena un código entero.
+    """
+    
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def encode(self, value: str) -> int:
+        """Devuelve el código de la cadena, agregándola si es nueva."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+    
+    def decode(self, code: int) -> str:
+        """Devuelve la cadena correspondiente a un código."""
+        return self.values[code]
+
+
+class ArrivalColumns:
+    """
+    Historial de llegadas en formato columnar.
+    
+    Columnas:
+        arrival_ts / assigned_ts: epoch en float64 (NaN si no fue asignada)
+        status: código de ArrivalStatus en int8
+        origin / flight_number / aircraft_id: códigos int32 de diccionario
+    """
+    
+    def __init__(self):
+        self.arrival_ts = array("d")
+        self.assigned_ts = array("d")
+        self.status = array("b")
+        self.origin = array("i")
+        self.flight_number = array("i")
+        self.aircraft_id = array("i")
+        
+        self.origins = StringDictionary()
+        self.flight_numbers = StringDictionary()
+        self.aircraft_ids = StringDictionary()
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Arrival]) -> "ArrivalColumns":
+        """
+        Construye el almacén a partir de registros de register_arrival().
+        
+        Args:
+            records (Iterable[Arrival]): Llegadas, por ejemplo manager.arrivals_log
+        
+        Returns:
+            ArrivalColumns: Almacén con todas las llegadas
+        """
+        columns = cls()
+        columns.extend(records)
+        return columns
+    
+    def __len__(self) -> int:
+        return len(self.arrival_ts)
+    
+    def append_raw(self, aircraft_id: str, flight_number: str, origin: str,
+                   arrival_ts: float, assigned_ts: Optional[float] = None,
+                   status: ArrivalStatus = ArrivalStatus.WAITING) -> None:
+        """Agrega una llegada a partir de sus valores sueltos."""
+        self.arrival_ts.append(arrival_ts)
+        self.assigned_ts.append(math.nan if assigned_ts is None else assigned_ts)
+        self.status.append(STATUS_CODES[ArrivalStatus(status)])
+        self.origin.append(self.origins.encode(origin))
+        self.flight_number.append(self.flight_numbers.encode(flight_number))
+        self.aircraft_id.append(self.aircraft_ids.encode(aircraft_id))
+    
+    def append(self, arrival: Arrival) -> None:
+        """Agrega un registro Arrival."""
+        self.append_raw(arrival.aircraft_id, arrival.flight_number, arrival.origin,
+                        arrival.arrival_ts, arrival.assigned_ts, arrival.status)
+    
+    def extend(self, records: Iterable[Arrival]) -> None:
+        """Agrega varios registros Arrival."""
+        for arrival in records:
+            self.append(arrival)
+    
+    def row(self, index: int) -> Arrival:
+        """Reconstruye el registro Arrival de una fila."""
+        assigned_ts = self.assigned_ts[index]
+        return Arrival(
+            self.aircraft_ids.decode(self.aircraft_id[index]),
+            self.flight_numbers.decode(self.flight_number[index]),
+            self.origins.decode(self.origin[index]),
+            self.arrival_ts[index],
+            STATUS_BY_CODE[self.status[index]],
+            None if math.isnan(assigned_ts) else assigned_ts
+        )
+    
+    def counts_by_origin(self) -> Dict[str, int]:
+        """
+        Cuenta las llegadas por aeropuerto de origen.
+        
+        Returns:
+            Dict[str, int]: Origen -> cantidad de llegadas
+        """
+        if np is not None:
+            counts = np.bincount(np.frombuffer(self.origin, dtype=np.int32),
+                                 minlength=len(self.origins)).tolist()
+        else:
+            counter = Counter(self.origin)
+            counts = [counter[code] for code in range(len(self.origins))]
+        
+        return {origin: count for origin, count in zip(self.origins.values, counts) if count}
+    
+    def counts_by_status(self) -> Dict[ArrivalStatus, int]:
+        """
+        Cuenta las llegadas por estado.
+        
+        Returns:
+            Dict[ArrivalStatus, int]: Estado -> cantidad de llegadas
+        """
+        if np is not None:
+            codes = np.frombuffer(self.status, dtype=np.int8)
+            counts = np.bincount(codes, minlength=len(STATUS_BY_CODE)).tolist()
+        else:
+            counter = Counter(self.status)
+            counts = [counter[code] for code in range(len(STATUS_BY_CODE))]
+        
+        return {status: count for status, count in zip(STATUS_BY_CODE, counts) if count}
+    
+    def histogram(self, bucket_seconds: int = 3600) -> List[Tuple[float, int]]:
+        """
+        Cuenta las llegadas por intervalo de tiempo (por defecto, por hora).
+        
+        Args:
+            bucket_seconds (int): Tamaño del intervalo en segundos
+        
+        Returns:
+            List[Tuple[float, int]]: (inicio del intervalo en epoch, llegadas), ordenado
+        
+        Raises:
+            ValueError: Si el tamaño del intervalo no es positivo
+        """
+        if bucket_seconds <= 0:
+            raise ValueError("El intervalo debe ser positivo")
+        
+        if np is not None and len(self):
+            buckets = np.floor_divide(np.frombuffer(self.arrival_ts, dtype=np.float64), bucket_seconds)
+            first, last = buckets.min(), buckets.max()
+            if last - first <= 4 * len(buckets):
+                # Rango acotado: bincount es lineal y evita ordenar
+                counts = np.bincount((buckets - first).astype(np.int64))
+                values = np.flatnonzero(counts)
+                return [((first + offset) * bucket_seconds, count)
+                        for offset, count in zip(values.tolist(), counts[values].tolist())]
+            values, counts = np.unique(buckets, return_counts=True)
+            return [(bucket * bucket_seconds, count) for bucket, count in zip(values.tolist(), counts.tolist())]
+        
+        counter = Counter(ts // bucket_seconds for ts in self.arrival_ts)
+        return [(bucket * bucket_seconds, counter[bucket]) for bucket in sorted(counter)]
+    
+    def wait_percentiles(self, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[float, float]:
+        """
+        Calcula percentiles de espera (asignación - llegada) en segundos.
+        
+        Solo se consideran las llegadas ya asignadas. Usa interpolación
+        lineal, igual que numpy.percentile.
+        
+        Args:
+            percentiles (Sequence[float]): Percentiles entre 0 y 100
+        
+        Returns:
+            Dict[float, float]: Percentil -> espera en segundos (vacío si no hay asignadas)
+        """
+        if np is not None:
+            waits = np.frombuffer(self.assigned_ts, dtype=np.float64) - np.frombuffer(self.arrival_ts, dtype=np.float64)
+            waits = waits[~np.isnan(waits)]
+            if not waits.size:
+                return {}
+            return dict(zip(percentiles, np.percentile(waits, percentiles).tolist()))
+        
+        waits = sorted(assigned - arrived for assigned, arrived in zip(self.assigned_ts, self.arrival_ts)
+                       if not math.isnan(assigned))
+        if not waits:
+            return {}
+        return {percentile: _interpolate(waits, percentile) for percentile in percentiles}
+
+
+def _interpolate(sorted_values: List[float], percentile: float) -> float:
+    """Percentil con interpolación lineal sobre una lista ordenada."""
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
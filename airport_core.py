@@ -0,0 +1,1218 @@
+"""
+Airport Traffic Manager - Núcleo
+Lógica de gestión de tráfico aéreo, sin dependencias de interfaz gráfica
+
+Registros, pools de instalaciones, el manager, el bus de eventos y las
+funciones core. No importa tkinter: los servidores, los workers de
+ingesta y las pruebas lo usan sin pagar el arranque de Tk ni necesitarlo
+instalado. La interfaz gráfica vive en airport_manager.py, que reexporta
+todo lo de este módulo.
+
+Autor: [Tu nombre]
+Curso: CSE 111
+Fecha: Junio 2025
+"""
+
+import contextlib
+import functools
+import heapq
+import operator
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Lock nulo del modo sin hilos: mismas sentencias with, sin sincronización
+_NO_LOCK = contextlib.nullcontext()
+
+# Clave de las instalaciones que no tienen entrada vigente en el heap de libres
+_NOT_QUEUED = object()
+
+# Locks por franjas para la ruta de diccionarios simples: cada instalación
+# se reclama bajo el lock de su franja, nunca bajo un lock global
+_DICT_LOCK_STRIPES = 64
+_dict_locks = [threading.Lock() for _ in range(_DICT_LOCK_STRIPES)]
+
+
+def _dict_lock(facility_info: Dict) -> threading.Lock:
+    # Los id() están alineados a 16 bytes: se descartan los bits bajos
+    return _dict_locks[(id(facility_info) >> 4) % _DICT_LOCK_STRIPES]
+
+
+class SystemClock:
+    """Reloj real: la hora del sistema."""
+    
+    time = staticmethod(time.time)
+    now = staticmethod(datetime.now)
+
+
+class VirtualClock:
+    """
+    Reloj manual para simulaciones y pruebas: solo avanza cuando se le pide.
+    
+    Args:
+        start (float): Hora inicial en epoch
+    """
+    
+    def __init__(self, start: float = 0.0):
+        self.current = start
+    
+    def time(self) -> float:
+        """Devuelve la hora actual en epoch."""
+        return self.current
+    
+    def now(self) -> datetime:
+        """Devuelve la hora actual como datetime."""
+        return datetime.fromtimestamp(self.current)
+    
+    def set(self, timestamp: float) -> None:
+        """
+        Mueve el reloj a una hora dada.
+        
+        Raises:
+            ValueError: Si la hora es anterior a la actual
+        """
+        if timestamp < self.current:
+            raise ValueError("El reloj no puede retroceder")
+        self.current = timestamp
+    
+    def advance(self, seconds: float) -> None:
+        """Adelanta el reloj la cantidad de segundos indicada."""
+        self.set(self.current + seconds)
+
+
+# Reloj por defecto de pools, managers y funciones core
+SYSTEM_CLOCK = SystemClock()
+
+
+class ArrivalStatus(str, Enum):
+    """Estados posibles de una llegada."""
+    
+    WAITING = "waiting_assignment"
+    ASSIGNED_RUNWAY = "assigned_runway"
+    ASSIGNED_TERMINAL = "assigned_terminal"
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+class FacilityStatus(str, Enum):
+    """Estados posibles de una instalación."""
+    
+    AVAILABLE = "available"
+    OCCUPIED = "occupied"
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+@functools.lru_cache(maxsize=4096)
+def _minute_prefix(minute: int) -> str:
+    # Fecha y hora local hasta el minuto; una entrada por minuto calendario
+    return datetime.fromtimestamp(minute * 60).strftime(TIME_FORMAT[:-3])
+
+
+def format_timestamp(timestamp: float) -> str:
+    """
+    Formatea un epoch con TIME_FORMAT.
+    
+    Todo lo que cambia más lento que el segundo se memoriza por minuto
+    (LRU), así que formatear miles de llegadas de la misma franja cuesta
+    una división y un f-string en lugar de un strftime por llegada.
+    
+    Args:
+        timestamp (float): Hora en epoch
+    
+    Returns:
+        str: Hora local formateada, igual que datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+    """
+    minute, second = divmod(int(timestamp // 1), 60)
+    return f"{_minute_prefix(minute)}:{second:02d}"
+
+
+class _SlotRecord(MutableMapping):
+    """
+    Base para registros con __slots__ que conservan el acceso tipo diccionario.
+    
+    Las subclases declaran en _KEYS las claves del diccionario original; cada
+    clave se resuelve como atributo (o propiedad) del mismo nombre.
+    """
+    
+    __slots__ = ()
+    _KEYS: Tuple[str, ...] = ()
+    _GETTERS: Dict[str, Callable[[Any], Any]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._GETTERS = {key: operator.attrgetter(key) for key in cls._KEYS}
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._GETTERS[key](self)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __delitem__(self, key: str) -> None:
+        raise TypeError(f"No se pueden eliminar campos de {type(self).__name__}")
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={self[key]!r}" for key in self._KEYS)
+        return f"{type(self).__name__}({fields})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Devuelve el registro como diccionario plano."""
+        return {key: self[key] for key in self._KEYS}
+
+
+class Arrival(_SlotRecord):
+    """
+    Registro compacto de una llegada.
+    
+    Guarda la hora de llegada como epoch (float) y el estado como
+    ArrivalStatus; arrival["arrival_time"] la devuelve formateada.
+    assigned_ts registra la primera asignación (None mientras espera).
+    """
+    
+    __slots__ = ("aircraft_id", "flight_number", "origin", "arrival_ts", "assigned_ts", "_status")
+    _KEYS = ("aircraft_id", "flight_number", "origin", "arrival_time", "status")
+    
+    def __init__(self, aircraft_id: str, flight_number: str, origin: str,
+                 arrival_ts: float, status: ArrivalStatus = ArrivalStatus.WAITING,
+                 assigned_ts: Optional[float] = None):
+        self.aircraft_id = aircraft_id
+        self.flight_number = flight_number
+        self.origin = origin
+        self.arrival_ts = arrival_ts
+        self.assigned_ts = assigned_ts
+        self.status = status
+    
+    @property
+    def status(self) -> ArrivalStatus:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str) -> None:
+        self._status = value if value.__class__ is ArrivalStatus else ArrivalStatus(value)
+    
+    @property
+    def arrival_time(self) -> str:
+        return format_timestamp(self.arrival_ts)
+    
+    @arrival_time.setter
+    def arrival_time(self, value: str) -> None:
+        self.arrival_ts = datetime.strptime(value, TIME_FORMAT).timestamp()
+
+
+class Facility(_SlotRecord):
+    """
+    Registro compacto del estado de una instalación.
+    
+    Guarda el inicio de ocupación como epoch (float) y el estado como
+    FacilityStatus; facility["start_time"] lo devuelve como datetime.
+    """
+    
+    __slots__ = ("_status", "aircraft", "start_ts")
+    _KEYS = ("status", "aircraft", "start_time")
+    
+    def __init__(self, status: FacilityStatus = FacilityStatus.AVAILABLE,
+                 aircraft: Optional[str] = None, start_ts: Optional[float] = None):
+        self.status = status
+        self.aircraft = aircraft
+        self.start_ts = start_ts
+    
+    @property
+    def status(self) -> FacilityStatus:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str) -> None:
+        self._status = value if value.__class__ is FacilityStatus else FacilityStatus(value)
+    
+    @property
+    def start_time(self) -> Optional[datetime]:
+        if self.start_ts is None:
+            return None
+        return datetime.fromtimestamp(self.start_ts)
+    
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]) -> None:
+        self.start_ts = None if value is None else value.timestamp()
+
+
+class ArrivalRegistered(NamedTuple):
+    """Evento: se registró una llegada en el manager."""
+    
+    arrival: Arrival
+
+
+class FacilityAssigned(NamedTuple):
+    """Evento: una instalación quedó ocupada por una aeronave."""
+    
+    facility_type: str
+    facility_name: str
+    aircraft_id: str
+    timestamp: float
+
+
+class FacilityReleased(NamedTuple):
+    """Evento: una instalación ocupada quedó libre."""
+    
+    facility_type: str
+    facility_name: str
+    aircraft_id: Optional[str]
+    start_ts: Optional[float]
+    timestamp: float
+
+
+class EventBus:
+    """
+    Bus de eventos publicar/suscribir del manager.
+    
+    Los suscriptores reciben los eventos de forma síncrona, en el orden en
+    que se publican. Para agrupar eventos en lotes se puede suscribir un
+    EventBatcher.
+    """
+    
+    def __init__(self):
+        self._handlers: Dict[Optional[type], List[Callable[[Any], None]]] = {}
+    
+    def subscribe(self, handler: Callable[[Any], None], *event_types: type) -> Callable[[], None]:
+        """
+        Suscribe un manejador a ciertos tipos de evento (o a todos).
+        
+        Args:
+            handler (Callable): Función que recibe cada evento
+            *event_types (type): Tipos de evento; si no se indican, recibe todos
+        
+        Returns:
+            Callable[[], None]: Función que cancela la suscripción
+        """
+        keys = event_types or (None,)
+        for key in keys:
+            self._handlers.setdefault(key, []).append(handler)
+        
+        def unsubscribe() -> None:
+            for key in keys:
+                handlers = self._handlers.get(key, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+        
+        return unsubscribe
+    
+    def publish(self, event: Any) -> None:
+        """Entrega un evento a los suscriptores de su tipo y a los generales."""
+        for handler in tuple(self._handlers.get(type(event), ())):
+            handler(event)
+        for handler in tuple(self._handlers.get(None, ())):
+            handler(event)
+
+
+class EventBatcher:
+    """
+    Suscriptor que acumula eventos y los entrega en lote.
+    
+    Al llegar el primer evento de un lote llama a schedule(flush) (por
+    ejemplo root.after_idle), de modo que una ráfaga de eventos produce una
+    sola entrega. Si se indica key, los eventos con la misma clave se
+    combinan y solo se conserva el último.
+    """
+    
+    def __init__(self, handler: Callable[[List[Any]], None],
+                 schedule: Optional[Callable[[Callable[[], None]], Any]] = None,
+                 key: Optional[Callable[[Any], Hashable]] = None):
+        self.handler = handler
+        self.schedule = schedule
+        self.key = key
+        self._pending: Dict[Hashable, Any] = {}
+        self._sequence = 0
+    
+    def __call__(self, event: Any) -> None:
+        if self.key is not None:
+            event_key = self.key(event)
+            # Reinsertar para que el lote respete el orden del último evento
+            self._pending.pop(event_key, None)
+        else:
+            event_key = self._sequence
+            self._sequence += 1
+        
+        first = not self._pending
+        self._pending[event_key] = event
+        
+        if first and self.schedule is not None:
+            self.schedule(self.flush)
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def flush(self) -> None:
+        """Entrega los eventos pendientes, si los hay."""
+        if not self._pending:
+            return
+        
+        events = list(self._pending.values())
+        self._pending.clear()
+        self.handler(events)
+
+
+class FacilityPool(Mapping):
+    """
+    Conjunto indexado de instalaciones de un mismo tipo (pistas o terminales).
+    
+    Se comporta como el diccionario de instalaciones original (nombre ->
+    {"status", "aircraft", "start_time"}), pero además mantiene un heap con
+    las instalaciones libres ordenadas por orden de alta. Así asignar y
+    liberar cuestan O(log n) y consultar disponibilidad O(1), sin recorrer
+    todas las instalaciones. Las entradas del heap que quedan obsoletas
+    (instalaciones ocupadas con occupy()) se descartan al llegar al tope.
+    
+    El estado de las instalaciones solo debe modificarse mediante assign(),
+    occupy() y release() (o las funciones assign_to/release_facility) para
+    que el índice se mantenga sincronizado.
+    
+    También registra qué instalaciones cambiaron desde la última llamada a
+    drain_changes(), para que la interfaz actualice solo esas filas, y si
+    tiene un EventBus publica FacilityAssigned/FacilityReleased.
+    
+    Las horas de ocupación se leen de `clock` (por defecto, el reloj del
+    sistema); con un VirtualClock el pool puede simularse más rápido que
+    en tiempo real.
+    
+    El orden del heap de libres lo decide `strategy` (ver
+    airport_scheduling.py): un objeto con key(nombre, orden), que da la
+    clave de una instalación al quedar libre, y on_release(nombre, inicio,
+    fin), que recibe cada ocupación terminada. Sin estrategia se asigna la
+    primera libre en orden de alta.
+    
+    add_hold() permite retener instalaciones libres fuera de la asignación
+    automática (assign(), assign_many() y first_available()): registra una
+    función hold(nombre, ahora) que devuelve True para las que no deben
+    entregarse (por ejemplo, las reservadas; ver airport_reservations.py).
+    Puede haber varias; una instalación queda retenida si alguna la retiene.
+    Las retenidas se siguen pudiendo ocupar por nombre con occupy().
+    
+    Lleva además totales acumulados que se actualizan bajo el lock y
+    cuestan un incremento cada uno: assigned_total, released_total,
+    rejected_total (asignaciones rechazadas por el manager) y
+    occupied_seconds_total (suma de las ocupaciones terminadas).
+    
+    Con thread_safe=True cada pool tiene su propio lock (uno por tipo de
+    instalación), así que reclamar una pista no bloquea a quien reclama
+    una terminal. Los eventos se publican dentro del lock para que los
+    suscriptores los reciban en el mismo orden en que cambió el estado.
+    """
+    
+    def __init__(self, facility_names: Iterable[str] = (), facility_type: str = "facility",
+                 events: Optional[EventBus] = None, thread_safe: bool = False,
+                 clock: Optional[Any] = None, strategy: Optional[Any] = None):
+        self.facility_type = facility_type
+        self.events = events
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.strategy = strategy
+        self.holds: List[Callable[[str, float], bool]] = []
+        self.lock = threading.RLock() if thread_safe else _NO_LOCK
+        self._facilities: Dict[str, Facility] = {}
+        self._order: Dict[str, int] = {}
+        self._free: List[Tuple[Any, str]] = []
+        self._queued: Dict[str, Any] = {}  # instalación -> clave de su entrada vigente en el heap
+        self._occupied: set = set()
+        self._changed: Dict[str, None] = {}
+        self.assigned_total = 0
+        self.released_total = 0
+        self.rejected_total = 0
+        self.occupied_seconds_total = 0.0
+        
+        for facility_name in facility_names:
+            self.add(facility_name)
+    
+    def __getitem__(self, facility_name: str) -> Facility:
+        return self._facilities[facility_name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._facilities)
+    
+    def __len__(self) -> int:
+        return len(self._facilities)
+    
+    def add(self, facility_name: str) -> None:
+        """
+        Da de alta una nueva instalación disponible.
+        
+        Args:
+            facility_name (str): Nombre de la instalación
+        
+        Raises:
+            ValueError: Si la instalación ya existe
+        """
+        with self.lock:
+            if facility_name in self._facilities:
+                raise ValueError(f"La instalación {facility_name} ya existe")
+            
+            order = len(self._order)
+            self._order[facility_name] = order
+            self._facilities[facility_name] = Facility()
+            self._push_free(facility_name)
+            self._changed[facility_name] = None
+    
+    def _push_free(self, facility_name: str) -> None:
+        order = self._order[facility_name]
+        key = order if self.strategy is None else self.strategy.key(facility_name, order)
+        # Si la clave no cambió se reutiliza la entrada que ya está en el heap;
+        # si cambió, la anterior queda obsoleta y se descarta al llegar al tope
+        if self._queued.get(facility_name, _NOT_QUEUED) != key:
+            self._queued[facility_name] = key
+            heapq.heappush(self._free, (key, facility_name))
+    
+    def set_strategy(self, strategy: Optional[Any]) -> None:
+        """
+        Cambia la estrategia de asignación y reordena las instalaciones libres.
+        
+        Args:
+            strategy: Estrategia (ver airport_scheduling.py), o None para la primera libre
+        """
+        with self.lock:
+            self.strategy = strategy
+            self._free = []
+            self._queued.clear()
+            for facility_name, facility in self._facilities.items():
+                if facility.status is FacilityStatus.AVAILABLE:
+                    self._push_free(facility_name)
+    
+    def _discard_stale(self) -> None:
+        # Quita del tope las entradas de instalaciones que ya no están libres
+        # y las reemplazadas por una clave nueva
+        free = self._free
+        queued = self._queued
+        while free:
+            key, facility_name = free[0]
+            current = queued.get(facility_name, _NOT_QUEUED)
+            if current == key and self._facilities[facility_name].status is FacilityStatus.AVAILABLE:
+                return
+            heapq.heappop(free)
+            if current == key:
+                del queued[facility_name]
+    
+    def _next_free(self, take: bool, now: Optional[float] = None) -> Optional[str]:
+        # La primera libre no retenida; con take=True sale del heap. Las
+        # retenidas se apartan y se devuelven al heap con la misma clave
+        free = self._free
+        if not self.holds:
+            self._discard_stale()
+            if not free:
+                return None
+            if not take:
+                return free[0][1]
+            _, facility_name = heapq.heappop(free)
+            del self._queued[facility_name]
+            return facility_name
+        
+        now = self.clock.time() if now is None else now
+        held = []
+        facility_name = None
+        while True:
+            self._discard_stale()
+            if not free:
+                break
+            if not self.is_held(free[0][1], now):
+                facility_name = free[0][1]
+                if take:
+                    heapq.heappop(free)
+                    del self._queued[facility_name]
+                break
+            held.append(heapq.heappop(free))
+        for entry in held:
+            heapq.heappush(free, entry)
+        return facility_name
+    
+    def assignable_count(self, limit: Optional[int] = None, now: Optional[float] = None) -> int:
+        """
+        Cuántas instalaciones entregaría la asignación automática.
+        
+        Sin holds es available_count(), O(1); con holds recorre las libres
+        en orden hasta juntar `limit` no retenidas.
+        
+        Args:
+            limit (int, optional): Máximo a contar; por defecto, todas
+            now (float, optional): Hora para evaluar los holds; por defecto, la del reloj del pool
+        
+        Returns:
+            int: Instalaciones libres no retenidas (a lo sumo `limit`)
+        """
+        if not self.holds:
+            count = self.available_count()
+            return count if limit is None else min(count, limit)
+        
+        now = self.clock.time() if now is None else now
+        with self.lock:
+            taken = []
+            count = 0
+            while limit is None or count < limit:
+                self._discard_stale()
+                if not self._free:
+                    break
+                entry = heapq.heappop(self._free)
+                taken.append(entry)
+                if not self.is_held(entry[1], now):
+                    count += 1
+            for entry in taken:
+                heapq.heappush(self._free, entry)
+            return count
+    
+    def add_hold(self, hold: Callable[[str, float], bool]) -> Callable[[], None]:
+        """
+        Registra una función que retiene instalaciones libres fuera de la asignación automática.
+        
+        Args:
+            hold (Callable): hold(nombre, ahora) -> True si la instalación no debe entregarse
+        
+        Returns:
+            Callable[[], None]: Función que quita el hold
+        """
+        with self.lock:
+            self.holds.append(hold)
+        
+        def remove() -> None:
+            with self.lock:
+                if hold in self.holds:
+                    self.holds.remove(hold)
+        
+        return remove
+    
+    def is_held(self, facility_name: str, now: Optional[float] = None) -> bool:
+        """Indica si algún hold retiene la instalación fuera de la asignación automática."""
+        if not self.holds:
+            return False
+        now = self.clock.time() if now is None else now
+        return any(hold(facility_name, now) for hold in self.holds)
+    
+    def available_count(self) -> int:
+        """Devuelve cuántas instalaciones están libres, en O(1)."""
+        return len(self._facilities) - len(self._occupied)
+    
+    def is_available(self, facility_name: str) -> bool:
+        """Indica si una instalación existe y está libre, en O(1)."""
+        facility = self._facilities.get(facility_name)
+        return facility is not None and facility.status is FacilityStatus.AVAILABLE
+    
+    def first_available(self) -> Optional[str]:
+        """Devuelve la próxima instalación que se asignaría, o None, en O(1) amortizado."""
+        with self.lock:
+            return self._next_free(take=False)
+    
+    def available(self) -> List[str]:
+        """Devuelve las instalaciones libres en el orden en que se asignarían."""
+        with self.lock:
+            return [facility_name for key, facility_name in sorted(self._free)
+                    if self._facilities[facility_name].status is FacilityStatus.AVAILABLE
+                    and self._queued.get(facility_name, _NOT_QUEUED) == key]
+    
+    def occupied(self) -> List[str]:
+        """Devuelve las instalaciones ocupadas, sin recorrer las libres."""
+        with self.lock:
+            return list(self._occupied)
+    
+    def occupancy_minutes(self, facility_names: Optional[Iterable[str]] = None,
+                          now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Calcula los minutos de uso de varias instalaciones en una sola pasada.
+        
+        Lee el reloj una sola vez para todas (check_time_used() lo lee una
+        vez por instalación), así que todas las filas de un refresco
+        muestran la misma hora.
+        
+        Args:
+            facility_names (Iterable[str], optional): Instalaciones a calcular; por defecto, las ocupadas
+            now (float, optional): Hora actual en epoch; por defecto, la del reloj del pool
+        
+        Returns:
+            Dict[str, int]: Minutos de uso de cada instalación ocupada (las libres se omiten)
+        """
+        now = self.clock.time() if now is None else now
+        facilities = self._facilities
+        
+        with self.lock:
+            occupied = self._occupied
+            names = occupied if facility_names is None else [
+                facility_name for facility_name in facility_names if facility_name in occupied]
+            return {facility_name: int((now - facilities[facility_name].start_ts) / 60) for facility_name in names}
+    
+    def drain_changes(self) -> List[str]:
+        """
+        Devuelve y olvida las instalaciones modificadas desde la última llamada.
+        
+        Returns:
+            List[str]: Nombres de instalaciones dadas de alta, asignadas o liberadas
+        """
+        with self.lock:
+            changed = list(self._changed)
+            self._changed.clear()
+            return changed
+    
+    def assign(self, aircraft_id: str) -> Optional[str]:
+        """
+        Ocupa la primera instalación libre con una aeronave.
+        
+        Args:
+            aircraft_id (str): Identificador de la aeronave
+        
+        Returns:
+            Optional[str]: Nombre de la instalación asignada, o None si no hay libres
+        """
+        with self.lock:
+            now = self.clock.time()
+            facility_name = self._next_free(take=True, now=now)
+            if facility_name is None:
+                return None
+            
+            self._occupy(facility_name, aircraft_id, now)
+            
+            return facility_name
+    
+    def assign_many(self, aircraft_ids: Iterable[str], start_ts: Optional[float] = None) -> List[str]:
+        """
+        Ocupa instalaciones libres para varias aeronaves, en orden.
+        
+        Args:
+            aircraft_ids (Iterable[str]): Identificadores de las aeronaves
+            start_ts (float, optional): Inicio de ocupación común; por defecto, ahora
+        
+        Returns:
+            List[str]: Instalaciones asignadas, una por aeronave hasta agotar las libres
+        """
+        start_ts = self.clock.time() if start_ts is None else start_ts
+        assigned = []
+        
+        with self.lock:
+            for aircraft_id in aircraft_ids:
+                facility_name = self._next_free(take=True, now=start_ts)
+                if facility_name is None:
+                    break
+                self._occupy(facility_name, aircraft_id, start_ts)
+                assigned.append(facility_name)
+        
+        return assigned
+    
+    def occupy(self, facility_name: str, aircraft_id: str, start_ts: Optional[float] = None) -> bool:
+        """
+        Ocupa una instalación concreta (por ejemplo, al reconstruir estado).
+        
+        Args:
+            facility_name (str): Nombre de la instalación
+            aircraft_id (str): Identificador de la aeronave
+            start_ts (float, optional): Inicio de ocupación en epoch; por defecto, ahora
+        
+        Returns:
+            bool: True si se ocupó, False si no existe o no estaba libre
+        """
+        with self.lock:
+            if not self.is_available(facility_name):
+                return False
+            
+            self._occupy(facility_name, aircraft_id, self.clock.time() if start_ts is None else start_ts)
+            return True
+    
+    def _occupy(self, facility_name: str, aircraft_id: str, start_ts: float) -> None:
+        facility = self._facilities[facility_name]
+        facility.status = FacilityStatus.OCCUPIED
+        facility.aircraft = aircraft_id
+        facility.start_ts = start_ts
+        self._occupied.add(facility_name)
+        self._changed[facility_name] = None
+        self.assigned_total += 1
+        
+        if self.events is not None:
+            self.events.publish(FacilityAssigned(self.facility_type, facility_name, aircraft_id, start_ts))
+    
+    def release(self, facility_name: str) -> bool:
+        """
+        Libera una instalación y la devuelve al conjunto de libres.
+        
+        Args:
+            facility_name (str): Nombre de la instalación
+        
+        Returns:
+            bool: True si la instalación existe, False en caso contrario
+        """
+        facility = self._facilities.get(facility_name)
+        if facility is None:
+            return False
+        
+        with self.lock:
+            if facility.status is not FacilityStatus.AVAILABLE:
+                aircraft_id, start_ts = facility.aircraft, facility.start_ts
+                released_ts = self.clock.time()
+                facility.status = FacilityStatus.AVAILABLE
+                facility.aircraft = None
+                facility.start_ts = None
+                if self.strategy is not None:
+                    self.strategy.on_release(facility_name, start_ts, released_ts)
+                self._push_free(facility_name)
+                self._occupied.discard(facility_name)
+                self._changed[facility_name] = None
+                self.released_total += 1
+                if start_ts is not None:
+                    self.occupied_seconds_total += released_ts - start_ts
+                
+                if self.events is not None:
+                    self.events.publish(FacilityReleased(self.facility_type, facility_name, aircraft_id,
+                                                         start_ts, released_ts))
+        
+        return True
+
+
+class AirportTrafficManager:
+    """
+    Clase principal para gestionar el tráfico aéreo en un aeropuerto.
+    Maneja pistas de aterrizaje y terminales disponibles.
+    
+    Con thread_safe=True puede usarse desde varios hilos a la vez (por
+    ejemplo la interfaz y un feed de ingesta): cada pool tiene su lock y
+    la cola de espera otro. Cuando se toman ambos, el orden es siempre
+    cola -> pool, así que no hay interbloqueos.
+    
+    Todas las horas se leen de `clock`, que se comparte con los pools.
+    """
+    
+    DEFAULT_RUNWAYS = ("Runway_01", "Runway_02", "Runway_03")
+    DEFAULT_TERMINALS = ("Terminal_A", "Terminal_B", "Terminal_C", "Terminal_D")
+    
+    def __init__(self, runways: Optional[Iterable[str]] = None, terminals: Optional[Iterable[str]] = None,
+                 thread_safe: bool = False, clock: Optional[Any] = None):
+        # Notifica ArrivalRegistered, FacilityAssigned y FacilityReleased
+        self.events = EventBus()
+        self.thread_safe = thread_safe
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        
+        runways = self.DEFAULT_RUNWAYS if runways is None else runways
+        self.airstrips = FacilityPool(runways, "runway", self.events, thread_safe, self.clock)
+        
+        terminals = self.DEFAULT_TERMINALS if terminals is None else terminals
+        self.terminals = FacilityPool(terminals, "terminal", self.events, thread_safe, self.clock)
+        
+        self.pools = {"runway": self.airstrips, "terminal": self.terminals}
+        
+        # Historial append-only: el camino de asignación nunca lo recorre
+        self.arrivals_log = []
+        
+        # Cola FIFO de aeronaves en espera e índice por aircraft_id
+        self.waiting_queue = deque()
+        self.arrivals_index = {}
+        self.queue_lock = threading.RLock() if thread_safe else _NO_LOCK
+    
+    def add_arrival(self, arrival_data: Dict[str, str]) -> None:
+        """
+        Agrega una llegada al historial, al índice y a la cola de espera.
+        
+        Args:
+            arrival_data (Dict): Registro devuelto por register_arrival()
+        """
+        with self.queue_lock:
+            self.arrivals_log.append(arrival_data)
+            self.arrivals_index[arrival_data["aircraft_id"]] = arrival_data
+            
+            if arrival_data["status"] == "waiting_assignment":
+                self.waiting_queue.append(arrival_data)
+            
+            self.events.publish(ArrivalRegistered(arrival_data))
+    
+    def find_arrival(self, aircraft_id: str) -> Optional[Dict[str, str]]:
+        """
+        Busca la última llegada registrada de una aeronave, en O(1).
+        
+        Args:
+            aircraft_id (str): Identificador de la aeronave
+        
+        Returns:
+            Optional[Dict]: Registro de llegada, o None si no existe
+        """
+        return self.arrivals_index.get(aircraft_id.strip().upper())
+    
+    def next_waiting(self) -> Optional[Dict[str, str]]:
+        """
+        Devuelve la primera aeronave en espera sin sacarla de la cola.
+        
+        Las llegadas que ya no están en espera se descartan de forma
+        perezosa al llegar al frente de la cola, por lo que el costo
+        amortizado es O(1).
+        
+        Returns:
+            Optional[Dict]: Registro de llegada, o None si no hay aeronaves en espera
+        """
+        queue = self.waiting_queue
+        with self.queue_lock:
+            while queue and queue[0]["status"] != "waiting_assignment":
+                queue.popleft()
+            
+            return queue[0] if queue else None
+    
+    def add_arrivals(self, arrivals: Iterable[Dict[str, str]]) -> None:
+        """
+        Agrega varias llegadas, en orden (ver add_arrival()).
+        
+        Args:
+            arrivals (Iterable[Dict]): Registros devueltos por register_arrivals_bulk()
+        """
+        log_append = self.arrivals_log.append
+        index = self.arrivals_index
+        queue_append = self.waiting_queue.append
+        publish = self.events.publish
+        
+        with self.queue_lock:
+            for arrival_data in arrivals:
+                log_append(arrival_data)
+                index[arrival_data["aircraft_id"]] = arrival_data
+                if arrival_data["status"] == "waiting_assignment":
+                    queue_append(arrival_data)
+                publish(ArrivalRegistered(arrival_data))
+    
+    def assign_arrival(self, arrival_data: Dict[str, str], facility_type: str,
+                       start_ts: Optional[float] = None, facility_name: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Asigna una llegada a una instalación del tipo indicado.
+        
+        Args:
+            arrival_data (Dict): Registro de llegada a asignar
+            facility_type (str): Tipo de instalación ("runway" o "terminal")
+            start_ts (float, optional): Inicio de ocupación en epoch; por defecto, ahora
+            facility_name (str, optional): Instalación concreta; por defecto, la que elija el pool
+        
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje/nombre_instalación)
+        """
+        if not arrival_data:
+            return False, "Datos inválidos"
+        
+        pool = self.pools[facility_type]
+        
+        # Elegir y ocupar bajo el mismo lock: dos hilos no pueden reclamar
+        # la misma instalación
+        with pool.lock:
+            if facility_name is None:
+                facility_name = pool.first_available()
+                if facility_name is None:
+                    pool.rejected_total += 1
+                    return False, f"No hay {facility_type}s disponibles"
+            elif not pool.is_available(facility_name):
+                pool.rejected_total += 1
+                return False, f"{facility_name} no está disponible"
+            
+            # La llegada se marca antes de ocupar la instalación para que los
+            # suscriptores de FacilityAssigned vean un estado consistente
+            if start_ts is None:
+                start_ts = self.clock.time()
+            arrival_data["status"] = f"assigned_{facility_type}"
+            if isinstance(arrival_data, Arrival) and arrival_data.assigned_ts is None:
+                arrival_data.assigned_ts = start_ts
+            pool.occupy(facility_name, arrival_data["aircraft_id"], start_ts)
+        
+        # Sale de la cola si estaba al frente; si no, se descarta al llegar
+        self.next_waiting()
+        
+        return True, facility_name
+    
+    def assign_next(self, facility_type: str) -> Tuple[bool, str]:
+        """
+        Asigna la primera aeronave en espera a una instalación del tipo indicado.
+        
+        A diferencia de next_waiting() + assign_arrival(), tomar la aeronave
+        y asignarla es atómico: dos hilos nunca asignan la misma aeronave.
+        
+        Args:
+            facility_type (str): Tipo de instalación ("runway" o "terminal")
+        
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje/nombre_instalación)
+        """
+        with self.queue_lock:
+            arrival_data = self.next_waiting()
+            if arrival_data is None:
+                return False, "No hay aeronaves esperando asignación"
+            return self.assign_arrival(arrival_data, facility_type)
+
+
+def register_arrival(aircraft_id: str, flight_number: str, origin: str, clock: Optional[Any] = None) -> Arrival:
+    """
+    Registra la llegada de una aeronave al sistema.
+    
+    Args:
+        aircraft_id (str): Identificador único de la aeronave
+        flight_number (str): Número de vuelo
+        origin (str): Aeropuerto de origen
+        clock (optional): Reloj del que se toma la hora de llegada; por defecto, el del sistema
+    
+    Returns:
+        Arrival: Registro de llegada (con acceso tipo diccionario)
+    
+    Raises:
+        ValueError: Si algún parámetro está vacío o es None
+    """
+    if not aircraft_id or not flight_number or not origin:
+        raise ValueError("Todos los campos son obligatorios")
+    
+    # Los identificadores se repiten mucho a lo largo del día: se internan
+    # para que todas las llegadas compartan la misma cadena
+    arrival_data = Arrival(
+        sys.intern(aircraft_id.strip().upper()),
+        sys.intern(flight_number.strip().upper()),
+        sys.intern(origin.strip().upper()),
+        (clock or SYSTEM_CLOCK).time()
+    )
+    
+    return arrival_data
+
+
+class BatchResult(NamedTuple):
+    """Resultado de un elemento de una operación por lotes."""
+    
+    index: int
+    success: bool
+    value: Any  # Arrival o nombre de instalación si hubo éxito; mensaje de error si no
+
+
+class BatchError(ValueError):
+    """Lote rechazado completo en modo todo-o-nada; results detalla cada elemento."""
+    
+    def __init__(self, message: str, results: List[BatchResult]):
+        super().__init__(message)
+        self.results = results
+
+
+def register_arrivals_bulk(rows: Iterable, atomic: bool = False, clock: Optional[Any] = None) -> List[BatchResult]:
+    """
+    Registra un lote de llegadas con una sola lectura del reloj.
+    
+    Cada fila es una tupla (aircraft_id, flight_number, origin) o un
+    diccionario con esas claves. Las filas se validan igual que en
+    register_arrival().
+    
+    Args:
+        rows (Iterable): Filas a registrar
+        atomic (bool): Si es True, una sola fila inválida rechaza todo el lote
+        clock (optional): Reloj del que se toma la hora de llegada; por defecto, el del sistema
+    
+    Returns:
+        List[BatchResult]: Un resultado por fila; value es el Arrival o el error
+    
+    Raises:
+        BatchError: En modo atomic, si alguna fila es inválida
+    """
+    arrival_ts = (clock or SYSTEM_CLOCK).time()
+    intern = sys.intern
+    results = []
+    failed = 0
+    
+    for index, row in enumerate(rows):
+        if row.__class__ is not tuple:
+            if isinstance(row, Mapping):
+                row = (row.get("aircraft_id"), row.get("flight_number"), row.get("origin"))
+            else:
+                row = tuple(row)
+        
+        if len(row) != 3 or not (row[0] and row[1] and row[2]):
+            results.append(BatchResult(index, False, "Todos los campos son obligatorios"))
+            failed += 1
+            continue
+        
+        aircraft_id, flight_number, origin = row
+        arrival_data = Arrival(intern(aircraft_id.strip().upper()), intern(flight_number.strip().upper()),
+                               intern(origin.strip().upper()), arrival_ts)
+        results.append(BatchResult(index, True, arrival_data))
+    
+    if atomic and failed:
+        raise BatchError(f"Lote rechazado: {failed} registros inválidos", results)
+    
+    return results
+
+
+def assign_batch(manager: AirportTrafficManager, aircraft_iter: Iterable[Dict[str, str]],
+                 facility_type: str, atomic: bool = False) -> List[BatchResult]:
+    """
+    Asigna un lote de llegadas a instalaciones de un tipo, con un solo reloj.
+    
+    Args:
+        manager (AirportTrafficManager): Manager con las instalaciones
+        aircraft_iter (Iterable[Dict]): Llegadas a asignar, en orden
+        facility_type (str): Tipo de instalación ("runway" o "terminal")
+        atomic (bool): Si es True, no se asigna nada salvo que alcancen las instalaciones
+    
+    Returns:
+        List[BatchResult]: Un resultado por llegada; value es la instalación o el error
+    
+    Raises:
+        BatchError: En modo atomic, si hay llegadas inválidas o faltan instalaciones
+    """
+    arrivals = list(aircraft_iter)
+    pool = manager.pools[facility_type]
+    valid = [index for index, arrival_data in enumerate(arrivals) if arrival_data]
+    
+    with pool.lock:
+        start_ts = manager.clock.time()
+        available = pool.assignable_count(len(valid), start_ts)
+        if atomic and (len(valid) < len(arrivals) or len(valid) > available):
+            message = "Datos inválidos" if len(valid) < len(arrivals) else f"No hay {facility_type}s disponibles"
+            results = [BatchResult(index, False, message) for index in range(len(arrivals))]
+            raise BatchError(f"Lote rechazado: {message}", results)
+        
+        # Igual que assign_arrival(): las llegadas se marcan antes de ocupar
+        status = ArrivalStatus(f"assigned_{facility_type}")
+        to_assign = valid[:available]
+        for index in to_assign:
+            arrival_data = arrivals[index]
+            arrival_data["status"] = status
+            if isinstance(arrival_data, Arrival) and arrival_data.assigned_ts is None:
+                arrival_data.assigned_ts = start_ts
+        
+        facility_names = pool.assign_many((arrivals[index]["aircraft_id"] for index in to_assign), start_ts)
+    
+    manager.next_waiting()
+    
+    results = [BatchResult(index, False, "Datos inválidos") for index in range(len(arrivals))]
+    for index, facility_name in zip(to_assign, facility_names):
+        results[index] = BatchResult(index, True, facility_name)
+    for index in valid[len(facility_names):]:
+        results[index] = BatchResult(index, False, f"No hay {facility_type}s disponibles")
+    
+    return results
+
+
+def assign_to(facility_dict: Dict[str, Dict], aircraft_data: Dict[str, str], facility_type: str,
+              clock: Optional[Any] = None) -> Tuple[bool, str]:
+    """
+    Asigna una aeronave a una instalación disponible (pista o terminal).
+    
+    Args:
+        facility_dict (Dict): Diccionario de instalaciones disponibles
+        aircraft_data (Dict): Datos de la aeronave a asignar
+        facility_type (str): Tipo de instalación ("runway" o "terminal")
+        clock (optional): Reloj para diccionarios simples; un FacilityPool usa el suyo
+    
+    Returns:
+        Tuple[bool, str]: (éxito, mensaje/nombre_instalación)
+    """
+    if not facility_dict or not aircraft_data:
+        return False, "Datos inválidos"
+    
+    # Ruta rápida: el pool indexado conoce sus instalaciones libres
+    if isinstance(facility_dict, FacilityPool):
+        facility_name = facility_dict.assign(aircraft_data["aircraft_id"])
+        if facility_name is None:
+            return False, f"No hay {facility_type}s disponibles"
+        return True, facility_name
+    
+    # Buscar instalación disponible
+    for facility_name, facility_info in facility_dict.items():
+        if facility_info["status"] == "available":
+            # Reclamar bajo el lock de su franja y volver a comprobar: otro
+            # hilo pudo ocuparla entre la lectura y el lock
+            with _dict_lock(facility_info):
+                if facility_info["status"] != "available":
+                    continue
+                
+                # Asignar aeronave a la instalación
+                facility_info["status"] = "occupied"
+                facility_info["aircraft"] = aircraft_data["aircraft_id"]
+                facility_info["start_time"] = (clock or SYSTEM_CLOCK).now()
+            
+            return True, facility_name
+    
+    return False, f"No hay {facility_type}s disponibles"
+
+
+def check_time_used(facility_dict: Dict[str, Dict], facility_name: str,
+                    clock: Optional[Any] = None) -> Optional[int]:
+    """
+    Calcula el tiempo que una instalación ha estado ocupada.
+    
+    Args:
+        facility_dict (Dict): Diccionario de instalaciones
+        facility_name (str): Nombre de la instalación a verificar
+        clock (optional): Reloj con la hora actual; por defecto, el del pool o el del sistema
+    
+    Returns:
+        Optional[int]: Minutos de uso, o None si no está ocupada o no existe
+    """
+    if facility_name not in facility_dict:
+        return None
+    
+    facility = facility_dict[facility_name]
+    if clock is None:
+        clock = facility_dict.clock if isinstance(facility_dict, FacilityPool) else SYSTEM_CLOCK
+    
+    # Ruta rápida: los registros Facility guardan el inicio como epoch
+    if isinstance(facility, Facility):
+        if facility.status is not FacilityStatus.OCCUPIED or facility.start_ts is None:
+            return None
+        return int((clock.time() - facility.start_ts) / 60)
+    
+    if facility["status"] != "occupied" or facility["start_time"] is None:
+        return None
+    
+    current_time = clock.now()
+    time_diff = current_time - facility["start_time"]
+    
+    return int(time_diff.total_seconds() / 60)
+
+
+def check_available(facility_dict: Dict[str, Dict]) -> List[str]:
+    """
+    Devuelve una lista de instalaciones disponibles.
+    
+    Args:
+        facility_dict (Dict): Diccionario de instalaciones
+    
+    Returns:
+        List[str]: Lista de nombres de instalaciones disponibles
+    """
+    if not facility_dict:
+        return []
+    
+    if isinstance(facility_dict, FacilityPool):
+        return facility_dict.available()
+    
+    available_facilities = []
+    
+    for facility_name, facility_info in facility_dict.items():
+        if facility_info["status"] == "available":
+            available_facilities.append(facility_name)
+    
+    return available_facilities
+
+
+def release_facility(facility_dict: Dict[str, Dict], facility_name: str) -> bool:
+    """
+    Libera una instalación ocupada.
+    
+    Args:
+        facility_dict (Dict): Diccionario de instalaciones
+        facility_name (str): Nombre de la instalación a liberar
+    
+    Returns:
+        bool: True si se liberó exitosamente, False en caso contrario
+    """
+    if isinstance(facility_dict, FacilityPool):
+        return facility_dict.release(facility_name)
+    
+    if facility_name not in facility_dict:
+        return False
+    
+    facility = facility_dict[facility_name]
+    with _dict_lock(facility):
+        facility["status"] = "available"
+        facility["aircraft"] = None
+        facility["start_time"] = None
+    
+    return True
@@ -0,0 +1,420 @@
+"""
+Airport Traffic Manager - Ingesta
+Carga en streaming de feeds de llegadas desde CSV, JSON-lines o stdin
+
+Las llegadas pasan por una cadena de generadores:
+    
+    lectura -> parseo -> lotes -> register_arrivals_bulk() -> manager
+            -> asignación automática opcional
+
+Cada etapa pide filas a la anterior solo cuando las necesita, así que la
+memoria usada por la ingesta no depende del tamaño del archivo: como
+máximo hay un lote en vuelo. Ese mismo esquema da la contrapresión: si la
+asignación o el manager van más lentos, simplemente se lee más despacio.
+Para feeds en vivo, prefetch() lee en un hilo aparte sobre una cola
+acotada que bloquea al lector cuando se llena.
+
+Para ejecutar sin interfaz:
+    python airport_manager.py ingest vuelos.csv --assign terminal
+    cat vuelos.jsonl | python airport_manager.py ingest - --format jsonl
+"""
+
+import argparse
+import csv
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from airport_core import AirportTrafficManager, register_arrivals_bulk
+
+
+FIELDS = ("aircraft_id", "flight_number", "origin")
+FORMATS = ("csv", "jsonl")
+
+# Marca fin de datos en la cola de prefetch()
+_DONE = object()
+
+# Segundos entre reintentos del lector de prefetch() con la cola llena
+_PUT_TIMEOUT = 0.1
+
+
+class IngestStats:
+    """
+    Contadores de una ingesta y su throughput.
+    
+    Solo se guardan los últimos `max_errors` rechazos, para que la memoria
+    siga acotada aunque el feed tenga muchas filas inválidas.
+    """
+    
+    def __init__(self, max_errors: int = 100):
+        self.read = 0
+        self.registered = 0
+        self.rejected = 0
+        self.assigned = 0
+        self.errors = deque(maxlen=max_errors)
+        self.started = time.perf_counter()
+    
+    @property
+    def elapsed(self) -> float:
+        """Segundos desde el inicio de la ingesta."""
+        return time.perf_counter() - self.started
+    
+    @property
+    def rate(self) -> float:
+        """Filas leídas por segundo."""
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed > 0 else 0.0
+    
+    def reject(self, line: int, message: str) -> None:
+        """Cuenta una fila rechazada y guarda el motivo."""
+        self.rejected += 1
+        self.errors.append((line, message))
+    
+    def summary(self) -> str:
+        """Resumen de una línea para mostrar al usuario."""
+        return (f"{self.read} leídas, {self.registered} registradas, {self.rejected} rechazadas, "
+                f"{self.assigned} asignadas en {self.elapsed:.2f}s ({self.rate:,.0f} filas/s)")
+
+
+def detect_format(path: str) -> str:
+    """
+    Deduce el formato de un feed por su extensión.
+    
+    Args:
+        path (str): Ruta del archivo
+    
+    Returns:
+        str: "csv" o "jsonl"
+    
+    Raises:
+        ValueError: Si la extensión no es conocida
+    """
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"No se reconoce el formato de {path}; indique csv o jsonl")
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Parsea filas CSV con encabezado aircraft_id,flight_number,origin.
+    
+    Args:
+        lines (Iterable[str]): Líneas del archivo (puede ser el archivo abierto)
+    
+    Yields:
+        Tuple[int, Any]: (número de línea, fila como tupla)
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    
+    header = [column.strip().lower() for column in header]
+    missing = [field for field in FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+    positions = [header.index(field) for field in FIELDS]
+    
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < len(header):
+            yield reader.line_num, ()
+        else:
+            yield reader.line_num, tuple(row[position] for position in positions)
+
+
+def parse_jsonl(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Parsea JSON-lines: un objeto con aircraft_id, flight_number y origin por línea.
+    
+    Las líneas con JSON inválido se devuelven como None para que el
+    pipeline las cuente como rechazadas sin cortar la ingesta.
+    
+    Args:
+        lines (Iterable[str]): Líneas del archivo
+    
+    Yields:
+        Tuple[int, Any]: (número de línea, objeto o None)
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+PARSERS: Dict[str, Callable[[Iterable[str]], Iterator[Tuple[int, Any]]]] = {
+    "csv": parse_csv,
+    "jsonl": parse_jsonl
+}
+
+
+def prefetch(items: Iterable[Any], maxsize: int = 1024, chunk_size: int = 64) -> Iterator[Any]:
+    """
+    Lee un iterable en un hilo aparte a través de una cola acotada.
+    
+    Sirve para que la lectura de un feed lento (stdin, un socket) se
+    solape con el registro. Cuando la cola se llena, el hilo lector se
+    bloquea: esa es la contrapresión hacia la fuente. Los elementos
+    viajan en bloques de `chunk_size` para no pagar la sincronización
+    de la cola por cada fila. Si el consumidor deja de iterar (o se
+    cierra el generador), el hilo lector termina en su próxima espera.
+    
+    Args:
+        items (Iterable): Fuente a leer
+        maxsize (int): Elementos máximos en vuelo (aproximado al bloque)
+        chunk_size (int): Elementos por bloque
+    
+    Yields:
+        Los mismos elementos, en orden
+    """
+    buffer = queue.Queue(max(1, maxsize // chunk_size))
+    failure = []
+    stop = threading.Event()
+    
+    def put(chunk) -> bool:
+        # Sin consumidor nadie vacía la cola: se reintenta hasta que pidan parar
+        while not stop.is_set():
+            try:
+                buffer.put(chunk, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def reader():
+        try:
+            for chunk in batched(items, chunk_size):
+                if not put(chunk):
+                    return
+        except BaseException as error:  # se relanza en el hilo consumidor
+            failure.append(error)
+        finally:
+            put(_DONE)
+    
+    threading.Thread(target=reader, name="ingest-prefetch", daemon=True).start()
+    
+    try:
+        while True:
+            chunk = buffer.get()
+            if chunk is _DONE:
+                break
+            yield from chunk
+    finally:
+        stop.set()
+    
+    if failure:
+        raise failure[0]
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Agrupa un iterable en listas de hasta `size` elementos."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def auto_assign(manager: AirportTrafficManager, facility_type: str) -> int:
+    """
+    Asigna aeronaves en espera, en orden de llegada, mientras haya instalaciones libres.
+    
+    Args:
+        manager (AirportTrafficManager): Manager con la cola de espera
+        facility_type (str): Tipo de instalación ("runway" o "terminal")
+    
+    Returns:
+        int: Cantidad de aeronaves asignadas
+    """
+    pool = manager.pools[facility_type]
+    start_ts = manager.clock.time()
+    assigned = 0
+    
+    while pool.available_count():
+        arrival_data = manager.next_waiting()
+        if arrival_data is None:
+            break
+        # Puede fallar aunque queden libres: otro hilo las tomó o el pool
+        # las retiene (hold); la aeronave sigue primera en la cola
+        success, _ = manager.assign_arrival(arrival_data, facility_type, start_ts)
+        if not success:
+            break
+        assigned += 1
+    
+    return assigned
+
+
+def ingest(manager: AirportTrafficManager, rows: Iterable[Tuple[int, Any]],
+           assign: Optional[str] = None, batch_size: int = 256,
+           stats: Optional[IngestStats] = None,
+           progress: Optional[Callable[[IngestStats], None]] = None) -> IngestStats:
+    """
+    Registra en el manager las filas de un parser, por lotes.
+    
+    Args:
+        manager (AirportTrafficManager): Manager de destino
+        rows (Iterable[Tuple[int, Any]]): Filas (número de línea, datos) de parse_csv()/parse_jsonl()
+        assign (str, optional): Tipo de instalación a asignar automáticamente
+        batch_size (int): Filas registradas por lote
+        stats (IngestStats, optional): Contadores a actualizar; por defecto, nuevos
+        progress (Callable, optional): Se llama con los contadores después de cada lote
+    
+    Returns:
+        IngestStats: Contadores de la ingesta
+    
+    Raises:
+        ValueError: Si batch_size no es positivo
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size debe ser al menos 1")
+    
+    stats = IngestStats() if stats is None else stats
+    
+    for batch in batched(rows, batch_size):
+        stats.read += len(batch)
+        
+        candidates = []
+        lines = []
+        for line_number, row in batch:
+            if row is None:
+                stats.reject(line_number, "JSON inválido")
+                continue
+            
+            if isinstance(row, dict):
+                row = tuple(row.get(field) for field in FIELDS)
+            elif isinstance(row, list):
+                row = tuple(row)
+            
+            if not isinstance(row, tuple) or not all(value is None or isinstance(value, str) for value in row):
+                stats.reject(line_number, "Formato de fila inválido")
+            else:
+                candidates.append(row)
+                lines.append(line_number)
+        
+        arrivals = []
+        for result in register_arrivals_bulk(candidates):
+            if result.success:
+                arrivals.append(result.value)
+            else:
+                stats.reject(lines[result.index], result.value)
+        
+        manager.add_arrivals(arrivals)
+        stats.registered += len(arrivals)
+        
+        if assign is not None:
+            stats.assigned += auto_assign(manager, assign)
+        
+        if progress is not None:
+            progress(stats)
+    
+    return stats
+
+
+def open_feed(path: str, encoding: str = "utf-8") -> TextIO:
+    """
+    Abre un feed; "-" es la entrada estándar.
+    
+    Para "-" se envuelve sys.stdin.buffer sin tomarlo: close_feed() lo
+    suelta con detach(), así que stdin sigue abierto al terminar.
+    """
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding=encoding, newline="")
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def close_feed(feed: TextIO, path: str) -> None:
+    """Cierra un feed abierto con open_feed() sin cerrar la entrada estándar."""
+    if path == "-":
+        feed.detach()
+    else:
+        feed.close()
+
+
+def ingest_file(manager: AirportTrafficManager, path: str, data_format: Optional[str] = None,
+                prefetch_size: int = 0, **options: Any) -> IngestStats:
+    """
+    Ingiere un archivo CSV/JSON-lines (o stdin) en streaming.
+    
+    Args:
+        manager (AirportTrafficManager): Manager de destino
+        path (str): Ruta del feed, o "-" para stdin
+        data_format (str, optional): "csv" o "jsonl"; por defecto se deduce de la extensión
+        prefetch_size (int): Si es mayor que 0, lee en un hilo con una cola de ese tamaño
+        **options: Opciones para ingest() (assign, batch_size, progress, ...)
+    
+    Returns:
+        IngestStats: Contadores de la ingesta
+    """
+    data_format = data_format or detect_format(path)
+    if data_format not in PARSERS:
+        raise ValueError(f"Formato desconocido: {data_format}")
+    
+    feed = open_feed(path)
+    rows = None
+    try:
+        rows = PARSERS[data_format](feed)
+        if prefetch_size > 0:
+            rows = prefetch(rows, prefetch_size)
+        return ingest(manager, rows, **options)
+    finally:
+        # Detiene el lector de prefetch antes de soltar el feed
+        if rows is not None:
+            rows.close()
+        close_feed(feed, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ingiere feeds de llegadas sin interfaz gráfica desde la línea de comandos."""
+    parser = argparse.ArgumentParser(prog="airport_manager.py ingest",
+                                     description="Ingiere llegadas desde CSV o JSON-lines")
+    parser.add_argument("paths", nargs="*", default=["-"], help="Archivos a ingerir ('-' para stdin)")
+    parser.add_argument("--format", choices=FORMATS, help="Formato del feed (por defecto, según la extensión)")
+    parser.add_argument("--assign", choices=("runway", "terminal"), help="Asignar automáticamente al llegar")
+    parser.add_argument("--batch-size", type=int, default=256, help="Filas por lote")
+    parser.add_argument("--prefetch", type=int, default=0, help="Leer en un hilo con una cola de este tamaño")
+    parser.add_argument("--progress", type=float, default=0, help="Segundos entre reportes de avance")
+    args = parser.parse_args(argv)
+    
+    manager = AirportTrafficManager()
+    stats = IngestStats()
+    
+    progress = None
+    if args.progress > 0:
+        last_report = [time.perf_counter()]
+        
+        def progress(current: IngestStats) -> None:
+            now = time.perf_counter()
+            if now - last_report[0] >= args.progress:
+                last_report[0] = now
+                print(current.summary(), file=sys.stderr)
+    
+    try:
+        for path in args.paths:
+            data_format = args.format or ("jsonl" if path == "-" else detect_format(path))
+            ingest_file(manager, path, data_format, args.prefetch, assign=args.assign,
+                        batch_size=args.batch_size, stats=stats, progress=progress)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    
+    for line_number, message in stats.errors:
+        print(f"Línea {line_number}: {message}", file=sys.stderr)
+    print(stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
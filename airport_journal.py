@@ -0,0 +1,416 @@
+"""
+Airport Traffic Manager - Journal
+Persistencia con journal append-only, snapshots y recuperación ante fallos
+
+Cada llegada, asignación y liberación publicada por el manager se agrega
+como una línea JSON al journal. Las escrituras se confirman en disco por
+grupos (group commit): se hace fsync cada `batch_size` registros o, como
+máximo, cada `max_delay` segundos. Periódicamente se guarda un snapshot
+compacto del estado completo y el journal se trunca, de modo que al
+arrancar solo se reaplica la cola posterior al último snapshot.
+
+Uso típico:
+    manager = AirportTrafficManager()
+    journal = Journal("estado/")
+    journal.recover(manager)
+    journal.attach(manager)
+"""
+
+import contextlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from airport_core import (
+    AirportTrafficManager,
+    Arrival,
+    ArrivalRegistered,
+    ArrivalStatus,
+    FacilityAssigned,
+    FacilityReleased,
+    FacilityStatus
+)
+
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def encode_event(event: Any) -> Optional[Dict[str, Any]]:
+    """
+    Convierte un evento del manager en un registro del journal.
+    
+    Args:
+        event: ArrivalRegistered, FacilityAssigned o FacilityReleased
+    
+    Returns:
+        Optional[Dict]: Registro serializable, o None si el evento no se persiste
+    """
+    if isinstance(event, ArrivalRegistered):
+        arrival = event.arrival
+        return {"op": "arrival", "aircraft_id": arrival.aircraft_id, "flight_number": arrival.flight_number,
+                "origin": arrival.origin, "arrival_ts": arrival.arrival_ts}
+    
+    if isinstance(event, FacilityAssigned):
+        return {"op": "assign", "type": event.facility_type, "facility": event.facility_name,
+                "aircraft_id": event.aircraft_id, "ts": event.timestamp}
+    
+    if isinstance(event, FacilityReleased):
+        return {"op": "release", "type": event.facility_type, "facility": event.facility_name,
+                "ts": event.timestamp}
+    
+    return None
+
+
+def apply_record(manager: AirportTrafficManager, record: Dict[str, Any]) -> None:
+    """
+    Reaplica un registro del journal sobre el manager.
+    
+    Una asignación también marca como asignada la llegada en espera de esa
+    aeronave, igual que AirportTrafficManager.assign_arrival().
+    
+    Args:
+        manager (AirportTrafficManager): Manager a reconstruir
+        record (Dict): Registro leído del journal
+    
+    Raises:
+        ValueError: Si la operación es desconocida
+    """
+    op = record["op"]
+    
+    if op == "arrival":
+        manager.add_arrival(Arrival(record["aircraft_id"], record["flight_number"],
+                                    record["origin"], record["arrival_ts"]))
+    elif op == "assign":
+        facility_type = record["type"]
+        manager.pools[facility_type].occupy(record["facility"], record["aircraft_id"], record["ts"])
+        
+        arrival = manager.arrivals_index.get(record["aircraft_id"])
+        if arrival is not None and arrival.status is ArrivalStatus.WAITING:
+            arrival.status = f"assigned_{facility_type}"
+            arrival.assigned_ts = record["ts"]
+    elif op == "release":
+        manager.pools[record["type"]].release(record["facility"])
+    else:
+        raise ValueError(f"Operación desconocida en el journal: {op}")
+
+
+def dump_state(manager: AirportTrafficManager) -> Dict[str, Any]:
+    """
+    Serializa el estado completo del manager en forma compacta.
+    
+    Args:
+        manager (AirportTrafficManager): Manager a serializar
+    
+    Returns:
+        Dict: Llegadas como filas y estado de instalaciones por tipo
+    """
+    return {
+        "arrivals": [
+            [arrival.aircraft_id, arrival.flight_number, arrival.origin,
+             arrival.arrival_ts, arrival.status.value, arrival.assigned_ts]
+            for arrival in manager.arrivals_log
+        ],
+        "facilities": {
+            facility_type: [[name, facility.status.value, facility.aircraft, facility.start_ts]
+                            for name, facility in pool.items()]
+            for facility_type, pool in manager.pools.items()
+        }
+    }
+
+
+def load_state(manager: AirportTrafficManager, state: Dict[str, Any]) -> None:
+    """
+    Restaura sobre el manager un estado producido por dump_state().
+    
+    Las instalaciones que el manager no tenga se dan de alta.
+    
+    Args:
+        manager (AirportTrafficManager): Manager recién creado
+        state (Dict): Estado serializado
+    """
+    for facility_type, rows in state["facilities"].items():
+        pool = manager.pools[facility_type]
+        for name, status, aircraft, start_ts in rows:
+            if name not in pool:
+                pool.add(name)
+            if status == FacilityStatus.OCCUPIED.value:
+                pool.occupy(name, aircraft, start_ts)
+    
+    for aircraft_id, flight_number, origin, arrival_ts, status, assigned_ts in state["arrivals"]:
+        manager.add_arrival(Arrival(aircraft_id, flight_number, origin, arrival_ts, status, assigned_ts))
+
+
+def _fsync_directory(directory: str) -> None:
+    # Hace durable el rename del snapshot; no todas las plataformas lo permiten
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Journal append-only con group commit y snapshots periódicos.
+    
+    Args:
+        directory (str): Directorio donde se guardan journal y snapshot
+        batch_size (int): Registros por fsync; 1 hace durable cada operación
+        max_delay (float): Segundos máximos que un registro espera su fsync (0 desactiva el hilo)
+        snapshot_every (int, optional): Registros entre snapshots automáticos
+        fsync (bool): Si es False solo se vacía el buffer (útil en pruebas)
+    """
+    
+    def __init__(self, directory: str, batch_size: int = 256, max_delay: float = 0.05,
+                 snapshot_every: Optional[int] = 100_000, fsync: bool = True):
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser al menos 1")
+        
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        
+        self.seq = 0
+        self.commits = 0
+        self._pending = 0
+        self._since_snapshot = 0
+        self._lock = threading.RLock()
+        self._file = None
+        self._manager: Optional[AirportTrafficManager] = None
+        self._unsubscribe = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> "Journal":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def recover(self, manager: AirportTrafficManager) -> int:
+        """
+        Carga el último snapshot y reaplica los registros posteriores.
+        
+        Si el último registro quedó cortado por un fallo, se descarta y el
+        journal se trunca en el último registro válido.
+        
+        Args:
+            manager (AirportTrafficManager): Manager recién creado, aún sin journal
+        
+        Returns:
+            int: Cantidad de registros del journal reaplicados
+        """
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as snapshot_file:
+                state = json.load(snapshot_file)
+            load_state(manager, state)
+            snapshot_seq = state["seq"]
+        
+        self.seq = snapshot_seq
+        replayed = 0
+        
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r+b") as journal_file:
+                valid_end = 0
+                for line in iter(journal_file.readline, b""):
+                    # Sin salto de línea el registro quedó a medio escribir, aunque
+                    # se pueda leer: al seguir escribiendo se pegaría al siguiente
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_end += len(line)
+                    
+                    if record["seq"] <= snapshot_seq:
+                        continue
+                    apply_record(manager, record)
+                    self.seq = record["seq"]
+                    replayed += 1
+                
+                journal_file.truncate(valid_end)
+        
+        self._since_snapshot = replayed
+        return replayed
+    
+    def attach(self, manager: AirportTrafficManager) -> "Journal":
+        """
+        Empieza a registrar los eventos del manager.
+        
+        Args:
+            manager (AirportTrafficManager): Manager a persistir (ya recuperado)
+        
+        Returns:
+            Journal: El mismo journal, para encadenar llamadas
+        """
+        self._manager = manager
+        self._file = open(self.journal_path, "ab")
+        self._unsubscribe = manager.events.subscribe(self._on_event, ArrivalRegistered,
+                                                     FacilityAssigned, FacilityReleased)
+        
+        if self.max_delay and self.batch_size > 1:
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+            self._flusher.start()
+        
+        return self
+    
+    def _on_event(self, event: Any) -> None:
+        record = encode_event(event)
+        if record is not None:
+            self.append(record)
+    
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.max_delay):
+            self.commit()
+    
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Agrega un registro al journal.
+        
+        Args:
+            record (Dict): Registro con al menos la clave "op"
+        
+        Returns:
+            int: Número de secuencia asignado
+        """
+        with self._lock:
+            self.seq += 1
+            line = json.dumps({"seq": self.seq, **record}, separators=(",", ":"))
+            self._file.write(line.encode("utf-8") + b"\n")
+            self._pending += 1
+            self._since_snapshot += 1
+            
+            if self._pending >= self.batch_size:
+                self._commit_locked()
+            
+            seq = self.seq
+            snapshot_due = self.snapshot_every and self._since_snapshot >= self.snapshot_every
+        
+        if snapshot_due:
+            self._try_snapshot()
+        return seq
+    
+    def commit(self) -> None:
+        """Confirma en disco los registros pendientes."""
+        with self._lock:
+            self._commit_locked()
+    
+    def _commit_locked(self) -> None:
+        if not self._pending or self._file is None:
+            return
+        
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self.commits += 1
+    
+    def _state_locks(self) -> List[Any]:
+        manager = self._manager
+        if manager is None or not manager.thread_safe:
+            return []
+        return [manager.queue_lock] + [pool.lock for pool in manager.pools.values()]
+    
+    def _try_snapshot(self) -> None:
+        # Se publica con el lock de la cola o de un pool tomado: esperar los
+        # demás podría trabar a otro hilo que los tome en otro orden. Si alguno
+        # está ocupado, el snapshot queda para un registro posterior.
+        acquired = []
+        try:
+            for lock in self._state_locks():
+                if not lock.acquire(blocking=False):
+                    return
+                acquired.append(lock)
+            # Otro hilo pudo haberlo hecho mientras tanto
+            if self._since_snapshot >= self.snapshot_every:
+                self._write_snapshot()
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+    
+    def snapshot(self) -> None:
+        """
+        Guarda un snapshot del estado del manager y trunca el journal.
+        
+        El snapshot se escribe en un archivo temporal y se renombra, así que
+        un fallo a mitad de camino deja el snapshot anterior intacto. Con un
+        manager thread_safe se toman el lock de la cola y los de los pools:
+        así ningún cambio queda en el estado sin su registro en el journal
+        (o al revés) y el seq del snapshot corresponde exactamente a ese
+        estado. No debe llamarse desde un suscriptor de eventos.
+        """
+        with contextlib.ExitStack() as stack:
+            for lock in self._state_locks():
+                stack.enter_context(lock)
+            self._write_snapshot()
+    
+    def _write_snapshot(self) -> None:
+        with self._lock:
+            self._commit_locked()
+            
+            state = dump_state(self._manager)
+            state["seq"] = self.seq
+            
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+                json.dump(state, snapshot_file, separators=(",", ":"))
+                snapshot_file.flush()
+                if self.fsync:
+                    os.fsync(snapshot_file.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            if self.fsync:
+                _fsync_directory(self.directory)
+            
+            # Todo lo anterior ya está en el snapshot
+            self._file.close()
+            self._file = open(self.journal_path, "wb")
+            self._since_snapshot = 0
+    
+    def close(self) -> None:
+        """Deja de registrar eventos y confirma los pendientes."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        
+        with self._lock:
+            if self._file is not None:
+                self._commit_locked()
+                self._file.close()
+                self._file = None
+
+
+def open_manager(directory: str, **journal_options: Any) -> Tuple[AirportTrafficManager, Journal]:
+    """
+    Crea un manager persistente: recupera su estado y le conecta un journal.
+    
+    Args:
+        directory (str): Directorio del journal y el snapshot
+        **journal_options: Opciones para Journal (batch_size, max_delay, ...)
+    
+    Returns:
+        Tuple[AirportTrafficManager, Journal]: Manager recuperado y su journal
+    """
+    manager = AirportTrafficManager()
+    journal = Journal(directory, **journal_options)
+    journal.recover(manager)
+    return manager, journal.attach(manager)
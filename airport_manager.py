@@ -2,166 +2,699 @@
 Airport Traffic Manager
 Sistema de gestión de tráfico aéreo para operadores de aeropuerto
 
+La lógica vive en airport_core.py y se reexporta desde aquí; este módulo
+agrega la interfaz gráfica. tkinter se importa recién al crear la
+ventana, así que importar este módulo no requiere Tk.
+
 Autor: [Tu nombre]
 Curso: CSE 111
 Fecha: Junio 2025
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import bisect
+import heapq
+import math
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from airport_core import (
+    SYSTEM_CLOCK,
+    TIME_FORMAT,
+    AirportTrafficManager,
+    Arrival,
+    ArrivalRegistered,
+    ArrivalStatus,
+    BatchError,
+    BatchResult,
+    EventBatcher,
+    EventBus,
+    Facility,
+    FacilityAssigned,
+    FacilityPool,
+    FacilityReleased,
+    FacilityStatus,
+    SystemClock,
+    VirtualClock,
+    assign_batch,
+    assign_to,
+    check_available,
+    check_time_used,
+    format_timestamp,
+    register_arrival,
+    register_arrivals_bulk,
+    release_facility,
+)
+
+# Módulos de tkinter, cargados por _load_tkinter()
+tk = None
+ttk = None
+messagebox = None
+
+
+def _load_tkinter() -> None:
+    """Importa tkinter la primera vez que se necesita la interfaz."""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as tkinter_ttk, messagebox as tkinter_messagebox
+        tk, ttk, messagebox = tkinter, tkinter_ttk, tkinter_messagebox
+
+
+# Pools con más instalaciones que esto se muestran virtualizados
+LARGE_FACILITY_LIST = 500
+FACILITY_ROWS = 10
+HISTORY_ROWS = 8
 
+# Cada cuánto se vacía la cola de resultados mientras hay comandos en curso
+# y cuánto puede durar como máximo cada vaciado (un cuadro a 60 Hz son 16 ms)
+DRAIN_INTERVAL_MS = 10
+DRAIN_BUDGET = 0.004
 
-class AirportTrafficManager:
+# Separación mínima entre dos redibujos (un cuadro a 60 Hz)
+FRAME_BUDGET = 0.016
+
+
+def arrival_row_values(arrival_data: Arrival) -> Tuple[str, Tuple]:
+    """Fila del historial de llegadas: (aeronave, (vuelo, origen, hora, estado))."""
+    return arrival_data.aircraft_id, (arrival_data.flight_number, arrival_data.origin,
+                                      arrival_data.arrival_time, str(arrival_data.status))
+
+
+class FacilityTreeView:
     """
-    Clase principal para gestionar el tráfico aéreo en un aeropuerto.
-    Maneja pistas de aterrizaje y terminales disponibles.
+    Mantiene un ttk.Treeview sincronizado con un FacilityPool.
+    
+    Guarda un mapa nombre de instalación -> id de fila del Treeview y los
+    valores mostrados, de modo que cada actualización toca solo las filas
+    que cambiaron en lugar de borrar y reinsertar todo el árbol.
     """
     
-    def __init__(self):
-        self.airstrips = {
-            "Runway_01": {"status": "available", "aircraft": None, "start_time": None},
-            "Runway_02": {"status": "available", "aircraft": None, "start_time": None},
-            "Runway_03": {"status": "available", "aircraft": None, "start_time": None}
-        }
+    def __init__(self, tree, pool: FacilityPool, occupied_label: str):
+        self.tree = tree
+        self.pool = pool
+        self.occupied_label = occupied_label
+        self._items: Dict[str, str] = {}
+        self._values: Dict[str, Tuple] = {}
+    
+    def _row_values(self, facility_name: str, minutes: Dict[str, int]) -> Tuple:
+        facility = self.pool[facility_name]
+        status = "Disponible" if facility.status is FacilityStatus.AVAILABLE else self.occupied_label
+        aircraft = facility.aircraft or "-"
+        return (status, aircraft, minutes.get(facility_name, 0))
+    
+    def _apply(self, facility_names: List[str]) -> int:
+        updated = 0
+        # Una lectura del reloj y una pasada para todos los minutos del refresco
+        minutes = self.pool.occupancy_minutes(facility_names)
+        
+        for facility_name in facility_names:
+            values = self._row_values(facility_name, minutes)
+            if self._values.get(facility_name) == values:
+                continue
+            
+            item = self._items.get(facility_name)
+            if item is None:
+                self._items[facility_name] = self.tree.insert("", "end", text=facility_name, values=values)
+            else:
+                self.tree.item(item, values=values)
+            
+            self._values[facility_name] = values
+            updated += 1
+        
+        return updated
+    
+    def refresh(self) -> int:
+        """
+        Aplica los cambios pendientes del pool.
+        
+        Returns:
+            int: Cantidad de filas insertadas o modificadas
+        """
+        return self._apply(self.pool.drain_changes())
+    
+    def refresh_times(self, facility_names: Optional[Iterable[str]] = None) -> int:
+        """
+        Actualiza los minutos de uso de las instalaciones ocupadas.
         
-        self.terminals = {
-            "Terminal_A": {"status": "available", "aircraft": None, "start_time": None},
-            "Terminal_B": {"status": "available", "aircraft": None, "start_time": None},
-            "Terminal_C": {"status": "available", "aircraft": None, "start_time": None},
-            "Terminal_D": {"status": "available", "aircraft": None, "start_time": None}
-        }
+        Args:
+            facility_names (Iterable[str], optional): Solo estas instalaciones; por defecto, todas las ocupadas
         
-        self.arrivals_log = []
+        Returns:
+            int: Cantidad de filas cuyo valor cambió
+        """
+        return self._apply(self.pool.occupied() if facility_names is None else list(facility_names))
 
 
-def register_arrival(aircraft_id: str, flight_number: str, origin: str) -> Dict[str, str]:
+class ArrivalHistory:
     """
-    Registra la llegada de una aeronave al sistema.
+    Historial de llegadas del manager, indexado para buscar sin recorrerlo.
+    
+    Guarda, por aeronave, vuelo y origen, las posiciones de cada llegada en
+    arrivals_log (ordenadas, porque el log solo crece) y las actualiza con
+    los eventos ArrivalRegistered. Buscar por prefijo cuesta una búsqueda
+    binaria sobre las claves más las coincidencias; nunca se recorre el log.
+    Funciona como fuente de VirtualTreeView: las filas se leen del log
+    recién al mostrarlas.
     
     Args:
-        aircraft_id (str): Identificador único de la aeronave
-        flight_number (str): Número de vuelo
-        origin (str): Aeropuerto de origen
+        manager (AirportTrafficManager): Manager cuyo historial se muestra
+    """
     
-    Returns:
-        Dict[str, str]: Información del registro de llegada
+    FIELDS = ("aircraft_id", "flight_number", "origin")
     
-    Raises:
-        ValueError: Si algún parámetro está vacío o es None
-    """
-    if not aircraft_id or not flight_number or not origin:
-        raise ValueError("Todos los campos son obligatorios")
+    def __init__(self, manager: AirportTrafficManager):
+        self.manager = manager
+        self._index: Dict[str, Dict[str, List[int]]] = {field: {} for field in self.FIELDS}
+        self._sorted_keys: Dict[str, Optional[List[str]]] = {field: None for field in self.FIELDS}
+        self._size = 0
+        
+        with manager.queue_lock:
+            for arrival_data in manager.arrivals_log:
+                self._add(arrival_data)
+            self._unsubscribe = manager.events.subscribe(self._on_registered, ArrivalRegistered)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _add(self, arrival_data: Arrival) -> None:
+        position = self._size
+        for field in self.FIELDS:
+            key = arrival_data[field]
+            positions = self._index[field].get(key)
+            if positions is None:
+                self._index[field][key] = [position]
+                # Clave nueva: la lista ordenada se rehace en la próxima búsqueda
+                self._sorted_keys[field] = None
+            else:
+                positions.append(position)
+        self._size = position + 1
+    
+    def _on_registered(self, event: ArrivalRegistered) -> None:
+        self._add(event.arrival)
+    
+    def rows(self, start: int, stop: int) -> List[Arrival]:
+        """Llegadas en las posiciones [start, stop) del log."""
+        return self.manager.arrivals_log[start:min(stop, self._size)]
+    
+    def search(self, text: str) -> Any:
+        """
+        Llegadas cuya aeronave, vuelo u origen empieza con `text`.
+        
+        Args:
+            text (str): Prefijo a buscar (sin distinguir mayúsculas)
+        
+        Returns:
+            ArrivalHistory | ArrivalSelection: Coincidencias en orden de llegada; con
+            text vacío, el propio historial (que sigue creciendo)
+        """
+        prefix = text.strip().upper()
+        if not prefix:
+            return self
+        
+        matches: List[List[int]] = []
+        for field in self.FIELDS:
+            keys = self._sorted_keys[field]
+            if keys is None:
+                keys = self._sorted_keys[field] = sorted(self._index[field])
+            low = bisect.bisect_left(keys, prefix)
+            high = bisect.bisect_left(keys, prefix + "\uffff")
+            matches.extend(self._index[field][key] for key in keys[low:high])
+        
+        if len(matches) == 1:
+            return ArrivalSelection(self, matches[0])
+        # Una llegada puede coincidir por más de un campo: unir sin repetir
+        return ArrivalSelection(self, sorted(set(heapq.merge(*matches))))
+    
+    def close(self) -> None:
+        """Deja de seguir las llegadas nuevas."""
+        self._unsubscribe()
+
+
+class ArrivalSelection:
+    """Subconjunto del historial (posiciones del log), paginable como fuente de VirtualTreeView."""
     
-    arrival_time = datetime.now()
+    def __init__(self, history: ArrivalHistory, positions):
+        self.history = history
+        self.positions = positions
     
-    arrival_data = {
-        "aircraft_id": aircraft_id.strip().upper(),
-        "flight_number": flight_number.strip().upper(),
-        "origin": origin.strip().upper(),
-        "arrival_time": arrival_time.strftime("%Y-%m-%d %H:%M:%S"),
-        "status": "waiting_assignment"
-    }
+    def __len__(self) -> int:
+        return len(self.positions)
     
-    return arrival_data
+    def rows(self, start: int, stop: int) -> List[Arrival]:
+        log = self.history.manager.arrivals_log
+        return [log[position] for position in self.positions[start:stop]]
 
 
-def assign_to(facility_dict: Dict[str, Dict], aircraft_data: Dict[str, str], facility_type: str) -> Tuple[bool, str]:
+class FacilitySource:
     """
-    Asigna una aeronave a una instalación disponible (pista o terminal).
+    Instalaciones de un pool como fuente paginable de VirtualTreeView.
     
-    Args:
-        facility_dict (Dict): Diccionario de instalaciones disponibles
-        aircraft_data (Dict): Datos de la aeronave a asignar
-        facility_type (str): Tipo de instalación ("runway" o "terminal")
+    Cada página lee el reloj una vez para los minutos de uso de sus filas.
     
-    Returns:
-        Tuple[bool, str]: (éxito, mensaje/nombre_instalación)
+    Args:
+        pool (FacilityPool): Pool a mostrar
+        occupied_label (str): Texto del estado ocupado
     """
-    if not facility_dict or not aircraft_data:
-        return False, "Datos inválidos"
-    
-    # Buscar instalación disponible
-    for facility_name, facility_info in facility_dict.items():
-        if facility_info["status"] == "available":
-            # Asignar aeronave a la instalación
-            facility_info["status"] = "occupied"
-            facility_info["aircraft"] = aircraft_data["aircraft_id"]
-            facility_info["start_time"] = datetime.now()
-            
-            return True, facility_name
     
-    return False, f"No hay {facility_type}s disponibles"
+    def __init__(self, pool: FacilityPool, occupied_label: str):
+        self.pool = pool
+        self.occupied_label = occupied_label
+        self._names: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self.pool)
+    
+    def rows(self, start: int, stop: int) -> List[Tuple]:
+        if len(self._names) != len(self.pool):
+            # Las instalaciones solo se dan de alta: basta con rehacer la lista al cambiar el tamaño
+            self._names = list(self.pool)
+        names = self._names[start:stop]
+        minutes = self.pool.occupancy_minutes(names)
+        rows = []
+        for facility_name in names:
+            facility = self.pool[facility_name]
+            status = "Disponible" if facility.status is FacilityStatus.AVAILABLE else self.occupied_label
+            rows.append((facility_name, status, facility.aircraft or "-", minutes.get(facility_name, 0)))
+        return rows
 
 
-def check_time_used(facility_dict: Dict[str, Dict], facility_name: str) -> Optional[int]:
+class VirtualTreeView:
     """
-    Calcula el tiempo que una instalación ha estado ocupada.
+    Treeview virtualizado: muestra solo una ventana de filas de una fuente paginable.
     
-    Args:
-        facility_dict (Dict): Diccionario de instalaciones
-        facility_name (str): Nombre de la instalación a verificar
+    La fuente solo necesita __len__ y rows(inicio, fin). El árbol tiene a lo
+    sumo `height` filas, que se reescriben al desplazarse, así que mostrar,
+    desplazarse o refrescar cuesta O(height) sin importar el tamaño de la
+    fuente. yview() implementa el protocolo de las Scrollbar de Tk.
     
-    Returns:
-        Optional[int]: Minutos de uso, o None si no está ocupada o no existe
+    Args:
+        tree: ttk.Treeview (o cualquier objeto con insert/item/delete)
+        source: Fuente con __len__ y rows(inicio, fin)
+        row_values (Callable): Convierte una fila en (texto, valores)
+        height (int): Filas visibles
+        scrollbar (optional): Scrollbar vertical; recibe set(inicio, fin) en fracciones
     """
-    if facility_name not in facility_dict:
-        return None
-    
-    facility = facility_dict[facility_name]
     
-    if facility["status"] != "occupied" or facility["start_time"] is None:
-        return None
-    
-    current_time = datetime.now()
-    time_diff = current_time - facility["start_time"]
-    
-    return int(time_diff.total_seconds() / 60)
+    def __init__(self, tree, source: Any, row_values: Callable[[Any], Tuple[str, Tuple]],
+                 height: int = 20, scrollbar: Optional[Any] = None):
+        self.tree = tree
+        self.source = source
+        self.row_values = row_values
+        self.height = height
+        self.scrollbar = scrollbar
+        self.first = 0
+        self._total = len(source)
+        self._items: List[str] = []
+        self._shown: List[Tuple[str, Tuple]] = []
+    
+    def set_source(self, source: Any) -> int:
+        """Cambia la fuente (por ejemplo, el resultado de una búsqueda) y vuelve al principio."""
+        self.source = source
+        self.first = 0
+        self._total = len(source)
+        return self.render()
+    
+    def render(self) -> int:
+        """
+        Materializa la ventana visible.
+        
+        Returns:
+            int: Cantidad de filas que cambiaron en el árbol
+        """
+        total = len(self.source)
+        if total > self._total and self.first + self.height >= self._total:
+            # La ventana mostraba el final: sigue a las filas nuevas, como un log
+            self.first = total - self.height
+        self._total = total
+        self.first = max(0, min(self.first, total - self.height))
+        shown = [self.row_values(row) for row in self.source.rows(self.first, self.first + self.height)]
+        
+        changed = 0
+        for position, (text, values) in enumerate(shown):
+            if position < len(self._items):
+                if self._shown[position] != (text, values):
+                    self.tree.item(self._items[position], text=text, values=values)
+                    changed += 1
+            else:
+                self._items.append(self.tree.insert("", "end", text=text, values=values))
+                changed += 1
+        for item in self._items[len(shown):]:
+            self.tree.delete(item)
+            changed += 1
+        del self._items[len(shown):]
+        self._shown = shown
+        
+        if self.scrollbar is not None:
+            self.scrollbar.set(*self.fractions())
+        return changed
+    
+    # Mismo protocolo que FacilityTreeView, para usarlas indistintamente
+    refresh = render
+    
+    def refresh_times(self, facility_names: Optional[Iterable[str]] = None) -> int:
+        """Redibuja la ventana visible: los minutos se calculan al pedir las filas."""
+        return self.render()
+    
+    def fractions(self) -> Tuple[float, float]:
+        """Parte visible de la fuente, como (inicio, fin) en fracciones de 0 a 1."""
+        total = len(self.source)
+        if not total:
+            return 0.0, 1.0
+        return self.first / total, min(1.0, (self.first + self.height) / total)
+    
+    def scroll(self, rows: int) -> int:
+        """Desplaza la ventana `rows` filas (negativo: hacia arriba)."""
+        self.first += rows
+        return self.render()
+    
+    def yview(self, *args: Any) -> int:
+        """
+        Comando de la Scrollbar: ("moveto", fracción) o ("scroll", n, "units"|"pages").
+        """
+        if args and args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.source))
+        elif args and args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        return self.render()
 
 
-def check_available(facility_dict: Dict[str, Dict]) -> List[str]:
+class CommandPipeline:
     """
-    Devuelve una lista de instalaciones disponibles.
+    Ejecuta los comandos de la interfaz en un hilo de trabajo.
+    
+    submit() deja el comando en una cola y vuelve enseguida, así que el
+    mainloop de Tk nunca espera a la lógica del manager. Las colas son
+    queue.SimpleQueue, que nunca bloquean al encolar ni al sacar sin
+    esperar. El hilo de Tk sí toma el lock de cada pool al refrescar la
+    vista (drain_changes, occupancy_minutes), pero el worker lo tiene solo
+    durante una operación del pool, no durante todo un comando: la espera
+    se acota a esa operación.
+    Cada resultado (o excepción) vuelve por la cola de resultados, que
+    drain() vacía en el hilo de Tk, programado con schedule (root.after)
+    solo mientras haya comandos en curso; sin comandos no hay ningún timer
+    activo. Cada drain() entrega resultados durante a lo sumo `budget`
+    segundos y deja el resto para la vuelta siguiente.
+    
+    El worker toma de una vez todos los comandos acumulados y combina las
+    rachas de comandos seguidos con la misma key: corren una sola vez, con
+    los argumentos del último (o combinados con merge(anteriores, nuevos))
+    y el callback del último. Solo se combinan los contiguos, así que los
+    comandos se ejecutan siempre en el orden en que se enviaron: asignar,
+    liberar, asignar son tres comandos.
     
     Args:
-        facility_dict (Dict): Diccionario de instalaciones
-    
-    Returns:
-        List[str]: Lista de nombres de instalaciones disponibles
+        schedule (Callable): Programa una llamada en el hilo de Tk, con la firma de root.after(ms, función)
+        on_error (Callable, optional): Recibe las excepciones de los comandos sin errback
+        interval (int): Milisegundos entre vaciados de la cola de resultados
+        budget (float): Segundos máximos de cada vaciado
     """
-    if not facility_dict:
-        return []
     
-    available_facilities = []
-    
-    for facility_name, facility_info in facility_dict.items():
-        if facility_info["status"] == "available":
-            available_facilities.append(facility_name)
-    
-    return available_facilities
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any],
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 interval: int = DRAIN_INTERVAL_MS, budget: float = DRAIN_BUDGET):
+        self.schedule = schedule
+        self.on_error = on_error
+        self.interval = interval
+        self.budget = budget
+        
+        # [función, argumentos, callback, errback, key, merge]; None detiene el worker
+        self.commands = queue.SimpleQueue()
+        # (función, argumentos, comandos que completa) a ejecutar en el hilo de Tk
+        self.results = queue.SimpleQueue()
+        
+        # Solo los toca el hilo de Tk
+        self._outstanding = 0
+        self._draining = False
+        self._thread = threading.get_ident()
+        self.submitted = 0
+        self.completed = 0
+        
+        # Solo los toca el worker
+        self.executed = 0
+        self.coalesced = 0
+        
+        self.worker = threading.Thread(target=self._work, name="airport-commands", daemon=True)
+        self.worker.start()
+    
+    def __len__(self) -> int:
+        """Comandos enviados cuyo resultado todavía no se entregó."""
+        return self._outstanding
+    
+    def submit(self, function: Callable[..., Any], *args: Any,
+               callback: Optional[Callable[[Any], None]] = None,
+               errback: Optional[Callable[[Exception], None]] = None,
+               key: Optional[Any] = None,
+               merge: Optional[Callable[[Tuple, Tuple], Tuple]] = None) -> None:
+        """
+        Encola function(*args) para el worker. Se llama desde el hilo de Tk.
+        
+        Args:
+            function (Callable): Comando a ejecutar en el worker
+            *args: Argumentos del comando
+            callback (Callable, optional): Recibe el resultado en el hilo de Tk
+            errback (Callable, optional): Recibe la excepción en el hilo de Tk
+            key (optional): Clave para combinar comandos acumulados seguidos
+            merge (Callable, optional): Combina los argumentos acumulados con los nuevos
+        """
+        self.submitted += 1
+        self._outstanding += 1
+        self.commands.put([function, args, callback, errback, key, merge])
+        self._start_draining()
+    
+    def post(self, function: Callable[..., None], *args: Any) -> None:
+        """
+        Programa function(*args) en el hilo de Tk. Se puede llamar desde cualquier hilo.
+        
+        Lo publicado por un comando en curso se entrega antes que su resultado.
+        """
+        self.results.put((function, args, 0))
+        if threading.get_ident() == self._thread:
+            self._start_draining()
+    
+    def _start_draining(self) -> None:
+        if not self._draining:
+            self._draining = True
+            self.schedule(self.interval, self.drain)
+    
+    def _take_burst(self) -> Optional[List[List[Any]]]:
+        """
+        Espera un comando y toma además los acumulados, combinando los seguidos de igual clave.
+        
+        Returns:
+            Optional[List]: Comandos a ejecutar, con la cantidad que completa cada uno al final; None para terminar
+        """
+        burst = []
+        command = self.commands.get()
+        while command is not None:
+            key = command[4]
+            combined = burst[-1] if burst and key is not None and burst[-1][4] == key else None
+            if combined is None:
+                command.append(1)
+                burst.append(command)
+            else:
+                merge = command[5]
+                combined[1] = merge(combined[1], command[1]) if merge is not None else command[1]
+                combined[2:4] = command[2:4]
+                combined[6] += 1
+                self.coalesced += 1
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return burst
+        # Terminar después de ejecutar lo que ya estaba en la cola
+        return burst + [None]
+    
+    def _work(self) -> None:
+        """Bucle del worker: ejecuta los comandos y deja los resultados en la cola."""
+        while True:
+            for command in self._take_burst():
+                if command is None:
+                    return
+                function, args, callback, errback, _, _, count = command
+                try:
+                    result = function(*args)
+                except Exception as error:
+                    self.results.put((errback or self.on_error or _raise, (error,), count))
+                else:
+                    self.results.put((callback, (result,), count))
+                self.executed += 1
+                # Ceder el GIL entre comandos: si el hilo de Tk lo espera, no
+                # aguarda el intervalo de cambio de hilo (5 ms) por cada comando
+                time.sleep(0)
+    
+    def drain(self) -> int:
+        """
+        Entrega en el hilo de Tk los resultados disponibles, dentro del presupuesto.
+        
+        Returns:
+            int: Cantidad de resultados y llamadas entregados
+        """
+        deadline = time.perf_counter() + self.budget
+        delivered = 0
+        try:
+            while True:
+                try:
+                    function, args, count = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self._outstanding -= count
+                self.completed += count
+                delivered += 1
+                if function is not None:
+                    function(*args)
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            if self._outstanding or not self.results.empty():
+                self.schedule(self.interval, self.drain)
+            else:
+                self._draining = False
+        return delivered
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Espera a que terminen los comandos encolados y detiene el worker."""
+        self.commands.put(None)
+        self.worker.join(timeout)
 
 
-def release_facility(facility_dict: Dict[str, Dict], facility_name: str) -> bool:
+def _raise(error: Exception) -> None:
+    raise error
+
+
+class RefreshScheduler:
     """
-    Libera una instalación ocupada.
+    Decide cuándo redibujar la interfaz: solo si algo cambió o si un
+    contador de minutos mostrado cambia de valor.
+    
+    observe() recibe los lotes de eventos del manager y marca la vista como
+    sucia. Además guarda un heap con el próximo cambio de minuto de cada
+    instalación ocupada (inicio + 60 s, + 120 s, ...), así que el timer se
+    programa exactamente para el próximo cambio de minuto de todas, sin
+    revisar las instalaciones. Las entradas de instalaciones liberadas o
+    reasignadas se descartan al llegar al tope. Entre dos redibujos pasa
+    al menos `frame` segundos: los cambios que llegan antes se juntan en
+    el redibujo siguiente. Sin cambios ni instalaciones ocupadas no queda
+    ningún timer programado.
     
     Args:
-        facility_dict (Dict): Diccionario de instalaciones
-        facility_name (str): Nombre de la instalación a liberar
-    
-    Returns:
-        bool: True si se liberó exitosamente, False en caso contrario
+        redraw (Callable): Recibe (sucia, {tipo: [instalaciones cuyo minuto cambió]})
+        schedule (Callable): Programa una llamada, con la firma de root.after(ms, función); devuelve un id
+        cancel (Callable): Cancela un id devuelto por schedule, como root.after_cancel
+        pools (Mapping[str, FacilityPool]): Pools por tipo de instalación
+        clock (optional): Reloj de los pools; por defecto SYSTEM_CLOCK
+        frame (float): Segundos mínimos entre redibujos
     """
-    if facility_name not in facility_dict:
-        return False
     
-    facility = facility_dict[facility_name]
-    facility["status"] = "available"
-    facility["aircraft"] = None
-    facility["start_time"] = None
+    def __init__(self, redraw: Callable[[bool, Dict[str, List[str]]], None],
+                 schedule: Callable[[int, Callable[[], None]], Any], cancel: Callable[[Any], None],
+                 pools: Mapping[str, FacilityPool], clock: Optional[Any] = None,
+                 frame: float = FRAME_BUDGET):
+        self.redraw = redraw
+        self.schedule = schedule
+        self.cancel = cancel
+        self.pools = pools
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.frame = frame
+        self.dirty = False
+        self.redraws = 0
+        
+        # (próximo cambio de minuto, tipo, instalación, inicio de la ocupación)
+        self._rollovers: List[Tuple[float, str, str, float]] = []
+        self._last_frame = float("-inf")
+        self._timer = None
+        self._wake_at = None
+        
+        for facility_type, pool in pools.items():
+            for facility_name in pool.occupied():
+                self._track(facility_type, facility_name, pool[facility_name].start_ts)
+        self._reschedule()
+    
+    def _track(self, facility_type: str, facility_name: str, start_ts: float) -> None:
+        # Próximo minuto completo a partir de ahora (la ocupación puede venir de antes)
+        elapsed = max(0.0, self.clock.time() - start_ts)
+        rollover = start_ts + 60 * (int(elapsed // 60) + 1)
+        heapq.heappush(self._rollovers, (rollover, facility_type, facility_name, start_ts))
+    
+    def observe(self, events: List[Any]) -> None:
+        """Registra un lote de eventos del manager y marca la vista como sucia."""
+        for event in events:
+            if isinstance(event, FacilityAssigned):
+                self._track(event.facility_type, event.facility_name, event.timestamp)
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Marca la vista como sucia: se redibuja en el próximo cuadro disponible."""
+        self.dirty = True
+        self._reschedule()
+    
+    def next_rollover(self) -> Optional[float]:
+        """Hora del próximo cambio de minuto de una instalación ocupada, o None."""
+        rollovers = self._rollovers
+        while rollovers:
+            rollover, facility_type, facility_name, start_ts = rollovers[0]
+            facility = self.pools[facility_type].get(facility_name)
+            if facility is not None and facility.start_ts == start_ts and \
+                    facility.status is not FacilityStatus.AVAILABLE:
+                return rollover
+            # Liberada o reasignada: la ocupación que seguía ya terminó
+            heapq.heappop(rollovers)
+        return None
     
-    return True
+    def _reschedule(self) -> None:
+        """Deja un solo timer, para el próximo cuadro sucio o cambio de minuto."""
+        wake_at = self.next_rollover()
+        if self.dirty:
+            wake_at = self._last_frame + self.frame if wake_at is None else min(wake_at, self._last_frame + self.frame)
+        if wake_at is not None:
+            wake_at = max(wake_at, self._last_frame + self.frame)
+        if wake_at == self._wake_at:
+            return
+        
+        if self._timer is not None:
+            self.cancel(self._timer)
+            self._timer = None
+        self._wake_at = wake_at
+        if wake_at is not None:
+            # Redondear hacia arriba: despertar antes del cambio no serviría
+            delay = math.ceil(max(0.0, wake_at - self.clock.time()) * 1000)
+            self._timer = self.schedule(delay, self._tick)
+    
+    def _tick(self) -> None:
+        self._timer = None
+        self._wake_at = None
+        now = self.clock.time()
+        if now < self._last_frame + self.frame:
+            # Despertó antes de que el cuadro esté disponible
+            self._reschedule()
+            return
+        
+        rolled: Dict[str, List[str]] = {}
+        rollovers = self._rollovers
+        while self.next_rollover() is not None and rollovers[0][0] <= now:
+            rollover, facility_type, facility_name, start_ts = rollovers[0]
+            rolled.setdefault(facility_type, []).append(facility_name)
+            # Saltar los minutos que pasaron sin despertar (por ejemplo, con la ventana suspendida)
+            skipped = int((now - rollover) // 60) + 1
+            heapq.heapreplace(rollovers, (rollover + 60 * skipped, facility_type, facility_name, start_ts))
+        
+        if self.dirty or rolled:
+            dirty = self.dirty
+            self.dirty = False
+            self._last_frame = now
+            self.redraws += 1
+            self.redraw(dirty, rolled)
+        self._reschedule()
+    
+    def stop(self) -> None:
+        """Cancela el timer pendiente."""
+        if self._timer is not None:
+            self.cancel(self._timer)
+        self._timer = None
+        self._wake_at = None
 
 
 class AirportGUI:
@@ -170,14 +703,50 @@ class AirportGUI:
     """
     
     def __init__(self, root):
+        _load_tkinter()
         self.root = root
         self.root.title("Airport Traffic Manager")
         self.root.geometry("800x600")
         
-        self.manager = AirportTrafficManager()
+        # El manager se modifica en el worker y se lee desde el hilo de Tk
+        self.manager = AirportTrafficManager(thread_safe=True)
+        self.commands = CommandPipeline(self.root.after, on_error=self.show_error)
         
         self.setup_gui()
         self.update_display()
+        
+        # Redibujar solo ante cambios o cuando un contador de minutos avanza
+        self.refresher = RefreshScheduler(self.redraw, self.root.after, self.root.after_cancel,
+                                          self.manager.pools, self.manager.clock)
+        
+        # Refrescar apenas el manager notifica cambios, agrupando ráfagas
+        # de eventos en una sola actualización cuando Tk queda libre. Los
+        # eventos se publican en el worker y se pasan al hilo de Tk.
+        self.event_batcher = EventBatcher(self.on_manager_events, self.root.after_idle)
+        self.manager.events.subscribe(lambda event: self.commands.post(self.event_batcher, event),
+                                      ArrivalRegistered, FacilityAssigned, FacilityReleased)
+    
+    def _virtual_view(self, frame, tree, source, row_values, height: int) -> VirtualTreeView:
+        """Conecta un Treeview a una fuente paginable, con scrollbar y rueda del mouse."""
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+        scrollbar.grid(row=0, column=2, sticky=(tk.N, tk.S))
+        view = VirtualTreeView(tree, source, row_values, height, scrollbar)
+        scrollbar.configure(command=view.yview)
+        
+        def on_wheel(event):
+            view.scroll(-3 if event.num == 4 or event.delta > 0 else 3)
+            return "break"
+        
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, on_wheel)
+        return view
+    
+    def _facility_view(self, frame, tree, pool: FacilityPool, occupied_label: str):
+        """Vista de un pool: completa si es chico, virtualizada si es grande."""
+        if len(pool) <= LARGE_FACILITY_LIST:
+            return FacilityTreeView(tree, pool, occupied_label)
+        return self._virtual_view(frame, tree, FacilitySource(pool, occupied_label),
+                                  lambda row: (row[0], row[1:]), FACILITY_ROWS)
     
     def setup_gui(self):
         """Configura la interfaz gráfica."""
@@ -208,13 +777,16 @@ class AirportGUI:
         runway_frame = ttk.LabelFrame(main_frame, text="Pistas de Aterrizaje", padding="5")
         runway_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5, padx=(0, 5))
         
-        self.runway_tree = ttk.Treeview(runway_frame, columns=("Status", "Aircraft", "Time"), show="tree headings")
+        self.runway_tree = ttk.Treeview(runway_frame, columns=("Status", "Aircraft", "Time"), show="tree headings",
+                                        height=FACILITY_ROWS)
         self.runway_tree.heading("#0", text="Pista")
         self.runway_tree.heading("Status", text="Estado")
         self.runway_tree.heading("Aircraft", text="Aeronave")
         self.runway_tree.heading("Time", text="Tiempo (min)")
         self.runway_tree.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        self.runway_view = self._facility_view(runway_frame, self.runway_tree, self.manager.airstrips, "Ocupada")
+        
         ttk.Button(runway_frame, text="Asignar a Pista", 
                   command=self.assign_to_runway).grid(row=1, column=0, pady=5)
         ttk.Button(runway_frame, text="Liberar Pista", 
@@ -224,98 +796,123 @@ class AirportGUI:
         terminal_frame = ttk.LabelFrame(main_frame, text="Terminales", padding="5")
         terminal_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
-        self.terminal_tree = ttk.Treeview(terminal_frame, columns=("Status", "Aircraft", "Time"), show="tree headings")
+        self.terminal_tree = ttk.Treeview(terminal_frame, columns=("Status", "Aircraft", "Time"), show="tree headings",
+                                          height=FACILITY_ROWS)
         self.terminal_tree.heading("#0", text="Terminal")
         self.terminal_tree.heading("Status", text="Estado")
         self.terminal_tree.heading("Aircraft", text="Aeronave")
         self.terminal_tree.heading("Time", text="Tiempo (min)")
         self.terminal_tree.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        self.terminal_view = self._facility_view(terminal_frame, self.terminal_tree, self.manager.terminals, "Ocupado")
+        
         ttk.Button(terminal_frame, text="Asignar a Terminal", 
                   command=self.assign_to_terminal).grid(row=1, column=0, pady=5)
         ttk.Button(terminal_frame, text="Liberar Terminal", 
                   command=self.release_terminal).grid(row=1, column=1, pady=5)
         
+        # Sección de historial: solo se materializan las filas visibles
+        history_frame = ttk.LabelFrame(main_frame, text="Historial de Llegadas", padding="5")
+        history_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        
+        self.history_tree = ttk.Treeview(history_frame, columns=("Flight", "Origin", "Time", "Status"),
+                                         show="tree headings", height=HISTORY_ROWS)
+        self.history_tree.heading("#0", text="Aeronave")
+        self.history_tree.heading("Flight", text="Vuelo")
+        self.history_tree.heading("Origin", text="Origen")
+        self.history_tree.heading("Time", text="Hora")
+        self.history_tree.heading("Status", text="Estado")
+        self.history_tree.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.history = ArrivalHistory(self.manager)
+        self.history_view = self._virtual_view(history_frame, self.history_tree, self.history,
+                                               arrival_row_values, HISTORY_ROWS)
+        
+        ttk.Label(history_frame, text="Buscar:").grid(row=1, column=0, sticky=tk.W)
+        self.history_search_var = tk.StringVar()
+        self.history_search_var.trace_add("write", lambda *args: self.search_history())
+        ttk.Entry(history_frame, textvariable=self.history_search_var).grid(row=1, column=1, sticky=tk.W, pady=5)
+        
         # Status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Sistema listo")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN)
-        status_bar.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        status_bar.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
-        # Timer para actualizar display
-        self.root.after(30000, self.auto_update)  # Actualizar cada 30 segundos
+        self.facility_views = {"runway": self.runway_view, "terminal": self.terminal_view}
+    
+    def show_error(self, error: Exception) -> None:
+        """Muestra el error de un comando."""
+        messagebox.showerror("Error", str(error))
     
     def register_arrival_gui(self):
         """Maneja el registro de llegadas desde la GUI."""
-        try:
-            aircraft_id = self.aircraft_id_var.get()
-            flight_number = self.flight_number_var.get()
-            origin = self.origin_var.get()
-            
-            arrival_data = register_arrival(aircraft_id, flight_number, origin)
-            self.manager.arrivals_log.append(arrival_data)
-            
-            # Limpiar campos
-            self.aircraft_id_var.set("")
-            self.flight_number_var.set("")
-            self.origin_var.set("")
-            
-            self.status_var.set(f"Llegada registrada: {arrival_data['flight_number']}")
-            
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
+        # Las variables de Tk se leen en el hilo de Tk; el registro corre en el worker
+        self.commands.submit(self._register_arrival, self.aircraft_id_var.get(),
+                             self.flight_number_var.get(), self.origin_var.get(),
+                             callback=self._on_arrival_registered)
+    
+    def _register_arrival(self, aircraft_id: str, flight_number: str, origin: str) -> Arrival:
+        """Comando: valida y agrega la llegada al manager."""
+        arrival_data = register_arrival(aircraft_id, flight_number, origin)
+        self.manager.add_arrival(arrival_data)
+        return arrival_data
+    
+    def _on_arrival_registered(self, arrival_data: Arrival) -> None:
+        # Limpiar campos
+        self.aircraft_id_var.set("")
+        self.flight_number_var.set("")
+        self.origin_var.set("")
+        
+        self.status_var.set(f"Llegada registrada: {arrival_data['flight_number']}")
     
     def assign_to_runway(self):
         """Asigna aeronave a pista disponible."""
-        if not self.manager.arrivals_log:
-            messagebox.showwarning("Advertencia", "No hay aeronaves en espera")
-            return
-        
-        # Usar la primera aeronave en espera
-        aircraft_data = None
-        for arrival in self.manager.arrivals_log:
-            if arrival["status"] == "waiting_assignment":
-                aircraft_data = arrival
-                break
-        
-        if not aircraft_data:
-            messagebox.showwarning("Advertencia", "No hay aeronaves esperando asignación")
-            return
-        
-        success, result = assign_to(self.manager.airstrips, aircraft_data, "runway")
-        
-        if success:
-            aircraft_data["status"] = "assigned_runway"
-            self.status_var.set(f"Aeronave {aircraft_data['aircraft_id']} asignada a {result}")
-            self.update_display()
-        else:
-            messagebox.showwarning("Advertencia", result)
+        self._submit_assignment("runway")
     
     def assign_to_terminal(self):
         """Asigna aeronave a terminal disponible."""
-        if not self.manager.arrivals_log:
-            messagebox.showwarning("Advertencia", "No hay aeronaves en espera")
-            return
-        
-        # Usar la primera aeronave en espera
-        aircraft_data = None
-        for arrival in self.manager.arrivals_log:
-            if arrival["status"] == "waiting_assignment":
-                aircraft_data = arrival
-                break
-        
-        if not aircraft_data:
-            messagebox.showwarning("Advertencia", "No hay aeronaves esperando asignación")
-            return
-        
-        success, result = assign_to(self.manager.terminals, aircraft_data, "terminal")
+        self._submit_assignment("terminal")
+    
+    def _submit_assignment(self, facility_type: str) -> None:
+        # Los clics que esperan turno se suman en un solo comando
+        self.commands.submit(self._assign_waiting, facility_type, 1, callback=self._on_assigned,
+                             key=("assign", facility_type),
+                             merge=lambda pending, new: (pending[0], pending[1] + new[1]))
+    
+    def _assign_waiting(self, facility_type: str, count: int) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Comando: asigna hasta `count` aeronaves en espera, en orden de llegada.
         
-        if success:
-            aircraft_data["status"] = "assigned_terminal"
-            self.status_var.set(f"Aeronave {aircraft_data['aircraft_id']} asignada a {result}")
-            self.update_display()
-        else:
-            messagebox.showwarning("Advertencia", result)
+        Returns:
+            Tuple: ([(aircraft_id, instalación), ...], advertencia o None)
+        """
+        assigned = []
+        for _ in range(count):
+            with self.manager.queue_lock:
+                # Usar la primera aeronave en espera
+                aircraft_data = self.manager.next_waiting()
+                if not aircraft_data:
+                    if not self.manager.arrivals_log:
+                        return assigned, "No hay aeronaves en espera"
+                    return assigned, "No hay aeronaves esperando asignación"
+                
+                success, result = self.manager.assign_arrival(aircraft_data, facility_type)
+            
+            if not success:
+                return assigned, result
+            assigned.append((aircraft_data["aircraft_id"], result))
+        return assigned, None
+    
+    def _on_assigned(self, outcome: Tuple[List[Tuple[str, str]], Optional[str]]) -> None:
+        assigned, warning = outcome
+        if len(assigned) == 1:
+            self.status_var.set(f"Aeronave {assigned[0][0]} asignada a {assigned[0][1]}")
+        elif assigned:
+            self.status_var.set(f"{len(assigned)} aeronaves asignadas; la última, "
+                                f"{assigned[-1][0]}, a {assigned[-1][1]}")
+        if warning:
+            messagebox.showwarning("Advertencia", warning)
     
     def release_runway(self):
         """Libera una pista seleccionada."""
@@ -325,9 +922,7 @@ class AirportGUI:
             return
         
         runway_name = self.runway_tree.item(selection[0])["text"]
-        if release_facility(self.manager.airstrips, runway_name):
-            self.status_var.set(f"Pista {runway_name} liberada")
-            self.update_display()
+        self._submit_release(self.manager.airstrips, runway_name, f"Pista {runway_name} liberada")
     
     def release_terminal(self):
         """Libera un terminal seleccionado."""
@@ -337,49 +932,75 @@ class AirportGUI:
             return
         
         terminal_name = self.terminal_tree.item(selection[0])["text"]
-        if release_facility(self.manager.terminals, terminal_name):
-            self.status_var.set(f"Terminal {terminal_name} liberado")
-            self.update_display()
+        self._submit_release(self.manager.terminals, terminal_name, f"Terminal {terminal_name} liberado")
     
-    def update_display(self):
-        """Actualiza la información mostrada en pantalla."""
-        # Limpiar árboles
-        for item in self.runway_tree.get_children():
-            self.runway_tree.delete(item)
-        
-        for item in self.terminal_tree.get_children():
-            self.terminal_tree.delete(item)
-        
-        # Actualizar pistas
-        for runway_name, runway_info in self.manager.airstrips.items():
-            status = "Disponible" if runway_info["status"] == "available" else "Ocupada"
-            aircraft = runway_info["aircraft"] or "-"
-            time_used = check_time_used(self.manager.airstrips, runway_name) or 0
-            
-            self.runway_tree.insert("", "end", text=runway_name, 
-                                  values=(status, aircraft, time_used))
-        
-        # Actualizar terminales
-        for terminal_name, terminal_info in self.manager.terminals.items():
-            status = "Disponible" if terminal_info["status"] == "available" else "Ocupado"
-            aircraft = terminal_info["aircraft"] or "-"
-            time_used = check_time_used(self.manager.terminals, terminal_name) or 0
-            
-            self.terminal_tree.insert("", "end", text=terminal_name, 
-                                    values=(status, aircraft, time_used))
+    def _submit_release(self, pool: FacilityPool, facility_name: str, message: str) -> None:
+        # Un doble clic sobre la misma instalación la libera una sola vez
+        def on_released(released: bool) -> None:
+            if released:
+                self.status_var.set(message)
+        
+        self.commands.submit(release_facility, pool, facility_name, callback=on_released,
+                             key=("release", pool.facility_type, facility_name))
+    
+    def search_history(self):
+        """Filtra el historial por el prefijo buscado, usando el índice."""
+        # Mientras se escribe solo importa la última búsqueda
+        self.commands.submit(self.history.search, self.history_search_var.get(),
+                             callback=self.history_view.set_source, key="search")
+    
+    def on_manager_events(self, events):
+        """Aplica en pantalla un lote de eventos del manager."""
+        # Una búsqueda activa es una foto: se rehace si llegaron aeronaves nuevas
+        if self.history_view.source is not self.history and \
+                any(isinstance(event, ArrivalRegistered) for event in events):
+            self.commands.submit(self.history.search, self.history_search_var.get(),
+                                 callback=self._on_search_refreshed, key="search-refresh")
+        self.refresher.observe(events)
+    
+    def _on_search_refreshed(self, source: Any) -> None:
+        # Conserva la posición de la ventana en el resultado nuevo
+        if self.history_view.source is not self.history:
+            self.history_view.source = source
+            self.history_view.render()
     
-    def auto_update(self):
-        """Actualización automática del display."""
-        self.update_display()
-        self.root.after(30000, self.auto_update)
+    def update_display(self):
+        """Actualiza solo las filas de instalaciones que cambiaron y la ventana visible del historial."""
+        self.runway_view.refresh()
+        self.terminal_view.refresh()
+        self.history_view.refresh()
+    
+    def redraw(self, dirty: bool, rolled: Dict[str, List[str]]) -> None:
+        """Cuadro del RefreshScheduler: aplica los cambios y los minutos que avanzaron."""
+        if dirty:
+            self.update_display()
+        for facility_type, facility_names in rolled.items():
+            self.facility_views[facility_type].refresh_times(facility_names)
 
 
 def main():
     """Función principal del programa."""
+    _load_tkinter()
     root = tk.Tk()
     app = AirportGUI(root)
     root.mainloop()
+    app.refresher.stop()
+    app.commands.close()
+
+
+def main_ingest(argv: Optional[List[str]] = None) -> int:
+    """
+    Ingiere feeds de llegadas sin interfaz gráfica (ver airport_ingest.py).
+    
+    Uso:
+        python airport_manager.py ingest vuelos.csv [--assign terminal]
+    """
+    # Import diferido: la ingesta solo se carga si se pide
+    from airport_ingest import main as ingest_main
+    return ingest_main(argv)
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["ingest"]:
+        sys.exit(main_ingest(sys.argv[2:]))
     main()
\ No newline at end of file
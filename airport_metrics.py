@@ -0,0 +1,572 @@
+"""
+Airport Traffic Manager - Métricas
+Contadores, histogramas de latencia, gauges y exportación Prometheus
+
+Las métricas viven en un MetricsRegistry que las exporta en el formato de
+texto de Prometheus, por HTTP (serve()) o a un archivo (dump()).
+ManagerMetrics instrumenta un AirportTrafficManager: exporta los totales
+de asignaciones y liberaciones, mide su latencia y cuánto dura cada
+ocupación, y expone la cola de espera y la ocupación de cada instalación.
+
+Para no cargar el camino caliente:
+- Los histogramas son log-lineales al estilo HDR: registrar un valor es
+  un math.frexp() y un incremento de lista, sin búsquedas ni locks.
+- Los contadores son los totales que los pools ya llevan bajo su lock;
+  se leen al exportar.
+- Latencias, duraciones de ocupación y pico de la cola se miden en una
+  de cada `sample_every` llamadas.
+- Lo que se puede derivar del estado (cola, ocupación) se calcula al
+  exportar, no en cada operación.
+
+Uso típico:
+    metrics = ManagerMetrics(manager)
+    server = metrics.registry.serve(9100)   # http://localhost:9100/metrics
+    metrics.registry.dump("metrics.prom")   # o a un archivo
+"""
+
+import math
+from math import frexp
+import os
+import sys
+import threading
+import time
+from collections import Counter as _SampleCounter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from airport_core import AirportTrafficManager, ArrivalStatus
+
+
+# Muestra exportada: (nombre, etiquetas, valor)
+Sample = Tuple[str, Dict[str, str], float]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """
+    Contador monótono.
+    
+    Args:
+        name (str): Nombre de la métrica (se exporta tal cual; por convención termina en _total)
+        help (str): Descripción
+        labels (Mapping[str, str], optional): Etiquetas fijas de esta serie
+        function (Callable[[], float], optional): Si se indica, el valor se lee al exportar
+    """
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help: str, labels: Optional[Mapping[str, str]] = None,
+                 function: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help
+        self.labels = dict(labels or {})
+        self.function = function
+        self.value = 0
+    
+    def inc(self, amount: float = 1) -> None:
+        """Suma `amount` (no negativo) al contador."""
+        self.value += amount
+    
+    def samples(self) -> Iterator[Sample]:
+        yield self.name, self.labels, self.function() if self.function is not None else self.value
+
+
+class Gauge:
+    """
+    Valor que sube y baja.
+    
+    Con `function` el valor se calcula al exportar; si la función devuelve
+    un diccionario, cada clave es una serie con la etiqueta `label_name`.
+    
+    Args:
+        name (str): Nombre de la métrica
+        help (str): Descripción
+        labels (Mapping[str, str], optional): Etiquetas fijas
+        function (Callable, optional): Devuelve el valor, o un diccionario clave -> valor
+        label_name (str): Etiqueta de las claves del diccionario
+    """
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, help: str, labels: Optional[Mapping[str, str]] = None,
+                 function: Optional[Callable[[], Any]] = None, label_name: str = "key"):
+        self.name = name
+        self.help = help
+        self.labels = dict(labels or {})
+        self.function = function
+        self.label_name = label_name
+        self.value = 0.0
+    
+    def set(self, value: float) -> None:
+        """Fija el valor."""
+        self.value = value
+    
+    def samples(self) -> Iterator[Sample]:
+        value = self.function() if self.function is not None else self.value
+        if isinstance(value, Mapping):
+            for key, item in value.items():
+                yield self.name, {**self.labels, self.label_name: key}, item
+        else:
+            yield self.name, self.labels, value
+
+
+class Histogram:
+    """
+    Histograma log-lineal al estilo HDR.
+    
+    Cada potencia de dos entre `lowest` y `highest` se divide en
+    `sub_buckets` partes iguales, así que el error relativo de los
+    cuantiles es a lo sumo 1 / sub_buckets (3% con 32). Se exporta como
+    summary de Prometheus: cuantiles, suma y cantidad.
+    
+    Args:
+        name (str): Nombre de la métrica
+        help (str): Descripción
+        labels (Mapping[str, str], optional): Etiquetas fijas
+        lowest (float): Menor valor distinguible (los menores cuentan en el primer bucket)
+        highest (float): Mayor valor distinguible (los mayores cuentan en el último)
+        sub_buckets (int): Buckets por potencia de dos
+        quantiles (Tuple[float, ...]): Cuantiles exportados
+    """
+    
+    kind = "summary"
+    
+    def __init__(self, name: str, help: str, labels: Optional[Mapping[str, str]] = None,
+                 lowest: float = 1e-6, highest: float = 3600.0, sub_buckets: int = 32,
+                 quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)):
+        self.name = name
+        self.help = help
+        self.labels = dict(labels or {})
+        self.lowest = lowest
+        self.sub_buckets = sub_buckets
+        self.quantiles = quantiles
+        self.exponents = max(1, math.frexp(highest / lowest)[1] + 1)
+        self.counts = [0] * (self.exponents * sub_buckets)
+        self._scale = 1.0 / lowest
+        self._span = 2 * sub_buckets
+        self._last = len(self.counts) - 1
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def _index(self, value: float) -> int:
+        mantissa, exponent = frexp(value * self._scale)
+        if exponent <= 0:
+            return 0
+        if exponent >= self.exponents:
+            return len(self.counts) - 1
+        # mantissa está en [0,5; 1): se reparte en sub_buckets partes
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+    
+    def record(self, value: float) -> None:
+        """Registra un valor, en O(1)."""
+        # _index() en línea: es el camino caliente
+        mantissa, exponent = frexp(value * self._scale)
+        if exponent <= 0:
+            index = 0
+        elif exponent >= self.exponents:
+            index = self._last
+        else:
+            index = exponent * self.sub_buckets + int((mantissa - 0.5) * self._span)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+    
+    def _bucket_value(self, index: int) -> float:
+        # Punto medio del bucket
+        exponent, sub_bucket = divmod(index, self.sub_buckets)
+        if exponent == 0:
+            return self.lowest / 2
+        return self.lowest * 2.0 ** exponent * (0.5 + (sub_bucket + 0.5) / (2 * self.sub_buckets))
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estima un cuantil.
+        
+        Args:
+            q (float): Cuantil entre 0 y 1
+        
+        Returns:
+            float: Valor estimado (0 si no hay registros); nunca mayor que el máximo registrado
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                # El último bucket junta todo lo que pasa de `highest`
+                return self.max if index == self._last else min(self._bucket_value(index), self.max)
+        return self.max
+    
+    def reset(self) -> None:
+        """Vacía el histograma."""
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def samples(self) -> Iterator[Sample]:
+        for q in self.quantiles:
+            yield self.name, {**self.labels, "quantile": str(q)}, self.quantile(q)
+        yield self.name + "_sum", self.labels, self.sum
+        yield self.name + "_count", self.labels, self.count
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exportables en formato de texto de Prometheus."""
+    
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._lock = threading.Lock()
+    
+    def register(self, metric: Any) -> Any:
+        """
+        Agrega una métrica y la devuelve.
+        
+        Raises:
+            ValueError: Si ya hay una métrica con el mismo nombre y etiquetas, o del mismo nombre y otro tipo
+        """
+        with self._lock:
+            for existing in self._metrics:
+                if existing.name == metric.name and (existing.kind != metric.kind or existing.labels == metric.labels):
+                    raise ValueError(f"Métrica duplicada: {metric.name}{_format_labels(metric.labels)}")
+            self._metrics.append(metric)
+        return metric
+    
+    def unregister(self, metric: Any) -> None:
+        """Quita una métrica."""
+        with self._lock:
+            if metric in self._metrics:
+                self._metrics.remove(metric)
+    
+    def counter(self, name: str, help: str, **kwargs: Any) -> Counter:
+        """Crea y registra un Counter."""
+        return self.register(Counter(name, help, **kwargs))
+    
+    def gauge(self, name: str, help: str, **kwargs: Any) -> Gauge:
+        """Crea y registra un Gauge."""
+        return self.register(Gauge(name, help, **kwargs))
+    
+    def histogram(self, name: str, help: str, **kwargs: Any) -> Histogram:
+        """Crea y registra un Histogram."""
+        return self.register(Histogram(name, help, **kwargs))
+    
+    def render(self) -> str:
+        """
+        Exporta todas las métricas.
+        
+        Returns:
+            str: Texto en el formato de exposición de Prometheus (versión 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+        
+        # Las series de un mismo nombre van juntas, con un solo HELP/TYPE
+        families: Dict[str, List[Any]] = {}
+        for metric in metrics:
+            families.setdefault(metric.name, []).append(metric)
+        
+        lines = []
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {family[0].help}")
+            lines.append(f"# TYPE {name} {family[0].kind}")
+            for metric in family:
+                for sample_name, labels, value in metric.samples():
+                    lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+    
+    def dump(self, path: str) -> None:
+        """
+        Escribe las métricas en un archivo (por ejemplo, para el textfile collector de node_exporter).
+        
+        La escritura es atómica: se escribe un temporal y se reemplaza.
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as output:
+            output.write(self.render())
+        os.replace(temporary, path)
+    
+    def serve(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Sirve las métricas por HTTP en un hilo de fondo.
+        
+        Args:
+            port (int): Puerto (0 elige uno libre; ver server.server_address)
+            host (str): Dirección de escucha
+        
+        Returns:
+            ThreadingHTTPServer: Servidor en marcha; server.shutdown() lo detiene
+        """
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="airport-metrics", daemon=True).start()
+        return server
+
+
+class ManagerMetrics:
+    """
+    Instrumenta un AirportTrafficManager.
+    
+    Los contadores salen de los totales que cada FacilityPool ya lleva
+    (assigned_total, released_total, ...) y se leen al exportar, así que
+    no suman trabajo por operación. Lo único que se mide en el camino
+    caliente es muestreado: se reemplazan en la instancia assign_arrival()
+    del manager y release() de cada pool por versiones que, una de cada
+    `sample_every` llamadas, miden la latencia, la duración de la ocupación
+    liberada y el largo de la cola. uninstall() lo deshace.
+    
+    Args:
+        manager (AirportTrafficManager): Manager a instrumentar
+        registry (MetricsRegistry, optional): Registro donde publicar; por defecto, uno nuevo
+        sample_every (int): Muestrear una de cada N llamadas (1 = todas)
+    """
+    
+    def __init__(self, manager: AirportTrafficManager, registry: Optional[MetricsRegistry] = None,
+                 sample_every: int = 16):
+        if sample_every < 1:
+            raise ValueError("sample_every debe ser al menos 1")
+        self.manager = manager
+        self.registry = MetricsRegistry() if registry is None else registry
+        self.sample_every = sample_every
+        self.waiting_peak = 0
+        self._metrics: List[Any] = []
+        
+        self.assign_latency: Dict[str, Histogram] = {}
+        self.release_latency: Dict[str, Histogram] = {}
+        self.occupancy: Dict[str, Histogram] = {}
+        
+        for facility_type, pool in manager.pools.items():
+            labels = {"type": facility_type}
+            self._add(Counter("airport_assignments_total", "Asignaciones exitosas", labels,
+                              function=lambda pool=pool: pool.assigned_total))
+            self._add(Counter("airport_assignment_failures_total", "Asignaciones rechazadas", labels,
+                              function=lambda pool=pool: pool.rejected_total))
+            self._add(Counter("airport_releases_total", "Liberaciones de instalaciones", labels,
+                              function=lambda pool=pool: pool.released_total))
+            self._add(Counter("airport_occupied_seconds_total", "Suma de las ocupaciones terminadas", labels,
+                              function=lambda pool=pool: pool.occupied_seconds_total))
+            self.assign_latency[facility_type] = self._add(Histogram(
+                "airport_assign_seconds", "Latencia de assign_arrival (muestreada)", labels))
+            self.release_latency[facility_type] = self._add(Histogram(
+                "airport_release_seconds", "Latencia de release (muestreada)", labels))
+            self.occupancy[facility_type] = self._add(Histogram(
+                "airport_occupancy_seconds", "Duración de las ocupaciones terminadas (muestreada)", labels,
+                lowest=1.0, highest=7 * 24 * 3600.0))
+            self._add(Gauge("airport_facilities_occupied", "Instalaciones ocupadas", labels,
+                            function=lambda pool=pool: len(pool) - pool.available_count()))
+            self._add(Gauge("airport_facility_occupied_seconds", "Segundos que lleva ocupada cada instalación",
+                            labels, function=lambda pool=pool: self._occupied_seconds(pool),
+                            label_name="facility"))
+        
+        self._add(Counter("airport_arrivals_total", "Llegadas registradas",
+                          function=lambda: len(manager.arrivals_log)))
+        self._add(Gauge("airport_waiting_aircraft", "Aeronaves en espera de asignación",
+                        function=self._waiting))
+        self._add(Gauge("airport_waiting_peak", "Pico de la cola de espera (muestreado, cota superior)",
+                        function=self._peak))
+        
+        self._install()
+    
+    def _add(self, metric: Any) -> Any:
+        self._metrics.append(self.registry.register(metric))
+        return metric
+    
+    def _waiting(self) -> int:
+        with self.manager.queue_lock:
+            return sum(1 for arrival_data in self.manager.waiting_queue if arrival_data.status is ArrivalStatus.WAITING)
+    
+    def _peak(self) -> int:
+        self._observe_queue()
+        return self.waiting_peak
+    
+    def _observe_queue(self) -> None:
+        # len() cuenta también las llegadas ya asignadas que la cola descarta de forma perezosa
+        depth = len(self.manager.waiting_queue)
+        if depth > self.waiting_peak:
+            self.waiting_peak = depth
+    
+    @staticmethod
+    def _occupied_seconds(pool) -> Dict[str, float]:
+        now = pool.clock.time()
+        return {facility_name: now - pool[facility_name].start_ts for facility_name in pool.occupied()}
+    
+    def _install(self) -> None:
+        manager = self.manager
+        assign_arrival = manager.assign_arrival
+        latency = self.assign_latency
+        observe_queue = self._observe_queue
+        sample_every = self.sample_every
+        perf_counter = time.perf_counter
+        countdown = sample_every
+        
+        def timed_assign_arrival(arrival_data, facility_type, start_ts=None, facility_name=None):
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                return assign_arrival(arrival_data, facility_type, start_ts, facility_name)
+            countdown = sample_every
+            observe_queue()
+            started = perf_counter()
+            result = assign_arrival(arrival_data, facility_type, start_ts, facility_name)
+            latency[facility_type].record(perf_counter() - started)
+            return result
+        
+        manager.assign_arrival = timed_assign_arrival
+        
+        for facility_type, pool in manager.pools.items():
+            pool.release = self._timed_release(pool, self.release_latency[facility_type],
+                                               self.occupancy[facility_type])
+    
+    def _timed_release(self, pool, latency: Histogram, occupancy: Histogram) -> Callable[[str], bool]:
+        release = pool.release
+        clock = pool.clock
+        sample_every = self.sample_every
+        perf_counter = time.perf_counter
+        countdown = sample_every
+        
+        def timed_release(facility_name):
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                return release(facility_name)
+            countdown = sample_every
+            facility = pool.get(facility_name)
+            start_ts = None if facility is None else facility.start_ts
+            started = perf_counter()
+            result = release(facility_name)
+            latency.record(perf_counter() - started)
+            if result and start_ts is not None:
+                occupancy.record(clock.time() - start_ts)
+            return result
+        
+        return timed_release
+    
+    def uninstall(self) -> None:
+        """Quita la instrumentación del manager y las métricas del registro."""
+        self.manager.__dict__.pop("assign_arrival", None)
+        for pool in self.manager.pools.values():
+            pool.__dict__.pop("release", None)
+        for metric in self._metrics:
+            self.registry.unregister(metric)
+        self._metrics.clear()
+
+
+class SamplingProfiler:
+    """
+    Perfilador por muestreo, opcional y sin dependencias.
+    
+    Un hilo de fondo mira cada `interval` segundos la pila del hilo
+    observado (sys._current_frames()) y cuenta las pilas vistas. No
+    instrumenta funciones, así que el costo para el hilo observado es
+    casi nulo; la precisión depende de la cantidad de muestras.
+    
+    Args:
+        interval (float): Segundos entre muestras
+        thread_id (int, optional): Hilo a observar; por defecto, el que crea el perfilador
+        depth (int): Marcos de pila guardados por muestra
+    """
+    
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None, depth: int = 32):
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.depth = depth
+        self.stacks: _SampleCounter = _SampleCounter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def start(self) -> None:
+        """Empieza a muestrear."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="airport-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Deja de muestrear (las muestras se conservan)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+    
+    def sample(self) -> None:
+        """Toma una muestra de la pila del hilo observado."""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and len(stack) < self.depth:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+    
+    def top(self, count: int = 20) -> List[Tuple[str, int]]:
+        """Funciones en el tope de la pila más vistas: [(archivo:función, muestras)]."""
+        leaves: _SampleCounter = _SampleCounter()
+        for stack, samples in self.stacks.items():
+            leaves[stack[-1]] += samples
+        return leaves.most_common(count)
+    
+    def folded(self) -> str:
+        """Pilas en formato plegado (una por línea, 'a;b;c muestras'), para flame graphs."""
+        return "".join(f"{';'.join(stack)} {samples}\n" for stack, samples in self.stacks.most_common())
+    
+    def register(self, registry: MetricsRegistry, count: int = 20) -> Gauge:
+        """Publica en el registro las `count` funciones más muestreadas."""
+        return registry.gauge("airport_profile_samples", "Muestras del perfilador por función",
+                              function=lambda: dict(self.top(count)), label_name="function")
@@ -0,0 +1,427 @@
+"""
+Airport Traffic Manager - Predicción
+Estimación en línea de tiempos de ocupación y de liberación de instalaciones
+
+Cada ocupación terminada (asignación -> liberación) actualiza estadísticas
+de su duración por instalación, por origen y por número de vuelo. Las
+estadísticas son de memoria constante y se actualizan en O(1): media y
+varianza con el algoritmo de Welford y cuantiles con el algoritmo P² de
+Jain y Chlamtac, que sigue cada cuantil con cinco marcadores sin guardar
+las observaciones.
+
+Al asignarse una instalación se predice su duración con la estadística
+más específica que tenga suficientes muestras (vuelo, origen, instalación
+o el tipo completo) y la hora estimada de liberación entra en un heap por
+tipo, así que "la próxima instalación en liberarse" cuesta O(log n).
+
+Uso típico:
+    predictor = TurnaroundPredictor(manager)
+    predictor.predict_release_time("Terminal_A")   # epoch estimado
+    predictor.next_to_free("terminal")             # ("Terminal_C", epoch)
+    BatchOptimizer(manager, "terminal", predictor.expected_dwell)
+"""
+
+import contextlib
+import heapq
+import math
+import threading
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from airport_core import AirportTrafficManager, FacilityAssigned, FacilityReleased
+
+
+class P2Quantile:
+    """
+    Estimador P² de un cuantil: cinco marcadores, O(1) por observación.
+    
+    Los marcadores guardan el mínimo, el máximo, el cuantil buscado y dos
+    puntos intermedios. Con cada observación se corren sus posiciones y,
+    si alguno se aleja de su posición ideal, se ajusta su altura con una
+    interpolación parabólica (o lineal, si la parabólica lo desordena).
+    Hasta juntar cinco observaciones el cuantil es exacto.
+    
+    Args:
+        quantile (float): Cuantil a estimar, entre 0 y 1
+    """
+    
+    __slots__ = ("quantile", "count", "heights", "positions", "_fractions")
+    
+    def __init__(self, quantile: float):
+        if not 0 < quantile < 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1")
+        self.quantile = quantile
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        # Con n observaciones el marcador i debería estar en 1 + (n - 1) * fracción
+        self._fractions = (0.0, quantile / 2, quantile, (1 + quantile) / 2)
+    
+    def add(self, value: float) -> None:
+        """Agrega una observación."""
+        count = self.count = self.count + 1
+        heights = self.heights
+        if count <= 5:
+            insort(heights, value)
+            return
+        
+        positions = self.positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect_right(heights, value) - 1
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        
+        scale = count - 1
+        fractions = self._fractions
+        for index in (1, 2, 3):
+            position = positions[index]
+            offset = 1 + scale * fractions[index] - position
+            if (offset >= 1 and positions[index + 1] - position > 1) or \
+                    (offset <= -1 and positions[index - 1] - position < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = heights[index] + step * (heights[index + step] - heights[index]) / \
+                        (positions[index + step] - position)
+                heights[index] = height
+                positions[index] = position + step
+    
+    def _parabolic(self, index: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        below = positions[index] - positions[index - 1]
+        above = positions[index + 1] - positions[index]
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (below + step) * (heights[index + 1] - heights[index]) / above +
+            (above - step) * (heights[index] - heights[index - 1]) / below)
+    
+    def value(self) -> float:
+        """Estimación actual del cuantil (NaN sin observaciones)."""
+        if self.count >= 5:
+            return self.heights[2]
+        if not self.count:
+            return math.nan
+        # Pocas observaciones: interpolar entre las ordenadas
+        position = self.quantile * (self.count - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.count - 1)
+        return self.heights[lower] + (position - lower) * (self.heights[upper] - self.heights[lower])
+
+
+class DwellStats:
+    """
+    Estadísticas de duración de ocupaciones en memoria constante.
+    
+    Media y varianza con el algoritmo de Welford (estable numéricamente)
+    y un P2Quantile por cuantil seguido.
+    
+    Args:
+        quantiles (Sequence[float]): Cuantiles a seguir
+    """
+    
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum", "_estimators")
+    
+    def __init__(self, quantiles: Sequence[float] = (0.5, 0.9)):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._estimators = tuple(P2Quantile(quantile) for quantile in quantiles)
+    
+    def add(self, dwell: float) -> None:
+        """Agrega la duración de una ocupación terminada, en segundos."""
+        count = self.count = self.count + 1
+        delta = dwell - self.mean
+        self.mean += delta / count
+        self._m2 += delta * (dwell - self.mean)
+        if dwell < self.minimum:
+            self.minimum = dwell
+        if dwell > self.maximum:
+            self.maximum = dwell
+        for estimator in self._estimators:
+            estimator.add(dwell)
+    
+    @property
+    def variance(self) -> float:
+        """Varianza muestral (0 con menos de dos observaciones)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+    
+    def quantile(self, quantile: float) -> float:
+        """
+        Estimación de un cuantil seguido.
+        
+        Raises:
+            KeyError: Si el cuantil no se sigue
+        """
+        for estimator in self._estimators:
+            if estimator.quantile == quantile:
+                return estimator.value()
+        raise KeyError(quantile)
+
+
+class Occupation(NamedTuple):
+    """Ocupación en curso y su liberación estimada."""
+    
+    facility_type: str
+    facility_name: str
+    aircraft_id: str
+    flight_number: str
+    origin: str
+    start_ts: float
+    predicted_release: float
+    basis: str
+
+
+class TurnaroundPredictor:
+    """
+    Predice cuándo se libera cada instalación ocupada del manager.
+    
+    Se suscribe a FacilityAssigned y FacilityReleased. Cada liberación
+    actualiza en O(1) las estadísticas de la instalación, del origen y del
+    vuelo de la aeronave y las del tipo de instalación. Las de orígenes y
+    vuelos se guardan en un LRU de a lo sumo `max_keys` claves cada una,
+    así que la memoria no crece con el historial.
+    
+    La predicción de una ocupación se calcula al asignarla con la
+    estadística más específica con al menos `min_samples` muestras y
+    queda fija; si la hora estimada pasa sin liberarse, se estima "ahora".
+    
+    Args:
+        manager (AirportTrafficManager): Manager a observar
+        quantile (float): Cuantil de la duración usado como predicción (0.5: mediana)
+        quantiles (Sequence[float]): Cuantiles seguidos en cada estadística
+        min_samples (int): Muestras mínimas para usar una estadística
+        default_dwell (float): Duración supuesta sin estadísticas, en segundos
+        max_keys (int): Orígenes y vuelos recordados como máximo
+    """
+    
+    DIMENSIONS = ("flight", "origin", "facility")
+    
+    def __init__(self, manager: AirportTrafficManager, quantile: float = 0.5,
+                 quantiles: Sequence[float] = (0.5, 0.9), min_samples: int = 5,
+                 default_dwell: float = 1800.0, max_keys: int = 10_000):
+        if max_keys < 1:
+            raise ValueError("max_keys debe ser positivo")
+        self.manager = manager
+        self.quantile = quantile
+        self.quantiles = tuple(sorted(set(quantiles) | {quantile}))
+        self.min_samples = min_samples
+        self.default_dwell = default_dwell
+        self.max_keys = max_keys
+        self.lock = threading.Lock() if manager.thread_safe else contextlib.nullcontext()
+        
+        # Estadísticas por dimensión: clave -> DwellStats, en orden de uso
+        self.stats: Dict[str, "OrderedDict[Tuple[str, str], DwellStats]"] = {
+            dimension: OrderedDict() for dimension in self.DIMENSIONS}
+        self._tables = tuple(self.stats[dimension] for dimension in self.DIMENSIONS)
+        self.by_type: Dict[str, DwellStats] = {}
+        
+        # Ocupaciones en curso y heap de liberaciones estimadas por tipo
+        self.occupations: Dict[Tuple[str, str], Occupation] = {}
+        self._releases: Dict[str, List[Tuple[float, str, float]]] = {}
+        self._stale: Dict[str, int] = {}
+        
+        for facility_type, pool in manager.pools.items():
+            for facility_name in pool.occupied():
+                facility = pool[facility_name]
+                self._on_assigned(FacilityAssigned(facility_type, facility_name, facility.aircraft, facility.start_ts))
+        self._unsubscribe = manager.events.subscribe(self._on_event, FacilityAssigned, FacilityReleased)
+    
+    def close(self) -> None:
+        """Deja de observar el manager."""
+        self._unsubscribe()
+    
+    def _on_event(self, event) -> None:
+        if isinstance(event, FacilityAssigned):
+            self._on_assigned(event)
+        else:
+            self._on_released(event)
+    
+    def _route(self, aircraft_id: str) -> Tuple[str, str]:
+        arrival_data = self.manager.find_arrival(aircraft_id)
+        if arrival_data is None:
+            return "", ""
+        return arrival_data["flight_number"], arrival_data["origin"]
+    
+    def _keys(self, facility_type: str, facility_name: str, flight_number: str,
+              origin: str) -> Tuple[Tuple[str, str], ...]:
+        # En el orden de DIMENSIONS; vuelos y orígenes se separan por tipo,
+        # porque una aeronave no ocupa una terminal lo mismo que una pista
+        return (facility_type, flight_number), (facility_type, origin), (facility_type, facility_name)
+    
+    def _on_assigned(self, event: FacilityAssigned) -> None:
+        flight_number, origin = self._route(event.aircraft_id)
+        with self.lock:
+            dwell, basis = self._predict_dwell(event.facility_type, event.facility_name, flight_number, origin)
+            occupation = Occupation(event.facility_type, event.facility_name, event.aircraft_id, flight_number,
+                                    origin, event.timestamp, event.timestamp + dwell, basis)
+            previous = self.occupations.get((event.facility_type, event.facility_name))
+            self.occupations[(event.facility_type, event.facility_name)] = occupation
+            heapq.heappush(self._releases.setdefault(event.facility_type, []),
+                           (occupation.predicted_release, event.facility_name, event.timestamp))
+            if previous is not None:
+                self._discard(event.facility_type)
+    
+    def _on_released(self, event: FacilityReleased) -> None:
+        with self.lock:
+            occupation = self.occupations.pop((event.facility_type, event.facility_name), None)
+            if occupation is not None:
+                self._discard(event.facility_type)
+            if event.start_ts is None:
+                return
+            dwell = event.timestamp - event.start_ts
+            flight_number, origin = ("", "") if occupation is None else (occupation.flight_number, occupation.origin)
+            
+            keys = self._keys(event.facility_type, event.facility_name, flight_number, origin)
+            for table, stats_key in zip(self._tables, keys):
+                if not stats_key[1]:
+                    continue
+                stats = table.get(stats_key)
+                if stats is None:
+                    stats = table[stats_key] = DwellStats(self.quantiles)
+                    if len(table) > self.max_keys:
+                        table.popitem(last=False)
+                else:
+                    table.move_to_end(stats_key)
+                stats.add(dwell)
+            
+            stats = self.by_type.get(event.facility_type)
+            if stats is None:
+                stats = self.by_type[event.facility_type] = DwellStats(self.quantiles)
+            stats.add(dwell)
+    
+    def _discard(self, facility_type: str) -> None:
+        # La entrada del heap de una ocupación terminada queda obsoleta. Se
+        # descarta al llegar al tope, pero si nadie consulta next_to_free()
+        # no llega nunca: cuando las obsoletas superan al doble de las
+        # vigentes, el heap se reconstruye solo con estas, en O(1) amortizado
+        stale = self._stale.get(facility_type, 0) + 1
+        releases = self._releases[facility_type]
+        if stale > 2 * (len(releases) - stale):
+            releases[:] = [entry for entry in releases if self._current(facility_type, entry)]
+            heapq.heapify(releases)
+            stale = 0
+        self._stale[facility_type] = stale
+    
+    def _current(self, facility_type: str, entry: Tuple[float, str, float]) -> bool:
+        occupation = self.occupations.get((facility_type, entry[1]))
+        return occupation is not None and occupation.start_ts == entry[2]
+    
+    def _predict_dwell(self, facility_type: str, facility_name: str,
+                       flight_number: str = "", origin: str = "") -> Tuple[float, str]:
+        keys = self._keys(facility_type, facility_name, flight_number, origin)
+        for dimension, table, stats_key in zip(self.DIMENSIONS, self._tables, keys):
+            stats = table.get(stats_key)
+            if stats is not None and stats.count >= self.min_samples:
+                return stats.quantile(self.quantile), dimension
+        stats = self.by_type.get(facility_type)
+        if stats is not None and stats.count >= self.min_samples:
+            return stats.quantile(self.quantile), "type"
+        return self.default_dwell, "default"
+    
+    def predict_dwell(self, facility_type: str, facility_name: str,
+                      flight_number: str = "", origin: str = "") -> float:
+        """
+        Duración esperada de una ocupación, en segundos.
+        
+        Sirve también para aeronaves en espera: se indica la instalación
+        candidata y el vuelo y origen de la aeronave.
+        
+        Args:
+            facility_type (str): Tipo de instalación ("runway" o "terminal")
+            facility_name (str): Nombre de la instalación
+            flight_number (str, optional): Número de vuelo de la aeronave
+            origin (str, optional): Origen de la aeronave
+        
+        Returns:
+            float: Duración estimada en segundos
+        """
+        with self.lock:
+            return self._predict_dwell(facility_type, facility_name, flight_number, origin)[0]
+    
+    def expected_dwell(self, facility_name: str) -> float:
+        """Duración esperada de una instalación sin datos de la aeronave (para BatchOptimizer)."""
+        for facility_type, pool in self.manager.pools.items():
+            if facility_name in pool:
+                return self.predict_dwell(facility_type, facility_name)
+        return self.default_dwell
+    
+    def _occupation(self, facility_name: str, facility_type: Optional[str]) -> Optional[Occupation]:
+        if facility_type is not None:
+            return self.occupations.get((facility_type, facility_name))
+        for facility_type in self.manager.pools:
+            occupation = self.occupations.get((facility_type, facility_name))
+            if occupation is not None:
+                return occupation
+        return None
+    
+    def predict_release_time(self, facility_name: str, facility_type: Optional[str] = None) -> Optional[float]:
+        """
+        Hora estimada (epoch) en que se libera una instalación.
+        
+        Args:
+            facility_name (str): Nombre de la instalación
+            facility_type (str, optional): Tipo; por defecto se busca en todos los pools
+        
+        Returns:
+            Optional[float]: Hora estimada; la actual si ya está libre o si se pasó de lo
+            estimado; None si la instalación no existe
+        """
+        now = self.manager.clock.time()
+        with self.lock:
+            occupation = self._occupation(facility_name, facility_type)
+        if occupation is not None:
+            return max(now, occupation.predicted_release)
+        if any(facility_name in pool for pool in self.manager.pools.values()):
+            return now
+        return None
+    
+    def next_to_free(self, facility_type: str) -> Optional[Tuple[str, float]]:
+        """
+        La instalación ocupada que se estima que se libera primero.
+        
+        Las entradas de ocupaciones ya terminadas se descartan al llegar al
+        tope del heap, así que cuesta O(log n) amortizado.
+        
+        Args:
+            facility_type (str): Tipo de instalación ("runway" o "terminal")
+        
+        Returns:
+            Optional[Tuple[str, float]]: (instalación, hora estimada), o None si no hay ocupadas
+        """
+        now = self.manager.clock.time()
+        with self.lock:
+            releases = self._releases.get(facility_type, [])
+            while releases:
+                predicted_release, facility_name, _ = releases[0]
+                if self._current(facility_type, releases[0]):
+                    return facility_name, max(now, predicted_release)
+                heapq.heappop(releases)
+                self._stale[facility_type] = max(0, self._stale.get(facility_type, 0) - 1)
+        return None
+    
+    def statistics(self, dimension: str, key: str, facility_type: str) -> Optional[DwellStats]:
+        """
+        Estadísticas guardadas de un vuelo, origen o instalación.
+        
+        Args:
+            dimension (str): "flight", "origin" o "facility"
+            key (str): Número de vuelo, origen o nombre de instalación
+            facility_type (str): Tipo de instalación
+        
+        Returns:
+            Optional[DwellStats]: Estadísticas, o None si no hay (o se descartaron del LRU)
+        """
+        with self.lock:
+            return self.stats[dimension].get((facility_type, key))
@@ -0,0 +1,453 @@
+"""
+Airport Traffic Manager - Reservas
+Calendario de reservas futuras de pistas y terminales
+
+Cada instalación tiene una línea de tiempo con sus reservas, sin
+solapamientos y ordenadas por inicio en listas paralelas: como ningún
+intervalo se solapa, los finales también quedan ordenados y los
+conflictos se detectan con dos búsquedas binarias (bisect), O(log n).
+
+Cuando se registra una llegada cuyo número de vuelo tiene una reserva
+vigente, el calendario la asigna a la instalación reservada. Mientras
+tanto, la asignación automática no entrega las instalaciones con una
+reserva próxima a otras aeronaves.
+
+Uso típico:
+    calendar = ReservationCalendar(manager, "terminal")
+    calendar.reserve("Terminal_A1", "UA100", start_ts, start_ts + 45 * 60)
+    manager.add_arrival(register_arrival("ABC123", "UA100", "JFK"))  # queda en Terminal_A1
+"""
+
+import contextlib
+import heapq
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from airport_core import AirportTrafficManager, Arrival, ArrivalRegistered, ArrivalStatus, FacilityReleased
+
+
+class Reservation(NamedTuple):
+    """Reserva de una instalación para un vuelo entre dos horas (epoch)."""
+    
+    facility: str
+    flight_number: str
+    start_ts: float
+    end_ts: float
+
+
+class ReservationConflict(ValueError):
+    """La reserva se solapa con otras; conflicts detalla cuáles."""
+    
+    def __init__(self, message: str, conflicts: List[Reservation]):
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+class Timeline:
+    """
+    Reservas de una instalación, ordenadas y sin solapamientos.
+    
+    Los intervalos son semiabiertos [inicio, fin): una reserva puede
+    empezar exactamente cuando termina la anterior.
+    
+    Args:
+        facility (str): Nombre de la instalación
+    """
+    
+    def __init__(self, facility: str):
+        self.facility = facility
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._flights: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    def __iter__(self):
+        for index in range(len(self._starts)):
+            yield self._reservation(index)
+    
+    def _reservation(self, index: int) -> Reservation:
+        return Reservation(self.facility, self._flights[index], self._starts[index], self._ends[index])
+    
+    def _span(self, start_ts: float, end_ts: float) -> Tuple[int, int]:
+        # Reservas que se solapan con [start_ts, end_ts): las que terminan
+        # después del inicio y empiezan antes del fin, siempre contiguas
+        return bisect_right(self._ends, start_ts), bisect_left(self._starts, end_ts)
+    
+    def is_free(self, start_ts: float, end_ts: float) -> bool:
+        """Indica si el intervalo no se solapa con ninguna reserva, en O(log n)."""
+        first, last = self._span(start_ts, end_ts)
+        return first >= last
+    
+    def conflicts(self, start_ts: float, end_ts: float) -> List[Reservation]:
+        """Devuelve las reservas que se solapan con el intervalo, en O(log n + k)."""
+        first, last = self._span(start_ts, end_ts)
+        return [self._reservation(index) for index in range(first, last)]
+    
+    def add(self, flight_number: str, start_ts: float, end_ts: float) -> Reservation:
+        """
+        Agrega una reserva.
+        
+        Args:
+            flight_number (str): Vuelo de la reserva
+            start_ts (float): Inicio en epoch
+            end_ts (float): Fin en epoch
+        
+        Returns:
+            Reservation: Reserva agregada
+        
+        Raises:
+            ValueError: Si el fin no es posterior al inicio
+            ReservationConflict: Si se solapa con otras reservas
+        """
+        if end_ts <= start_ts:
+            raise ValueError("El fin de la reserva debe ser posterior al inicio")
+        
+        first, last = self._span(start_ts, end_ts)
+        if first < last:
+            raise ReservationConflict(f"{self.facility} ya está reservada en ese horario",
+                                      [self._reservation(index) for index in range(first, last)])
+        
+        self._starts.insert(first, start_ts)
+        self._ends.insert(first, end_ts)
+        self._flights.insert(first, flight_number)
+        return Reservation(self.facility, flight_number, start_ts, end_ts)
+    
+    def _find(self, flight_number: str, start_ts: float) -> Optional[int]:
+        index = bisect_left(self._starts, start_ts)
+        if index < len(self._starts) and self._starts[index] == start_ts and self._flights[index] == flight_number:
+            return index
+        return None
+    
+    def remove(self, flight_number: str, start_ts: float) -> bool:
+        """Quita la reserva de un vuelo que empieza a start_ts, en O(log n) más el corrimiento."""
+        index = self._find(flight_number, start_ts)
+        if index is None:
+            return False
+        del self._starts[index], self._ends[index], self._flights[index]
+        return True
+    
+    def trim(self, flight_number: str, start_ts: float, end_ts: float) -> bool:
+        """
+        Adelanta el fin de la reserva de un vuelo que empieza a start_ts, en O(log n).
+        
+        Acortar una reserva no cambia el orden ni crea solapamientos; si el
+        nuevo fin no es posterior al inicio, la reserva se quita.
+        
+        Returns:
+            bool: False si la reserva no existe o ya terminaba antes de end_ts
+        """
+        index = self._find(flight_number, start_ts)
+        if index is None or end_ts >= self._ends[index]:
+            return False
+        if end_ts <= start_ts:
+            del self._starts[index], self._ends[index], self._flights[index]
+        else:
+            self._ends[index] = end_ts
+        return True
+    
+    def first_gap(self, after: float) -> Tuple[float, int]:
+        """
+        Devuelve el primer hueco desde `after` como (inicio, índice de la reserva que lo cierra).
+        
+        El hueco termina donde empieza esa reserva (ver gap_end()); el
+        siguiente empieza donde ella termina (ver next_gap()).
+        """
+        index = bisect_right(self._ends, after)
+        if index < len(self._starts) and self._starts[index] <= after:
+            return self._ends[index], index + 1
+        return after, index
+    
+    def gap_end(self, index: int) -> float:
+        """Fin del hueco cerrado por la reserva `index` (math.inf después de la última)."""
+        return self._starts[index] if index < len(self._starts) else math.inf
+    
+    def next_gap(self, index: int) -> Tuple[float, int]:
+        """Hueco siguiente al cerrado por la reserva `index` (que debe existir)."""
+        return self._ends[index], index + 1
+    
+    def earliest(self, duration: float, after: float) -> float:
+        """
+        Devuelve el primer inicio libre de al menos `duration` segundos desde `after`.
+        
+        Recorre solo los huecos a partir de `after`: O(log n + k), con k las
+        reservas que hubo que saltar.
+        """
+        start_ts, index = self.first_gap(after)
+        while self.gap_end(index) - start_ts < duration:
+            start_ts, index = self.next_gap(index)
+        return start_ts
+    
+    def prune(self, before: float) -> int:
+        """Descarta las reservas que terminaron antes de `before` y devuelve cuántas."""
+        count = bisect_right(self._ends, before)
+        del self._starts[:count], self._ends[:count], self._flights[:count]
+        return count
+
+
+class ReservationCalendar:
+    """
+    Calendario de reservas de las instalaciones de un tipo del manager.
+    
+    Se suscribe a ArrivalRegistered: una llegada cuyo vuelo tiene una
+    reserva vigente (desde `early` segundos antes del inicio hasta el fin)
+    se asigna a la instalación reservada si está libre. Usa el lock de la
+    cola del manager, así que respeta el orden de locks cola -> pool. Las
+    líneas de tiempo tienen además un lock propio, el último del orden:
+    lo toman también el hold y el fin de las ocupaciones, que corren
+    bajo el lock del pool.
+    
+    Para que la instalación esté libre al llegar el vuelo, el calendario
+    se registra como hold del pool (ver FacilityPool.add_hold): la
+    asignación automática no entrega una instalación desde `early`
+    segundos antes de una reserva hasta su fin. Si aun así la reserva no
+    se puede convertir (la instalación se ocupó antes y sigue ocupada), se
+    cuenta en `failed_conversions`. Una reserva convertida cuya aeronave
+    libera la instalación antes del fin se acorta hasta la liberación.
+    
+    Args:
+        manager (AirportTrafficManager): Manager cuyas instalaciones se reservan
+        facility_type (str): Tipo de instalación ("runway" o "terminal")
+        early (float): Segundos antes del inicio en que ya se acepta la llegada
+    """
+    
+    def __init__(self, manager: AirportTrafficManager, facility_type: str = "terminal", early: float = 1800.0):
+        self.manager = manager
+        self.facility_type = facility_type
+        self.early = early
+        self.lock = manager.queue_lock
+        self._timeline_lock = threading.Lock() if manager.thread_safe else contextlib.nullcontext()
+        self.timelines: Dict[str, Timeline] = {
+            facility_name: Timeline(facility_name) for facility_name in manager.pools[facility_type]
+        }
+        self._by_flight: Dict[str, Reservation] = {}
+        # Instalación -> (reserva convertida, aeronave que la ocupa)
+        self._converted: Dict[str, Tuple[Reservation, str]] = {}
+        self.failed_conversions = 0
+        self._remove_hold = manager.pools[facility_type].add_hold(self.is_held)
+        self._unsubscribe = [manager.events.subscribe(self._on_registered, ArrivalRegistered),
+                             manager.events.subscribe(self._on_released, FacilityReleased)]
+    
+    def close(self) -> None:
+        """Deja de convertir reservas al registrar llegadas y de retener las instalaciones reservadas."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._remove_hold()
+    
+    def __len__(self) -> int:
+        return len(self._by_flight)
+    
+    def _timeline(self, facility_name: str) -> Timeline:
+        timeline = self.timelines.get(facility_name)
+        if timeline is None:
+            if facility_name not in self.manager.pools[self.facility_type]:
+                raise ValueError(f"Instalación desconocida: {facility_name}")
+            # Instalación agregada al pool después de crear el calendario
+            with self._timeline_lock:
+                timeline = self.timelines.setdefault(facility_name, Timeline(facility_name))
+        return timeline
+    
+    def is_held(self, facility_name: str, now: float) -> bool:
+        """
+        Indica si una instalación está retenida para una reserva, en O(log n).
+        
+        Lo consulta el pool bajo su propio lock, así que toma solo el de
+        las líneas de tiempo y no el de la cola (el orden es cola -> pool).
+        
+        Args:
+            facility_name (str): Instalación libre candidata
+            now (float): Hora de la asignación
+        
+        Returns:
+            bool: True si tiene una reserva que empieza antes de `early` segundos desde ahora y no terminó
+        """
+        timeline = self.timelines.get(facility_name)
+        if timeline is None:
+            return False
+        with self._timeline_lock:
+            return not timeline.is_free(now, now + self.early)
+    
+    def reserve(self, facility_name: str, flight_number: str, start_ts: float, end_ts: float) -> Reservation:
+        """
+        Reserva una instalación para un vuelo.
+        
+        Args:
+            facility_name (str): Instalación a reservar
+            flight_number (str): Vuelo (una reserva vigente por vuelo)
+            start_ts (float): Inicio en epoch
+            end_ts (float): Fin en epoch
+        
+        Returns:
+            Reservation: Reserva creada
+        
+        Raises:
+            ValueError: Si el vuelo ya tiene reserva, la instalación no existe o el intervalo es inválido
+            ReservationConflict: Si la instalación ya está reservada en ese horario
+        """
+        flight_number = flight_number.strip().upper()
+        with self.lock:
+            if flight_number in self._by_flight:
+                raise ValueError(f"El vuelo {flight_number} ya tiene una reserva")
+            timeline = self._timeline(facility_name)
+            with self._timeline_lock:
+                reservation = timeline.add(flight_number, start_ts, end_ts)
+            self._by_flight[flight_number] = reservation
+            return reservation
+    
+    def reserve_earliest(self, flight_number: str, duration: float, after: Optional[float] = None) -> Reservation:
+        """
+        Reserva el primer hueco de `duration` segundos en cualquier instalación.
+        
+        Args:
+            flight_number (str): Vuelo
+            duration (float): Duración de la reserva en segundos
+            after (float, optional): Hora desde la que buscar; por defecto, ahora
+        
+        Returns:
+            Reservation: Reserva creada
+        """
+        with self.lock:
+            facility_name, start_ts = self.earliest_free(duration, after)
+            return self.reserve(facility_name, flight_number, start_ts, start_ts + duration)
+    
+    def cancel(self, flight_number: str) -> bool:
+        """Cancela la reserva vigente de un vuelo; devuelve False si no tenía."""
+        with self.lock:
+            reservation = self._by_flight.pop(flight_number.strip().upper(), None)
+            if reservation is None:
+                return False
+            with self._timeline_lock:
+                return self.timelines[reservation.facility].remove(reservation.flight_number, reservation.start_ts)
+    
+    def find(self, flight_number: str) -> Optional[Reservation]:
+        """Devuelve la reserva vigente de un vuelo, en O(1)."""
+        return self._by_flight.get(flight_number.strip().upper())
+    
+    def conflicts(self, facility_name: str, start_ts: float, end_ts: float) -> List[Reservation]:
+        """Devuelve las reservas de una instalación que se solapan con el intervalo, en O(log n + k)."""
+        with self.lock:
+            timeline = self._timeline(facility_name)
+            with self._timeline_lock:
+                return timeline.conflicts(start_ts, end_ts)
+    
+    def earliest_free(self, duration: float, after: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Busca el primer hueco de `duration` segundos entre todas las instalaciones.
+        
+        Solo tiene en cuenta las reservas, no las ocupaciones en curso. A
+        igual hora gana la instalación dada de alta primero.
+        
+        Args:
+            duration (float): Duración buscada en segundos
+            after (float, optional): Hora desde la que buscar; por defecto, ahora
+        
+        Returns:
+            Tuple[str, float]: (instalación, inicio en epoch)
+        
+        Raises:
+            ValueError: Si no hay instalaciones o la duración no es positiva
+        """
+        if duration <= 0:
+            raise ValueError("La duración debe ser positiva")
+        after = self.manager.clock.time() if after is None else after
+        
+        # Un cursor por instalación en un heap ordenado por inicio del hueco:
+        # solo se avanzan los huecos que empiezan antes del resultado
+        with self.lock:
+            timelines = [self._timeline(facility_name) for facility_name in self.manager.pools[self.facility_type]]
+            with self._timeline_lock:
+                return self._earliest_free(timelines, duration, after)
+    
+    def _earliest_free(self, timelines: List[Timeline], duration: float, after: float) -> Tuple[str, float]:
+        cursors = []
+        for order, timeline in enumerate(timelines):
+            start_ts, index = timeline.first_gap(after)
+            cursors.append((start_ts, order, index))
+        heapq.heapify(cursors)
+        while cursors:
+            start_ts, order, index = cursors[0]
+            timeline = timelines[order]
+            if timeline.gap_end(index) - start_ts >= duration:
+                return timeline.facility, start_ts
+            start_ts, index = timeline.next_gap(index)
+            heapq.heapreplace(cursors, (start_ts, order, index))
+        
+        raise ValueError(f"No hay {self.facility_type}s para reservar")
+    
+    def prune(self, before: Optional[float] = None) -> int:
+        """
+        Descarta las reservas ya terminadas.
+        
+        Args:
+            before (float, optional): Descarta las que terminaron antes de esta hora; por defecto, ahora
+        
+        Returns:
+            int: Reservas descartadas
+        """
+        before = self.manager.clock.time() if before is None else before
+        with self.lock:
+            for flight_number in [flight_number for flight_number, reservation in self._by_flight.items()
+                                  if reservation.end_ts <= before]:
+                del self._by_flight[flight_number]
+            with self._timeline_lock:
+                return sum(timeline.prune(before) for timeline in self.timelines.values())
+    
+    def convert(self, arrival_data: Arrival) -> Optional[str]:
+        """
+        Asigna una llegada a la instalación reservada para su vuelo.
+        
+        La reserva se convierte solo si está vigente, la llegada está en
+        espera y la instalación está libre; si la instalación sigue ocupada,
+        se cuenta en `failed_conversions`. Una vez convertida deja de ser
+        la reserva vigente del vuelo, pero el intervalo sigue bloqueado en
+        la línea de tiempo hasta su fin o hasta que la aeronave libere la
+        instalación, si es antes.
+        
+        Args:
+            arrival_data (Arrival): Llegada registrada
+        
+        Returns:
+            Optional[str]: Instalación asignada, o None si no se convirtió
+        """
+        with self.lock:
+            reservation = self._by_flight.get(arrival_data.flight_number)
+            if reservation is None or arrival_data.status is not ArrivalStatus.WAITING:
+                return None
+            
+            now = self.manager.clock.time()
+            if not reservation.start_ts - self.early <= now < reservation.end_ts:
+                return None
+            
+            # Se anota antes de asignar: la aeronave puede liberar la
+            # instalación desde otro hilo apenas la ocupa
+            with self._timeline_lock:
+                self._converted[reservation.facility] = (reservation, arrival_data.aircraft_id)
+            success, _ = self.manager.assign_arrival(arrival_data, self.facility_type,
+                                                     facility_name=reservation.facility)
+            if not success:
+                with self._timeline_lock:
+                    del self._converted[reservation.facility]
+                self.failed_conversions += 1
+                return None
+            
+            del self._by_flight[reservation.flight_number]
+            return reservation.facility
+    
+    def _on_registered(self, event: ArrivalRegistered) -> None:
+        if self._by_flight:
+            self.convert(event.arrival)
+    
+    def _on_released(self, event: FacilityReleased) -> None:
+        # Corre bajo el lock del pool: solo toma el de las líneas de tiempo
+        if event.facility_type != self.facility_type:
+            return
+        with self._timeline_lock:
+            converted = self._converted.get(event.facility_name)
+            if converted is None or converted[1] != event.aircraft_id:
+                return
+            reservation, _ = self._converted.pop(event.facility_name)
+            self.timelines[reservation.facility].trim(reservation.flight_number, reservation.start_ts,
+                                                      event.timestamp)
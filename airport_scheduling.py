@@ -0,0 +1,379 @@
+"""
+Airport Traffic Manager - Planificación
+Estrategias de asignación y optimizador por lotes de pistas y terminales
+
+Estrategias: deciden qué instalación libre se asigna primero. Son la clave
+del heap de libres de FacilityPool, así que elegir sigue costando O(log n):
+    
+    pool.set_strategy(LeastRecentlyUsed())
+
+Optimizador: planifica una ventana de aeronaves en espera para minimizar
+la espera total. El inicio de una aeronave en una instalación es la hora
+en que esta queda libre más lo que tardan las que la preceden, así que
+la espera total se minimiza como un problema de asignación:
+
+- Si el tiempo de ocupación depende solo de la instalación, basta con
+  tomar los n turnos (instalación, posición) más tempranos: una mezcla
+  de k listas ordenadas con un heap, O(n log m). Es exacto.
+- Si depende de la aeronave y la instalación, la posición k desde el
+  final en la instalación s cuesta libre(s) + (k - 1) * ocupación(i, s)
+  y se resuelve con el algoritmo húngaro (SciPy si está instalado).
+"""
+
+import heapq
+import math
+import statistics
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from airport_core import AirportTrafficManager, Arrival, ArrivalStatus, FacilityStatus
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # SciPy es opcional
+    linear_sum_assignment = None
+
+
+# Posiciones por instalación además del reparto parejo en plan_min_cost()
+POSITION_SLACK = 2
+
+
+class FirstAvailable:
+    """Estrategia original: la primera instalación libre en orden de alta."""
+    
+    name = "first_available"
+    
+    def key(self, facility_name: str, order: int) -> Any:
+        return order
+    
+    def on_release(self, facility_name: str, start_ts: Optional[float], end_ts: float) -> None:
+        pass
+
+
+class LeastRecentlyUsed(FirstAvailable):
+    """
+    La instalación libre que hace más tiempo que se liberó.
+    
+    Reparte el uso entre todas en lugar de cargar siempre Runway_01.
+    """
+    
+    name = "least_recently_used"
+    
+    def __init__(self):
+        self.released: Dict[str, float] = {}
+    
+    def key(self, facility_name: str, order: int) -> Any:
+        # Las nunca usadas van primero, en orden de alta
+        return (self.released.get(facility_name, -math.inf), order)
+    
+    def on_release(self, facility_name: str, start_ts: Optional[float], end_ts: float) -> None:
+        self.released[facility_name] = end_ts
+
+
+class ShortestExpectedDwell(FirstAvailable):
+    """
+    La instalación libre con menor ocupación esperada.
+    
+    La ocupación esperada de cada instalación es una media móvil
+    exponencial de sus ocupaciones terminadas.
+    
+    Args:
+        expected (Mapping[str, float], optional): Ocupación esperada inicial por instalación, en segundos
+        default (float): Ocupación esperada de las instalaciones sin historia
+        alpha (float): Peso de la última ocupación en la media móvil
+    """
+    
+    name = "shortest_expected_dwell"
+    
+    def __init__(self, expected: Optional[Mapping[str, float]] = None, default: float = 1800.0,
+                 alpha: float = 0.2):
+        self.expected: Dict[str, float] = dict(expected or {})
+        self.default = default
+        self.alpha = alpha
+    
+    def expected_dwell(self, facility_name: str) -> float:
+        """Ocupación esperada de una instalación, en segundos."""
+        return self.expected.get(facility_name, self.default)
+    
+    def key(self, facility_name: str, order: int) -> Any:
+        return (self.expected_dwell(facility_name), order)
+    
+    def on_release(self, facility_name: str, start_ts: Optional[float], end_ts: float) -> None:
+        if start_ts is None:
+            return
+        previous = self.expected.get(facility_name)
+        dwell = end_ts - start_ts
+        self.expected[facility_name] = dwell if previous is None else previous + self.alpha * (dwell - previous)
+
+
+STRATEGIES: Dict[str, Callable[[], FirstAvailable]] = {
+    FirstAvailable.name: FirstAvailable,
+    LeastRecentlyUsed.name: LeastRecentlyUsed,
+    ShortestExpectedDwell.name: ShortestExpectedDwell
+}
+
+
+class PlannedAssignment(NamedTuple):
+    """Una aeronave del plan: en qué instalación y a qué hora empieza."""
+    
+    aircraft_id: str
+    facility: str
+    start_ts: float
+
+
+def plan_by_facility(aircraft_ids: Sequence[str], free_at: Mapping[str, float],
+                     dwell: Mapping[str, float]) -> List[PlannedAssignment]:
+    """
+    Plan de espera total mínima cuando la ocupación depende solo de la instalación.
+    
+    Los turnos de cada instalación empiezan en free_at[s], free_at[s] + dwell[s], ...
+    Se toman los len(aircraft_ids) turnos más tempranos y se reparten en
+    orden de llegada (FIFO), lo que no cambia la espera total.
+    
+    Args:
+        aircraft_ids (Sequence[str]): Aeronaves en espera, en orden de llegada
+        free_at (Mapping[str, float]): Instalación -> hora en que queda libre
+        dwell (Mapping[str, float]): Instalación -> ocupación por aeronave, en segundos
+    
+    Returns:
+        List[PlannedAssignment]: Plan ordenado por hora de inicio
+    """
+    slots = [(start, facility_name) for facility_name, start in free_at.items()]
+    heapq.heapify(slots)
+    
+    plan = []
+    for aircraft_id in aircraft_ids:
+        if not slots:
+            break
+        start, facility_name = slots[0]
+        plan.append(PlannedAssignment(aircraft_id, facility_name, start))
+        heapq.heapreplace(slots, (start + dwell[facility_name], facility_name))
+    
+    return plan
+
+
+def _hungarian(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """Algoritmo húngaro con potenciales, O(n² m) para n filas <= m columnas."""
+    rows, columns = len(cost), len(cost[0])
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    match = [0] * (columns + 1)  # columna -> fila (1-indexado; 0 = libre)
+    way = [0] * (columns + 1)
+    
+    for row in range(1, rows + 1):
+        match[0] = row
+        column0 = 0
+        minimum = [math.inf] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column0] = True
+            row0 = match[column0]
+            cost_row = cost[row0 - 1]
+            delta, column1 = math.inf, 0
+            for column in range(1, columns + 1):
+                if not used[column]:
+                    current = cost_row[column - 1] - u[row0] - v[column]
+                    if current < minimum[column]:
+                        minimum[column] = current
+                        way[column] = column0
+                    if minimum[column] < delta:
+                        delta, column1 = minimum[column], column
+            for column in range(columns + 1):
+                if used[column]:
+                    u[match[column]] += delta
+                    v[column] -= delta
+                else:
+                    minimum[column] -= delta
+            column0 = column1
+            if match[column0] == 0:
+                break
+        while column0:
+            column1 = way[column0]
+            match[column0] = match[column1]
+            column0 = column1
+    
+    return sorted((match[column] - 1, column - 1) for column in range(1, columns + 1) if match[column])
+
+
+def solve_assignment(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    Asignación de costo mínimo entre filas y columnas (algoritmo húngaro).
+    
+    Usa scipy.optimize.linear_sum_assignment si está instalado; si no,
+    una implementación en Python puro, adecuada para ventanas chicas.
+    
+    Args:
+        cost (Sequence[Sequence[float]]): Matriz de costos, filas <= columnas
+    
+    Returns:
+        List[Tuple[int, int]]: Pares (fila, columna), uno por fila
+    
+    Raises:
+        ValueError: Si hay más filas que columnas
+    """
+    if not len(cost):
+        return []
+    if len(cost) > len(cost[0]):
+        raise ValueError("Hay más filas que columnas: no todas pueden asignarse")
+    
+    if linear_sum_assignment is not None:
+        rows, columns = linear_sum_assignment(cost)
+        return list(zip(rows.tolist(), columns.tolist()))
+    return _hungarian(cost)
+
+
+def plan_min_cost(aircraft_ids: Sequence[str], free_at: Mapping[str, float],
+                  dwell: Sequence[Sequence[float]], max_per_facility: Optional[int] = None) -> List[PlannedAssignment]:
+    """
+    Plan de espera total mínima cuando la ocupación depende de aeronave e instalación.
+    
+    Cada columna del problema de asignación es una posición contada desde
+    el final de la cola de una instalación: la aeronave en la posición k
+    retrasa a las k - 1 que la siguen, así que cuesta
+    free_at[s] + (k - 1) * dwell[i][s].
+    
+    El costo del húngaro crece con filas² × columnas, así que no se
+    ofrecen todas las posiciones: cada instalación tiene a lo sumo
+    max_per_facility, y de ellas solo entran las n + n / 5 más baratas con
+    la ocupación mediana de cada instalación (las primeras posiciones de
+    las que se liberan antes o son más rápidas). Si la ocupación depende
+    solo de la instalación la poda no pierde nada; si no, es una
+    aproximación que deja margen para desviarse de la mediana.
+    
+    Args:
+        aircraft_ids (Sequence[str]): Aeronaves en espera
+        free_at (Mapping[str, float]): Instalación -> hora en que queda libre (define el orden de las columnas)
+        dwell (Sequence[Sequence[float]]): dwell[i][s], ocupación de la aeronave i en la instalación s
+        max_per_facility (int, optional): Posiciones por instalación; por defecto, el reparto parejo más dos
+    
+    Returns:
+        List[PlannedAssignment]: Plan ordenado por hora de inicio
+    """
+    facilities = list(free_at)
+    if not aircraft_ids or not facilities:
+        return []
+    
+    count = len(aircraft_ids)
+    positions = max_per_facility or math.ceil(count / len(facilities)) + POSITION_SLACK
+    starts = [free_at[facility_name] for facility_name in facilities]
+    candidates = min(len(facilities) * positions, count + count // 5)
+    
+    if linear_sum_assignment is not None:
+        import numpy as np
+        dwell_matrix = np.asarray(dwell, dtype=np.float64)
+        steps = np.arange(positions, dtype=np.float64)
+        # Columnas agrupadas por instalación: (s, k) -> s * positions + k
+        estimate = (np.asarray(starts)[:, None] + np.median(dwell_matrix, axis=0)[:, None] * steps[None, :]).ravel()
+        columns = np.sort(np.argpartition(estimate, candidates - 1)[:candidates])
+        facility_indexes, column_steps = np.divmod(columns, positions)
+        cost = np.asarray(starts)[facility_indexes][None, :] + dwell_matrix[:, facility_indexes] * column_steps[None, :]
+        columns = columns.tolist()
+    else:
+        typical = [statistics.median(column) for column in zip(*dwell)]
+        columns = sorted(sorted(range(len(facilities) * positions), key=lambda column: (
+            starts[column // positions] + typical[column // positions] * (column % positions)))[:candidates])
+        cost = [[starts[column // positions] + row[column // positions] * (column % positions) for column in columns]
+                for row in dwell]
+    
+    # Agrupar por instalación y ordenar de la posición más lejana del final a la más cercana
+    queues: Dict[int, List[Tuple[int, int]]] = {}
+    for row, column in solve_assignment(cost):
+        facility_index, step = divmod(columns[column], positions)
+        queues.setdefault(facility_index, []).append((step, row))
+    
+    plan = []
+    for facility_index, entries in queues.items():
+        facility_name = facilities[facility_index]
+        start = starts[facility_index]
+        for _, row in sorted(entries, reverse=True):
+            plan.append(PlannedAssignment(aircraft_ids[row], facility_name, start))
+            start += dwell[row][facility_index]
+    
+    plan.sort(key=lambda planned: planned.start_ts)
+    return plan
+
+
+class BatchOptimizer:
+    """
+    Asigna una ventana de aeronaves en espera según un plan de espera mínima.
+    
+    Args:
+        manager (AirportTrafficManager): Manager con la cola de espera
+        facility_type (str): Tipo de instalación ("runway" o "terminal")
+        facility_dwell (Callable[[str], float]): Ocupación esperada de una instalación, en segundos
+        aircraft_dwell (Callable[[Arrival, str], float], optional): Ocupación esperada de una
+            aeronave en una instalación; si se indica se usa plan_min_cost()
+    """
+    
+    def __init__(self, manager: AirportTrafficManager, facility_type: str,
+                 facility_dwell: Callable[[str], float],
+                 aircraft_dwell: Optional[Callable[[Arrival, str], float]] = None):
+        self.manager = manager
+        self.facility_type = facility_type
+        self.facility_dwell = facility_dwell
+        self.aircraft_dwell = aircraft_dwell
+    
+    def waiting(self, window: int) -> List[Arrival]:
+        """Las primeras `window` aeronaves en espera, en orden de llegada."""
+        selected = []
+        for arrival_data in self.manager.waiting_queue:
+            if arrival_data.status is ArrivalStatus.WAITING:
+                selected.append(arrival_data)
+                if len(selected) == window:
+                    break
+        return selected
+    
+    def free_at(self) -> Dict[str, float]:
+        """
+        Hora estimada en que queda libre cada instalación.
+        
+        Las libres retenidas por el pool (ver pool.add_hold, por ejemplo para una
+        reserva) quedan fuera del plan: dispatch() las ocupa por nombre.
+        """
+        now = self.manager.clock.time()
+        pool = self.manager.pools[self.facility_type]
+        estimates = {}
+        for facility_name, facility in pool.items():
+            if facility.status is FacilityStatus.AVAILABLE and pool.is_held(facility_name, now):
+                continue
+            if facility.status is FacilityStatus.AVAILABLE or facility.start_ts is None:
+                estimates[facility_name] = now
+            else:
+                estimates[facility_name] = max(now, facility.start_ts + self.facility_dwell(facility_name))
+        return estimates
+    
+    def plan(self, window: int = 500) -> List[PlannedAssignment]:
+        """
+        Planifica las próximas `window` aeronaves en espera.
+        
+        Returns:
+            List[PlannedAssignment]: Plan ordenado por hora de inicio
+        """
+        arrivals = self.waiting(window)
+        free_at = self.free_at()
+        aircraft_ids = [arrival_data.aircraft_id for arrival_data in arrivals]
+        
+        if self.aircraft_dwell is None:
+            dwell = {facility_name: self.facility_dwell(facility_name) for facility_name in free_at}
+            return plan_by_facility(aircraft_ids, free_at, dwell)
+        
+        dwell_rows = [[self.aircraft_dwell(arrival_data, facility_name) for facility_name in free_at]
+                      for arrival_data in arrivals]
+        return plan_min_cost(aircraft_ids, free_at, dwell_rows)
+    
+    def dispatch(self, window: int = 500) -> List[PlannedAssignment]:
+        """
+        Asigna ya las aeronaves del plan cuyas instalaciones están libres.
+        
+        Returns:
+            List[PlannedAssignment]: Asignaciones realizadas
+        """
+        now = self.manager.clock.time()
+        applied = []
+        for planned in self.plan(window):
+            if planned.start_ts > now:
+                break
+            arrival_data = self.manager.find_arrival(planned.aircraft_id)
+            success, _ = self.manager.assign_arrival(arrival_data, self.facility_type, now, planned.facility)
+            if success:
+                applied.append(planned)
+        return applied
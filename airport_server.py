@@ -0,0 +1,546 @@
+"""
+Airport Traffic Manager - Servidor
+Capa de servicio asyncio que comparte un manager por TCP o socket Unix
+
+Protocolo: JSON delimitado por líneas. Cada línea es una petición
+    
+    {"id": 1, "op": "register", "args": {"aircraft_id": "ABC123", ...}}
+
+o un lote (una lista de peticiones) que se responde con una lista en una
+sola línea. Las respuestas son {"id": 1, "ok": true, "result": ...} o
+{"id": 1, "ok": false, "error": "..."}. El cliente puede enviar muchas
+peticiones sin esperar respuesta (pipelining): se responden en orden.
+
+Tras {"op": "subscribe"} el servidor además empuja los cambios de estado
+como {"event": {...}}, con el mismo formato que los registros del journal.
+
+El manager se usa solo desde el event loop, así que no necesita locks.
+
+Para ejecutar:
+    python airport_server.py --port 8765
+    python airport_server.py --unix /tmp/airport.sock
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import sys
+import threading
+import typing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from airport_journal import encode_event
+from airport_core import (
+    AirportTrafficManager,
+    BatchResult,
+    check_available,
+    check_time_used,
+    register_arrival,
+    release_facility
+)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Tamaño máximo de una línea (un lote grande ocupa una sola línea)
+MAX_LINE = 16 * 1024 * 1024
+
+# Un suscriptor que acumula más de esto sin leer se desconecta
+MAX_PUSH_BUFFER = 8 * 1024 * 1024
+
+READ_CHUNK = 256 * 1024
+
+
+class RequestError(ValueError):
+    """Error devuelto por el servidor para una petición."""
+
+
+def _parameter_types(function: Callable[..., Any]) -> Dict[str, Tuple[Tuple[type, ...], bool]]:
+    # Parámetro -> (tipos admitidos según la anotación, si es obligatorio)
+    hints = typing.get_type_hints(function)
+    parameters = {}
+    for name, parameter in inspect.signature(function).parameters.items():
+        expected = hints.get(name, object)
+        # Optional[str] admite str y None
+        parameters[name] = (typing.get_args(expected) or (expected,),
+                            parameter.default is inspect.Parameter.empty)
+    return parameters
+
+
+def _dumps(message: Any) -> bytes:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class AirportServer:
+    """
+    Servidor asyncio que expone un AirportTrafficManager.
+    
+    Args:
+        manager (AirportTrafficManager, optional): Manager compartido; por defecto, uno nuevo
+    """
+    
+    def __init__(self, manager: Optional[AirportTrafficManager] = None):
+        self.manager = AirportTrafficManager() if manager is None else manager
+        self.requests = 0
+        self._subscribers: Set[asyncio.StreamWriter] = set()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        
+        self._operations: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "register": self._register,
+            "assign": self._assign,
+            "release": self._release,
+            "available": self._available,
+            "time_used": self._time_used,
+            "find": self._find,
+            "state": self._state
+        }
+        self._parameters = {op: _parameter_types(operation) for op, operation in self._operations.items()}
+    
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Tuple[str, int]:
+        """
+        Empieza a escuchar por TCP.
+        
+        Args:
+            host (str): Dirección local
+            port (int): Puerto; 0 elige uno libre
+        
+        Returns:
+            Tuple[str, int]: Dirección y puerto en que quedó escuchando
+        """
+        self._bind_loop()
+        server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+    
+    async def start_unix(self, path: str) -> None:
+        """
+        Empieza a escuchar en un socket Unix.
+        
+        Args:
+            path (str): Ruta del socket
+        """
+        self._bind_loop()
+        self._servers.append(await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE))
+    
+    def _bind_loop(self) -> None:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+            self._unsubscribe = self.manager.events.subscribe(self._on_event)
+    
+    async def serve_forever(self) -> None:
+        """Atiende conexiones hasta que se cancele la tarea."""
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+    
+    async def close(self) -> None:
+        """Deja de escuchar y cierra las conexiones de los suscriptores."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for writer in list(self._subscribers):
+            writer.close()
+        self._subscribers.clear()
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        partial = b""
+        try:
+            while True:
+                chunk = await reader.read(READ_CHUNK)
+                if not chunk:
+                    break
+                
+                # Con pipelining llegan varias peticiones juntas: se procesan
+                # todas y sus respuestas salen en una sola escritura
+                lines = (partial + chunk).split(b"\n")
+                partial = lines.pop()
+                if len(partial) > MAX_LINE:
+                    break
+                
+                responses = [self.handle_line(line, writer) for line in lines if line.strip()]
+                if responses:
+                    writer.write(b"".join(responses))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(writer)
+            writer.close()
+    
+    def handle_line(self, line: bytes, writer: Optional[asyncio.StreamWriter] = None) -> bytes:
+        """
+        Procesa una línea del protocolo y devuelve la respuesta codificada.
+        
+        Args:
+            line (bytes): Petición o lote en JSON
+            writer (StreamWriter, optional): Conexión de origen (para subscribe)
+        
+        Returns:
+            bytes: Respuesta o lista de respuestas, terminada en salto de línea
+        """
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return _dumps({"id": None, "ok": False, "error": "JSON inválido"})
+        
+        if isinstance(message, list):
+            return _dumps([self.handle_request(request, writer) for request in message])
+        return _dumps(self.handle_request(message, writer))
+    
+    def handle_request(self, request: Any, writer: Optional[asyncio.StreamWriter] = None) -> Dict[str, Any]:
+        """
+        Ejecuta una petición sobre el manager.
+        
+        Args:
+            request (Dict): Petición con id, op y args
+            writer (StreamWriter, optional): Conexión de origen (para subscribe)
+        
+        Returns:
+            Dict: Respuesta con ok y result/error
+        """
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "Petición inválida"}
+        
+        self.requests += 1
+        request_id = request.get("id")
+        op = request.get("op")
+        args = request.get("args") or {}
+        
+        if op in ("subscribe", "unsubscribe") and writer is not None:
+            if op == "subscribe":
+                self._subscribers.add(writer)
+            else:
+                self._subscribers.discard(writer)
+            return {"id": request_id, "ok": True, "result": True}
+        
+        operation = self._operations.get(op)
+        if operation is None:
+            return {"id": request_id, "ok": False, "error": f"Operación desconocida: {op}"}
+        if not isinstance(args, dict):
+            return {"id": request_id, "ok": False, "error": "args debe ser un objeto"}
+        
+        try:
+            self._check_args(op, args)
+            return {"id": request_id, "ok": True, "result": operation(**args)}
+        except (RequestError, ValueError) as error:
+            return {"id": request_id, "ok": False, "error": str(error)}
+    
+    def _check_args(self, op: str, args: Dict[str, Any]) -> None:
+        # Valida contra la firma de la operación antes de llamarla
+        parameters = self._parameters[op]
+        for name, value in args.items():
+            if name not in parameters:
+                raise RequestError(f"Argumento desconocido para {op}: {name}")
+            types, _ = parameters[name]
+            if not isinstance(value, types):
+                expected = " o ".join("null" if kind is type(None) else kind.__name__ for kind in types)
+                raise RequestError(f"{name} debe ser {expected}, no {type(value).__name__}")
+        
+        missing = [name for name, (_, required) in parameters.items() if required and name not in args]
+        if missing:
+            raise RequestError(f"Faltan argumentos para {op}: {', '.join(missing)}")
+    
+    def _pool(self, facility_type: str):
+        try:
+            return self.manager.pools[facility_type]
+        except KeyError:
+            raise RequestError(f"Tipo de instalación desconocido: {facility_type}")
+    
+    def _register(self, aircraft_id: str, flight_number: str, origin: str) -> Dict[str, Any]:
+        arrival_data = register_arrival(aircraft_id, flight_number, origin)
+        self.manager.add_arrival(arrival_data)
+        return arrival_data.to_dict()
+    
+    def _assign(self, facility_type: str, aircraft_id: Optional[str] = None) -> str:
+        self._pool(facility_type)
+        if aircraft_id is None:
+            success, result = self.manager.assign_next(facility_type)
+        else:
+            arrival_data = self.manager.find_arrival(aircraft_id)
+            if arrival_data is None:
+                raise RequestError(f"Aeronave desconocida: {aircraft_id}")
+            success, result = self.manager.assign_arrival(arrival_data, facility_type)
+        
+        if not success:
+            raise RequestError(result)
+        return result
+    
+    def _release(self, facility_type: str, facility: str) -> bool:
+        return release_facility(self._pool(facility_type), facility)
+    
+    def _available(self, facility_type: str) -> List[str]:
+        return check_available(self._pool(facility_type))
+    
+    def _time_used(self, facility_type: str, facility: str) -> Optional[int]:
+        return check_time_used(self._pool(facility_type), facility)
+    
+    def _find(self, aircraft_id: str) -> Optional[Dict[str, Any]]:
+        arrival_data = self.manager.find_arrival(aircraft_id)
+        return None if arrival_data is None else arrival_data.to_dict()
+    
+    def _state(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {
+            facility_type: {name: {"status": facility.status, "aircraft": facility.aircraft,
+                                   "start_ts": facility.start_ts}
+                            for name, facility in pool.items()}
+            for facility_type, pool in self.manager.pools.items()
+        }
+    
+    def _on_event(self, event: Any) -> None:
+        if not self._subscribers:
+            return
+        record = encode_event(event)
+        if record is None:
+            return
+        
+        line = _dumps({"event": record})
+        if threading.get_ident() == self._loop_thread:
+            self._push(line)
+        else:
+            # El manager cambió desde otro hilo: los sockets solo se tocan desde el loop
+            self._loop.call_soon_threadsafe(self._push, line)
+    
+    def _push(self, line: bytes) -> None:
+        for writer in list(self._subscribers):
+            if writer.transport.get_write_buffer_size() > MAX_PUSH_BUFFER:
+                self._subscribers.discard(writer)
+                writer.transport.abort()
+            else:
+                writer.write(line)
+
+
+class AirportClient:
+    """
+    Cliente asyncio del protocolo de AirportServer.
+    
+    Las peticiones se envían apenas se piden y las respuestas se asocian
+    por id, así que varias corutinas pueden usar el mismo cliente a la vez
+    y sus peticiones viajan en pipeline. Los eventos empujados por el
+    servidor se encolan en `events`.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._outgoing: List[bytes] = []
+        self.events: asyncio.Queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._reader_task = self._loop.create_task(self._read_loop())
+    
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                      path: Optional[str] = None) -> "AirportClient":
+        """
+        Se conecta a un servidor por TCP o, si se indica path, por socket Unix.
+        
+        Returns:
+            AirportClient: Cliente conectado
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+    
+    async def __aenter__(self) -> "AirportClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Cierra la conexión; las peticiones pendientes fallan."""
+        self._flush()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._reader_task
+    
+    def _request(self, op: str, args: Dict[str, Any]) -> Tuple[Dict[str, Any], asyncio.Future]:
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        return {"id": request_id, "op": op, "args": args}, future
+    
+    def _write(self, data: bytes) -> None:
+        # Las peticiones de una misma vuelta del loop salen en una sola escritura
+        if not self._outgoing:
+            self._loop.call_soon(self._flush)
+        self._outgoing.append(data)
+    
+    def _flush(self) -> None:
+        if self._outgoing:
+            self._writer.write(b"".join(self._outgoing))
+            self._outgoing.clear()
+    
+    def send(self, op: str, **args: Any) -> asyncio.Future:
+        """
+        Envía una petición sin esperar la respuesta.
+        
+        Args:
+            op (str): Operación
+            **args: Argumentos de la operación
+        
+        Returns:
+            asyncio.Future: Se resuelve con el resultado o con RequestError
+        """
+        request, future = self._request(op, args)
+        self._write(_dumps(request))
+        return future
+    
+    async def call(self, op: str, **args: Any) -> Any:
+        """
+        Envía una petición y espera su resultado.
+        
+        Raises:
+            RequestError: Si el servidor rechazó la petición
+        """
+        future = self.send(op, **args)
+        await self._writer.drain()
+        return await future
+    
+    async def batch(self, requests: Iterable[Tuple[str, Dict[str, Any]]]) -> List[BatchResult]:
+        """
+        Envía varias peticiones en una sola línea y espera todas las respuestas.
+        
+        Args:
+            requests (Iterable[Tuple[str, Dict]]): Pares (operación, argumentos)
+        
+        Returns:
+            List[BatchResult]: Un resultado por petición; value es el resultado o el error
+        """
+        messages, futures = [], []
+        for op, args in requests:
+            request, future = self._request(op, args)
+            messages.append(request)
+            futures.append(future)
+        
+        self._write(_dumps(messages))
+        await self._writer.drain()
+        
+        results = []
+        for index, future in enumerate(futures):
+            try:
+                results.append(BatchResult(index, True, await future))
+            except RequestError as error:
+                results.append(BatchResult(index, False, str(error)))
+        return results
+    
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                for response in message if isinstance(message, list) else (message,):
+                    self._dispatch(response)
+        except ConnectionError:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Conexión cerrada"))
+            self._pending.clear()
+    
+    def _dispatch(self, response: Dict[str, Any]) -> None:
+        if "event" in response:
+            self.events.put_nowait(response["event"])
+            return
+        
+        future = self._pending.pop(response.get("id"), None)
+        if future is None or future.done():
+            return
+        if response["ok"]:
+            future.set_result(response["result"])
+        else:
+            future.set_exception(RequestError(response["error"]))
+    
+    async def ping(self) -> str:
+        """Comprueba que el servidor responde."""
+        return await self.call("ping")
+    
+    async def register(self, aircraft_id: str, flight_number: str, origin: str) -> Dict[str, Any]:
+        """Registra una llegada; devuelve el registro creado."""
+        return await self.call("register", aircraft_id=aircraft_id, flight_number=flight_number, origin=origin)
+    
+    async def assign(self, facility_type: str, aircraft_id: Optional[str] = None) -> str:
+        """Asigna una aeronave (o la próxima en espera); devuelve la instalación."""
+        args = {"facility_type": facility_type}
+        if aircraft_id is not None:
+            args["aircraft_id"] = aircraft_id
+        return await self.call("assign", **args)
+    
+    async def release(self, facility_type: str, facility: str) -> bool:
+        """Libera una instalación."""
+        return await self.call("release", facility_type=facility_type, facility=facility)
+    
+    async def available(self, facility_type: str) -> List[str]:
+        """Lista las instalaciones libres de un tipo."""
+        return await self.call("available", facility_type=facility_type)
+    
+    async def time_used(self, facility_type: str, facility: str) -> Optional[int]:
+        """Minutos de uso de una instalación ocupada."""
+        return await self.call("time_used", facility_type=facility_type, facility=facility)
+    
+    async def find(self, aircraft_id: str) -> Optional[Dict[str, Any]]:
+        """Busca la última llegada de una aeronave."""
+        return await self.call("find", aircraft_id=aircraft_id)
+    
+    async def state(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Estado de todas las instalaciones."""
+        return await self.call("state")
+    
+    async def subscribe(self) -> None:
+        """Pide al servidor que empuje los cambios de estado a `events`."""
+        await self.call("subscribe")
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None,
+                manager: Optional[AirportTrafficManager] = None) -> None:
+    """Arranca un servidor y lo atiende hasta que se cancele."""
+    server = AirportServer(manager)
+    if path is not None:
+        await server.start_unix(path)
+        print(f"Escuchando en {path}", flush=True)
+    else:
+        host, port = await server.start(host, port)
+        print(f"Escuchando en {host}:{port}", flush=True)
+    
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Arranca el servidor desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servidor del Airport Traffic Manager")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Dirección TCP")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Puerto TCP (0 elige uno libre)")
+    parser.add_argument("--unix", help="Escuchar en un socket Unix en lugar de TCP")
+    args = parser.parse_args(argv)
+    
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
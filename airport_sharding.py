@@ -0,0 +1,360 @@
+"""
+Airport Traffic Manager - Red de aeropuertos
+Motor particionado: aeropuertos repartidos entre procesos de trabajo
+
+Cada aeropuerto tiene su propio AirportTrafficManager y vive en un único
+shard (proceso), elegido con crc32 del código de aeropuerto. Las
+operaciones se enrutan por aeropuerto de destino y viajan en lotes: un
+execute() agrupa los comandos por shard, los envía a todos los procesos
+y después recoge las respuestas, así que los shards trabajan en paralelo
+(scatter/gather). Las consultas de toda la red, como la disponibilidad,
+se responden igual: se preguntan a todos los shards y se combinan.
+
+Uso típico:
+    with ShardedEngine({"ASU": {"runways": ["Runway_01"], "terminals": ["Gate_1"]}}) as engine:
+        engine.register_arrival("ASU", "ABC123", "UA100", "JFK")
+        engine.assign("ASU", "runway")
+"""
+
+import multiprocessing
+import os
+import zlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from airport_core import (
+    AirportTrafficManager,
+    ArrivalStatus,
+    BatchResult,
+    check_available,
+    register_arrival,
+    release_facility
+)
+from airport_snapshot import load_config
+
+
+# Comando: (aeropuerto, operación, argumentos)
+Command = Tuple[str, str, Dict[str, Any]]
+
+# Aeropuerto comodín: la operación se aplica a todos los del shard
+ALL_AIRPORTS = "*"
+
+
+def shard_for(airport: str, shard_count: int) -> int:
+    """
+    Devuelve el shard de un aeropuerto.
+    
+    crc32 es estable entre procesos y ejecuciones, a diferencia de hash().
+    
+    Args:
+        airport (str): Código de aeropuerto
+        shard_count (int): Cantidad de shards
+    
+    Returns:
+        int: Índice de shard entre 0 y shard_count - 1
+    """
+    return zlib.crc32(airport.encode("utf-8")) % shard_count
+
+
+def _register(manager: AirportTrafficManager, aircraft_id: str, flight_number: str, origin: str) -> str:
+    arrival_data = register_arrival(aircraft_id, flight_number, origin)
+    manager.add_arrival(arrival_data)
+    return arrival_data.aircraft_id
+
+
+def _assign(manager: AirportTrafficManager, facility_type: str) -> str:
+    success, result = manager.assign_next(facility_type)
+    if not success:
+        raise ValueError(result)
+    return result
+
+
+def _release(manager: AirportTrafficManager, facility_type: str, facility: str) -> bool:
+    return release_facility(manager.pools[facility_type], facility)
+
+
+def _available(manager: AirportTrafficManager, facility_type: str) -> List[str]:
+    return check_available(manager.pools[facility_type])
+
+
+def _summary(manager: AirportTrafficManager) -> Dict[str, int]:
+    waiting = sum(1 for arrival in manager.waiting_queue if arrival.status is ArrivalStatus.WAITING)
+    return {"waiting": waiting, "arrivals": len(manager.arrivals_log),
+            "runways_free": manager.airstrips.available_count(),
+            "terminals_free": manager.terminals.available_count()}
+
+
+# Operación -> (función, argumentos que recibe y su tipo)
+OPERATIONS: Dict[str, Tuple[Callable[..., Any], Dict[str, type]]] = {
+    "register": (_register, {"aircraft_id": str, "flight_number": str, "origin": str}),
+    "assign": (_assign, {"facility_type": str}),
+    "release": (_release, {"facility_type": str, "facility": str}),
+    "available": (_available, {"facility_type": str}),
+    "summary": (_summary, {})
+}
+
+
+def _check_arguments(op: str, args: Any) -> Optional[str]:
+    """
+    Valida los argumentos de un comando contra los declarados en OPERATIONS.
+    
+    Args:
+        op (str): Operación
+        args: Argumentos recibidos
+    
+    Returns:
+        Optional[str]: Mensaje de error, o None si los argumentos son válidos
+    """
+    if not isinstance(args, dict):
+        return "Los argumentos deben ser un diccionario"
+    
+    _, parameters = OPERATIONS[op]
+    for name, value in args.items():
+        if name not in parameters:
+            return f"Argumento desconocido para {op}: {name}"
+        if not isinstance(value, parameters[name]):
+            return f"{name} debe ser {parameters[name].__name__}, no {type(value).__name__}"
+    
+    missing = [name for name in parameters if name not in args]
+    if missing:
+        return f"Faltan argumentos para {op}: {', '.join(missing)}"
+    return None
+
+
+def _merge(command: Command, replies: List[Tuple[bool, Any]]) -> Tuple[bool, Any]:
+    # Un comando de ALL_AIRPORTS trae una respuesta por shard: se combinan
+    # los diccionarios, o se devuelve el primer error
+    if command[0] != ALL_AIRPORTS:
+        return replies[0]
+    merged: Dict[str, Any] = {}
+    for success, value in replies:
+        if not success:
+            return False, value
+        merged.update(value)
+    return True, merged
+
+
+class Shard:
+    """
+    Aeropuertos de un shard, ejecutados en el proceso actual.
+    
+    Es lo que corre dentro de cada proceso de trabajo; con workers=0 el
+    motor lo usa directamente, sin procesos ni IPC.
+    
+    Args:
+        airports (Mapping): Código -> {"runways": [...], "terminals": [...]}
+    """
+    
+    def __init__(self, airports: Mapping[str, Mapping[str, Iterable[str]]]):
+        self.managers = {
+            code: AirportTrafficManager(airport.get("runways", ()), airport.get("terminals", ()))
+            for code, airport in airports.items()
+        }
+    
+    def run(self, airport: str, op: str, args: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Ejecuta un comando y devuelve (éxito, resultado o mensaje de error).
+        
+        Con ALL_AIRPORTS el resultado es un diccionario aeropuerto -> resultado.
+        """
+        if op not in OPERATIONS:
+            return False, f"Operación desconocida: {op}"
+        error = _check_arguments(op, args)
+        if error is not None:
+            return False, error
+        
+        operation, _ = OPERATIONS[op]
+        try:
+            if airport == ALL_AIRPORTS:
+                return True, {code: operation(manager, **args) for code, manager in self.managers.items()}
+            manager = self.managers.get(airport)
+            if manager is None:
+                return False, f"Aeropuerto desconocido: {airport}"
+            return True, operation(manager, **args)
+        except (KeyError, ValueError) as error:
+            # Tipo de instalación desconocido o sin aeronaves que asignar
+            return False, str(error)
+    
+    def run_batch(self, commands: List[Command]) -> List[Tuple[bool, Any]]:
+        """Ejecuta varios comandos en orden."""
+        return [self.run(airport, op, args) for airport, op, args in commands]
+
+
+def _worker_main(connection, airports: Mapping[str, Mapping[str, Iterable[str]]]) -> None:
+    # Bucle de un proceso de trabajo: recibe lotes hasta recibir None
+    shard = Shard(airports)
+    while True:
+        commands = connection.recv()
+        if commands is None:
+            break
+        connection.send(shard.run_batch(commands))
+    connection.close()
+
+
+class ShardedEngine:
+    """
+    Red de aeropuertos particionada entre procesos de trabajo.
+    
+    Args:
+        airports (Mapping): Código -> {"runways": [...], "terminals": [...]}
+        workers (int, optional): Procesos de trabajo; por defecto, uno por núcleo.
+            Con 0 todo corre en el proceso actual (útil para pruebas)
+    """
+    
+    def __init__(self, airports: Mapping[str, Mapping[str, Iterable[str]]], workers: Optional[int] = None):
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        self.shard_count = max(1, workers)
+        self.airports = list(airports)
+        
+        partitions: List[Dict[str, Mapping[str, Iterable[str]]]] = [{} for _ in range(self.shard_count)]
+        for code, airport in airports.items():
+            partitions[shard_for(code, self.shard_count)][code] = airport
+        
+        self._local: Optional[Shard] = Shard(airports) if workers == 0 else None
+        self._connections = []
+        self._processes = []
+        
+        if self._local is None:
+            for number, partition in enumerate(partitions):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_worker_main, args=(child, partition),
+                                                  name=f"airport-shard-{number}", daemon=True)
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+    
+    @classmethod
+    def from_config(cls, config_path: str, workers: Optional[int] = None) -> "ShardedEngine":
+        """
+        Crea el motor a partir de una configuración JSON/YAML (ver airport_snapshot.load_config).
+        
+        Args:
+            config_path (str): Archivo de configuración
+            workers (int, optional): Procesos de trabajo
+        
+        Returns:
+            ShardedEngine: Motor con los aeropuertos de la configuración
+        """
+        return cls(load_config(config_path)["airports"], workers)
+    
+    def __enter__(self) -> "ShardedEngine":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Detiene los procesos de trabajo."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections.clear()
+        self._processes.clear()
+    
+    def execute(self, commands: Iterable[Command]) -> List[BatchResult]:
+        """
+        Ejecuta comandos en la red: scatter a los shards y gather de los resultados.
+        
+        Los comandos de un mismo aeropuerto se ejecutan en el orden dado;
+        los de aeropuertos en distintos shards, en paralelo. Un comando de
+        ALL_AIRPORTS se ejecuta en todos los shards y su resultado es el
+        diccionario combinado, como en broadcast(). Si el proceso de un shard
+        terminó, sus comandos fallan con un mensaje en lugar de bloquear.
+        
+        Args:
+            commands (Iterable[Command]): Tuplas (aeropuerto, operación, argumentos)
+        
+        Returns:
+            List[BatchResult]: Un resultado por comando, en el orden de entrada
+        """
+        commands = list(commands)
+        if self._local is not None:
+            return [BatchResult(index, *result) for index, result in enumerate(self._local.run_batch(commands))]
+        
+        # ALL_AIRPORTS va a todos los shards, en su lugar dentro de cada lote
+        batches: Dict[int, List[Command]] = defaultdict(list)
+        positions: Dict[int, List[int]] = defaultdict(list)
+        for index, command in enumerate(commands):
+            if command[0] == ALL_AIRPORTS:
+                shards: Iterable[int] = range(self.shard_count)
+            else:
+                shards = (shard_for(command[0], self.shard_count),)
+            for shard in shards:
+                batches[shard].append(command)
+                positions[shard].append(index)
+        
+        # Primero se envía a todos y recién después se espera: los shards trabajan a la vez
+        sent = [shard for shard, batch in batches.items() if self._send(shard, batch)]
+        
+        replies: List[List[Tuple[bool, Any]]] = [[] for _ in commands]
+        for shard in batches:
+            shard_replies = self._receive(shard) if shard in sent else None
+            if shard_replies is None:
+                shard_replies = [(False, f"El proceso del shard {shard} terminó")] * len(batches[shard])
+            for index, reply in zip(positions[shard], shard_replies):
+                replies[index].append(reply)
+        
+        return [BatchResult(index, *_merge(command, replies[index])) for index, command in enumerate(commands)]
+    
+    def _send(self, shard: int, batch: List[Command]) -> bool:
+        try:
+            self._connections[shard].send(batch)
+        except (BrokenPipeError, OSError):
+            return False
+        return True
+    
+    def _receive(self, shard: int) -> Optional[List[Tuple[bool, Any]]]:
+        # Si el proceso murió, el otro extremo del pipe se cerró y recv no se bloquea
+        try:
+            return self._connections[shard].recv()
+        except (EOFError, OSError):
+            return None
+    
+    def broadcast(self, op: str, **args: Any) -> Dict[str, Any]:
+        """
+        Ejecuta una operación en todos los aeropuertos y combina los resultados.
+        
+        Args:
+            op (str): Operación
+            **args: Argumentos de la operación
+        
+        Returns:
+            Dict[str, Any]: Aeropuerto -> resultado
+        
+        Raises:
+            ValueError: Si algún shard rechazó la operación
+        """
+        result = self.execute([(ALL_AIRPORTS, op, args)])[0]
+        if not result.success:
+            raise ValueError(result.value)
+        return result.value
+    
+    def _call(self, airport: str, op: str, **args: Any) -> Tuple[bool, Any]:
+        result = self.execute([(airport, op, args)])[0]
+        return result.success, result.value
+    
+    def register_arrival(self, airport: str, aircraft_id: str, flight_number: str, origin: str) -> Tuple[bool, str]:
+        """Registra una llegada en su aeropuerto de destino."""
+        return self._call(airport, "register", aircraft_id=aircraft_id, flight_number=flight_number, origin=origin)
+    
+    def assign(self, airport: str, facility_type: str) -> Tuple[bool, str]:
+        """Asigna la próxima aeronave en espera de un aeropuerto."""
+        return self._call(airport, "assign", facility_type=facility_type)
+    
+    def release(self, airport: str, facility_type: str, facility: str) -> Tuple[bool, Any]:
+        """Libera una instalación de un aeropuerto."""
+        return self._call(airport, "release", facility_type=facility_type, facility=facility)
+    
+    def available(self, facility_type: str) -> Dict[str, List[str]]:
+        """Instalaciones libres de un tipo en toda la red."""
+        return self.broadcast("available", facility_type=facility_type)
+    
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Llegadas, aeronaves en espera e instalaciones libres de cada aeropuerto."""
+        return self.broadcast("summary")
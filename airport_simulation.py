@@ -0,0 +1,282 @@
+"""
+Airport Traffic Manager - Simulación
+Simulador de eventos discretos con reloj virtual para planificar capacidad
+
+El simulador mueve un VirtualClock de evento en evento (un heap ordenado
+por hora) y usa las funciones core del manager para registrar, asignar y
+liberar, así que una semana de tráfico se simula en segundos. Cada
+aeronave aterriza (espera pista, la ocupa un tiempo), pasa a la cola de
+terminales, ocupa una terminal y se va.
+
+Mide la utilización de pistas y terminales, el largo medio y máximo de
+cada cola y la espera media.
+
+Uso típico:
+    simulation = Simulation(AirportTrafficManager(runways, terminals, clock=VirtualClock()), seed=1)
+    simulation.add_arrivals(poisson(60), exponential(3), exponential(45))
+    report = simulation.run(7 * 24 * 3600)
+"""
+
+import heapq
+import itertools
+import random
+from collections import deque
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrival
+
+
+# Distribuciones: reciben el generador aleatorio y la hora actual; devuelven segundos
+Distribution = Callable[[random.Random, float], float]
+
+FACILITY_TYPES = ("runway", "terminal")
+
+
+def poisson(arrivals_per_hour: float) -> Distribution:
+    """
+    Tiempos entre llegadas de un proceso de Poisson de tasa constante.
+    
+    Args:
+        arrivals_per_hour (float): Llegadas por hora
+    
+    Returns:
+        Distribution: Tiempo hasta la próxima llegada, en segundos
+    """
+    if arrivals_per_hour <= 0:
+        raise ValueError("La tasa de llegadas debe ser positiva")
+    rate = arrivals_per_hour / 3600
+    return lambda randomizer, now: randomizer.expovariate(rate)
+
+
+def hourly_poisson(arrivals_per_hour: Sequence[float]) -> Distribution:
+    """
+    Proceso de Poisson con una tasa distinta para cada hora del día.
+    
+    Se muestrea por aceptación-rechazo (thinning) sobre la tasa máxima.
+    
+    Args:
+        arrivals_per_hour (Sequence[float]): Llegadas por hora; se repite cíclicamente (típicamente 24 valores)
+    
+    Returns:
+        Distribution: Tiempo hasta la próxima llegada, en segundos
+    """
+    rates = list(arrivals_per_hour)
+    peak = max(rates, default=0)
+    if peak <= 0 or min(rates) < 0:
+        raise ValueError("Las tasas deben ser no negativas y alguna positiva")
+    
+    def draw(randomizer: random.Random, now: float) -> float:
+        candidate = now
+        while True:
+            candidate += randomizer.expovariate(peak / 3600)
+            if randomizer.random() * peak < rates[int(candidate // 3600) % len(rates)]:
+                return candidate - now
+    
+    return draw
+
+
+def exponential(mean_minutes: float) -> Distribution:
+    """Duración exponencial con la media indicada, en segundos."""
+    rate = 1 / (mean_minutes * 60)
+    return lambda randomizer, now: randomizer.expovariate(rate)
+
+
+def constant(minutes: float) -> Distribution:
+    """Duración fija, en segundos."""
+    seconds = minutes * 60
+    return lambda randomizer, now: seconds
+
+
+class SimulationReport(NamedTuple):
+    """Resultados de una simulación."""
+    
+    duration: float                    # segundos simulados
+    events: int                        # eventos procesados
+    arrivals: int                      # aeronaves llegadas
+    completed: int                     # aeronaves que liberaron su terminal
+    utilization: Dict[str, float]      # tipo -> fracción media de instalaciones ocupadas
+    mean_queue: Dict[str, float]       # tipo -> aeronaves en espera, promedio en el tiempo
+    max_queue: Dict[str, int]          # tipo -> máximo de aeronaves en espera
+    mean_wait: Dict[str, float]        # tipo -> espera media hasta la asignación, en segundos
+
+
+class Simulation:
+    """
+    Simulador de eventos discretos sobre un AirportTrafficManager.
+    
+    Args:
+        manager (AirportTrafficManager, optional): Manager con un VirtualClock; por defecto, uno nuevo
+        seed (int, optional): Semilla del generador aleatorio
+    
+    Raises:
+        ValueError: Si el manager no usa un VirtualClock
+    """
+    
+    def __init__(self, manager: Optional[AirportTrafficManager] = None, seed: Optional[int] = None):
+        self.manager = AirportTrafficManager(clock=VirtualClock()) if manager is None else manager
+        if not isinstance(self.manager.clock, VirtualClock):
+            raise ValueError("El manager de la simulación debe usar un VirtualClock")
+        
+        self.clock: VirtualClock = self.manager.clock
+        self.random = random.Random(seed)
+        self.start = self.clock.time()
+        self.events = 0
+        
+        self._heap = []
+        self._sequence = itertools.count()
+        self._arrived = 0
+        self._completed = 0
+        self._terminal_queue = deque()
+        self._queued = {facility_type: 0 for facility_type in FACILITY_TYPES}
+        self._max_queue = {facility_type: 0 for facility_type in FACILITY_TYPES}
+        self._waits = {facility_type: [0.0, 0] for facility_type in FACILITY_TYPES}
+        
+        # Integrales en el tiempo de instalaciones ocupadas y de aeronaves en cola
+        self._busy_area = {facility_type: 0.0 for facility_type in FACILITY_TYPES}
+        self._queue_area = {facility_type: 0.0 for facility_type in FACILITY_TYPES}
+        self._last = self.start
+    
+    def schedule(self, delay: float, action: Callable[..., None], *args: Any) -> None:
+        """
+        Programa una acción dentro de `delay` segundos simulados.
+        
+        Args:
+            delay (float): Segundos desde ahora (no negativo)
+            action (Callable): Función a ejecutar
+            *args: Argumentos de la función
+        """
+        heapq.heappush(self._heap, (self.clock.time() + delay, next(self._sequence), action, args))
+    
+    def add_arrivals(self, interarrival: Distribution, runway_dwell: Distribution,
+                     terminal_dwell: Distribution, origins: Sequence[str] = ("JFK", "MIA", "ATL", "GRU", "EZE")) -> None:
+        """
+        Agrega un flujo de llegadas sintéticas.
+        
+        Args:
+            interarrival (Distribution): Tiempo entre llegadas (ver poisson() y hourly_poisson())
+            runway_dwell (Distribution): Ocupación de la pista por aeronave
+            terminal_dwell (Distribution): Ocupación de la terminal por aeronave
+            origins (Sequence[str]): Orígenes a sortear
+        """
+        self.schedule(interarrival(self.random, self.clock.time()), self._arrive,
+                      interarrival, runway_dwell, terminal_dwell, tuple(origins))
+    
+    def _arrive(self, interarrival: Distribution, runway_dwell: Distribution,
+                terminal_dwell: Distribution, origins: Sequence[str]) -> None:
+        number = self._arrived
+        self._arrived += 1
+        arrival_data = register_arrival(f"SIM{number:07d}", f"SM{number % 9000}",
+                                        self.random.choice(origins), self.clock)
+        self.manager.add_arrival(arrival_data)
+        self._enqueue("runway")
+        self._assign_runways(runway_dwell, terminal_dwell)
+        
+        self.schedule(interarrival(self.random, self.clock.time()), self._arrive,
+                      interarrival, runway_dwell, terminal_dwell, origins)
+    
+    def _enqueue(self, facility_type: str) -> None:
+        queued = self._queued[facility_type] + 1
+        self._queued[facility_type] = queued
+        if queued > self._max_queue[facility_type]:
+            self._max_queue[facility_type] = queued
+    
+    def _record_wait(self, facility_type: str, seconds: float) -> None:
+        self._queued[facility_type] -= 1
+        wait = self._waits[facility_type]
+        wait[0] += seconds
+        wait[1] += 1
+    
+    def _assign_runways(self, runway_dwell: Distribution, terminal_dwell: Distribution) -> None:
+        manager = self.manager
+        while manager.airstrips.available_count():
+            arrival_data = manager.next_waiting()
+            if arrival_data is None:
+                return
+            # Las libres pueden estar retenidas por reservas (pool.add_hold)
+            success, runway = manager.assign_arrival(arrival_data, "runway")
+            if not success:
+                return
+            self._record_wait("runway", arrival_data.assigned_ts - arrival_data.arrival_ts)
+            self.schedule(runway_dwell(self.random, self.clock.time()), self._leave_runway,
+                          runway, arrival_data, runway_dwell, terminal_dwell)
+    
+    def _leave_runway(self, runway: str, arrival_data: Any, runway_dwell: Distribution,
+                      terminal_dwell: Distribution) -> None:
+        self.manager.airstrips.release(runway)
+        self._terminal_queue.append((arrival_data, self.clock.time()))
+        self._enqueue("terminal")
+        self._assign_runways(runway_dwell, terminal_dwell)
+        self._assign_terminals(terminal_dwell)
+    
+    def _assign_terminals(self, terminal_dwell: Distribution) -> None:
+        manager = self.manager
+        queue = self._terminal_queue
+        while queue and manager.terminals.available_count():
+            arrival_data, queued_at = queue[0]
+            success, terminal = manager.assign_arrival(arrival_data, "terminal")
+            if not success:
+                return
+            queue.popleft()
+            self._record_wait("terminal", self.clock.time() - queued_at)
+            self.schedule(terminal_dwell(self.random, self.clock.time()), self._leave_terminal,
+                          terminal, terminal_dwell)
+    
+    def _leave_terminal(self, terminal: str, terminal_dwell: Distribution) -> None:
+        self.manager.terminals.release(terminal)
+        self._completed += 1
+        self._assign_terminals(terminal_dwell)
+    
+    def _advance(self, timestamp: float) -> None:
+        # Acumula las integrales hasta `timestamp` y mueve el reloj
+        elapsed = timestamp - self._last
+        if elapsed > 0:
+            for facility_type, pool in self.manager.pools.items():
+                self._busy_area[facility_type] += (len(pool) - pool.available_count()) * elapsed
+                self._queue_area[facility_type] += self._queued[facility_type] * elapsed
+            self._last = timestamp
+        self.clock.set(timestamp)
+    
+    def run(self, duration: float) -> SimulationReport:
+        """
+        Procesa eventos hasta `duration` segundos después del inicio.
+        
+        Puede llamarse varias veces para continuar la simulación.
+        
+        Args:
+            duration (float): Segundos simulados desde el inicio de la simulación
+        
+        Returns:
+            SimulationReport: Métricas acumuladas desde el inicio
+        """
+        until = self.start + duration
+        heap = self._heap
+        
+        while heap and heap[0][0] <= until:
+            timestamp, _, action, args = heapq.heappop(heap)
+            self._advance(timestamp)
+            action(*args)
+            self.events += 1
+        
+        self._advance(until)
+        return self.report()
+    
+    def report(self) -> SimulationReport:
+        """Métricas acumuladas hasta la hora actual del reloj."""
+        duration = self.clock.time() - self.start
+        pools = self.manager.pools
+        
+        def per_duration(area: float) -> float:
+            return area / duration if duration > 0 else 0.0
+        
+        return SimulationReport(
+            duration=duration,
+            events=self.events,
+            arrivals=self._arrived,
+            completed=self._completed,
+            utilization={facility_type: per_duration(area) / max(len(pools[facility_type]), 1)
+                         for facility_type, area in self._busy_area.items()},
+            mean_queue={facility_type: per_duration(area) for facility_type, area in self._queue_area.items()},
+            max_queue=dict(self._max_queue),
+            mean_wait={facility_type: total / count if count else 0.0
+                       for facility_type, (total, count) in self._waits.items()}
+        )
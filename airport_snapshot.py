@@ -0,0 +1,341 @@
+"""
+Airport Traffic Manager - Snapshot binario
+Formato de registros fijos para abrir configuraciones grandes con mmap
+
+El archivo se abre con mmap y solo se decodifican los registros que se
+consultan, así que el tiempo de arranque no depende de la cantidad de
+aeropuertos ni de instalaciones.
+
+Estructura (little endian):
+    Cabecera (32 bytes): magic, versión, aeropuertos, instalaciones, llegadas
+    Tabla de aeropuertos (24 bytes c/u): código y rangos de instalaciones y llegadas
+    Instalaciones (64 bytes c/u): nombre, tipo, estado, aeronave, inicio de ocupación
+    Llegadas (64 bytes c/u): aeronave, vuelo, origen, llegada, asignación, estado
+    Índice por nombre (4 bytes c/u): posiciones de instalaciones ordenadas por nombre
+
+Para convertir una configuración:
+    python airport_snapshot.py config.json config.snap
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from airport_core import AirportTrafficManager, Arrival, ArrivalStatus, FacilityStatus
+
+
+MAGIC = b"ATMSNAP1"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHHIII8x")
+AIRPORT = struct.Struct("<8sIIII")
+FACILITY = struct.Struct("<32sBB6x16sd")
+ARRIVAL = struct.Struct("<16s16s8sddB7x")
+INDEX = struct.Struct("<I")
+
+FACILITY_TYPES: Tuple[str, ...] = ("runway", "terminal")
+FACILITY_STATUSES: Tuple[FacilityStatus, ...] = tuple(FacilityStatus)
+ARRIVAL_STATUSES: Tuple[ArrivalStatus, ...] = tuple(ArrivalStatus)
+
+
+class FacilityRecord(NamedTuple):
+    """Instalación decodificada de un snapshot."""
+    
+    name: str
+    facility_type: str
+    status: FacilityStatus
+    aircraft: Optional[str]
+    start_ts: Optional[float]
+
+
+def _pack_text(value: Optional[str], size: int) -> bytes:
+    encoded = (value or "").encode("utf-8")
+    if len(encoded) > size:
+        raise ValueError(f"'{value}' supera los {size} bytes del formato")
+    return encoded
+
+
+def _unpack_text(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8")
+
+
+def _optional_ts(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _ts_or_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def write_snapshot(path: str, managers: Mapping[str, AirportTrafficManager]) -> None:
+    """
+    Escribe el estado de varios aeropuertos en un snapshot binario.
+    
+    Args:
+        path (str): Archivo de destino
+        managers (Mapping[str, AirportTrafficManager]): Código de aeropuerto -> manager
+    
+    Raises:
+        ValueError: Si un código o nombre no entra en su campo de tamaño fijo
+    """
+    airport_rows = []
+    facility_rows = []
+    arrival_rows = []
+    index_rows = []
+    
+    for code, manager in managers.items():
+        facility_first, arrival_first = len(facility_rows), len(arrival_rows)
+        
+        names = []
+        for facility_type in FACILITY_TYPES:
+            for name, facility in manager.pools[facility_type].items():
+                names.append((name, len(facility_rows)))
+                facility_rows.append(FACILITY.pack(
+                    _pack_text(name, 32), FACILITY_TYPES.index(facility_type),
+                    FACILITY_STATUSES.index(facility.status), _pack_text(facility.aircraft, 16),
+                    _optional_ts(facility.start_ts)))
+        
+        for arrival in manager.arrivals_log:
+            arrival_rows.append(ARRIVAL.pack(
+                _pack_text(arrival.aircraft_id, 16), _pack_text(arrival.flight_number, 16),
+                _pack_text(arrival.origin, 8), arrival.arrival_ts, _optional_ts(arrival.assigned_ts),
+                ARRIVAL_STATUSES.index(arrival.status)))
+        
+        index_rows.extend(INDEX.pack(position) for _, position in sorted(names))
+        airport_rows.append(AIRPORT.pack(_pack_text(code, 8), facility_first, len(facility_rows) - facility_first,
+                                         arrival_first, len(arrival_rows) - arrival_first))
+    
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, VERSION, 0, len(airport_rows), len(facility_rows), len(arrival_rows)))
+        for rows in (airport_rows, facility_rows, arrival_rows, index_rows):
+            snapshot_file.write(b"".join(rows))
+    os.replace(temp_path, path)
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Lee una configuración de aeropuertos en JSON (o YAML si PyYAML está instalado).
+    
+    Formato:
+        {"airports": {"ASU": {"runways": ["Runway_01"], "terminals": ["Terminal_A"]}}}
+    
+    Args:
+        config_path (str): Archivo .json, .yaml o .yml
+    
+    Returns:
+        Dict: Configuración leída
+    
+    Raises:
+        ValueError: Si el archivo es YAML y PyYAML no está instalado
+    """
+    with open(config_path, "r", encoding="utf-8") as config_file:
+        if config_path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Se necesita PyYAML para leer configuraciones YAML")
+            return yaml.safe_load(config_file)
+        return json.load(config_file)
+
+
+def convert_config(config_path: str, snapshot_path: str) -> int:
+    """
+    Convierte una configuración JSON/YAML en un snapshot binario.
+    
+    Args:
+        config_path (str): Configuración de origen
+        snapshot_path (str): Snapshot de destino
+    
+    Returns:
+        int: Cantidad de instalaciones escritas
+    """
+    config = load_config(config_path)
+    managers = {
+        code: AirportTrafficManager(airport.get("runways", ()), airport.get("terminals", ()))
+        for code, airport in config["airports"].items()
+    }
+    write_snapshot(snapshot_path, managers)
+    return sum(len(manager.airstrips) + len(manager.terminals) for manager in managers.values())
+
+
+class SnapshotFile:
+    """
+    Snapshot binario abierto con mmap y leído de forma perezosa.
+    
+    Abrirlo solo lee la cabecera y la tabla de aeropuertos; las
+    instalaciones y llegadas se decodifican al consultarlas.
+    
+    Args:
+        path (str): Archivo de snapshot
+    
+    Raises:
+        ValueError: Si el archivo no es un snapshot válido
+    """
+    
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} no es un snapshot válido")
+        
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} no es un snapshot válido")
+        
+        magic, version, _, airport_count, facility_count, arrival_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} no es un snapshot válido")
+        
+        self.facility_count = facility_count
+        self.arrival_count = arrival_count
+        self.decoded = 0
+        
+        self._facilities_at = HEADER.size + airport_count * AIRPORT.size
+        self._arrivals_at = self._facilities_at + facility_count * FACILITY.size
+        self._index_at = self._arrivals_at + arrival_count * ARRIVAL.size
+        
+        self._airports: Dict[str, Tuple[int, int, int, int]] = {}
+        for position in range(airport_count):
+            code, *ranges = AIRPORT.unpack_from(self._map, HEADER.size + position * AIRPORT.size)
+            self._airports[_unpack_text(code)] = tuple(ranges)
+    
+    def __enter__(self) -> "SnapshotFile":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Cierra el mapeo y el archivo."""
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def airports(self) -> List[str]:
+        """Devuelve los códigos de aeropuerto del snapshot."""
+        return list(self._airports)
+    
+    def _range(self, airport: str) -> Tuple[int, int, int, int]:
+        try:
+            return self._airports[airport]
+        except KeyError:
+            raise KeyError(f"Aeropuerto desconocido: {airport}")
+    
+    def facility(self, position: int) -> FacilityRecord:
+        """
+        Decodifica la instalación en una posición global del snapshot.
+        
+        Args:
+            position (int): Posición entre 0 y facility_count - 1
+        
+        Returns:
+            FacilityRecord: Instalación decodificada
+        """
+        if not 0 <= position < self.facility_count:
+            raise IndexError(position)
+        
+        name, facility_type, status, aircraft, start_ts = FACILITY.unpack_from(
+            self._map, self._facilities_at + position * FACILITY.size)
+        self.decoded += 1
+        return FacilityRecord(_unpack_text(name), FACILITY_TYPES[facility_type], FACILITY_STATUSES[status],
+                              _unpack_text(aircraft) or None, _ts_or_none(start_ts))
+    
+    def _name_at(self, position: int) -> bytes:
+        offset = self._facilities_at + position * FACILITY.size
+        return self._map[offset:offset + 32].rstrip(b"\0")
+    
+    def find(self, airport: str, name: str) -> Optional[FacilityRecord]:
+        """
+        Busca una instalación por nombre con búsqueda binaria sobre el índice.
+        
+        Args:
+            airport (str): Código de aeropuerto
+            name (str): Nombre de la instalación
+        
+        Returns:
+            Optional[FacilityRecord]: Instalación, o None si no existe
+        """
+        first, count, _, _ = self._range(airport)
+        target = name.encode("utf-8")
+        
+        low, high = first, first + count
+        while low < high:
+            middle = (low + high) // 2
+            position = INDEX.unpack_from(self._map, self._index_at + middle * INDEX.size)[0]
+            if self._name_at(position) < target:
+                low = middle + 1
+            else:
+                high = middle
+        
+        if low < first + count:
+            position = INDEX.unpack_from(self._map, self._index_at + low * INDEX.size)[0]
+            if self._name_at(position) == target:
+                return self.facility(position)
+        return None
+    
+    def facilities(self, airport: str) -> Iterator[FacilityRecord]:
+        """Recorre las instalaciones de un aeropuerto en orden de alta."""
+        first, count, _, _ = self._range(airport)
+        for position in range(first, first + count):
+            yield self.facility(position)
+    
+    def arrivals(self, airport: str) -> Iterator[Arrival]:
+        """Recorre el historial de llegadas de un aeropuerto."""
+        _, _, first, count = self._range(airport)
+        for position in range(first, first + count):
+            aircraft_id, flight_number, origin, arrival_ts, assigned_ts, status = ARRIVAL.unpack_from(
+                self._map, self._arrivals_at + position * ARRIVAL.size)
+            self.decoded += 1
+            yield Arrival(_unpack_text(aircraft_id), _unpack_text(flight_number), _unpack_text(origin),
+                          arrival_ts, ARRIVAL_STATUSES[status], _ts_or_none(assigned_ts))
+    
+    def load_manager(self, airport: str, with_history: bool = True) -> AirportTrafficManager:
+        """
+        Construye el manager de un aeropuerto decodificando solo sus registros.
+        
+        Args:
+            airport (str): Código de aeropuerto
+            with_history (bool): Si también se carga el historial de llegadas
+        
+        Returns:
+            AirportTrafficManager: Manager con el estado guardado
+        """
+        records = list(self.facilities(airport))
+        manager = AirportTrafficManager(
+            [record.name for record in records if record.facility_type == "runway"],
+            [record.name for record in records if record.facility_type == "terminal"])
+        
+        for record in records:
+            if record.status is FacilityStatus.OCCUPIED:
+                manager.pools[record.facility_type].occupy(record.name, record.aircraft, record.start_ts)
+        
+        if with_history:
+            for arrival in self.arrivals(airport):
+                manager.add_arrival(arrival)
+        
+        return manager
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Convierte una configuración JSON/YAML en snapshot desde la línea de comandos."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Uso: python airport_snapshot.py <config.json|yaml> <salida.snap>", file=sys.stderr)
+        return 2
+    
+    count = convert_config(argv[0], argv[1])
+    print(f"{count} instalaciones escritas en {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Airport Traffic Manager - Almacenamiento SQLite
+Historial persistente de llegadas y asignaciones con consultas indexadas
+
+SQLiteStore guarda en una base SQLite (modo WAL) cada llegada y cada
+ocupación de instalación publicada por el manager, de modo que el
+historial sobrevive al proceso y se puede consultar por aeronave, vuelo,
+origen o rango de tiempo sin recorrer arrivals_log.
+
+- Las escrituras se acumulan y se confirman por lotes en una sola
+  transacción (executemany sobre sentencias preparadas): cada
+  `batch_size` registros o, como máximo, cada `max_delay` segundos.
+- Cada hilo usa su propia conexión, creada la primera vez que la pide;
+  con WAL los lectores no bloquean al escritor.
+- Las consultas confirman antes lo pendiente, así que ven todo lo que
+  el manager ya publicó.
+
+Uso típico:
+    manager, store = open_manager("aeropuerto.db")
+    store.arrivals_from("JFK", inicio, fin)
+    store.assignment_history(facility_name="Gate_1")
+"""
+
+import itertools
+import sqlite3
+import threading
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from airport_core import (
+    AirportTrafficManager,
+    Arrival,
+    ArrivalRegistered,
+    ArrivalStatus,
+    FacilityAssigned,
+    FacilityReleased
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS arrivals (
+    id INTEGER PRIMARY KEY,
+    aircraft_id TEXT NOT NULL,
+    flight_number TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    arrival_ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    assigned_ts REAL
+);
+CREATE INDEX IF NOT EXISTS arrivals_aircraft ON arrivals (aircraft_id);
+CREATE INDEX IF NOT EXISTS arrivals_flight ON arrivals (flight_number, arrival_ts);
+CREATE INDEX IF NOT EXISTS arrivals_time ON arrivals (arrival_ts);
+CREATE INDEX IF NOT EXISTS arrivals_origin ON arrivals (origin, arrival_ts);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    id INTEGER PRIMARY KEY,
+    facility_type TEXT NOT NULL,
+    facility TEXT NOT NULL,
+    aircraft_id TEXT,
+    start_ts REAL NOT NULL,
+    end_ts REAL
+);
+CREATE INDEX IF NOT EXISTS assignments_facility ON assignments (facility, start_ts);
+CREATE INDEX IF NOT EXISTS assignments_aircraft ON assignments (aircraft_id);
+CREATE INDEX IF NOT EXISTS assignments_open ON assignments (facility_type, facility) WHERE end_ts IS NULL;
+"""
+
+INSERT_ARRIVAL = ("INSERT INTO arrivals (aircraft_id, flight_number, origin, arrival_ts, status, assigned_ts) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+INSERT_ASSIGNMENT = ("INSERT INTO assignments (facility_type, facility, aircraft_id, start_ts) "
+                     "VALUES (?, ?, ?, ?)")
+# La fila de la llegada asignada (aeronave + hora de llegada) copia su estado en memoria
+MARK_ASSIGNED = ("UPDATE arrivals SET status = ?, assigned_ts = ? "
+                 "WHERE aircraft_id = ? AND arrival_ts = ?")
+# Sin manager conectado: la última llegada de la aeronave, conservando la primera hora de asignación
+MARK_LATEST_ASSIGNED = ("UPDATE arrivals SET status = ?, assigned_ts = COALESCE(assigned_ts, ?) "
+                        "WHERE id = (SELECT MAX(id) FROM arrivals WHERE aircraft_id = ?)")
+CLOSE_ASSIGNMENT = ("UPDATE assignments SET end_ts = ? "
+                    "WHERE facility_type = ? AND facility = ? AND end_ts IS NULL")
+
+ARRIVAL_COLUMNS = "aircraft_id, flight_number, origin, arrival_ts, status, assigned_ts"
+ASSIGNMENT_COLUMNS = "facility_type, facility, aircraft_id, start_ts, end_ts"
+
+
+class StoredArrival(NamedTuple):
+    """Llegada leída del historial."""
+    
+    aircraft_id: str
+    flight_number: str
+    origin: str
+    arrival_ts: float
+    status: str
+    assigned_ts: Optional[float]
+
+
+class AssignmentRecord(NamedTuple):
+    """Ocupación de una instalación; end_ts es None mientras sigue ocupada."""
+    
+    facility_type: str
+    facility_name: str
+    aircraft_id: Optional[str]
+    start_ts: float
+    end_ts: Optional[float]
+
+
+class SQLiteStore:
+    """
+    Historial de llegadas y asignaciones en SQLite, con escrituras por lotes.
+    
+    Args:
+        path (str): Archivo de la base (":memory:" no sirve: cada hilo tendría su propia base)
+        batch_size (int): Registros por transacción
+        max_delay (float): Segundos máximos que un registro espera su transacción (0 desactiva el hilo)
+        synchronous (str): PRAGMA synchronous; NORMAL es durable ante caídas del proceso con WAL
+    """
+    
+    def __init__(self, path: str, batch_size: int = 1000, max_delay: float = 0.05,
+                 synchronous: str = "NORMAL"):
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser al menos 1")
+        
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.synchronous = synchronous
+        self.commits = 0
+        
+        self._pending: List[Tuple[str, Tuple]] = []
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._unsubscribe = None
+        self._manager: Optional[AirportTrafficManager] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+    
+    def __enter__(self) -> "SQLiteStore":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # check_same_thread=False solo para que close() pueda cerrarlas todas;
+            # cada conexión se usa desde el hilo que la creó
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+    
+    def attach(self, manager: AirportTrafficManager) -> "SQLiteStore":
+        """
+        Empieza a guardar los eventos del manager.
+        
+        Args:
+            manager (AirportTrafficManager): Manager a persistir (ya recuperado)
+        
+        Returns:
+            SQLiteStore: El mismo almacenamiento, para encadenar llamadas
+        """
+        self._manager = manager
+        self._unsubscribe = manager.events.subscribe(self.record, ArrivalRegistered,
+                                                     FacilityAssigned, FacilityReleased)
+        
+        if self.max_delay and self.batch_size > 1:
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="sqlite-flusher", daemon=True)
+            self._flusher.start()
+        
+        return self
+    
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.max_delay):
+            self.commit()
+    
+    def record(self, event: Any) -> None:
+        """
+        Encola la escritura de un evento del manager.
+        
+        Args:
+            event: ArrivalRegistered, FacilityAssigned o FacilityReleased (los demás se ignoran)
+        """
+        if isinstance(event, ArrivalRegistered):
+            arrival = event.arrival
+            statements = ((INSERT_ARRIVAL, (arrival.aircraft_id, arrival.flight_number, arrival.origin,
+                                            arrival.arrival_ts, arrival.status.value, arrival.assigned_ts)),)
+        elif isinstance(event, FacilityAssigned):
+            # assign_arrival() marca la llegada antes de publicar: su estado y su
+            # primera hora de asignación ya son los definitivos en memoria
+            arrival = None if self._manager is None else self._manager.find_arrival(event.aircraft_id)
+            if arrival is not None:
+                mark = (MARK_ASSIGNED, (ArrivalStatus(arrival.status).value, arrival.assigned_ts,
+                                        arrival.aircraft_id, arrival.arrival_ts))
+            else:
+                mark = (MARK_LATEST_ASSIGNED, (f"assigned_{event.facility_type}", event.timestamp,
+                                               event.aircraft_id))
+            statements = ((INSERT_ASSIGNMENT, (event.facility_type, event.facility_name,
+                                               event.aircraft_id, event.timestamp)), mark)
+        elif isinstance(event, FacilityReleased):
+            statements = ((CLOSE_ASSIGNMENT, (event.timestamp, event.facility_type, event.facility_name)),)
+        else:
+            return
+        
+        with self._lock:
+            self._pending.extend(statements)
+            if len(self._pending) >= self.batch_size:
+                self._commit_locked()
+    
+    def commit(self) -> None:
+        """Confirma las escrituras pendientes en una transacción."""
+        with self._lock:
+            self._commit_locked()
+    
+    def _commit_locked(self) -> None:
+        if not self._pending:
+            return
+        
+        pending, self._pending = self._pending, []
+        connection = self._connection()
+        with connection:
+            # Las corridas consecutivas de la misma sentencia van en un solo executemany
+            for sql, statements in itertools.groupby(pending, key=lambda statement: statement[0]):
+                connection.executemany(sql, (params for _, params in statements))
+        self.commits += 1
+    
+    def _query(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        self.commit()
+        return self._connection().execute(sql, params)
+    
+    def arrivals_from(self, origin: str, start_ts: float, end_ts: float) -> List[StoredArrival]:
+        """
+        Llegadas desde un origen en un rango de tiempo.
+        
+        Args:
+            origin (str): Aeropuerto de origen
+            start_ts (float): Inicio del rango en epoch (incluido)
+            end_ts (float): Fin del rango en epoch (excluido)
+        
+        Returns:
+            List[StoredArrival]: Llegadas ordenadas por hora de llegada
+        """
+        return list(map(StoredArrival._make, self._query(
+            f"SELECT {ARRIVAL_COLUMNS} FROM arrivals WHERE origin = ? AND arrival_ts >= ? AND arrival_ts < ? "
+            "ORDER BY arrival_ts", (origin, start_ts, end_ts))))
+    
+    def arrivals_between(self, start_ts: float, end_ts: float) -> List[StoredArrival]:
+        """Llegadas en el rango [start_ts, end_ts), ordenadas por hora de llegada."""
+        return list(map(StoredArrival._make, self._query(
+            f"SELECT {ARRIVAL_COLUMNS} FROM arrivals WHERE arrival_ts >= ? AND arrival_ts < ? "
+            "ORDER BY arrival_ts", (start_ts, end_ts))))
+    
+    def arrivals_for_flight(self, flight_number: str) -> List[StoredArrival]:
+        """Llegadas de un número de vuelo, ordenadas por hora de llegada."""
+        return list(map(StoredArrival._make, self._query(
+            f"SELECT {ARRIVAL_COLUMNS} FROM arrivals WHERE flight_number = ? ORDER BY arrival_ts",
+            (flight_number,))))
+    
+    def arrivals_for_aircraft(self, aircraft_id: str) -> List[StoredArrival]:
+        """Llegadas de una aeronave, en orden de registro."""
+        return list(map(StoredArrival._make, self._query(
+            f"SELECT {ARRIVAL_COLUMNS} FROM arrivals WHERE aircraft_id = ? ORDER BY id", (aircraft_id,))))
+    
+    def arrival_count(self) -> int:
+        """Cantidad de llegadas guardadas."""
+        return self._query("SELECT COUNT(*) FROM arrivals").fetchone()[0]
+    
+    def assignment_history(self, facility_name: Optional[str] = None, aircraft_id: Optional[str] = None,
+                           start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> List[AssignmentRecord]:
+        """
+        Ocupaciones de instalaciones, filtradas por cualquier combinación de criterios.
+        
+        Args:
+            facility_name (str, optional): Solo las de esta instalación
+            aircraft_id (str, optional): Solo las de esta aeronave
+            start_ts (float, optional): Solo las que empezaron en o después de este instante
+            end_ts (float, optional): Solo las que empezaron antes de este instante
+        
+        Returns:
+            List[AssignmentRecord]: Ocupaciones ordenadas por inicio
+        """
+        conditions = []
+        params: List[Any] = []
+        for condition, value in (("facility = ?", facility_name), ("aircraft_id = ?", aircraft_id),
+                                 ("start_ts >= ?", start_ts), ("start_ts < ?", end_ts)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return list(map(AssignmentRecord._make, self._query(
+            f"SELECT {ASSIGNMENT_COLUMNS} FROM assignments{where} ORDER BY start_ts, id", tuple(params))))
+    
+    def recover(self, manager: AirportTrafficManager) -> int:
+        """
+        Restaura sobre el manager las llegadas y las ocupaciones abiertas.
+        
+        Las instalaciones que el manager no tenga se dan de alta.
+        
+        Args:
+            manager (AirportTrafficManager): Manager recién creado, aún sin almacenamiento conectado
+        
+        Returns:
+            int: Cantidad de llegadas restauradas
+        """
+        for facility_type, facility_name, aircraft_id, start_ts, _ in self._query(
+                f"SELECT {ASSIGNMENT_COLUMNS} FROM assignments WHERE end_ts IS NULL ORDER BY id"):
+            pool = manager.pools[facility_type]
+            if facility_name not in pool:
+                pool.add(facility_name)
+            pool.occupy(facility_name, aircraft_id, start_ts)
+        
+        before = len(manager.arrivals_log)
+        manager.add_arrivals(Arrival(aircraft_id, flight_number, origin, arrival_ts,
+                                     ArrivalStatus(status), assigned_ts)
+                             for aircraft_id, flight_number, origin, arrival_ts, status, assigned_ts
+                             in self._query(f"SELECT {ARRIVAL_COLUMNS} FROM arrivals ORDER BY id"))
+        return len(manager.arrivals_log) - before
+    
+    def close(self) -> None:
+        """Deja de registrar eventos, confirma lo pendiente y cierra las conexiones."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+            self._manager = None
+        
+        with self._lock:
+            self._commit_locked()
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._local = threading.local()
+
+
+def open_manager(path: str, **store_options: Any) -> Tuple[AirportTrafficManager, SQLiteStore]:
+    """
+    Crea un manager persistente: recupera su estado de la base y le conecta el almacenamiento.
+    
+    Args:
+        path (str): Archivo de la base SQLite
+        **store_options: Opciones para SQLiteStore (batch_size, max_delay, ...)
+    
+    Returns:
+        Tuple[AirportTrafficManager, SQLiteStore]: Manager recuperado y su almacenamiento
+    """
+    manager = AirportTrafficManager()
+    store = SQLiteStore(path, **store_options)
+    store.recover(manager)
+    return manager, store.attach(manager)
@@ -0,0 +1,67 @@
+"""
+Benchmark de la analítica columnar del historial de llegadas.
+
+Carga N llegadas sintéticas en ArrivalColumns y mide el tiempo de las
+consultas (conteo por origen, histograma por hora y percentiles de espera).
+El objetivo de menos de un segundo para 10M llegadas requiere NumPy.
+
+Para ejecutar:
+    python benchmarks/bench_analytics.py [cantidad]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airport_analytics
+from airport_analytics import ArrivalColumns
+from airport_core import ArrivalStatus
+
+
+DEFAULT_COUNT = 10_000_000
+DAY_START = 1_750_000_000.0
+
+
+def build(count):
+    """Genera `count` llegadas repartidas en una semana."""
+    rng = random.Random(111)
+    origins = [f"A{i:02d}" for i in range(300)]
+    columns = ArrivalColumns()
+    for i in range(count):
+        arrival_ts = DAY_START + i * (7 * 86400 / count)
+        assigned = i % 10 != 0
+        columns.append_raw(f"CC-{i % 5000:04d}", f"UA{i % 2000}", rng.choice(origins), arrival_ts,
+                           arrival_ts + rng.expovariate(1 / 600) if assigned else None,
+                           ArrivalStatus.ASSIGNED_RUNWAY if assigned else ArrivalStatus.WAITING)
+    return columns
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    backend = "numpy" if airport_analytics.np is not None else "python puro"
+    print(f"Llegadas: {count:,} (backend: {backend})")
+    
+    start = time.perf_counter()
+    columns = build(count)
+    print(f"{'carga':>20}: {time.perf_counter() - start:8.2f} s")
+    
+    queries = (
+        ("conteo por origen", columns.counts_by_origin),
+        ("histograma horario", columns.histogram),
+        ("percentiles espera", columns.wait_percentiles),
+    )
+    total = 0.0
+    for label, query in queries:
+        start = time.perf_counter()
+        query()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print(f"{label:>20}: {elapsed:8.3f} s")
+    print(f"{'total consultas':>20}: {total:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
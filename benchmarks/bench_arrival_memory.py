@@ -0,0 +1,66 @@
+"""
+Benchmark de memoria de los registros de llegada.
+
+Compara los bytes por llegada del diccionario original (cinco claves con
+la hora ya formateada) contra el registro Arrival con __slots__, epoch
+numérico, estado enum y cadenas internadas.
+
+Para ejecutar:
+    python benchmarks/bench_arrival_memory.py [cantidad]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import register_arrival
+
+
+DEFAULT_COUNT = 1_000_000
+
+
+def legacy_register_arrival(aircraft_id, flight_number, origin):
+    """Réplica del register_arrival original basado en diccionarios."""
+    return {
+        "aircraft_id": aircraft_id.strip().upper(),
+        "flight_number": flight_number.strip().upper(),
+        "origin": origin.strip().upper(),
+        "arrival_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "status": "waiting_assignment"
+    }
+
+
+def feed(count):
+    """Genera entradas con la repetición típica de un día de tráfico."""
+    for i in range(count):
+        yield f"cc-{i % 5000:04d}", f"ua{i % 2000}", f"a{i % 300:02d}"
+
+
+def bytes_per_arrival(factory, count):
+    """Mide la memoria retenida por `count` llegadas creadas con `factory`."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    records = [factory(*row) for row in feed(count)]
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del records
+    return used / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    print(f"Llegadas: {count:,}")
+    for label, factory in (("dict (antes)", legacy_register_arrival),
+                           ("Arrival (después)", register_arrival)):
+        start = time.perf_counter()
+        used = bytes_per_arrival(factory, count)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>20}: {used:8.1f} bytes/llegada ({elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de las operaciones por lotes contra llamadas individuales.
+
+Registra y asigna N llegadas (por defecto 100.000) a N puestos, primero
+con un bucle de register_arrival()/assign_arrival() y luego con
+register_arrivals_bulk()/assign_batch().
+
+Para ejecutar:
+    python benchmarks/bench_bulk.py [cantidad]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import (
+    AirportTrafficManager,
+    assign_batch,
+    register_arrival,
+    register_arrivals_bulk
+)
+
+
+DEFAULT_COUNT = 100_000
+
+
+def rows(count):
+    """Filas de entrada como llegarían de un feed de horarios."""
+    return [(f"cc-{i % 5000:04d}", f"ua{i % 2000}", f"a{i % 300:02d}") for i in range(count)]
+
+
+def new_manager(count):
+    """Manager con tantos puestos como llegadas."""
+    return AirportTrafficManager([], [f"Stand_{i:06d}" for i in range(count)])
+
+
+def single_calls(feed, count):
+    manager = new_manager(count)
+    start = time.perf_counter()
+    for row in feed:
+        manager.add_arrival(register_arrival(*row))
+    registered = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for arrival_data in manager.arrivals_log:
+        manager.assign_arrival(arrival_data, "terminal")
+    return registered, time.perf_counter() - start
+
+
+def batch_calls(feed, count):
+    manager = new_manager(count)
+    start = time.perf_counter()
+    manager.add_arrivals(result.value for result in register_arrivals_bulk(feed))
+    registered = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    assign_batch(manager, manager.arrivals_log, "terminal")
+    return registered, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    feed = rows(count)
+    print(f"Llegadas: {count:,}")
+    print(f"{'modo':>12} {'registro (llegadas/s)':>22} {'asignación (llegadas/s)':>24}")
+    for label, run in (("individual", single_calls), ("lotes", batch_calls)):
+        registered, assigned = run(feed, count)
+        print(f"{label:>12} {count / registered:>22,.0f} {count / assigned:>24,.0f}")
+
+
+if __name__ == "__main__":
+    main()
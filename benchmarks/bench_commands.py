@@ -0,0 +1,120 @@
+"""
+Benchmark de latencia de entrada con CommandPipeline bajo carga.
+
+Simula el mainloop de Tk: en cada vuelta llega un clic de registro (y cada
+diez, un doble clic en Asignar) y después corren los timers vencidos, que
+entregan los resultados del worker. Mide cuánto tarda cada vuelta mientras
+el worker procesa 10.000 registros; la entrada no debe esperar más de un
+cuadro (16 ms). Los dobles clics se combinan como en la interfaz: las
+cantidades se suman, así que ningún clic se pierde.
+
+Para ejecutar:
+    python benchmarks/bench_commands.py
+"""
+
+import gc
+import heapq
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_manager import AirportTrafficManager, CommandPipeline, register_arrival
+
+
+ARRIVALS = 10_000
+FRAME = 0.016
+
+
+class Scheduler:
+    """root.after simulado: los timers corren cuando se gira el mainloop."""
+    
+    def __init__(self):
+        self.timers = []
+        self._sequence = 0
+    
+    def after(self, ms, callback):
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self._sequence, callback))
+        self._sequence += 1
+    
+    def run_due(self):
+        """Ejecuta los timers vencidos y devuelve cuántos corrieron."""
+        now = time.perf_counter()
+        ran = 0
+        while self.timers and self.timers[0][0] <= now:
+            heapq.heappop(self.timers)[2]()
+            ran += 1
+        return ran
+
+
+def run(arrivals):
+    """Devuelve las duraciones de cada vuelta, el pipeline y los clics atendidos en Asignar."""
+    scheduler = Scheduler()
+    pipeline = CommandPipeline(scheduler.after)
+    manager = AirportTrafficManager(thread_safe=True)
+    registered = []
+    clicks = []
+    steps = []
+    
+    def add_arrival(number):
+        arrival_data = register_arrival(f"AC{number:05d}", "UA100", "JFK")
+        manager.add_arrival(arrival_data)
+        return arrival_data
+    
+    def assign_waiting(count):
+        # Como AirportGUI._assign_waiting: una asignación por clic combinado
+        clicks.append(count)
+        for _ in range(count):
+            if not manager.assign_next("terminal")[0]:
+                break
+    
+    def submit_assignment():
+        pipeline.submit(assign_waiting, 1, key="assign", merge=lambda pending, new: (pending[0] + new[0],))
+    
+    for number in range(arrivals):
+        # Cada vuelta del mainloop atiende un clic y luego los timers vencidos
+        started = time.perf_counter()
+        pipeline.submit(add_arrival, number, callback=registered.append)
+        if number % 10 == 0:
+            # Doble clic en Asignar
+            submit_assignment()
+            submit_assignment()
+        steps.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        scheduler.run_due()
+        steps.append(time.perf_counter() - started)
+    
+    while len(pipeline):
+        started = time.perf_counter()
+        if not scheduler.run_due():
+            time.sleep(0.001)
+            continue
+        steps.append(time.perf_counter() - started)
+    
+    pipeline.close()
+    assert len(registered) == arrivals
+    return steps, pipeline, sum(clicks)
+
+
+def main():
+    arrivals = int(sys.argv[1]) if len(sys.argv) > 1 else ARRIVALS
+    # Los objetos creados al importar no cuentan para el recolector durante la medición
+    gc.collect()
+    gc.freeze()
+    steps, pipeline, clicks = run(arrivals)
+    gc.unfreeze()
+    
+    steps.sort()
+    p99 = steps[int(len(steps) * 0.99)]
+    print(f"Comandos: {pipeline.submitted:,}  ejecutados: {pipeline.executed:,}  combinados: {pipeline.coalesced:,}")
+    print(f"Vueltas del mainloop: {len(steps):,}")
+    print(f"  mediana {steps[len(steps) // 2] * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms  máximo {steps[-1] * 1000:.3f} ms")
+    
+    assert clicks == 2 * len(range(0, arrivals, 10)), "se perdieron clics de Asignar al combinar"
+    assert p99 < FRAME, f"el p99 de la entrada fue {p99 * 1000:.1f} ms (cuadro: {FRAME * 1000:.0f} ms)"
+
+
+if __name__ == "__main__":
+    main()
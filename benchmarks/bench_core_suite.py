@@ -0,0 +1,194 @@
+"""
+Suite de regresión de rendimiento de las funciones core (pytest-benchmark).
+
+Genera conjuntos de instalaciones y registros de llegadas de 10, 1.000,
+100.000 y 1.000.000 de elementos y mide register_arrival, assign_to,
+check_available, check_time_used, release_facility y
+AirportGUI.update_display (con árboles simulados, sin pantalla).
+
+Requiere pytest-benchmark; sin él, la suite se omite.
+
+Para ejecutar:
+    pytest benchmarks/bench_core_suite.py
+
+Guardar una línea base (JSON en benchmarks/.benchmarks/<máquina>/):
+    pytest benchmarks/bench_core_suite.py --benchmark-storage=benchmarks/.benchmarks --benchmark-save=baseline
+
+Comparar contra la última línea base y fallar si la mediana empeora más de 15%:
+    pytest benchmarks/bench_core_suite.py --benchmark-storage=benchmarks/.benchmarks \\
+        --benchmark-compare --benchmark-compare-fail=median:15%
+
+Los tamaños se pueden acotar con AIRPORT_BENCH_SIZES (por ejemplo "10,1000").
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_manager import (
+    HISTORY_ROWS,
+    AirportGUI,
+    AirportTrafficManager,
+    ArrivalHistory,
+    FacilityPool,
+    FacilityTreeView,
+    VirtualClock,
+    VirtualTreeView,
+    arrival_row_values,
+    assign_to,
+    check_available,
+    check_time_used,
+    register_arrival,
+    release_facility,
+)
+
+
+START = 1_750_000_000.0
+SIZES = tuple(int(size) for size in os.environ.get("AIRPORT_BENCH_SIZES", "10,1000,100000,1000000").split(","))
+
+_pools = {}
+
+
+class StubTree:
+    """Treeview simulado: guarda los valores de cada fila."""
+    
+    def __init__(self):
+        self._rows = {}
+    
+    def insert(self, parent, index, text, values):
+        item = f"I{len(self._rows)}"
+        self._rows[item] = values
+        return item
+    
+    def item(self, item, text=None, values=None):
+        self._rows[item] = values
+    
+    def delete(self, item):
+        del self._rows[item]
+
+
+def rounds_for(size, budget=200_000):
+    """Rondas que entran en el presupuesto de elementos recorridos."""
+    return max(3, min(200, budget // size))
+
+
+def build_pool(size):
+    """
+    Pool de `size` instalaciones con la mitad ocupada (la primera mitad).
+    
+    Se construye una vez por tamaño; cada benchmark deja el pool como lo encontró.
+    """
+    if size not in _pools:
+        clock = VirtualClock(START)
+        pool = FacilityPool((f"Stand_{number:07d}" for number in range(size)), "stand", clock=clock)
+        for number in range(size // 2):
+            pool.occupy(f"Stand_{number:07d}", f"AC{number:07d}", START - 60 * (number % 240))
+        pool.drain_changes()
+        clock.advance(3600)
+        _pools[size] = pool
+    return _pools[size]
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"n={size}")
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def pool(size):
+    return build_pool(size)
+
+
+def test_register_arrival(benchmark, size):
+    """Registrar un log de `size` llegadas."""
+    clock = VirtualClock(START)
+    rows = [(f"AC{number:07d}", f"UA{number % 9000 + 100}", "JFK") for number in range(size)]
+    
+    def register_log():
+        return [register_arrival(aircraft_id, flight_number, origin, clock)
+                for aircraft_id, flight_number, origin in rows]
+    
+    arrivals = benchmark.pedantic(register_log, rounds=rounds_for(size), warmup_rounds=1)
+    assert len(arrivals) == size
+
+
+def test_assign_to(benchmark, pool):
+    """Asignar la única instalación libre que queda en el pool."""
+    free = pool.available()
+    for facility_name in free[1:]:
+        pool.occupy(facility_name, "BENCH")
+    aircraft = {"aircraft_id": "BENCH"}
+    
+    def setup():
+        release_facility(pool, free[0])
+    
+    try:
+        result = benchmark.pedantic(assign_to, (pool, aircraft, "stand"), setup=setup, rounds=200)
+        assert result == (True, free[0])
+    finally:
+        for facility_name in free:
+            release_facility(pool, facility_name)
+        pool.drain_changes()
+
+
+def test_check_available(benchmark, pool):
+    """Listar las instalaciones libres (la mitad del pool)."""
+    available = benchmark.pedantic(check_available, (pool,), rounds=rounds_for(len(pool)), warmup_rounds=1)
+    assert len(available) == len(pool) - len(pool) // 2
+
+
+def test_check_time_used(benchmark, pool):
+    """Minutos de uso de una instalación ocupada."""
+    facility_name = pool.occupied()[0]
+    assert benchmark(check_time_used, pool, facility_name) is not None
+
+
+def test_release_facility(benchmark, pool):
+    """Liberar una instalación ocupada."""
+    facility_name = pool.available()[0]
+    
+    def setup():
+        pool.occupy(facility_name, "BENCH")
+    
+    try:
+        result = benchmark.pedantic(release_facility, (pool, facility_name), setup=setup, rounds=200)
+        assert result is True
+    finally:
+        pool.drain_changes()
+
+
+def test_update_display(benchmark, size):
+    """Refrescar la GUI (instalaciones y ventana del historial) tras asignar y liberar el 1% de cada tipo."""
+    clock = VirtualClock(START)
+    names = [f"Stand_{number:07d}" for number in range(size)]
+    manager = AirportTrafficManager(runways=names, terminals=names, clock=clock)
+    
+    # La GUI sin ventana: solo el manager y las vistas sobre árboles simulados
+    gui = AirportGUI.__new__(AirportGUI)
+    gui.manager = manager
+    gui.runway_view = FacilityTreeView(StubTree(), manager.airstrips, "Ocupada")
+    gui.terminal_view = FacilityTreeView(StubTree(), manager.terminals, "Ocupado")
+    for number in range(min(size, 1000)):
+        manager.add_arrival(register_arrival(f"AC{number:07d}", "BN100", "JFK", clock))
+    gui.history = ArrivalHistory(manager)
+    gui.history_view = VirtualTreeView(StubTree(), gui.history, arrival_row_values, HISTORY_ROWS)
+    gui.update_display()
+    
+    changed = names[:max(1, size // 100)]
+    occupied = [False]
+    
+    def change():
+        for pool in manager.pools.values():
+            for facility_name in changed:
+                if occupied[0]:
+                    pool.release(facility_name)
+                else:
+                    pool.occupy(facility_name, "BENCH")
+        occupied[0] = not occupied[0]
+    
+    benchmark.pedantic(gui.update_display, setup=change, rounds=rounds_for(len(changed), 20_000))
@@ -0,0 +1,68 @@
+"""
+Benchmark del pool indexado de instalaciones.
+
+Mide la latencia por operación de asignar + liberar con todas las
+instalaciones ocupadas salvo la última (el peor caso para el recorrido
+lineal del diccionario original), comparando el diccionario plano con
+FacilityPool para distintos tamaños.
+
+Para ejecutar:
+    python benchmarks/bench_facility_pool.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import FacilityPool, assign_to, release_facility
+
+
+SIZES = (7, 100, 1_000, 10_000)
+OPERATIONS = 20_000
+
+
+def build_plain(size):
+    """Construye el diccionario original con todo ocupado menos la última."""
+    facilities = {
+        f"Stand_{i:05d}": {"status": "available", "aircraft": None, "start_time": None}
+        for i in range(size)
+    }
+    aircraft = {"aircraft_id": "BENCH"}
+    for _ in range(size - 1):
+        assign_to(facilities, aircraft, "stand")
+    return facilities
+
+
+def build_pool(size):
+    """Construye un FacilityPool con todo ocupado menos la última."""
+    pool = FacilityPool(f"Stand_{i:05d}" for i in range(size))
+    aircraft = {"aircraft_id": "BENCH"}
+    for _ in range(size - 1):
+        assign_to(pool, aircraft, "stand")
+    return pool
+
+
+def time_cycle(facilities, operations):
+    """Devuelve los microsegundos por ciclo asignar + liberar."""
+    aircraft = {"aircraft_id": "BENCH"}
+    start = time.perf_counter()
+    for _ in range(operations):
+        _, facility_name = assign_to(facilities, aircraft, "stand")
+        release_facility(facilities, facility_name)
+    return (time.perf_counter() - start) / operations * 1e6
+
+
+def main():
+    print(f"{'instalaciones':>14} {'dict (us/op)':>14} {'pool (us/op)':>14}")
+    for size in SIZES:
+        # El recorrido lineal es lento: menos iteraciones para tamaños grandes
+        plain_ops = OPERATIONS if size <= 100 else max(200, OPERATIONS * 100 // size)
+        plain = time_cycle(build_plain(size), plain_ops)
+        pooled = time_cycle(build_pool(size), OPERATIONS)
+        print(f"{size:>14} {plain:>14.2f} {pooled:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark del tiempo hasta la primera pintura del historial de llegadas.
+
+Con 1.000.000 de llegadas en el manager compara llenar el árbol completo
+(una fila por llegada, como un Treeview ansioso) con VirtualTreeView,
+que materializa solo la ventana visible. Mide también desplazarse a
+posiciones al azar y buscar por prefijo con el índice de ArrivalHistory
+frente a recorrer el log. Usa un árbol simulado en memoria, así que los
+tiempos del árbol ansioso son una cota inferior: un ttk.Treeview real
+agrega decenas de microsegundos por fila insertada.
+
+Para ejecutar:
+    python benchmarks/bench_history.py [llegadas]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrivals_bulk
+from airport_manager import HISTORY_ROWS, ArrivalHistory, VirtualTreeView, arrival_row_values
+
+
+ORIGINS = ["JFK", "LAX", "MIA", "ATL", "ORD", "EZE", "GRU", "MAD", "CDG", "LHR"]
+SCROLLS = 1_000
+SEARCHES = 100
+
+
+class StubTree:
+    """Treeview simulado: solo guarda los valores."""
+    
+    def __init__(self):
+        self._rows = {}
+    
+    def insert(self, parent, index, text, values):
+        item = f"I{len(self._rows)}"
+        self._rows[item] = (text, values)
+        return item
+    
+    def item(self, item, text, values):
+        self._rows[item] = (text, values)
+    
+    def delete(self, item):
+        del self._rows[item]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    randomizer = random.Random(2025)
+    manager = AirportTrafficManager(runways=[], terminals=[], clock=VirtualClock(1_750_000_000.0))
+    
+    # El historial se indexa a medida que llegan las aeronaves, como en la GUI
+    history = ArrivalHistory(manager)
+    started = time.perf_counter()
+    manager.add_arrivals(result.value for result in register_arrivals_bulk(
+        (f"AC{number:07d}", f"FL{randomizer.randrange(5_000):04d}", randomizer.choice(ORIGINS))
+        for number in range(count)))
+    print(f"Registro de {count:,} llegadas con el índice al día: {time.perf_counter() - started:.1f}s")
+    
+    started = time.perf_counter()
+    tree = StubTree()
+    for arrival_data in manager.arrivals_log:
+        text, values = arrival_row_values(arrival_data)
+        tree.insert("", "end", text=text, values=values)
+    eager = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    view = VirtualTreeView(StubTree(), history, arrival_row_values, HISTORY_ROWS)
+    view.render()
+    virtual = time.perf_counter() - started
+    print("Primera pintura:")
+    print(f"  árbol completo ({count:,} filas):  {eager * 1e3:10.1f} ms")
+    print(f"  virtualizado ({HISTORY_ROWS} filas):       {virtual * 1e3:10.3f} ms ({eager / virtual:,.0f}x)")
+    
+    positions = [randomizer.random() for _ in range(SCROLLS)]
+    started = time.perf_counter()
+    for position in positions:
+        view.yview("moveto", position)
+    print(f"Desplazamiento a una posición al azar: {(time.perf_counter() - started) / SCROLLS * 1e6:.0f} µs")
+    
+    prefixes = [f"FL{randomizer.randrange(500):03d}" for _ in range(SEARCHES)]
+    started = time.perf_counter()
+    matches = sum(len(history.search(prefix)) for prefix in prefixes)
+    indexed = (time.perf_counter() - started) / SEARCHES
+    started = time.perf_counter()
+    for prefix in prefixes[:10]:
+        [arrival_data for arrival_data in manager.arrivals_log
+         if any(arrival_data[field].startswith(prefix) for field in ArrivalHistory.FIELDS)]
+    scan = (time.perf_counter() - started) / 10
+    print(f"Búsqueda por prefijo (~{matches // SEARCHES:,} coincidencias):")
+    print(f"  índice:          {indexed * 1e3:8.2f} ms")
+    print(f"  recorrer el log: {scan * 1e3:8.2f} ms ({scan / indexed:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark del tiempo de arranque sin interfaz.
+
+Importa en un intérprete nuevo el núcleo (airport_core), el módulo
+principal (airport_manager, que ya no carga tkinter al importarse) y,
+como referencia del arranque anterior, el núcleo más tkinter, ttk y
+messagebox. Para cada caso informa el tiempo acumulado que reporta
+`python -X importtime` y el tiempo total del proceso, el mejor de varias
+corridas.
+
+Para ejecutar:
+    python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+CASES = {
+    "airport_core": "import airport_core",
+    "airport_manager": "import airport_manager",
+    "núcleo + tkinter (antes)": "import tkinter, tkinter.ttk, tkinter.messagebox; import airport_core",
+    "intérprete vacío": "pass",
+}
+
+
+def measure(statement):
+    """
+    Importa en un proceso nuevo.
+    
+    Returns:
+        Tuple[float, float, bool]: (ms acumulados según -X importtime, ms del proceso, si cargó tkinter)
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; import sys; print('tkinter' in sys.modules)"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - started
+    
+    # Cada línea de nivel superior es "import time: propio | acumulado | módulo"
+    cumulative = 0
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and not fields[2].startswith("  ") and fields[1].strip().isdigit():
+            cumulative += int(fields[1])
+    return cumulative / 1000, elapsed * 1000, completed.stdout.strip() == "True"
+
+
+def main():
+    print(f"{'caso':>26} {'importtime (ms)':>16} {'proceso (ms)':>13} {'tkinter':>8}")
+    for name, statement in CASES.items():
+        results = [measure(statement) for _ in range(RUNS)]
+        imports = min(result[0] for result in results)
+        process = min(result[1] for result in results)
+        loaded = "sí" if results[0][2] else "no"
+        print(f"{name:>26} {imports:16.1f} {process:13.1f} {loaded:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark de la ingesta en streaming.
+
+Genera un feed CSV y otro JSON-lines de N llegadas (por defecto 200.000)
+en un directorio temporal y mide filas por segundo, con y sin prefetch
+en un hilo aparte.
+
+Para ejecutar:
+    python benchmarks/bench_ingest.py [cantidad]
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_ingest import ingest_file
+from airport_core import AirportTrafficManager
+
+
+DEFAULT_COUNT = 200_000
+
+
+def write_feeds(directory, count):
+    """Escribe los dos feeds y devuelve sus rutas."""
+    csv_path = os.path.join(directory, "vuelos.csv")
+    jsonl_path = os.path.join(directory, "vuelos.jsonl")
+    
+    with open(csv_path, "w", encoding="utf-8") as csv_file, \
+            open(jsonl_path, "w", encoding="utf-8") as jsonl_file:
+        csv_file.write("aircraft_id,flight_number,origin\n")
+        for i in range(count):
+            row = (f"CC-{i % 5000:04d}", f"UA{i % 2000}", f"A{i % 300:02d}")
+            csv_file.write(",".join(row) + "\n")
+            jsonl_file.write(json.dumps(dict(zip(("aircraft_id", "flight_number", "origin"), row))) + "\n")
+    
+    return csv_path, jsonl_path
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    print(f"Llegadas: {count:,}")
+    print(f"{'formato':>8} {'prefetch':>9} {'filas/s':>12}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_feeds(directory, count):
+            for prefetch_size in (0, 1024):
+                stats = ingest_file(AirportTrafficManager(), path, prefetch_size=prefetch_size,
+                                    assign="terminal")
+                data_format = os.path.splitext(path)[1][1:]
+                print(f"{data_format:>8} {prefetch_size:>9} {stats.rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
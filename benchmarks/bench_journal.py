@@ -0,0 +1,83 @@
+"""
+Benchmark del journal con durabilidad activada.
+
+1. Operaciones por segundo sostenidas (registrar + asignar + liberar) con
+   fsync por grupos de distinto tamaño.
+2. Tiempo de recuperación de un journal de N eventos sin snapshot.
+
+Para ejecutar:
+    python benchmarks/bench_journal.py [eventos_recuperacion]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_journal import JOURNAL_FILE, Journal, open_manager
+from airport_core import AirportTrafficManager, register_arrival, release_facility
+
+
+BATCH_SIZES = (1, 16, 256)
+DURATION = 2.0
+DEFAULT_RECOVERY_EVENTS = 1_000_000
+
+
+def sustained_ops(batch_size):
+    """Devuelve operaciones por segundo durante DURATION segundos."""
+    with tempfile.TemporaryDirectory() as directory:
+        manager, journal = open_manager(directory, batch_size=batch_size, snapshot_every=None)
+        operations = 0
+        deadline = time.perf_counter() + DURATION
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            manager.add_arrival(register_arrival(f"CC-{operations % 5000}", "UA100", "JFK"))
+            _, facility_name = manager.assign_arrival(manager.next_waiting(), "runway")
+            release_facility(manager.airstrips, facility_name)
+            operations += 3
+        journal.close()
+        return operations / (time.perf_counter() - start), journal.commits
+
+
+def write_journal(path, events):
+    """Escribe un journal sintético de `events` registros."""
+    runways = ("Runway_01", "Runway_02", "Runway_03")
+    with open(path, "w", encoding="utf-8") as journal_file:
+        ts = 1_750_000_000.0
+        for seq in range(1, events + 1):
+            cycle, step = divmod(seq - 1, 3)
+            aircraft_id = f"CC-{cycle}"
+            runway = runways[cycle % 3]
+            if step == 0:
+                record = {"op": "arrival", "aircraft_id": aircraft_id, "flight_number": f"UA{cycle % 2000}",
+                          "origin": "JFK", "arrival_ts": ts}
+            elif step == 1:
+                record = {"op": "assign", "type": "runway", "facility": runway, "aircraft_id": aircraft_id, "ts": ts}
+            else:
+                record = {"op": "release", "type": "runway", "facility": runway, "ts": ts}
+            ts += 1.0
+            journal_file.write(json.dumps({"seq": seq, **record}, separators=(",", ":")) + "\n")
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECOVERY_EVENTS
+    
+    print("Operaciones sostenidas con fsync:")
+    for batch_size in BATCH_SIZES:
+        ops, commits = sustained_ops(batch_size)
+        print(f"  batch_size={batch_size:>4}: {ops:>10,.0f} ops/s ({commits:,} fsync)")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        write_journal(os.path.join(directory, JOURNAL_FILE), events)
+        manager = AirportTrafficManager()
+        start = time.perf_counter()
+        replayed = Journal(directory, max_delay=0).recover(manager)
+        elapsed = time.perf_counter() - start
+        print(f"Recuperación de {replayed:,} eventos: {elapsed:.2f} s ({replayed / elapsed:,.0f} eventos/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark del costo de la instrumentación en el camino caliente.
+
+Repite ciclos de asignar y liberar (assign_next() + release()) sobre un
+manager sin instrumentar y sobre uno con ManagerMetrics, alternando
+varias rondas para repartir el ruido, e informa el sobrecosto. También
+mide el costo de registrar un valor en el histograma y de exportar.
+
+Para ejecutar:
+    python benchmarks/bench_metrics.py [ciclos]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, register_arrivals_bulk
+from airport_metrics import Histogram, ManagerMetrics
+
+
+FACILITIES = 200
+ROUNDS = 11
+
+
+def make_manager(cycles, instrumented, sample_every=16):
+    manager = AirportTrafficManager([f"Runway_{number:03d}" for number in range(FACILITIES)], [])
+    manager.add_arrivals(result.value for result in register_arrivals_bulk(
+        (f"AC{number:07d}", "UA100", "JFK") for number in range(cycles)))
+    metrics = ManagerMetrics(manager, sample_every=sample_every) if instrumented else None
+    return manager, metrics
+
+
+def run(manager, cycles):
+    """Segundos de `cycles` ciclos de asignar y liberar."""
+    assign_next = manager.assign_next
+    release = manager.airstrips.release
+    start = time.perf_counter()
+    for _ in range(cycles):
+        _, runway = assign_next("runway")
+        release(runway)
+    return time.perf_counter() - start
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    results = {"sin métricas": [], "con métricas": [], "con métricas, sin muestreo": []}
+    settings = {"sin métricas": (False, 16), "con métricas": (True, 16), "con métricas, sin muestreo": (True, 1)}
+    
+    for _ in range(ROUNDS):
+        for name, (instrumented, sample_every) in settings.items():
+            manager, metrics = make_manager(cycles, instrumented, sample_every)
+            results[name].append(run(manager, cycles))
+    
+    baseline = min(results["sin métricas"])
+    print(f"Ciclos asignar + liberar: {cycles:,} ({ROUNDS} rondas, mejor tiempo)")
+    for name, times in results.items():
+        best = min(times)
+        print(f"{name:>28}: {best / cycles * 1e6:6.2f} µs/ciclo  sobrecosto {(best / baseline - 1) * 100:+5.1f}%")
+    
+    histogram = Histogram("bench_seconds", "")
+    start = time.perf_counter()
+    for number in range(1_000_000):
+        histogram.record(number * 1e-9)
+    print(f"Histogram.record(): {(time.perf_counter() - start) * 1e3 / 1_000:.3f} µs")
+    
+    manager, metrics = make_manager(cycles, True)
+    run(manager, cycles)
+    start = time.perf_counter()
+    text = metrics.registry.render()
+    print(f"Exportación Prometheus: {(time.perf_counter() - start) * 1e3:.2f} ms, "
+          f"{len(text.splitlines())} líneas ({FACILITIES} pistas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark del predictor de liberaciones.
+
+Con pools de distintos tamaños, todos ocupados, mide lo que agrega el
+predictor a cada ciclo liberar -> asignar (actualizar las estadísticas
+en O(1) y programar la nueva predicción en el heap) y el costo de
+next_to_free() y predict_release_time(). Como referencia, busca la
+próxima liberación recorriendo todas las ocupadas. Informa también
+cuántas estadísticas quedan guardadas, acotadas por max_keys, después
+de 110.000 ocupaciones de vuelos casi siempre distintos.
+
+Para ejecutar:
+    python benchmarks/bench_prediction.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrival
+from airport_prediction import TurnaroundPredictor
+
+
+SIZES = (100, 10_000, 100_000)
+CYCLES = 10_000
+QUERIES = 10_000
+ORIGINS = ["JFK", "LAX", "MIA", "ATL", "ORD", "EZE", "GRU", "MAD", "CDG", "LHR"]
+
+
+def cycle_cost(size, with_predictor):
+    """Microsegundos por ciclo liberar -> registrar -> asignar con el pool lleno."""
+    randomizer = random.Random(2025)
+    clock = VirtualClock(1_750_000_000.0)
+    manager = AirportTrafficManager(runways=[], terminals=[f"Gate_{number:06d}" for number in range(size)],
+                                    clock=clock)
+    predictor = TurnaroundPredictor(manager, max_keys=10_000) if with_predictor else None
+    pool = manager.terminals
+    
+    def occupy(number):
+        manager.add_arrival(register_arrival(f"AC{number:07d}", f"FL{randomizer.randrange(200_000):06d}",
+                                             randomizer.choice(ORIGINS), clock))
+        manager.assign_next("terminal")
+    
+    for number in range(size):
+        occupy(number)
+    names = list(pool.occupied())
+    
+    started = time.perf_counter()
+    for number in range(CYCLES):
+        clock.advance(randomizer.uniform(1, 5))
+        # Todas siguen ocupadas: la liberada se reasigna enseguida
+        pool.release(names[randomizer.randrange(size)])
+        occupy(size + number)
+    elapsed = (time.perf_counter() - started) / CYCLES
+    return elapsed * 1e6, manager, predictor
+
+
+def main():
+    print(f"{'ocupadas':>10} {'ciclo sin':>12} {'ciclo con':>12} {'next_to_free':>14} "
+          f"{'predict_release':>16} {'recorrido':>12}")
+    for size in SIZES:
+        # El mejor de tres, alternando, porque el costo por ciclo es chico y ruidoso
+        without = with_predictor = float("inf")
+        for _ in range(3):
+            without = min(without, cycle_cost(size, False)[0])
+            elapsed, manager, predictor = cycle_cost(size, True)
+            with_predictor = min(with_predictor, elapsed)
+        
+        started = time.perf_counter()
+        for _ in range(QUERIES):
+            predictor.next_to_free("terminal")
+        next_cost = (time.perf_counter() - started) / QUERIES * 1e6
+        
+        names = list(manager.terminals)
+        started = time.perf_counter()
+        for number in range(QUERIES):
+            predictor.predict_release_time(names[number % len(names)], "terminal")
+        predict_cost = (time.perf_counter() - started) / QUERIES * 1e6
+        
+        # Referencia: la mínima liberación estimada recorriendo todas las ocupadas
+        started = time.perf_counter()
+        for _ in range(10):
+            min(predictor.occupations.values(), key=lambda occupation: occupation.predicted_release)
+        scan_cost = (time.perf_counter() - started) / 10 * 1e6
+        
+        print(f"{size:>10,} {without:>10.1f}µs {with_predictor:>10.1f}µs {next_cost:>12.2f}µs "
+              f"{predict_cost:>14.2f}µs {scan_cost:>10.0f}µs")
+    
+    kept = {dimension: len(table) for dimension, table in predictor.stats.items()}
+    print(f"Estadísticas guardadas con max_keys=10.000: {kept}")
+
+
+if __name__ == "__main__":
+    main()
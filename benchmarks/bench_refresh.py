@@ -0,0 +1,91 @@
+"""
+Microbenchmark del refresco periódico: costo por cada 1.000 instalaciones.
+
+Compara el cálculo de minutos de uso original (check_time_used() por
+instalación: una búsqueda y una lectura del reloj cada una) con
+FacilityPool.occupancy_minutes() (una lectura del reloj y una pasada), y
+el refresco completo de FacilityTreeView.refresh_times() sobre un árbol
+simulado. También compara formatear horas de llegada con strftime y con
+format_timestamp(), memorizado por minuto.
+
+Para ejecutar:
+    python benchmarks/bench_refresh.py
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_manager import TIME_FORMAT, FacilityPool, FacilityTreeView, check_time_used, format_timestamp
+
+
+FACILITIES = 1_000
+ROUNDS = 200
+ARRIVALS = 10_000
+
+
+class StubTree:
+    """Treeview simulado: solo guarda los valores."""
+    
+    def __init__(self):
+        self._rows = {}
+    
+    def insert(self, parent, index, text, values):
+        item = f"I{len(self._rows)}"
+        self._rows[item] = values
+        return item
+    
+    def item(self, item, values):
+        self._rows[item] = values
+
+
+def per_round(function, rounds=ROUNDS):
+    """Microsegundos por llamada, el mejor de tres intentos."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            function()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best * 1e6
+
+
+def main():
+    now = time.time()
+    pool = FacilityPool([f"Gate_{number:04d}" for number in range(FACILITIES)], "terminal")
+    randomizer = random.Random(2025)
+    for facility_name in pool:
+        pool.occupy(facility_name, "BENCH", now - randomizer.uniform(0, 4 * 3600))
+    names = pool.occupied()
+    
+    legacy = per_round(lambda: {name: check_time_used(pool, name) for name in names})
+    single_pass = per_round(lambda: pool.occupancy_minutes(names))
+    print(f"Minutos de uso de {FACILITIES:,} instalaciones ocupadas:")
+    print(f"  check_time_used() por instalación: {legacy:8.0f} µs")
+    print(f"  occupancy_minutes(), una pasada:   {single_pass:8.0f} µs ({legacy / single_pass:.1f}x)")
+    
+    view = FacilityTreeView(StubTree(), pool, "Ocupado")
+    view.refresh()
+    
+    def refresh_times():
+        # Simula el paso de un minuto para que todas las filas cambien
+        for facility in pool.values():
+            facility.start_ts -= 60
+        view.refresh_times()
+    
+    print(f"  refresh_times() con todas las filas cambiadas: {per_round(refresh_times, 50):8.0f} µs")
+    
+    timestamps = sorted(now - randomizer.uniform(0, 3600) for _ in range(ARRIVALS))
+    strftime = per_round(lambda: [datetime.fromtimestamp(ts).strftime(TIME_FORMAT) for ts in timestamps], 5)
+    cached = per_round(lambda: [format_timestamp(ts) for ts in timestamps], 5)
+    print(f"Formatear {ARRIVALS:,} horas de llegada de la última hora:")
+    print(f"  strftime:           {strftime / 1000:8.2f} ms")
+    print(f"  format_timestamp(): {cached / 1000:8.2f} ms ({strftime / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark del calendario de reservas con 100.000 reservas.
+
+Reparte 100.000 reservas de 30 a 90 minutos entre 200 puertas a lo
+largo de un mes (las que chocan se reintentan en el primer hueco) y
+mide: altas por segundo, consultas de conflicto y de primer hueco por
+segundo, y el costo de convertir reservas al registrar las llegadas.
+
+Para ejecutar:
+    python benchmarks/bench_reservations.py [reservas]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrival
+from airport_reservations import ReservationCalendar, ReservationConflict
+
+
+START = 1_750_000_000.0
+GATES = 200
+DAYS = 30
+QUERIES = 20_000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    randomizer = random.Random(2025)
+    clock = VirtualClock(START)
+    gates = [f"Gate_{number:03d}" for number in range(GATES)]
+    manager = AirportTrafficManager(runways=[], terminals=gates, clock=clock)
+    calendar = ReservationCalendar(manager, "terminal")
+    
+    requests = [(randomizer.choice(gates), f"FL{number:06d}", START + randomizer.uniform(0, DAYS * 86400),
+                 randomizer.uniform(30, 90) * 60) for number in range(count)]
+    
+    conflicts = 0
+    relocation_time = 0.0
+    started = time.perf_counter()
+    for gate, flight_number, start_ts, duration in requests:
+        try:
+            calendar.reserve(gate, flight_number, start_ts, start_ts + duration)
+        except ReservationConflict:
+            conflicts += 1
+            relocated = time.perf_counter()
+            calendar.reserve_earliest(flight_number, duration, start_ts)
+            relocation_time += time.perf_counter() - relocated
+    elapsed = time.perf_counter() - started
+    booking_time = elapsed - relocation_time
+    print(f"Reservas: {len(calendar):,} en {GATES} puertas ({conflicts:,} reubicadas por conflicto)")
+    print(f"Altas: {elapsed:.2f}s en total; directas {booking_time / (count - conflicts) * 1e6:.1f} µs, "
+          f"reubicadas en el primer hueco {relocation_time / max(conflicts, 1) * 1e6:.0f} µs")
+    
+    probes = [(randomizer.choice(gates), START + randomizer.uniform(0, DAYS * 86400)) for _ in range(QUERIES)]
+    started = time.perf_counter()
+    for gate, start_ts in probes:
+        calendar.conflicts(gate, start_ts, start_ts + 3600)
+    elapsed = time.perf_counter() - started
+    print(f"Conflictos: {QUERIES / elapsed:,.0f} consultas/s ({elapsed / QUERIES * 1e6:.1f} µs)")
+    
+    started = time.perf_counter()
+    for _, start_ts in probes[:QUERIES // 10]:
+        calendar.earliest_free(2 * 3600, start_ts)
+    elapsed = time.perf_counter() - started
+    print(f"Primer hueco de 2 h en {GATES} puertas: {elapsed / (QUERIES // 10) * 1e6:.0f} µs por búsqueda")
+    
+    # Conversión: llegadas de los vuelos reservados en la primera hora
+    first_hour = sorted((reservation for reservation in (calendar.find(flight_number)
+                                                         for _, flight_number, _, _ in requests)
+                         if reservation.start_ts < START + 3600), key=lambda reservation: reservation.start_ts)
+    started = time.perf_counter()
+    converted = 0
+    for reservation in first_hour:
+        clock.set(max(clock.time(), reservation.start_ts))
+        arrival_data = register_arrival(f"AC{converted:06d}", reservation.flight_number, "JFK", clock)
+        manager.add_arrival(arrival_data)
+        converted += arrival_data.status.value == "assigned_terminal"
+    elapsed = time.perf_counter() - started
+    print(f"Conversión al registrar: {converted}/{len(first_hour)} llegadas asignadas "
+          f"({elapsed / max(len(first_hour), 1) * 1e6:.1f} µs por llegada)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de latencia del servidor asyncio bajo carga.
+
+Arranca airport_server.py en otro proceso y le envía peticiones a ritmo
+constante (por defecto 10.000 por segundo durante 5 segundos) desde un
+cliente con pipelining, sin esperar respuestas para enviar las
+siguientes (carga en lazo abierto). Informa latencias p50 y p99.
+
+Para ejecutar:
+    python benchmarks/bench_server.py [peticiones/s] [segundos]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from airport_server import AirportClient
+
+
+DEFAULT_RATE = 10_000
+DEFAULT_SECONDS = 5
+TICK = 0.001
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def load(port, rate, seconds):
+    client = await AirportClient.connect("127.0.0.1", port)
+    latencies = []
+    
+    def request(number):
+        sent = time.perf_counter()
+        if number % 4 == 0:
+            future = client.send("register", aircraft_id=f"ID{number}", flight_number="UA1", origin="JFK")
+        elif number % 4 == 1:
+            future = client.send("find", aircraft_id=f"ID{number - 1}")
+        else:
+            future = client.send("available", facility_type="terminal")
+        future.add_done_callback(lambda _: latencies.append(time.perf_counter() - sent))
+        return future
+    
+    futures = []
+    start = time.perf_counter()
+    total = int(rate * seconds)
+    sent = 0
+    while sent < total:
+        # Enviar todo lo que corresponde hasta ahora según el ritmo pedido
+        due = min(total, int((time.perf_counter() - start) * rate))
+        while sent < due:
+            futures.append(request(sent))
+            sent += 1
+        await asyncio.sleep(TICK)
+    
+    await asyncio.gather(*futures)
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return total / elapsed, sorted(latencies)
+
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RATE
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SECONDS
+    
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "airport_server.py"), "--port", "0"],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        achieved, latencies = asyncio.run(load(port, rate, seconds))
+    finally:
+        server.terminate()
+        server.wait()
+    
+    print(f"Ritmo pedido: {rate:,}/s  logrado: {achieved:,.0f}/s  peticiones: {len(latencies):,}")
+    print(f"p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
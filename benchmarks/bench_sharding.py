@@ -0,0 +1,75 @@
+"""
+Benchmark del motor particionado con 50 aeropuertos.
+
+Envía lotes de comandos (registrar, asignar terminal y liberarla) a
+aeropuertos elegidos al azar y mide comandos por segundo en el proceso
+actual y con 1, 2, 4, ... procesos de trabajo hasta la cantidad de núcleos.
+La escala depende de los núcleos disponibles: con un solo núcleo los
+procesos solo agregan el costo de IPC.
+
+Para ejecutar:
+    python benchmarks/bench_sharding.py [comandos]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_sharding import ShardedEngine
+
+
+AIRPORT_COUNT = 50
+DEFAULT_COMMANDS = 300_000
+BATCH_SIZE = 3_000
+
+
+def network():
+    """50 aeropuertos con 4 pistas y 12 terminales cada uno."""
+    return {
+        f"A{number:02d}": {"runways": [f"Runway_{i:02d}" for i in range(4)],
+                           "terminals": [f"Terminal_{i:02d}" for i in range(12)]}
+        for number in range(AIRPORT_COUNT)
+    }
+
+
+def batches(airports, commands):
+    """Lotes de ciclos registrar/asignar/liberar sobre aeropuertos al azar."""
+    randomizer = random.Random(7)
+    cycles = []
+    for number in range(commands // 3):
+        airport = randomizer.choice(airports)
+        cycles.append((airport, "register", {"aircraft_id": f"CC{number}", "flight_number": "UA1", "origin": "JFK"}))
+        cycles.append((airport, "assign", {"facility_type": "terminal"}))
+        cycles.append((airport, "release", {"facility_type": "terminal", "facility": "Terminal_00"}))
+    return [cycles[start:start + BATCH_SIZE] for start in range(0, len(cycles), BATCH_SIZE)]
+
+
+def run(workers, airports, work):
+    with ShardedEngine(airports, workers) as engine:
+        start = time.perf_counter()
+        for batch in work:
+            engine.execute(batch)
+        engine.available("terminal")
+        return sum(len(batch) for batch in work) / (time.perf_counter() - start)
+
+
+def main():
+    commands = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COMMANDS
+    airports = network()
+    work = batches(list(airports), commands)
+    
+    cores = os.cpu_count() or 1
+    worker_counts = [0] + [count for count in (1, 2, 4, 8, 16, 32) if count <= max(cores, 1)]
+    
+    print(f"Aeropuertos: {AIRPORT_COUNT}  comandos: {commands:,}  núcleos: {cores}")
+    print(f"{'procesos':>9} {'comandos/s':>12}")
+    for workers in worker_counts:
+        label = "local" if workers == 0 else str(workers)
+        print(f"{label:>9} {run(workers, airports, work):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
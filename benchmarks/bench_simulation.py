@@ -0,0 +1,49 @@
+"""
+Benchmark del simulador: una semana de un hub con mucho tráfico.
+
+Simula 7 días de un aeropuerto con 4 pistas y 60 terminales, llegadas
+con un perfil horario (pico de 90 por hora), 3 minutos de pista y 40
+minutos de terminal en promedio. Informa eventos simulados por segundo
+de reloj y las métricas de capacidad.
+
+Para ejecutar:
+    python benchmarks/bench_simulation.py [días]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, VirtualClock
+from airport_simulation import Simulation, exponential, hourly_poisson
+
+
+# Llegadas por hora a lo largo del día
+HOURLY_PROFILE = [10, 5, 5, 5, 10, 30, 70, 90, 90, 80, 70, 60,
+                  60, 60, 70, 80, 90, 90, 80, 70, 50, 40, 30, 20]
+
+
+def main():
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 7
+    manager = AirportTrafficManager([f"Runway_{i:02d}" for i in range(4)],
+                                    [f"Terminal_{i:02d}" for i in range(60)],
+                                    clock=VirtualClock(1_750_000_000.0))
+    simulation = Simulation(manager, seed=2025)
+    simulation.add_arrivals(hourly_poisson(HOURLY_PROFILE), exponential(3), exponential(40))
+    
+    start = time.perf_counter()
+    report = simulation.run(days * 24 * 3600)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Días simulados: {days:g}  llegadas: {report.arrivals:,}  completadas: {report.completed:,}")
+    print(f"Eventos: {report.events:,} en {elapsed:.2f}s ({report.events / elapsed:,.0f} eventos/s)")
+    for facility_type in ("runway", "terminal"):
+        print(f"{facility_type:>9}: utilización {report.utilization[facility_type]:.1%}  "
+              f"cola media {report.mean_queue[facility_type]:.2f}  máx {report.max_queue[facility_type]}  "
+              f"espera media {report.mean_wait[facility_type] / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de arranque con configuraciones grandes.
+
+Compara leer una configuración JSON y construir todos los managers contra
+abrir el snapshot binario con mmap, buscar una instalación y cargar un
+solo aeropuerto.
+
+Para ejecutar:
+    python benchmarks/bench_snapshot_startup.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager
+from airport_snapshot import SnapshotFile, convert_config, load_config
+
+
+AIRPORTS = 100
+SIZES = (1_000, 10_000, 100_000, 400_000)
+
+
+def write_config(path, total_facilities):
+    """Escribe una configuración con AIRPORTS aeropuertos."""
+    per_airport = total_facilities // AIRPORTS
+    airports = {
+        f"A{code:03d}": {
+            "runways": [f"Runway_{i:05d}" for i in range(per_airport // 10)],
+            "terminals": [f"Gate_{i:05d}" for i in range(per_airport - per_airport // 10)]
+        }
+        for code in range(AIRPORTS)
+    }
+    with open(path, "w", encoding="utf-8") as config_file:
+        json.dump({"airports": airports}, config_file)
+
+
+def main():
+    print(f"{'instalaciones':>14} {'JSON (ms)':>12} {'mmap abrir (ms)':>16} {'buscar (ms)':>12} {'1 aeropuerto (ms)':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            config_path = os.path.join(directory, f"config_{size}.json")
+            snapshot_path = os.path.join(directory, f"config_{size}.snap")
+            write_config(config_path, size)
+            convert_config(config_path, snapshot_path)
+            
+            start = time.perf_counter()
+            config = load_config(config_path)
+            managers = {code: AirportTrafficManager(airport["runways"], airport["terminals"])
+                        for code, airport in config["airports"].items()}
+            json_ms = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            snapshot = SnapshotFile(snapshot_path)
+            open_ms = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            snapshot.find("A050", "Gate_00007")
+            find_ms = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            snapshot.load_manager("A050")
+            load_ms = (time.perf_counter() - start) * 1000
+            snapshot.close()
+            del managers
+            
+            print(f"{size:>14,} {json_ms:>12.1f} {open_ms:>16.3f} {find_ms:>12.3f} {load_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
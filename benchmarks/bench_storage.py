@@ -0,0 +1,92 @@
+"""
+Benchmark del almacenamiento SQLite con 10 millones de llegadas.
+
+Guarda N llegadas (por defecto 10.000.000) con SQLiteStore.record(), en
+transacciones de `batch_size` registros, y mide filas por segundo y el
+tamaño de la base. Después mide consultas indexadas por segundo: por
+aeronave, por vuelo, por origen en una ventana de una hora y por rango
+de una hora; y, como referencia, el recorrido lineal de una lista en
+memoria con la misma consulta por origen.
+
+Para ejecutar:
+    python benchmarks/bench_storage.py [llegadas] [batch_size]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import Arrival, ArrivalRegistered
+from airport_storage import SQLiteStore
+
+
+START = 1_750_000_000.0
+ORIGINS = ["JFK", "LAX", "MIA", "ATL", "ORD", "DFW", "DEN", "SEA", "BOS", "SFO",
+           "EZE", "GRU", "MAD", "CDG", "LHR", "FRA", "NRT", "SYD", "MEX", "BOG"]
+QUERIES = 2_000
+SCAN_LIMIT = 1_000_000
+
+
+def arrivals(count):
+    """Una llegada cada 3 segundos, con origen y vuelo pseudoaleatorios."""
+    randomizer = random.Random(2025)
+    for number in range(count):
+        yield Arrival(f"AC{number:08d}", f"FL{randomizer.randrange(20_000):05d}",
+                      ORIGINS[randomizer.randrange(len(ORIGINS))], START + number * 3)
+
+
+def per_second(label, function, probes):
+    started = time.perf_counter()
+    rows = sum(len(function(*probe)) for probe in probes)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {len(probes) / elapsed:10,.0f} consultas/s "
+          f"({elapsed / len(probes) * 1e3:.3f} ms, {rows / len(probes):.1f} filas)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    span = count * 3
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "airport.db")
+        store = SQLiteStore(path, batch_size=batch_size, max_delay=0)
+        
+        started = time.perf_counter()
+        for arrival in arrivals(count):
+            store.record(ArrivalRegistered(arrival))
+        store.commit()
+        elapsed = time.perf_counter() - started
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"Inserción de {count:,} llegadas (lotes de {batch_size:,}): {elapsed:.1f}s, "
+              f"{count / elapsed:,.0f} filas/s, {store.commits:,} transacciones, base de {size / 2**20:,.0f} MiB")
+        
+        randomizer = random.Random(7)
+        windows = [START + randomizer.uniform(0, span - 3600) for _ in range(QUERIES)]
+        print("Consultas indexadas:")
+        per_second("por aeronave", store.arrivals_for_aircraft,
+                   [(f"AC{randomizer.randrange(count):08d}",) for _ in range(QUERIES)])
+        per_second("por vuelo", store.arrivals_for_flight,
+                   [(f"FL{randomizer.randrange(20_000):05d}",) for _ in range(QUERIES)])
+        per_second("por origen en una hora", store.arrivals_from,
+                   [(randomizer.choice(ORIGINS), start_ts, start_ts + 3600) for start_ts in windows])
+        per_second("por rango de una hora", store.arrivals_between,
+                   [(start_ts, start_ts + 3600) for start_ts in windows])
+        store.close()
+    
+    # Referencia: la misma consulta por origen recorriendo una lista en memoria
+    log = list(arrivals(min(count, SCAN_LIMIT)))
+    probes = [(randomizer.choice(ORIGINS), start_ts, start_ts + 3600) for start_ts in windows[:20]]
+    started = time.perf_counter()
+    for origin, start_ts, end_ts in probes:
+        [arrival for arrival in log if arrival.origin == origin and start_ts <= arrival.arrival_ts < end_ts]
+    elapsed = (time.perf_counter() - started) / len(probes)
+    print(f"Recorrido lineal de {len(log):,} llegadas en memoria: {elapsed * 1e3:.1f} ms por consulta")
+
+
+if __name__ == "__main__":
+    main()
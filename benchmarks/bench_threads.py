@@ -0,0 +1,67 @@
+"""
+Benchmark del modo thread-safe con 1 a 16 hilos.
+
+Cada hilo registra llegadas y alterna asignar/liberar sobre pistas y
+terminales (la mitad de los hilos en cada tipo), con un total fijo de
+operaciones. Como referencia se mide también el manager sin locks en un
+solo hilo.
+
+Con el GIL de CPython el throughput no escala con los hilos: lo que se
+mide es que el costo de los locks y la contención se mantengan acotados.
+
+Para ejecutar:
+    python benchmarks/bench_threads.py [operaciones]
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_core import AirportTrafficManager, register_arrival
+
+
+DEFAULT_OPERATIONS = 200_000
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def worker(manager, facility_type, rounds, prefix):
+    pool = manager.pools[facility_type]
+    for round_number in range(rounds):
+        manager.add_arrival(register_arrival(f"{prefix}{round_number}", "UA1", "JFK"))
+        success, facility_name = manager.assign_next(facility_type)
+        if success:
+            pool.release(facility_name)
+
+
+def run(thread_count, operations, thread_safe=True):
+    manager = AirportTrafficManager([f"Runway_{i:02d}" for i in range(8)],
+                                    [f"Terminal_{i:02d}" for i in range(8)], thread_safe)
+    rounds = operations // thread_count
+    threads = [
+        threading.Thread(target=worker, args=(manager, ("runway", "terminal")[number % 2], rounds, f"T{number}-"))
+        for number in range(thread_count)
+    ]
+    
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return rounds * thread_count / (time.perf_counter() - start)
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OPERATIONS
+    print(f"Ciclos registrar/asignar/liberar: {operations:,}")
+    print(f"{'hilos':>6} {'ciclos/s':>12}")
+    print(f"{'1*':>6} {run(1, operations, thread_safe=False):>12,.0f}")
+    for thread_count in THREAD_COUNTS:
+        print(f"{thread_count:>6} {run(thread_count, operations):>12,.0f}")
+    print("* sin locks (thread_safe=False)")
+
+
+if __name__ == "__main__":
+    main()
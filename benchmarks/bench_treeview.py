@@ -0,0 +1,111 @@
+"""
+Benchmark de actualización del Treeview con 2.000 instalaciones.
+
+Compara la reconstrucción completa original (borrar y reinsertar todas las
+filas) con FacilityTreeView, que solo toca las filas que cambiaron. Usa un
+Treeview real si hay pantalla disponible; si no, un árbol simulado en
+memoria que cuenta las llamadas.
+
+Para ejecutar:
+    python benchmarks/bench_treeview.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport_manager import FacilityPool, FacilityTreeView, check_time_used
+
+
+FACILITIES = 2_000
+CHANGES = (1, 10, 100, 1_000)
+ROUNDS = 20
+
+
+class StubTree:
+    """Treeview simulado para entornos sin pantalla."""
+    
+    def __init__(self):
+        self._rows = {}
+        self._next = 0
+    
+    def get_children(self):
+        return list(self._rows)
+    
+    def delete(self, item):
+        del self._rows[item]
+    
+    def insert(self, parent, index, text, values):
+        self._next += 1
+        item = f"I{self._next}"
+        self._rows[item] = (text, values)
+        return item
+    
+    def item(self, item, values):
+        self._rows[item] = (self._rows[item][0], values)
+
+
+def make_tree():
+    """Devuelve un Treeview real si es posible, o el simulado."""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+        return ttk.Treeview(root, columns=("Status", "Aircraft", "Time")), "tk"
+    except Exception:
+        return StubTree(), "simulado"
+
+
+def full_rebuild(tree, pool):
+    """Réplica del update_display original."""
+    for item in tree.get_children():
+        tree.delete(item)
+    for name, info in pool.items():
+        status = "Disponible" if info["status"] == "available" else "Ocupado"
+        tree.insert("", "end", text=name,
+                    values=(status, info["aircraft"] or "-", check_time_used(pool, name) or 0))
+
+
+def toggle(pool, count):
+    """Cambia el estado de las primeras `count` instalaciones."""
+    for name in list(pool)[:count]:
+        if pool.is_available(name):
+            pool.assign("BENCH")
+        else:
+            pool.release(name)
+
+
+def main():
+    tree, kind = make_tree()
+    print(f"Instalaciones: {FACILITIES:,} (Treeview {kind})")
+    print(f"{'cambios':>8} {'rebuild (ms)':>14} {'incremental (ms)':>18}")
+    
+    for count in CHANGES:
+        pool = FacilityPool(f"Gate_{i:04d}" for i in range(FACILITIES))
+        view = FacilityTreeView(tree, pool, "Ocupado")
+        for item in tree.get_children():
+            tree.delete(item)
+        view.refresh()
+        
+        rebuild = incremental = 0.0
+        for _ in range(ROUNDS):
+            toggle(pool, count)
+            start = time.perf_counter()
+            view.refresh()
+            incremental += time.perf_counter() - start
+        
+        rebuild_tree = StubTree() if kind == "simulado" else tree
+        for _ in range(ROUNDS):
+            toggle(pool, count)
+            start = time.perf_counter()
+            full_rebuild(rebuild_tree, pool)
+            rebuild += time.perf_counter() - start
+        
+        print(f"{count:>8} {rebuild / ROUNDS * 1000:>14.2f} {incremental / ROUNDS * 1000:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
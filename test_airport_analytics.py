@@ -0,0 +1,112 @@
+"""
+Test Suite para la analítica columnar del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_analytics.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import airport_analytics
+from airport_analytics import ArrivalColumns
+from airport_core import AirportTrafficManager, Arrival, ArrivalStatus, register_arrival
+
+
+BASE_TS = 1_750_000_000.0 - (1_750_000_000.0 % 3600)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Ejecuta cada prueba con NumPy (si está instalado) y en Python puro"""
+    if request.param == "numpy":
+        if airport_analytics.np is None:
+            pytest.skip("NumPy no está instalado")
+    else:
+        monkeypatch.setattr(airport_analytics, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def columns():
+    """Fixture con cinco llegadas, cuatro de ellas asignadas"""
+    columns = ArrivalColumns()
+    columns.append(Arrival("ABC123", "UA100", "JFK", BASE_TS, ArrivalStatus.ASSIGNED_RUNWAY, BASE_TS + 60))
+    columns.append(Arrival("DEF456", "AA200", "MIA", BASE_TS + 600, ArrivalStatus.ASSIGNED_RUNWAY, BASE_TS + 720))
+    columns.append(Arrival("GHI789", "DL300", "JFK", BASE_TS + 3700, ArrivalStatus.ASSIGNED_TERMINAL, BASE_TS + 3880))
+    columns.append(Arrival("ABC123", "UA101", "ATL", BASE_TS + 7300, ArrivalStatus.ASSIGNED_TERMINAL, BASE_TS + 7540))
+    columns.append(Arrival("JKL012", "UA100", "JFK", BASE_TS + 7400))
+    return columns
+
+
+class TestArrivalColumns:
+    """Tests para ArrivalColumns"""
+    
+    def test_dictionary_encoding(self, columns):
+        """Prueba que los identificadores repetidos comparten código"""
+        assert len(columns) == 5
+        assert columns.origins.values == ["JFK", "MIA", "ATL"]
+        assert list(columns.origin) == [0, 1, 0, 2, 0]
+        assert len(columns.aircraft_ids) == 4
+    
+    def test_row_roundtrip(self, columns):
+        """Prueba que una fila reconstruye el registro original"""
+        row = columns.row(4)
+        
+        assert row["aircraft_id"] == "JKL012"
+        assert row.status is ArrivalStatus.WAITING
+        assert row.assigned_ts is None
+        assert columns.row(0).assigned_ts == BASE_TS + 60
+    
+    def test_counts_by_origin(self, columns, backend):
+        """Prueba el conteo por origen"""
+        assert columns.counts_by_origin() == {"JFK": 3, "MIA": 1, "ATL": 1}
+    
+    def test_counts_by_status(self, columns, backend):
+        """Prueba el conteo por estado"""
+        assert columns.counts_by_status() == {
+            ArrivalStatus.WAITING: 1,
+            ArrivalStatus.ASSIGNED_RUNWAY: 2,
+            ArrivalStatus.ASSIGNED_TERMINAL: 2
+        }
+    
+    def test_hourly_histogram(self, columns, backend):
+        """Prueba el histograma por hora"""
+        assert columns.histogram() == [(BASE_TS, 2), (BASE_TS + 3600, 1), (BASE_TS + 7200, 2)]
+        
+        with pytest.raises(ValueError):
+            columns.histogram(0)
+    
+    def test_wait_percentiles(self, columns, backend):
+        """Prueba los percentiles de espera de las llegadas asignadas"""
+        percentiles = columns.wait_percentiles((0, 50, 100))
+        
+        # Esperas: 60, 120, 180 y 240 segundos
+        assert percentiles == {0: 60.0, 50: 150.0, 100: 240.0}
+    
+    def test_empty_store(self, backend):
+        """Prueba las consultas sin llegadas"""
+        columns = ArrivalColumns()
+        
+        assert columns.counts_by_origin() == {}
+        assert columns.histogram() == []
+        assert columns.wait_percentiles() == {}
+    
+    def test_from_manager_history(self):
+        """Prueba la construcción desde el historial del manager"""
+        manager = AirportTrafficManager()
+        manager.add_arrival(register_arrival("ABC123", "UA100", "JFK"))
+        manager.add_arrival(register_arrival("DEF456", "AA200", "MIA"))
+        manager.assign_arrival(manager.next_waiting(), "runway")
+        
+        columns = ArrivalColumns.from_records(manager.arrivals_log)
+        
+        assert columns.counts_by_origin() == {"JFK": 1, "MIA": 1}
+        assert len(columns.wait_percentiles((50,))) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
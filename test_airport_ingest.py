@@ -0,0 +1,226 @@
+"""
+Test Suite para la ingesta en streaming del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_ingest.py -v
+"""
+
+import io
+import itertools
+import pytest
+import sys
+import os
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_ingest import IngestStats, ingest, ingest_file, main, parse_csv, parse_jsonl, prefetch
+from airport_core import AirportTrafficManager
+from airport_reservations import ReservationCalendar
+
+
+CSV_FEED = """aircraft_id,flight_number,origin
+abc123,ua100,jfk
+,aa200,mia
+def456,dl300,atl
+ghi789,lh400
+"""
+
+JSONL_FEED = """{"aircraft_id": "ABC123", "flight_number": "UA100", "origin": "JFK"}
+
+esto no es json
+["DEF456", "AA200", "MIA"]
+{"aircraft_id": 7, "flight_number": "DL300", "origin": "ATL"}
+"""
+
+
+class TestParsers:
+    """Tests para parse_csv y parse_jsonl"""
+    
+    def test_parse_csv(self):
+        """Prueba el parseo CSV con números de línea"""
+        rows = list(parse_csv(CSV_FEED.splitlines()))
+        
+        assert rows[0] == (2, ("abc123", "ua100", "jfk"))
+        assert rows[2] == (4, ("def456", "dl300", "atl"))
+        assert rows[3] == (5, ())
+    
+    def test_parse_csv_column_order(self):
+        """Prueba que las columnas se toman por nombre"""
+        rows = list(parse_csv(["origin,aircraft_id,flight_number", "JFK,ABC123,UA100"]))
+        assert rows == [(2, ("ABC123", "UA100", "JFK"))]
+    
+    def test_parse_csv_missing_columns(self):
+        """Prueba que un encabezado incompleto se rechaza"""
+        with pytest.raises(ValueError, match="origin"):
+            list(parse_csv(["aircraft_id,flight_number", "ABC123,UA100"]))
+    
+    def test_parse_jsonl(self):
+        """Prueba que las líneas vacías se saltan y el JSON inválido se marca"""
+        rows = list(parse_jsonl(JSONL_FEED.splitlines()))
+        
+        assert [line for line, _ in rows] == [1, 3, 4, 5]
+        assert rows[1] == (3, None)
+    
+    def test_parsers_are_lazy(self):
+        """Prueba que el parser no lee más líneas de las que se le piden"""
+        consumed = []
+        
+        def lines():
+            for number in range(1000):
+                consumed.append(number)
+                yield f'["ID{number}", "UA{number}", "JFK"]'
+        
+        rows = parse_jsonl(lines())
+        next(rows)
+        assert len(consumed) == 1
+
+
+class TestIngest:
+    """Tests para la ingesta en el manager"""
+    
+    def test_ingest_csv(self, tmp_path):
+        """Prueba la ingesta de un archivo CSV con filas inválidas"""
+        path = tmp_path / "vuelos.csv"
+        path.write_text(CSV_FEED, encoding="utf-8")
+        manager = AirportTrafficManager()
+        
+        stats = ingest_file(manager, str(path))
+        
+        assert (stats.read, stats.registered, stats.rejected) == (4, 2, 2)
+        assert [line for line, _ in stats.errors] == [3, 5]
+        assert manager.find_arrival("DEF456")["origin"] == "ATL"
+        assert manager.next_waiting()["aircraft_id"] == "ABC123"
+    
+    def test_ingest_jsonl(self, tmp_path):
+        """Prueba la ingesta de JSON-lines con objetos y listas"""
+        path = tmp_path / "vuelos.jsonl"
+        path.write_text(JSONL_FEED, encoding="utf-8")
+        manager = AirportTrafficManager()
+        
+        stats = ingest_file(manager, str(path))
+        
+        assert (stats.read, stats.registered, stats.rejected) == (4, 2, 2)
+        assert dict(stats.errors) == {3: "JSON inválido", 5: "Formato de fila inválido"}
+    
+    def test_auto_assign_in_order(self):
+        """Prueba la asignación automática hasta agotar las instalaciones"""
+        manager = AirportTrafficManager(["Runway_01", "Runway_02"], [])
+        rows = [(number, (f"ID{number}", "UA1", "JFK")) for number in range(5)]
+        
+        stats = ingest(manager, rows, assign="runway", batch_size=2)
+        
+        assert stats.assigned == 2
+        assert manager.airstrips["Runway_01"]["aircraft"] == "ID0"
+        assert manager.airstrips["Runway_02"]["aircraft"] == "ID1"
+        assert manager.next_waiting()["aircraft_id"] == "ID2"
+    
+    def test_auto_assign_counts_only_successes(self):
+        """Prueba que las asignaciones rechazadas no se cuentan aunque queden instalaciones libres"""
+        manager = AirportTrafficManager(["Runway_01", "Runway_02"], [])
+        # Runway_02 queda libre pero retenida para una reserva
+        calendar = ReservationCalendar(manager, "runway")
+        now = manager.clock.time()
+        calendar.reserve("Runway_02", "ZZ999", now, now + 3600)
+        rows = [(number, (f"ID{number}", "UA1", "JFK")) for number in range(3)]
+        
+        stats = ingest(manager, rows, assign="runway", batch_size=2)
+        
+        assert stats.assigned == 1
+        assert manager.airstrips.available_count() == 1
+        assert manager.next_waiting()["aircraft_id"] == "ID1"
+    
+    def test_bounded_batches(self):
+        """Prueba que nunca se lee más de un lote por delante del manager"""
+        manager = AirportTrafficManager()
+        read = []
+        
+        def rows():
+            for number in range(100):
+                read.append(number)
+                yield number, (f"ID{number}", "UA1", "JFK")
+        
+        def progress(stats):
+            assert len(read) - len(manager.arrivals_log) == 0
+            assert stats.read <= 100
+        
+        stats = ingest(manager, rows(), batch_size=10, progress=progress)
+        assert stats.registered == 100
+    
+    def test_stdin_stays_open(self, monkeypatch):
+        """Prueba que ingerir "-" no cierra la entrada estándar"""
+        stdin = io.TextIOWrapper(io.BytesIO(CSV_FEED.encode("utf-8")))
+        monkeypatch.setattr(sys, "stdin", stdin)
+        
+        stats = ingest_file(AirportTrafficManager(), "-", data_format="csv", prefetch_size=8)
+        
+        assert stats.registered == 2
+        assert not stdin.buffer.closed
+    
+    def test_invalid_batch_size(self):
+        """Prueba que el tamaño de lote debe ser positivo"""
+        with pytest.raises(ValueError):
+            ingest(AirportTrafficManager(), [], batch_size=0)
+    
+    def test_stats_rate(self):
+        """Prueba el contador de throughput"""
+        stats = IngestStats(max_errors=2)
+        stats.read = 10
+        for line in range(5):
+            stats.reject(line, "error")
+        
+        assert stats.rate > 0
+        assert stats.rejected == 5
+        assert len(stats.errors) == 2
+
+
+class TestPrefetch:
+    """Tests para la lectura en un hilo aparte"""
+    
+    def test_preserves_order(self):
+        """Prueba que prefetch entrega los elementos en orden"""
+        assert list(prefetch(range(1000), maxsize=8)) == list(range(1000))
+    
+    def test_propagates_errors(self):
+        """Prueba que un error de la fuente llega al consumidor"""
+        def failing():
+            yield 1
+            raise ValueError("feed cortado")
+        
+        with pytest.raises(ValueError, match="feed cortado"):
+            list(prefetch(failing()))
+    
+    
+    def test_reader_stops_with_consumer(self):
+        """Prueba que el hilo lector termina si el consumidor deja de iterar"""
+        running = set(threading.enumerate())
+        rows = prefetch(itertools.count(), maxsize=8, chunk_size=2)
+        assert next(rows) == 0
+        reader = next(thread for thread in threading.enumerate()
+                      if thread not in running and thread.name == "ingest-prefetch")
+        
+        rows.close()
+        reader.join(timeout=5)
+        
+        assert not reader.is_alive()
+
+
+class TestCommandLine:
+    """Tests para el punto de entrada sin interfaz"""
+    
+    def test_main(self, tmp_path, capsys):
+        """Prueba la CLI con asignación automática"""
+        path = tmp_path / "vuelos.csv"
+        path.write_text(CSV_FEED, encoding="utf-8")
+        
+        assert main([str(path), "--assign", "terminal"]) == 0
+        
+        out, err = capsys.readouterr()
+        assert "2 registradas" in out
+        assert "2 asignadas" in out
+        assert "Línea 3" in err
+    
+    def test_unknown_format(self, tmp_path, capsys):
+        """Prueba que una extensión desconocida es un error"""
+        assert main([str(tmp_path / "vuelos.txt")]) == 1
+        assert "Error" in capsys.readouterr().err
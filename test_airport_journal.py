@@ -0,0 +1,167 @@
+"""
+Test Suite para el journal y la recuperación del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_journal.py -v
+"""
+
+import pytest
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import airport_journal
+from airport_journal import Journal, dump_state, open_manager
+from airport_core import AirportTrafficManager, ArrivalRegistered, register_arrival, release_facility
+
+
+def run_shift(manager):
+    """Registra tres llegadas, asigna dos y libera una"""
+    for aircraft_id, flight_number, origin in (("ABC123", "UA100", "JFK"),
+                                               ("DEF456", "AA200", "MIA"),
+                                               ("GHI789", "DL300", "ATL")):
+        manager.add_arrival(register_arrival(aircraft_id, flight_number, origin))
+    
+    manager.assign_arrival(manager.next_waiting(), "runway")
+    manager.assign_arrival(manager.next_waiting(), "terminal")
+    release_facility(manager.airstrips, "Runway_01")
+
+
+def recovered(directory):
+    """Recupera un manager nuevo desde el directorio"""
+    manager = AirportTrafficManager()
+    replayed = Journal(directory, max_delay=0, fsync=False).recover(manager)
+    return manager, replayed
+
+
+class TestJournal:
+    """Tests para Journal"""
+    
+    def test_recover_replays_journal(self, tmp_path):
+        """Prueba que el estado se reconstruye solo con el journal"""
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        run_shift(manager)
+        journal.close()
+        
+        restored, replayed = recovered(str(tmp_path))
+        
+        assert replayed == 6
+        assert dump_state(restored) == dump_state(manager)
+        assert restored.next_waiting()["aircraft_id"] == "GHI789"
+        assert restored.find_arrival("DEF456").assigned_ts == manager.find_arrival("DEF456").assigned_ts
+    
+    def test_snapshot_and_tail(self, tmp_path):
+        """Prueba que tras un snapshot solo se reaplica la cola del journal"""
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=4)
+        run_shift(manager)
+        journal.close()
+        
+        assert os.path.exists(journal.snapshot_path)
+        restored, replayed = recovered(str(tmp_path))
+        
+        assert replayed == 2
+        assert dump_state(restored) == dump_state(manager)
+    
+    def test_continues_after_recovery(self, tmp_path):
+        """Prueba que un journal recuperado sigue la numeración"""
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        run_shift(manager)
+        journal.close()
+        
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        assert journal.seq == 6
+        manager.assign_arrival(manager.next_waiting(), "runway")
+        journal.close()
+        
+        restored, _ = recovered(str(tmp_path))
+        assert restored.airstrips["Runway_01"]["aircraft"] == "GHI789"
+    
+    def test_truncated_record_is_discarded(self, tmp_path):
+        """Prueba la recuperación con el último registro cortado por un fallo"""
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        run_shift(manager)
+        journal.close()
+        
+        with open(journal.journal_path, "ab") as journal_file:
+            journal_file.write(b'{"seq":7,"op":"arr')
+        
+        restored, replayed = recovered(str(tmp_path))
+        
+        assert replayed == 6
+        with open(journal.journal_path, "rb") as journal_file:
+            assert journal_file.read().endswith(b"}\n")
+    
+    def test_record_without_newline_is_discarded(self, tmp_path):
+        """Prueba que un último registro completo pero sin salto de línea se trunca"""
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        run_shift(manager)
+        journal.close()
+        
+        with open(journal.journal_path, "rb+") as journal_file:
+            journal_file.truncate(os.path.getsize(journal.journal_path) - 1)
+        
+        manager, journal = open_manager(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=None)
+        assert journal.seq == 5
+        manager.add_arrival(register_arrival("JKL012", "B6400", "BOS"))
+        journal.close()
+        
+        restored, replayed = recovered(str(tmp_path))
+        
+        assert replayed == 6
+        assert dump_state(restored) == dump_state(manager)
+        assert restored.find_arrival("JKL012") is not None
+    
+    def test_group_commit(self, tmp_path):
+        """Prueba que el fsync se hace por grupos de registros"""
+        manager, journal = open_manager(str(tmp_path), batch_size=4, max_delay=0, snapshot_every=None)
+        run_shift(manager)
+        
+        assert journal.commits == 1
+        journal.close()
+        assert journal.commits == 2
+    
+    def test_snapshot_with_concurrent_arrival(self, tmp_path, monkeypatch):
+        """Prueba que una llegada de otro hilo durante un snapshot no se reaplica dos veces"""
+        manager = AirportTrafficManager(thread_safe=True)
+        in_snapshot, added = threading.Event(), threading.Event()
+        
+        def on_arrival(event):
+            if event.arrival.aircraft_id == "JKL012":
+                added.set()
+        
+        def slow_dump_state(state_manager):
+            # Da tiempo a que el otro hilo registre su llegada a mitad del snapshot
+            in_snapshot.set()
+            added.wait(0.5)
+            return dump_state(state_manager)
+        
+        manager.events.subscribe(on_arrival, ArrivalRegistered)
+        monkeypatch.setattr(airport_journal, "dump_state", slow_dump_state)
+        journal = Journal(str(tmp_path), batch_size=1, max_delay=0, snapshot_every=4, fsync=False)
+        journal.attach(manager)
+        
+        def late_arrival():
+            in_snapshot.wait()
+            manager.add_arrival(register_arrival("JKL012", "B6400", "BOS"))
+        
+        thread = threading.Thread(target=late_arrival)
+        thread.start()
+        run_shift(manager)
+        thread.join()
+        journal.close()
+        
+        restored, _ = recovered(str(tmp_path))
+        
+        assert len(restored.arrivals_log) == 4
+        assert dump_state(restored) == dump_state(manager)
+    
+    def test_invalid_batch_size(self, tmp_path):
+        """Prueba la validación de batch_size"""
+        with pytest.raises(ValueError):
+            Journal(str(tmp_path), batch_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
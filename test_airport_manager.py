@@ -14,12 +14,39 @@ import pytest
 from datetime import datetime, timedelta
 import sys
 import os
+import subprocess
+import threading
+import time
+import heapq
 
 # Agregar el directorio padre al path para importar el módulo principal
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from airport_manager import (
+    AirportTrafficManager,
+    Arrival,
+    ArrivalRegistered,
+    ArrivalStatus,
+    BatchError,
+    EventBatcher,
+    EventBus,
+    FacilityAssigned,
+    FacilityReleased,
+    Facility,
+    FacilityPool,
+    FacilityStatus,
+    FacilityTreeView,
+    ArrivalHistory,
+    CommandPipeline,
+    RefreshScheduler,
+    FacilitySource,
+    VirtualTreeView,
+    arrival_row_values,
+    VirtualClock,
+    format_timestamp,
     register_arrival,
+    register_arrivals_bulk,
+    assign_batch,
     assign_to,
     check_time_used,
     check_available,
@@ -290,6 +317,779 @@ class TestReleaseFacility:
         assert result is False
 
 
+class TestRecords:
+    """Tests para los registros compactos Arrival y Facility"""
+    
+    def test_arrival_stores_epoch_and_enum(self):
+        """Prueba que la llegada guarda epoch numérico y estado enum"""
+        arrival = register_arrival("ABC123", "UA100", "JFK")
+        
+        assert isinstance(arrival, Arrival)
+        assert isinstance(arrival.arrival_ts, float)
+        assert arrival.status is ArrivalStatus.WAITING
+        assert not hasattr(arrival, "__dict__")
+    
+    def test_arrival_dict_compatibility(self):
+        """Prueba el acceso tipo diccionario de la llegada"""
+        arrival = Arrival("ABC123", "UA100", "JFK", datetime(2025, 6, 15, 10, 30).timestamp())
+        
+        assert arrival["arrival_time"] == "2025-06-15 10:30:00"
+        assert arrival.to_dict() == {
+            "aircraft_id": "ABC123",
+            "flight_number": "UA100",
+            "origin": "JFK",
+            "arrival_time": "2025-06-15 10:30:00",
+            "status": "waiting_assignment"
+        }
+        
+        arrival["status"] = "assigned_runway"
+        assert arrival.status is ArrivalStatus.ASSIGNED_RUNWAY
+        
+        with pytest.raises(ValueError):
+            arrival["status"] = "unknown"
+        with pytest.raises(KeyError):
+            arrival["gate"]
+    
+    def test_facility_dict_compatibility(self):
+        """Prueba el acceso tipo diccionario de la instalación"""
+        facility = Facility()
+        
+        assert facility == {"status": "available", "aircraft": None, "start_time": None}
+        
+        start = datetime(2025, 6, 15, 10, 30)
+        facility["status"] = "occupied"
+        facility["start_time"] = start
+        
+        assert facility.status is FacilityStatus.OCCUPIED
+        assert facility.start_ts == start.timestamp()
+        assert facility["start_time"] == start
+    
+    def test_format_timestamp_matches_strftime(self):
+        """Prueba que el formateo memorizado por minuto coincide con strftime"""
+        base = datetime(2025, 6, 15, 10, 30).timestamp()
+        for offset in (0, 0.9, 59, 60, 3599.5, 86400 * 200 + 17):
+            expected = datetime.fromtimestamp(base + offset).strftime("%Y-%m-%d %H:%M:%S")
+            assert format_timestamp(base + offset) == expected
+
+
+class TestFacilityPool:
+    """Tests para el pool indexado de instalaciones"""
+    
+    @pytest.fixture
+    def pool(self):
+        """Fixture con un pool de tres pistas"""
+        return FacilityPool(["Runway_01", "Runway_02", "Runway_03"])
+    
+    @pytest.fixture
+    def sample_aircraft(self):
+        """Fixture con datos de aeronave de prueba"""
+        return register_arrival("ABC123", "UA100", "JFK")
+    
+    def test_pool_behaves_like_facility_dict(self, pool):
+        """Prueba que el pool expone la misma estructura que el diccionario"""
+        assert list(pool) == ["Runway_01", "Runway_02", "Runway_03"]
+        assert pool["Runway_01"] == {"status": "available", "aircraft": None, "start_time": None}
+        assert "Runway_99" not in pool
+    
+    def test_assign_in_insertion_order(self, pool, sample_aircraft):
+        """Prueba que se asigna la primera instalación libre en orden de alta"""
+        assert assign_to(pool, sample_aircraft, "runway") == (True, "Runway_01")
+        assert assign_to(pool, sample_aircraft, "runway") == (True, "Runway_02")
+        
+        release_facility(pool, "Runway_01")
+        
+        assert assign_to(pool, sample_aircraft, "runway") == (True, "Runway_01")
+        assert pool["Runway_01"]["aircraft"] == "ABC123"
+        assert check_time_used(pool, "Runway_01") == 0
+    
+    def test_availability_index_stays_in_sync(self, pool, sample_aircraft):
+        """Prueba que el índice de libres se mantiene sincronizado"""
+        assign_to(pool, sample_aircraft, "runway")
+        
+        assert pool.available_count() == 2
+        assert check_available(pool) == ["Runway_02", "Runway_03"]
+        assert pool.is_available("Runway_01") is False
+        assert pool.first_available() == "Runway_02"
+        
+        # Liberar dos veces no debe duplicar la instalación en el índice
+        assert release_facility(pool, "Runway_01") is True
+        assert release_facility(pool, "Runway_01") is True
+        assert pool.available_count() == 3
+    
+    def test_no_available_facilities(self, sample_aircraft):
+        """Prueba el mensaje cuando el pool está completo"""
+        pool = FacilityPool(["Terminal_A"])
+        assign_to(pool, sample_aircraft, "terminal")
+        
+        success, message = assign_to(pool, sample_aircraft, "terminal")
+        
+        assert success is False
+        assert "No hay terminals disponibles" in message
+    
+    def test_duplicate_and_unknown_facilities(self, pool):
+        """Prueba altas duplicadas y liberación de instalaciones inexistentes"""
+        with pytest.raises(ValueError):
+            pool.add("Runway_01")
+        
+        assert release_facility(pool, "Runway_99") is False
+    
+    def test_occupy_specific_facility(self, pool, sample_aircraft):
+        """Prueba ocupar una instalación concreta sin romper el orden de asignación"""
+        assert pool.occupy("Runway_01", "XYZ789", 1_750_000_000.0) is True
+        assert pool.occupy("Runway_01", "XYZ789") is False
+        assert pool.occupy("Runway_99", "XYZ789") is False
+        
+        assert pool["Runway_01"].start_ts == 1_750_000_000.0
+        assert pool.available_count() == 2
+        assert pool.first_available() == "Runway_02"
+        assert assign_to(pool, sample_aircraft, "runway") == (True, "Runway_02")
+        
+        release_facility(pool, "Runway_01")
+        assert check_available(pool) == ["Runway_01", "Runway_03"]
+        assert assign_to(pool, sample_aircraft, "runway") == (True, "Runway_01")
+    
+    def test_manager_uses_pools(self):
+        """Prueba que el manager usa pools indexados"""
+        manager = AirportTrafficManager()
+        
+        assert isinstance(manager.airstrips, FacilityPool)
+        assert isinstance(manager.terminals, FacilityPool)
+        assert len(check_available(manager.airstrips)) == 3
+        assert len(check_available(manager.terminals)) == 4
+
+
+class FakeTree:
+    """Treeview mínimo en memoria para probar la GUI sin pantalla"""
+    
+    def __init__(self):
+        self.rows = {}
+        self.calls = 0
+    
+    def insert(self, parent, index, text, values):
+        self.calls += 1
+        item = f"I{len(self.rows):03d}"
+        self.rows[item] = {"text": text, "values": values}
+        return item
+    
+    def item(self, item, values, text=None):
+        self.calls += 1
+        self.rows[item]["values"] = values
+        if text is not None:
+            self.rows[item]["text"] = text
+    
+    def delete(self, item):
+        self.calls += 1
+        del self.rows[item]
+    
+    def texts(self):
+        return [row["text"] for row in self.rows.values()]
+    
+    def values_of(self, facility_name):
+        for row in self.rows.values():
+            if row["text"] == facility_name:
+                return row["values"]
+
+
+class TestFacilityTreeView:
+    """Tests para la actualización incremental del Treeview"""
+    
+    @pytest.fixture
+    def view(self):
+        """Fixture con una vista sobre un pool de tres pistas"""
+        pool = FacilityPool(["Runway_01", "Runway_02", "Runway_03"])
+        return FacilityTreeView(FakeTree(), pool, "Ocupada")
+    
+    def test_first_refresh_inserts_all_rows(self, view):
+        """Prueba que la primera actualización inserta todas las filas"""
+        assert view.refresh() == 3
+        assert view.tree.values_of("Runway_02") == ("Disponible", "-", 0)
+    
+    def test_refresh_only_touches_changed_rows(self, view):
+        """Prueba que solo se actualizan las filas modificadas"""
+        view.refresh()
+        view.tree.calls = 0
+        
+        assign_to(view.pool, register_arrival("ABC123", "UA100", "JFK"), "runway")
+        
+        assert view.refresh() == 1
+        assert view.tree.calls == 1
+        assert view.tree.values_of("Runway_01") == ("Ocupada", "ABC123", 0)
+        assert view.refresh() == 0
+    
+    def test_refresh_times_skips_unchanged_values(self, view):
+        """Prueba que los minutos solo se reescriben si cambiaron"""
+        assign_to(view.pool, register_arrival("ABC123", "UA100", "JFK"), "runway")
+        view.refresh()
+        
+        assert view.refresh_times() == 0
+        
+        view.pool["Runway_01"].start_ts -= 120
+        
+        assert view.refresh_times() == 1
+        assert view.tree.values_of("Runway_01") == ("Ocupada", "ABC123", 2)
+    
+    def test_pool_change_tracking(self):
+        """Prueba el registro de cambios y de ocupadas del pool"""
+        pool = FacilityPool(["Terminal_A", "Terminal_B"])
+        assert pool.drain_changes() == ["Terminal_A", "Terminal_B"]
+        
+        assign_to(pool, register_arrival("ABC123", "UA100", "JFK"), "terminal")
+        
+        assert pool.occupied() == ["Terminal_A"]
+        assert pool.drain_changes() == ["Terminal_A"]
+        assert pool.drain_changes() == []
+    
+    def test_occupancy_minutes_reads_clock_once(self):
+        """Prueba que los minutos de todas las ocupadas salen de una sola lectura del reloj"""
+        clock = VirtualClock(1_750_000_000.0)
+        reads = []
+        clock_time = clock.time
+        pool = FacilityPool(["Gate_1", "Gate_2", "Gate_3"], clock=clock)
+        pool.occupy("Gate_1", "ABC123", clock.time() - 150)
+        pool.occupy("Gate_2", "DEF456", clock.time() - 3600)
+        clock.time = lambda: reads.append(1) or clock_time()
+        
+        assert pool.occupancy_minutes() == {"Gate_1": 2, "Gate_2": 60}
+        assert pool.occupancy_minutes(["Gate_2", "Gate_3", "Gate_9"]) == {"Gate_2": 60}
+        assert len(reads) == 2
+
+
+class TestVirtualTreeView:
+    """Tests para el historial indexado y la vista virtualizada"""
+    
+    @pytest.fixture
+    def manager(self):
+        """Fixture con 1.000 llegadas de tres vuelos y dos orígenes"""
+        manager = AirportTrafficManager(clock=VirtualClock(1_750_000_000.0))
+        manager.add_arrivals(result.value for result in register_arrivals_bulk(
+            (f"AC{number:04d}", ("UA100", "UA200", "DL300")[number % 3], ("JFK", "MIA")[number % 2])
+            for number in range(1000)))
+        return manager
+    
+    def test_first_render_materializes_window(self, manager):
+        """Prueba que solo se insertan las filas visibles"""
+        view = VirtualTreeView(FakeTree(), ArrivalHistory(manager), arrival_row_values, height=5)
+        
+        assert view.render() == 5
+        assert view.tree.texts() == ["AC0000", "AC0001", "AC0002", "AC0003", "AC0004"]
+        assert view.fractions() == (0.0, 0.005)
+    
+    def test_scroll_reuses_rows(self, manager):
+        """Prueba que desplazarse reescribe las mismas filas sin insertar"""
+        view = VirtualTreeView(FakeTree(), ArrivalHistory(manager), arrival_row_values, height=5)
+        view.render()
+        
+        view.scroll(10)
+        assert view.tree.texts() == ["AC0010", "AC0011", "AC0012", "AC0013", "AC0014"]
+        view.yview("moveto", "0.5")
+        assert view.first == 500
+        view.yview("scroll", "-1", "pages")
+        assert view.first == 495
+        view.yview("moveto", "1.0")
+        assert view.tree.texts()[-1] == "AC0999"
+        assert len(view.tree.rows) == 5
+    
+    def test_follows_new_arrivals_at_end(self, manager):
+        """Prueba que la ventana al final sigue a las llegadas nuevas"""
+        view = VirtualTreeView(FakeTree(), ArrivalHistory(manager), arrival_row_values, height=5)
+        view.yview("moveto", "1.0")
+        
+        manager.add_arrival(register_arrival("ZZ9999", "AA400", "LAX"))
+        view.refresh()
+        
+        assert view.tree.texts()[-1] == "ZZ9999"
+    
+    def test_search_uses_index(self, manager):
+        """Prueba la búsqueda por prefijo en aeronave, vuelo y origen"""
+        history = ArrivalHistory(manager)
+        
+        assert len(history.search("ua")) == 667
+        assert len(history.search("JFK")) == 500
+        assert len(history.search("AC000")) == 10
+        assert history.search("  ") is history
+        assert history.search("XX").rows(0, 10) == []
+        # Un prefijo que coincide en dos campos no repite llegadas
+        manager.add_arrival(register_arrival("DL0001", "DL300", "ATL"))
+        assert [arrival.aircraft_id for arrival in history.search("DL").rows(330, 340)][-1] == "DL0001"
+        assert len(history.search("DL")) == 334
+    
+    def test_set_source_shrinks_window(self, manager):
+        """Prueba que una fuente más chica borra las filas sobrantes"""
+        history = ArrivalHistory(manager)
+        view = VirtualTreeView(FakeTree(), history, arrival_row_values, height=5)
+        view.render()
+        
+        view.set_source(history.search("AC0999"))
+        
+        assert view.tree.texts() == ["AC0999"]
+    
+    def test_facility_source(self):
+        """Prueba la vista virtualizada de un pool grande"""
+        clock = VirtualClock(1_750_000_000.0)
+        pool = FacilityPool([f"Gate_{number:04d}" for number in range(2000)], clock=clock)
+        pool.occupy("Gate_1500", "ABC123", clock.time() - 600)
+        view = VirtualTreeView(FakeTree(), FacilitySource(pool, "Ocupado"), lambda row: (row[0], row[1:]), height=4)
+        
+        view.yview("moveto", "0.75")
+        
+        assert view.tree.values_of("Gate_1500") == ("Ocupado", "ABC123", 10)
+        assert len(view.tree.rows) == 4
+
+
+class FakeScheduler:
+    """root.after simulado: los timers corren cuando la prueba hace girar el mainloop"""
+    
+    def __init__(self):
+        self.timers = []
+        self._sequence = 0
+    
+    def after(self, ms, callback):
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self._sequence, callback))
+        self._sequence += 1
+    
+    def run_due(self):
+        """Ejecuta los timers vencidos y devuelve cuántos corrieron"""
+        now = time.perf_counter()
+        ran = 0
+        while self.timers and self.timers[0][0] <= now:
+            heapq.heappop(self.timers)[2]()
+            ran += 1
+        return ran
+    
+    def run_until(self, condition, timeout=30.0):
+        """Gira el mainloop hasta que se cumpla la condición"""
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            assert time.perf_counter() < deadline, "el mainloop no terminó a tiempo"
+            if not self.run_due():
+                time.sleep(0.001)
+
+
+class TestCommandPipeline:
+    """Tests para los comandos de la GUI ejecutados en un hilo de trabajo"""
+    
+    @pytest.fixture
+    def scheduler(self):
+        return FakeScheduler()
+    
+    @pytest.fixture
+    def pipeline(self, scheduler):
+        pipeline = CommandPipeline(scheduler.after)
+        yield pipeline
+        pipeline.close()
+    
+    def test_callbacks_run_on_scheduler_thread(self, scheduler, pipeline):
+        """Prueba que el comando corre en el worker y el callback en el hilo de Tk"""
+        results = []
+        
+        pipeline.submit(lambda value: (threading.get_ident(), value * 2), 21,
+                        callback=lambda result: results.append((result, threading.get_ident())))
+        assert len(pipeline) == 1
+        scheduler.run_until(lambda: not len(pipeline))
+        
+        (worker_thread, value), callback_thread = results[0]
+        assert value == 42
+        assert worker_thread != threading.get_ident()
+        assert callback_thread == threading.get_ident()
+        # Sin comandos en curso no queda ningún timer programado
+        assert scheduler.timers == []
+    
+    def test_coalesces_waiting_commands(self, scheduler, pipeline):
+        """Prueba que los comandos con la misma clave que esperan turno se combinan"""
+        gate = threading.Event()
+        calls = []
+        pipeline.submit(gate.wait)
+        
+        for _ in range(5):
+            pipeline.submit(calls.append, 1, key="assign", merge=lambda old, new: (old[0] + new[0],))
+        gate.set()
+        scheduler.run_until(lambda: not len(pipeline))
+        
+        assert calls == [5]
+        assert (pipeline.submitted, pipeline.completed) == (6, 6)
+        assert (pipeline.executed, pipeline.coalesced) == (2, 4)
+    
+    def test_coalescing_keeps_order(self, scheduler, pipeline):
+        """Prueba que no se combinan comandos de igual clave separados por otro"""
+        running, gate = threading.Event(), threading.Event()
+        calls = []
+        # El worker queda ocupado: los siguientes llegan juntos en la ráfaga siguiente
+        pipeline.submit(lambda: (running.set(), gate.wait()))
+        running.wait()
+        
+        pipeline.submit(calls.append, "asignar", key="assign")
+        pipeline.submit(calls.append, "liberar", key="release")
+        pipeline.submit(calls.append, "asignar", key="assign")
+        pipeline.submit(calls.append, "asignar", key="assign")
+        gate.set()
+        scheduler.run_until(lambda: not len(pipeline))
+        
+        assert calls == ["asignar", "liberar", "asignar"]
+        assert (pipeline.executed, pipeline.coalesced) == (4, 1)
+    
+    def test_errors_reach_errback(self, scheduler):
+        """Prueba que las excepciones del worker llegan al errback o a on_error"""
+        errors = []
+        pipeline = CommandPipeline(scheduler.after, on_error=lambda error: errors.append(("on_error", error)))
+        
+        pipeline.submit(register_arrival, "", "UA100", "JFK")
+        pipeline.submit(int, "x", errback=lambda error: errors.append(("errback", error)))
+        scheduler.run_until(lambda: not len(pipeline))
+        pipeline.close()
+        
+        assert [(origin, type(error)) for origin, error in errors] == \
+            [("on_error", ValueError), ("errback", ValueError)]
+    
+    def test_posts_arrive_before_result(self, scheduler, pipeline):
+        """Prueba que lo publicado por un comando se entrega antes que su resultado"""
+        delivered = []
+        
+        def command():
+            pipeline.post(delivered.append, "evento")
+            return "resultado"
+        
+        pipeline.submit(command, callback=delivered.append)
+        scheduler.run_until(lambda: not len(pipeline))
+        
+        assert delivered == ["evento", "resultado"]
+
+
+class ClockScheduler:
+    """root.after y root.after_cancel simulados sobre un VirtualClock"""
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.timers = {}
+        self._next_id = 0
+    
+    def after(self, ms, callback):
+        self._next_id += 1
+        self.timers[self._next_id] = (self.clock.time() + ms / 1000, callback)
+        return self._next_id
+    
+    def after_cancel(self, timer):
+        del self.timers[timer]
+    
+    def advance(self, seconds):
+        """Avanza el reloj ejecutando los timers vencidos en orden"""
+        target = self.clock.time() + seconds
+        while self.timers:
+            timer, (due, callback) = min(self.timers.items(), key=lambda item: item[1][0])
+            if due > target:
+                break
+            del self.timers[timer]
+            self.clock.set(max(due, self.clock.time()))
+            callback()
+        self.clock.set(target)
+
+
+class TestRefreshScheduler:
+    """Tests para el redibujo por cambios y por cambio de minuto"""
+    
+    START = 1_750_000_000.0
+    
+    @pytest.fixture
+    def setup(self):
+        """Fixture con un manager de reloj virtual, su vista de pistas y el scheduler"""
+        clock = VirtualClock(self.START)
+        manager = AirportTrafficManager(clock=clock)
+        timers = ClockScheduler(clock)
+        view = FacilityTreeView(FakeTree(), manager.airstrips, "Ocupada")
+        view.refresh()
+        frames = []
+        
+        def redraw(dirty, rolled):
+            frames.append((clock.time() - self.START, dirty, rolled))
+            if dirty:
+                view.refresh()
+            for facility_names in rolled.values():
+                view.refresh_times(facility_names)
+        
+        refresher = RefreshScheduler(redraw, timers.after, timers.after_cancel, manager.pools, clock)
+        manager.events.subscribe(lambda event: refresher.observe([event]), FacilityAssigned, FacilityReleased)
+        return manager, clock, timers, view, refresher, frames
+    
+    def assign(self, manager, aircraft_id):
+        manager.add_arrival(register_arrival(aircraft_id, "UA100", "JFK", manager.clock))
+        return manager.assign_next("runway")[1]
+    
+    def test_idle_has_no_timers(self, setup):
+        """Prueba que sin cambios ni ocupadas no queda ningún timer"""
+        manager, clock, timers, view, refresher, frames = setup
+        
+        assert timers.timers == {}
+        refresher.invalidate()
+        timers.advance(1)
+        
+        assert frames == [(0.0, True, {})]
+        assert timers.timers == {}
+    
+    def test_redraws_on_minute_rollover(self, setup):
+        """Prueba que el timer despierta justo cuando un contador de minutos avanza"""
+        manager, clock, timers, view, refresher, frames = setup
+        clock.advance(10)
+        self.assign(manager, "ABC123")
+        timers.advance(1)
+        assert frames == [(10.0, True, {})]
+        
+        timers.advance(58.9)
+        assert view.tree.values_of("Runway_01") == ("Ocupada", "ABC123", 0)
+        timers.advance(0.1)
+        
+        assert frames[-1] == (70.0, False, {"runway": ["Runway_01"]})
+        assert view.tree.values_of("Runway_01") == ("Ocupada", "ABC123", 1)
+        assert [due - self.START for due, _ in timers.timers.values()] == [130.0]
+    
+    def test_frame_budget_coalesces_changes(self, setup):
+        """Prueba que los cambios de una ráfaga se juntan en un redibujo por cuadro"""
+        manager, clock, timers, view, refresher, frames = setup
+        
+        for _ in range(100):
+            refresher.invalidate()
+            timers.advance(0.001)
+        timers.advance(1)
+        
+        assert len(frames) <= 0.1 / 0.016 + 1
+        assert all(later[0] - earlier[0] >= 0.016 for earlier, later in zip(frames, frames[1:]))
+        assert not refresher.dirty
+    
+    def test_released_facility_stops_timer(self, setup):
+        """Prueba que las ocupaciones liberadas se descartan del heap"""
+        manager, clock, timers, view, refresher, frames = setup
+        facility_name = self.assign(manager, "ABC123")
+        timers.advance(30)
+        manager.airstrips.release(facility_name)
+        timers.advance(1)
+        
+        assert view.tree.values_of("Runway_01") == ("Disponible", "-", 0)
+        assert timers.timers == {}
+        assert refresher.next_rollover() is None
+    
+    def test_busy_view_accurate_to_the_minute(self, setup):
+        """Prueba que con tráfico la vista muestra siempre los minutos correctos"""
+        manager, clock, timers, view, refresher, frames = setup
+        for number in range(3):
+            self.assign(manager, f"AC{number}")
+            timers.advance(17)
+        
+        for _ in range(600):
+            timers.advance(1)
+            minutes = manager.airstrips.occupancy_minutes()
+            assert {name: view.tree.values_of(name)[2] for name in minutes} == minutes
+        
+        # Un redibujo por cambio de estado y uno por cada cambio de minuto
+        assert len(frames) == 3 + 3 * 10
+    
+    def test_seeds_occupied_facilities(self):
+        """Prueba que las ocupaciones anteriores al scheduler se programan al crearlo"""
+        clock = VirtualClock(self.START)
+        manager = AirportTrafficManager(clock=clock)
+        manager.airstrips.occupy("Runway_02", "ABC123", self.START - 90)
+        timers = ClockScheduler(clock)
+        
+        refresher = RefreshScheduler(lambda dirty, rolled: None, timers.after, timers.after_cancel,
+                                     manager.pools, clock)
+        
+        assert refresher.next_rollover() == self.START + 30
+        assert len(timers.timers) == 1
+
+
+class TestWaitingQueue:
+    """Tests para la cola de espera del AirportTrafficManager"""
+    
+    @pytest.fixture
+    def manager(self):
+        """Fixture con un manager y tres llegadas registradas"""
+        manager = AirportTrafficManager()
+        manager.add_arrival(register_arrival("ABC123", "UA100", "JFK"))
+        manager.add_arrival(register_arrival("DEF456", "AA200", "MIA"))
+        manager.add_arrival(register_arrival("GHI789", "DL300", "ATL"))
+        return manager
+    
+    def test_next_waiting_is_fifo(self, manager):
+        """Prueba que se atiende en orden de llegada"""
+        assert manager.next_waiting()["aircraft_id"] == "ABC123"
+        
+        success, facility_name = manager.assign_arrival(manager.next_waiting(), "runway")
+        
+        assert success is True
+        assert facility_name == "Runway_01"
+        assert manager.next_waiting()["aircraft_id"] == "DEF456"
+        assert manager.find_arrival("ABC123")["status"] == "assigned_runway"
+    
+    def test_history_is_kept(self, manager):
+        """Prueba que el historial conserva las llegadas ya asignadas"""
+        manager.assign_arrival(manager.next_waiting(), "terminal")
+        
+        assert len(manager.arrivals_log) == 3
+        assert manager.arrivals_log[0]["status"] == "assigned_terminal"
+    
+    def test_assign_out_of_order(self, manager):
+        """Prueba asignar una aeronave que no está al frente de la cola"""
+        manager.assign_arrival(manager.find_arrival("def456"), "runway")
+        
+        assert manager.next_waiting()["aircraft_id"] == "ABC123"
+        manager.assign_arrival(manager.next_waiting(), "runway")
+        assert manager.next_waiting()["aircraft_id"] == "GHI789"
+    
+    def test_failed_assignment_keeps_aircraft_waiting(self, manager):
+        """Prueba que una asignación fallida no saca la aeronave de la cola"""
+        for _ in range(3):
+            manager.assign_arrival(manager.next_waiting(), "runway")
+        manager.add_arrival(register_arrival("JKL012", "UA400", "ORD"))
+        
+        success, message = manager.assign_arrival(manager.next_waiting(), "runway")
+        
+        assert success is False
+        assert "No hay runways disponibles" in message
+        assert manager.next_waiting()["aircraft_id"] == "JKL012"
+    
+    def test_empty_queue(self):
+        """Prueba la cola vacía"""
+        manager = AirportTrafficManager()
+        
+        assert manager.next_waiting() is None
+        assert manager.find_arrival("ABC123") is None
+
+
+class TestEventBus:
+    """Tests para el bus de eventos del manager"""
+    
+    @pytest.fixture
+    def manager(self):
+        """Fixture con un manager y un registro de eventos"""
+        manager = AirportTrafficManager()
+        manager.received = []
+        manager.events.subscribe(manager.received.append)
+        return manager
+    
+    def test_core_operations_publish_events(self, manager):
+        """Prueba que registrar, asignar y liberar publican eventos"""
+        arrival = register_arrival("ABC123", "UA100", "JFK")
+        manager.add_arrival(arrival)
+        manager.assign_arrival(arrival, "runway")
+        release_facility(manager.airstrips, "Runway_01")
+        
+        registered, assigned, released = manager.received
+        
+        assert registered == ArrivalRegistered(arrival)
+        assert isinstance(assigned, FacilityAssigned)
+        assert assigned[:3] == ("runway", "Runway_01", "ABC123")
+        assert isinstance(released, FacilityReleased)
+        assert released.aircraft_id == "ABC123"
+        assert released.start_ts == assigned.timestamp
+    
+    def test_release_of_available_facility_is_silent(self, manager):
+        """Prueba que liberar una instalación libre no publica eventos"""
+        release_facility(manager.terminals, "Terminal_A")
+        
+        assert manager.received == []
+    
+    def test_subscribe_by_type_and_unsubscribe(self):
+        """Prueba la suscripción filtrada por tipo y su cancelación"""
+        bus = EventBus()
+        received = []
+        unsubscribe = bus.subscribe(received.append, FacilityReleased)
+        
+        bus.publish(FacilityAssigned("runway", "Runway_01", "ABC123", 0.0))
+        bus.publish(FacilityReleased("runway", "Runway_01", "ABC123", 0.0, 1.0))
+        unsubscribe()
+        bus.publish(FacilityReleased("runway", "Runway_01", "ABC123", 0.0, 1.0))
+        
+        assert len(received) == 1
+    
+    def test_batcher_schedules_once_per_batch(self):
+        """Prueba que una ráfaga de eventos produce una sola entrega"""
+        scheduled = []
+        batches = []
+        batcher = EventBatcher(batches.append, scheduled.append)
+        
+        batcher("a")
+        batcher("b")
+        
+        assert len(scheduled) == 1
+        scheduled[0]()
+        assert batches == [["a", "b"]]
+        
+        batcher("c")
+        assert len(scheduled) == 2
+    
+    def test_batcher_coalesces_by_key(self):
+        """Prueba que los eventos con la misma clave se combinan"""
+        batches = []
+        batcher = EventBatcher(batches.append, key=lambda event: event.facility_name)
+        
+        batcher(FacilityAssigned("runway", "Runway_01", "ABC123", 0.0))
+        batcher(FacilityAssigned("runway", "Runway_02", "DEF456", 0.0))
+        batcher(FacilityReleased("runway", "Runway_01", "ABC123", 0.0, 1.0))
+        batcher.flush()
+        
+        assert [type(event) for event in batches[0]] == [FacilityAssigned, FacilityReleased]
+        assert batches[0][1].facility_name == "Runway_01"
+
+
+class TestBatchOperations:
+    """Tests para register_arrivals_bulk() y assign_batch()"""
+    
+    def test_register_bulk_shares_one_clock_reading(self):
+        """Prueba el registro por lotes con tuplas y diccionarios"""
+        results = register_arrivals_bulk([
+            ("  abc123 ", "ua100", "jfk"),
+            {"aircraft_id": "DEF456", "flight_number": "AA200", "origin": "MIA"}
+        ])
+        
+        assert [result.success for result in results] == [True, True]
+        first, second = results[0].value, results[1].value
+        assert first["aircraft_id"] == "ABC123"
+        assert second["origin"] == "MIA"
+        assert first.arrival_ts == second.arrival_ts
+    
+    def test_register_bulk_reports_invalid_rows(self):
+        """Prueba que las filas inválidas se informan sin cortar el lote"""
+        results = register_arrivals_bulk([("ABC123", "", "JFK"), ("DEF456", "AA200", "MIA"), ("X",)])
+        
+        assert [result.success for result in results] == [False, True, False]
+        assert results[0].value == "Todos los campos son obligatorios"
+        assert results[1].index == 1
+    
+    def test_register_bulk_atomic(self):
+        """Prueba el modo todo-o-nada del registro por lotes"""
+        with pytest.raises(BatchError) as error:
+            register_arrivals_bulk([("ABC123", "UA100", "JFK"), (None, "AA200", "MIA")], atomic=True)
+        
+        assert [result.success for result in error.value.results] == [True, False]
+    
+    def test_assign_batch(self):
+        """Prueba la asignación por lotes con instalaciones insuficientes"""
+        manager = AirportTrafficManager()
+        arrivals = [result.value for result in register_arrivals_bulk(
+            [(f"CC-{i}", f"UA{i}", "JFK") for i in range(4)])]
+        manager.add_arrivals(arrivals)
+        
+        results = assign_batch(manager, arrivals, "runway")
+        
+        assert [result.value for result in results[:3]] == ["Runway_01", "Runway_02", "Runway_03"]
+        assert results[3].success is False
+        assert "No hay runways disponibles" in results[3].value
+        assert manager.next_waiting()["aircraft_id"] == "CC-3"
+        assert len({manager.airstrips[name].start_ts for name in manager.airstrips}) == 1
+    
+    def test_assign_batch_atomic(self):
+        """Prueba que en modo todo-o-nada no se asigna nada si faltan instalaciones"""
+        manager = AirportTrafficManager()
+        arrivals = [register_arrival(f"CC-{i}", f"UA{i}", "JFK") for i in range(4)]
+        manager.add_arrivals(arrivals)
+        
+        with pytest.raises(BatchError):
+            assign_batch(manager, arrivals, "runway", atomic=True)
+        
+        assert manager.airstrips.available_count() == 3
+        assert manager.next_waiting()["aircraft_id"] == "CC-0"
+        
+        results = assign_batch(manager, arrivals[:3], "runway", atomic=True)
+        assert all(result.success for result in results)
+
+
 class TestIntegration:
     """Tests de integración del sistema completo"""
     
@@ -335,6 +1135,27 @@ class TestIntegration:
         assert time_after_release is None
 
 
+class TestHeadlessImport:
+    """Tests del núcleo sin interfaz gráfica"""
+    
+    @pytest.mark.parametrize("module", ["airport_core", "airport_manager"])
+    def test_import_does_not_load_tkinter(self, module):
+        """Prueba que importar el núcleo o el módulo principal no carga tkinter"""
+        code = f"import sys, {module}; print('tkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        
+        assert result.stdout.strip() == "False"
+    
+    def test_manager_reexports_core(self):
+        """Prueba que airport_manager reexporta los mismos objetos del núcleo"""
+        import airport_core
+        
+        assert AirportTrafficManager is airport_core.AirportTrafficManager
+        assert register_arrival is airport_core.register_arrival
+        assert FacilityPool is airport_core.FacilityPool
+
+
 def test_edge_cases():
     """Prueba casos límite del sistema"""
     
@@ -384,6 +1205,110 @@ def test_edge_cases():
         assert time_after is None
 
 
+class TestThreadSafety:
+    """Tests de estrés del modo thread-safe: ninguna instalación se asigna dos veces"""
+    
+    THREADS = 8
+    ROUNDS = 300
+    
+    @pytest.fixture(autouse=True)
+    def frequent_switches(self):
+        """Fuerza cambios de hilo frecuentes para provocar carreras"""
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(interval)
+    
+    def run_workers(self, worker):
+        """Ejecuta el worker en varios hilos y devuelve los errores encontrados"""
+        errors = []
+        
+        def guarded(number):
+            try:
+                worker(number)
+            except AssertionError as error:
+                errors.append(error)
+        
+        threads = [threading.Thread(target=guarded, args=(number,)) for number in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+    
+    def test_no_double_assignment(self):
+        """Prueba asignar y liberar desde varios hilos sobre pocas pistas"""
+        manager = AirportTrafficManager(["Runway_01", "Runway_02", "Runway_03"], [], thread_safe=True)
+        holders = {name: None for name in manager.airstrips}
+        holders_lock = threading.Lock()
+        
+        def worker(number):
+            for round_number in range(self.ROUNDS):
+                aircraft_id = f"T{number}R{round_number}"
+                manager.add_arrival(register_arrival(aircraft_id, "UA1", "JFK"))
+                success, facility_name = manager.assign_next("runway")
+                if not success:
+                    continue
+                
+                with holders_lock:
+                    assert holders[facility_name] is None, f"{facility_name} asignada dos veces"
+                    holders[facility_name] = aircraft_id
+                
+                with holders_lock:
+                    holders[facility_name] = None
+                assert manager.airstrips.release(facility_name)
+        
+        assert self.run_workers(worker) == []
+        assert manager.airstrips.available_count() == 3
+        
+        # Cada aeronave se asignó como mucho una vez
+        assigned = [arrival for arrival in manager.arrivals_log if arrival["status"] != "waiting_assignment"]
+        assert len({arrival["aircraft_id"] for arrival in assigned}) == len(assigned)
+    
+    def test_events_follow_state_order(self):
+        """Prueba que los eventos de una instalación alternan asignación y liberación"""
+        manager = AirportTrafficManager(["Runway_01"], [], thread_safe=True)
+        events = []
+        manager.events.subscribe(events.append, FacilityAssigned, FacilityReleased)
+        
+        def worker(number):
+            for round_number in range(self.ROUNDS):
+                manager.add_arrival(register_arrival(f"T{number}R{round_number}", "UA1", "JFK"))
+                success, facility_name = manager.assign_next("runway")
+                if success:
+                    manager.airstrips.release(facility_name)
+        
+        assert self.run_workers(worker) == []
+        kinds = [type(event) for event in events]
+        assert kinds[0::2] == [FacilityAssigned] * (len(kinds) // 2)
+        assert kinds[1::2] == [FacilityReleased] * (len(kinds) // 2)
+    
+    def test_plain_dict_path(self):
+        """Prueba la ruta de diccionarios simples con locks por franjas"""
+        facilities = {f"Gate_{number}": {"status": "available", "aircraft": None, "start_time": None}
+                      for number in range(2)}
+        holders = {name: None for name in facilities}
+        holders_lock = threading.Lock()
+        
+        def worker(number):
+            aircraft_data = {"aircraft_id": f"T{number}"}
+            for _ in range(self.ROUNDS):
+                success, facility_name = assign_to(facilities, aircraft_data, "terminal")
+                if not success:
+                    continue
+                
+                with holders_lock:
+                    assert holders[facility_name] is None, f"{facility_name} asignada dos veces"
+                    holders[facility_name] = number
+                
+                with holders_lock:
+                    holders[facility_name] = None
+                release_facility(facilities, facility_name)
+        
+        assert self.run_workers(worker) == []
+        assert len(check_available(facilities)) == 2
+
+
 if __name__ == "__main__":
     # Ejecutar todas las pruebas
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
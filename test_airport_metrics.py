@@ -0,0 +1,237 @@
+"""
+Test Suite para las métricas del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_metrics.py -v
+"""
+
+import pytest
+import random
+import sys
+import os
+import time
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrival
+from airport_metrics import CONTENT_TYPE, Counter, Gauge, Histogram, ManagerMetrics, MetricsRegistry, SamplingProfiler
+
+
+START = 1_750_000_000.0
+
+
+class TestRegistry:
+    """Tests para el registro y el formato de exportación"""
+    
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+    
+    def test_counter_and_gauge_render(self):
+        """Prueba HELP, TYPE, etiquetas y valores en el texto exportado"""
+        counter = self.registry.counter("jobs_total", "Trabajos", labels={"kind": "a"})
+        counter.inc()
+        counter.inc(2)
+        self.registry.gauge("temperature", "Temperatura").set(21.5)
+        
+        text = self.registry.render()
+        
+        assert "# HELP jobs_total Trabajos\n# TYPE jobs_total counter\n" in text
+        assert 'jobs_total{kind="a"} 3\n' in text
+        assert "# TYPE temperature gauge\ntemperature 21.5\n" in text
+    
+    def test_series_share_family(self):
+        """Prueba que las series de un mismo nombre comparten un solo HELP/TYPE"""
+        self.registry.counter("jobs_total", "Trabajos", labels={"kind": "a"})
+        self.registry.counter("jobs_total", "Trabajos", labels={"kind": "b"})
+        
+        text = self.registry.render()
+        
+        assert text.count("# TYPE jobs_total") == 1
+        assert 'jobs_total{kind="a"} 0' in text and 'jobs_total{kind="b"} 0' in text
+    
+    def test_duplicate_rejected(self):
+        """Prueba que no se puede registrar dos veces la misma serie ni otro tipo con el mismo nombre"""
+        self.registry.counter("jobs_total", "Trabajos")
+        
+        with pytest.raises(ValueError):
+            self.registry.counter("jobs_total", "Trabajos")
+        with pytest.raises(ValueError):
+            self.registry.gauge("jobs_total", "Trabajos", labels={"kind": "a"})
+    
+    def test_gauge_function_mapping(self):
+        """Prueba que un gauge con función que devuelve un diccionario genera una serie por clave"""
+        self.registry.register(Gauge("busy", "Ocupación", function=lambda: {"Gate_1": 1, 'A"B': 0},
+                                     label_name="facility"))
+        
+        text = self.registry.render()
+        
+        assert 'busy{facility="Gate_1"} 1' in text
+        assert 'busy{facility="A\\"B"} 0' in text
+    
+    def test_dump(self, tmp_path):
+        """Prueba la exportación a archivo"""
+        self.registry.register(Counter("jobs_total", "Trabajos", function=lambda: 7))
+        path = tmp_path / "metrics.prom"
+        
+        self.registry.dump(str(path))
+        
+        assert "jobs_total 7\n" in path.read_text(encoding="utf-8")
+        assert not os.path.exists(f"{path}.tmp")
+    
+    def test_serve(self):
+        """Prueba el endpoint HTTP"""
+        self.registry.counter("jobs_total", "Trabajos").inc()
+        server = self.registry.serve(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert "jobs_total 1\n" in response.read().decode("utf-8")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestHistogram:
+    """Tests para el histograma log-lineal"""
+    
+    def test_quantile_accuracy(self):
+        """Prueba que los cuantiles quedan dentro del error relativo de los buckets"""
+        randomizer = random.Random(2025)
+        values = sorted(randomizer.lognormvariate(-6, 2) for _ in range(20_000))
+        histogram = Histogram("latency_seconds", "Latencia")
+        for value in values:
+            histogram.record(value)
+        
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.04)
+        assert histogram.count == len(values)
+        assert histogram.sum == pytest.approx(sum(values))
+    
+    def test_out_of_range_values(self):
+        """Prueba que los valores fuera de rango caen en los buckets de los extremos"""
+        histogram = Histogram("latency_seconds", "Latencia", lowest=1.0, highest=100.0)
+        histogram.record(0.0)
+        histogram.record(1e9)
+        
+        assert histogram.counts[0] == 1
+        assert histogram.counts[-1] == 1
+        assert histogram.quantile(1.0) == 1e9
+    
+    def test_render_as_summary(self):
+        """Prueba la exportación como summary y el reinicio"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latencia", quantiles=(0.5,))
+        histogram.record(2.0)
+        
+        text = registry.render()
+        
+        assert "# TYPE latency_seconds summary" in text
+        assert 'latency_seconds{quantile="0.5"}' in text
+        assert "latency_seconds_sum 2\nlatency_seconds_count 1\n" in text
+        histogram.reset()
+        assert histogram.count == 0 and histogram.quantile(0.5) == 0.0
+
+
+class TestManagerMetrics:
+    """Tests para la instrumentación del manager"""
+    
+    def setup_method(self):
+        self.clock = VirtualClock(START)
+        self.manager = AirportTrafficManager(runways=["Runway_1", "Runway_2"], terminals=["Gate_1"],
+                                             clock=self.clock)
+        self.metrics = ManagerMetrics(self.manager, sample_every=1)
+    
+    def _arrive(self, count):
+        for number in range(count):
+            self.manager.add_arrival(register_arrival(f"AC{number:03d}", "UA100", "JFK", self.clock))
+    
+    def test_counts_from_pools(self):
+        """Prueba los totales de asignaciones, rechazos y liberaciones"""
+        self._arrive(3)
+        
+        for _ in range(3):
+            self.manager.assign_next("runway")
+        self.clock.advance(600)
+        self.manager.airstrips.release("Runway_1")
+        
+        text = self.metrics.registry.render()
+        
+        assert 'airport_assignments_total{type="runway"} 2' in text
+        assert 'airport_assignment_failures_total{type="runway"} 1' in text
+        assert 'airport_releases_total{type="runway"} 1' in text
+        assert 'airport_occupied_seconds_total{type="runway"} 600' in text
+        assert 'airport_facilities_occupied{type="runway"} 1' in text
+        assert 'airport_facility_occupied_seconds{type="runway",facility="Runway_2"} 600' in text
+        assert "airport_arrivals_total 3" in text
+        assert "airport_waiting_aircraft 1" in text
+    
+    def test_sampled_histograms(self):
+        """Prueba que con sample_every=1 se miden todas las latencias y ocupaciones"""
+        self._arrive(1)
+        self.manager.assign_next("runway")
+        self.clock.advance(1200)
+        self.manager.airstrips.release("Runway_1")
+        
+        assert self.metrics.assign_latency["runway"].count == 1
+        assert self.metrics.release_latency["runway"].count == 1
+        occupancy = self.metrics.occupancy["runway"]
+        assert occupancy.count == 1
+        assert occupancy.quantile(0.5) == pytest.approx(1200, rel=0.04)
+    
+    def test_sampling_rate(self):
+        """Prueba que se mide una de cada sample_every llamadas"""
+        self.metrics.uninstall()
+        metrics = ManagerMetrics(self.manager, sample_every=4)
+        for _ in range(10):
+            self.manager.airstrips.release("Runway_1")
+        
+        assert metrics.release_latency["runway"].count == 2
+    
+    def test_uninstall(self):
+        """Prueba que uninstall() restaura los métodos y vacía el registro"""
+        self.metrics.uninstall()
+        
+        assert "assign_arrival" not in vars(self.manager)
+        assert "release" not in vars(self.manager.airstrips)
+        assert self.metrics.registry.render() == "\n"
+        # Se puede volver a instrumentar sobre el mismo registro
+        ManagerMetrics(self.manager, self.metrics.registry)
+    
+    def test_invalid_sample_every(self):
+        """Prueba que sample_every debe ser positivo"""
+        with pytest.raises(ValueError):
+            ManagerMetrics(self.manager, MetricsRegistry(), sample_every=0)
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests para el perfilador por muestreo"""
+    
+    def test_sample_current_thread(self):
+        """Prueba que una muestra registra la pila del hilo observado"""
+        profiler = SamplingProfiler()
+        
+        with profiler:
+            busy_loop(0.2)
+        
+        assert profiler.samples > 0
+        assert profiler.top(1)[0][0] == "test_airport_metrics.py:busy_loop"
+        assert "test_airport_metrics.py:busy_loop " in profiler.folded()
+    
+    def test_register(self):
+        """Prueba la publicación de las funciones más muestreadas"""
+        registry = MetricsRegistry()
+        profiler = SamplingProfiler()
+        with profiler:
+            busy_loop(0.1)
+        profiler.register(registry)
+        
+        assert 'airport_profile_samples{function="test_airport_metrics.py:busy_loop"}' in registry.render()
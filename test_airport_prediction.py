@@ -0,0 +1,187 @@
+"""
+Test Suite para la predicción de ocupaciones del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_prediction.py -v
+"""
+
+import pytest
+import math
+import random
+import statistics
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import AirportTrafficManager, VirtualClock, register_arrival
+from airport_prediction import DwellStats, P2Quantile, TurnaroundPredictor
+from airport_scheduling import BatchOptimizer
+
+
+START = 1_750_000_000.0
+
+
+class Shift:
+    """Manager con reloj virtual y ayudas para ocupar y liberar instalaciones"""
+    
+    def __init__(self, **options):
+        self.clock = VirtualClock(START)
+        self.manager = AirportTrafficManager(runways=["Runway_01"], terminals=["Terminal_A", "Terminal_B"],
+                                             clock=self.clock)
+        self.predictor = TurnaroundPredictor(self.manager, **options)
+        self._number = 0
+    
+    def occupy(self, facility_name, flight_number="UA100", origin="JFK"):
+        self._number += 1
+        aircraft_id = f"AC{self._number:04d}"
+        self.manager.add_arrival(register_arrival(aircraft_id, flight_number, origin, self.clock))
+        self.manager.assign_arrival(self.manager.find_arrival(aircraft_id), "terminal", facility_name=facility_name)
+    
+    def turnaround(self, facility_name, minutes, flight_number="UA100", origin="JFK"):
+        self.occupy(facility_name, flight_number, origin)
+        self.clock.advance(minutes * 60)
+        self.manager.terminals.release(facility_name)
+
+
+class TestStreamingStatistics:
+    """Tests para los estimadores en línea"""
+    
+    def test_p2_tracks_quantiles(self):
+        """Prueba que P² se aproxima a los cuantiles exactos"""
+        randomizer = random.Random(7)
+        values = [randomizer.lognormvariate(7, 0.5) for _ in range(20_000)]
+        ordered = sorted(values)
+        
+        for quantile in (0.5, 0.9, 0.99):
+            estimator = P2Quantile(quantile)
+            for value in values:
+                estimator.add(value)
+            exact = ordered[int(quantile * len(values))]
+            assert estimator.value() == pytest.approx(exact, rel=0.02)
+    
+    def test_p2_exact_with_few_values(self):
+        """Prueba que con menos de cinco valores el cuantil es exacto"""
+        estimator = P2Quantile(0.5)
+        assert math.isnan(estimator.value())
+        for value in (30, 10, 20):
+            estimator.add(value)
+        
+        assert estimator.value() == 20
+        with pytest.raises(ValueError):
+            P2Quantile(1.0)
+    
+    def test_welford_mean_and_variance(self):
+        """Prueba la media y la varianza de Welford contra statistics"""
+        randomizer = random.Random(3)
+        values = [1e9 + randomizer.gauss(1800, 300) for _ in range(5000)]
+        stats = DwellStats()
+        for value in values:
+            stats.add(value)
+        
+        assert stats.count == 5000
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-6)
+        assert (stats.minimum, stats.maximum) == (min(values), max(values))
+
+
+class TestTurnaroundPredictor:
+    """Tests para TurnaroundPredictor"""
+    
+    def test_default_without_history(self):
+        """Prueba que sin historia se usa la duración por defecto"""
+        shift = Shift(default_dwell=900)
+        shift.occupy("Terminal_A")
+        
+        assert shift.predictor.predict_release_time("Terminal_A") == START + 900
+        assert shift.predictor.occupations[("terminal", "Terminal_A")].basis == "default"
+        assert shift.predictor.predict_release_time("Terminal_B") == START
+        assert shift.predictor.predict_release_time("Gate_99") is None
+    
+    def test_prefers_most_specific_statistics(self):
+        """Prueba el orden vuelo -> origen -> instalación -> tipo"""
+        shift = Shift(min_samples=3)
+        for _ in range(3):
+            shift.turnaround("Terminal_A", 40, "UA100", "JFK")
+            shift.turnaround("Terminal_A", 20, "AA200", "MIA")
+        
+        predictor = shift.predictor
+        assert predictor.predict_dwell("terminal", "Terminal_A", "UA100", "JFK") == 40 * 60
+        assert predictor.predict_dwell("terminal", "Terminal_A", "DL300", "MIA") == 20 * 60
+        # Vuelo y origen sin historia: la instalación y, sin ella, el tipo
+        assert predictor.predict_dwell("terminal", "Terminal_A", "DL300", "LAX") == \
+            predictor.statistics("facility", "Terminal_A", "terminal").quantile(0.5)
+        assert predictor.predict_dwell("terminal", "Terminal_B", "DL300", "LAX") == \
+            predictor.by_type["terminal"].quantile(0.5)
+        assert 20 * 60 <= predictor.by_type["terminal"].quantile(0.5) <= 40 * 60
+        assert predictor.predict_dwell("runway", "Runway_01") == predictor.default_dwell
+        
+        now = shift.clock.time()
+        shift.occupy("Terminal_B", "UA100", "JFK")
+        assert predictor.predict_release_time("Terminal_B") == now + 40 * 60
+        assert predictor.occupations[("terminal", "Terminal_B")].basis == "flight"
+    
+    def test_next_to_free(self):
+        """Prueba la próxima instalación en liberarse y que se descartan las liberadas"""
+        shift = Shift(min_samples=1)
+        shift.turnaround("Terminal_A", 50, "UA100")
+        shift.turnaround("Terminal_A", 10, "AA200")
+        
+        shift.occupy("Terminal_A", "UA100")
+        shift.occupy("Terminal_B", "AA200")
+        now = shift.clock.time()
+        
+        assert shift.predictor.next_to_free("terminal") == ("Terminal_B", now + 10 * 60)
+        shift.manager.terminals.release("Terminal_B")
+        assert shift.predictor.next_to_free("terminal") == ("Terminal_A", now + 50 * 60)
+        shift.clock.advance(3600)
+        # Pasada la hora estimada, se estima que se libera ya
+        assert shift.predictor.next_to_free("terminal") == ("Terminal_A", shift.clock.time())
+        assert shift.predictor.next_to_free("runway") is None
+    
+    def test_memory_is_bounded(self):
+        """Prueba que vuelos y orígenes se guardan en un LRU acotado"""
+        shift = Shift(max_keys=3)
+        for number in range(10):
+            shift.turnaround("Terminal_A", 30, f"FL{number}", f"O{number}")
+        
+        predictor = shift.predictor
+        assert len(predictor.stats["flight"]) == 3
+        assert len(predictor.stats["origin"]) == 3
+        assert predictor.statistics("flight", "FL0", "terminal") is None
+        assert predictor.statistics("flight", "FL9", "terminal").count == 1
+        assert predictor.occupations == {}
+        assert predictor.by_type["terminal"].count == 10
+    
+    def test_release_heap_is_bounded(self):
+        """Prueba que el heap de liberaciones no crece sin consultar next_to_free"""
+        shift = Shift()
+        # Terminal_B queda ocupada todo el turno con la predicción más lejana
+        shift.occupy("Terminal_B")
+        for _ in range(20_000):
+            shift.turnaround("Terminal_A", 1)
+        
+        releases = shift.predictor._releases["terminal"]
+        assert len(releases) <= 3 * len(shift.predictor.occupations)
+        assert shift.predictor.next_to_free("terminal") == ("Terminal_B", shift.clock.time())
+    
+    def test_seeds_current_occupations(self):
+        """Prueba que las ocupaciones previas al predictor se estiman al crearlo"""
+        clock = VirtualClock(START)
+        manager = AirportTrafficManager(clock=clock)
+        manager.add_arrival(register_arrival("ABC123", "UA100", "JFK", clock))
+        manager.assign_arrival(manager.next_waiting(), "runway")
+        
+        predictor = TurnaroundPredictor(manager, default_dwell=600)
+        
+        assert predictor.next_to_free("runway") == ("Runway_01", START + 600)
+        predictor.close()
+    
+    def test_feeds_batch_optimizer(self):
+        """Prueba que expected_dwell sirve como ocupación esperada del optimizador"""
+        shift = Shift(min_samples=1)
+        shift.turnaround("Terminal_A", 45)
+        optimizer = BatchOptimizer(shift.manager, "terminal", shift.predictor.expected_dwell)
+        
+        assert optimizer.facility_dwell("Terminal_A") == 45 * 60
+        assert shift.predictor.expected_dwell("Terminal_B") == 45 * 60
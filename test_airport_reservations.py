@@ -0,0 +1,244 @@
+"""
+Test Suite para el calendario de reservas del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_reservations.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import AirportTrafficManager, ArrivalStatus, BatchError, VirtualClock, assign_batch, register_arrival
+from airport_reservations import Reservation, ReservationCalendar, ReservationConflict, Timeline
+
+
+START = 1_750_000_000.0
+HOUR = 3600.0
+
+
+class TestTimeline:
+    """Tests para la línea de tiempo de una instalación"""
+    
+    def setup_method(self):
+        self.timeline = Timeline("Gate_1")
+        self.timeline.add("UA100", 100, 200)
+        self.timeline.add("AA200", 300, 400)
+    
+    def test_add_keeps_order(self):
+        """Prueba que las reservas quedan ordenadas sin importar el orden de alta"""
+        self.timeline.add("DL300", 0, 50)
+        
+        assert [reservation.flight_number for reservation in self.timeline] == ["DL300", "UA100", "AA200"]
+    
+    def test_conflicts(self):
+        """Prueba la detección de solapamientos con intervalos semiabiertos"""
+        assert self.timeline.conflicts(150, 350) == [Reservation("Gate_1", "UA100", 100, 200),
+                                                     Reservation("Gate_1", "AA200", 300, 400)]
+        assert self.timeline.is_free(200, 300)
+        assert not self.timeline.is_free(199, 201)
+    
+    def test_add_conflict(self):
+        """Prueba que una reserva solapada se rechaza con el detalle del conflicto"""
+        with pytest.raises(ReservationConflict) as error:
+            self.timeline.add("DL300", 350, 450)
+        
+        assert error.value.conflicts == [Reservation("Gate_1", "AA200", 300, 400)]
+        assert len(self.timeline) == 2
+    
+    def test_add_invalid_interval(self):
+        """Prueba que el fin debe ser posterior al inicio"""
+        with pytest.raises(ValueError):
+            self.timeline.add("DL300", 500, 500)
+    
+    def test_earliest(self):
+        """Prueba la búsqueda del primer hueco suficiente"""
+        assert self.timeline.earliest(50, 0) == 0
+        assert self.timeline.earliest(150, 0) == 400
+        assert self.timeline.earliest(100, 150) == 200
+        assert self.timeline.earliest(101, 150) == 400
+    
+    def test_trim(self):
+        """Prueba adelantar el fin de una reserva y quitarla si no queda intervalo"""
+        assert self.timeline.trim("UA100", 100, 150)
+        assert self.timeline.is_free(150, 300)
+        assert not self.timeline.trim("UA100", 100, 180)
+        assert not self.timeline.trim("DL300", 100, 120)
+        assert self.timeline.trim("AA200", 300, 300)
+        assert [reservation.flight_number for reservation in self.timeline] == ["UA100"]
+    
+    def test_remove_and_prune(self):
+        """Prueba quitar una reserva y descartar las terminadas"""
+        assert self.timeline.remove("UA100", 100)
+        assert not self.timeline.remove("UA100", 100)
+        assert self.timeline.prune(400) == 1
+        assert len(self.timeline) == 0
+
+
+class TestReservationCalendar:
+    """Tests para el calendario sobre el manager"""
+    
+    def setup_method(self):
+        self.clock = VirtualClock(START)
+        self.manager = AirportTrafficManager(terminals=["Gate_1", "Gate_2"], clock=self.clock)
+        self.calendar = ReservationCalendar(self.manager, "terminal", early=600)
+    
+    def test_reserve_and_cancel(self):
+        """Prueba reservar, buscar y cancelar por número de vuelo"""
+        self.calendar.reserve("Gate_1", " ua100 ", START + HOUR, START + 2 * HOUR)
+        
+        assert self.calendar.find("UA100").facility == "Gate_1"
+        with pytest.raises(ValueError):
+            self.calendar.reserve("Gate_2", "UA100", START, START + HOUR)
+        assert self.calendar.cancel("UA100")
+        assert self.calendar.find("UA100") is None
+        assert self.calendar.timelines["Gate_1"].is_free(START, START + 3 * HOUR)
+    
+    def test_unknown_facility(self):
+        """Prueba que no se puede reservar una instalación inexistente"""
+        with pytest.raises(ValueError):
+            self.calendar.reserve("Gate_9", "UA100", START, START + HOUR)
+    
+    def test_earliest_free_across_facilities(self):
+        """Prueba el primer hueco entre todas las instalaciones"""
+        self.calendar.reserve("Gate_1", "UA100", START, START + HOUR)
+        self.calendar.reserve("Gate_2", "AA200", START + 600, START + 2 * HOUR)
+        
+        assert self.calendar.earliest_free(600) == ("Gate_2", START)
+        assert self.calendar.earliest_free(1800) == ("Gate_1", START + HOUR)
+        
+        reservation = self.calendar.reserve_earliest("DL300", 1800)
+        assert reservation == Reservation("Gate_1", "DL300", START + HOUR, START + HOUR + 1800)
+    
+    def test_registration_converts_reservation(self):
+        """Prueba que registrar el vuelo reservado lo asigna a su instalación"""
+        self.calendar.reserve("Gate_2", "UA100", START + 300, START + HOUR)
+        arrival = register_arrival("ABC123", "UA100", "JFK", self.clock)
+        self.manager.add_arrival(arrival)
+        
+        assert arrival.status is ArrivalStatus.ASSIGNED_TERMINAL
+        assert self.manager.terminals["Gate_2"]["aircraft"] == "ABC123"
+        assert self.calendar.find("UA100") is None
+        assert not self.calendar.timelines["Gate_2"].is_free(START + 300, START + 400)
+    
+    def test_registration_too_early(self):
+        """Prueba que una llegada muy anticipada queda en espera"""
+        self.calendar.reserve("Gate_2", "UA100", START + HOUR, START + 2 * HOUR)
+        arrival = register_arrival("ABC123", "UA100", "JFK", self.clock)
+        self.manager.add_arrival(arrival)
+        
+        assert arrival.status is ArrivalStatus.WAITING
+        assert self.calendar.find("UA100") is not None
+    
+    def test_registration_with_occupied_facility(self):
+        """Prueba que si la instalación reservada está ocupada la llegada queda en espera"""
+        self.calendar.reserve("Gate_1", "UA100", START, START + HOUR)
+        self.manager.terminals.occupy("Gate_1", "XYZ999")
+        arrival = register_arrival("ABC123", "UA100", "JFK", self.clock)
+        self.manager.add_arrival(arrival)
+        
+        assert arrival.status is ArrivalStatus.WAITING
+        assert self.calendar.convert(arrival) is None
+        assert self.calendar.failed_conversions == 2
+    
+    def test_walk_ins_skip_reserved_facility(self):
+        """Prueba que la asignación automática no entrega una instalación con reserva próxima"""
+        self.calendar.reserve("Gate_1", "UA100", START + 300, START + HOUR)
+        self.calendar.reserve("Gate_2", "AA200", START + 2 * HOUR, START + 3 * HOUR)
+        for aircraft_id, flight_number in (("DEF456", "DL300"), ("GHI789", "B6400")):
+            self.manager.add_arrival(register_arrival(aircraft_id, flight_number, "MIA", self.clock))
+        
+        # Gate_2 tiene su reserva lejos: se entrega; Gate_1 queda retenida
+        assert self.manager.assign_next("terminal") == (True, "Gate_2")
+        assert self.manager.assign_next("terminal")[0] is False
+        assert self.manager.terminals.first_available() is None
+        assert self.manager.terminals.assignable_count() == 0
+        with pytest.raises(BatchError):
+            assign_batch(self.manager, [self.manager.find_arrival("GHI789")], "terminal", atomic=True)
+        assert assign_batch(self.manager, [self.manager.find_arrival("GHI789")], "terminal")[0].success is False
+        assert self.manager.find_arrival("GHI789").status is ArrivalStatus.WAITING
+        
+        arrival = register_arrival("ABC123", "UA100", "JFK", self.clock)
+        self.manager.add_arrival(arrival)
+        assert self.manager.terminals["Gate_1"]["aircraft"] == "ABC123"
+        assert self.calendar.failed_conversions == 0
+    
+    def test_hold_ends_with_reservation(self):
+        """Prueba que la instalación vuelve a entregarse al terminar la reserva o al cerrar el calendario"""
+        self.calendar.reserve("Gate_1", "UA100", START, START + HOUR)
+        self.calendar.reserve("Gate_2", "AA200", START, START + 2 * HOUR)
+        assert self.manager.terminals.first_available() is None
+        
+        self.clock.advance(HOUR)
+        assert self.manager.terminals.first_available() == "Gate_1"
+        self.calendar.close()
+        assert self.manager.terminals.assignable_count() == 2
+    
+    def test_several_calendars_hold_the_pool(self):
+        """Prueba que un segundo calendario sobre el mismo pool no anula al primero"""
+        manager = AirportTrafficManager(terminals=["Gate_1", "Gate_2", "Gate_3"], clock=self.clock)
+        first = ReservationCalendar(manager, "terminal", early=600)
+        second = ReservationCalendar(manager, "terminal", early=600)
+        first.reserve("Gate_1", "UA100", START, START + HOUR)
+        second.reserve("Gate_2", "AA200", START, START + HOUR)
+        
+        assert manager.terminals.first_available() == "Gate_3"
+        assert manager.terminals.assignable_count() == 1
+        assert manager.terminals.assignable_count(limit=1) == 1
+        
+        second.close()
+        assert manager.terminals.first_available() == "Gate_2"
+        first.close()
+        assert manager.terminals.holds == []
+    
+    def test_early_release_trims_converted_reservation(self):
+        """Prueba que liberar antes del fin acorta la reserva convertida"""
+        self.calendar.reserve("Gate_1", "UA100", START + 300, START + HOUR)
+        self.calendar.reserve("Gate_2", "AA200", START + 300, START + HOUR)
+        self.manager.add_arrival(register_arrival("ABC123", "UA100", "JFK", self.clock))
+        self.manager.add_arrival(register_arrival("DEF456", "AA200", "MIA", self.clock))
+        
+        self.clock.advance(900)
+        self.manager.terminals.release("Gate_1")
+        assert list(self.calendar.timelines["Gate_1"]) == [Reservation("Gate_1", "UA100", START + 300, START + 900)]
+        assert self.manager.terminals.first_available() == "Gate_1"
+        
+        # Otra aeronave en la misma instalación no toca la reserva ya acortada
+        self.manager.terminals.occupy("Gate_1", "XYZ999")
+        self.manager.terminals.release("Gate_1")
+        assert len(self.calendar.timelines["Gate_1"]) == 1
+        
+        self.clock.advance(HOUR)
+        self.manager.terminals.release("Gate_2")
+        assert list(self.calendar.timelines["Gate_2"]) == [Reservation("Gate_2", "AA200", START + 300, START + HOUR)]
+    
+    def test_release_before_start_removes_reservation(self):
+        """Prueba que una aeronave que se va antes del inicio de su reserva la libera entera"""
+        self.calendar.reserve("Gate_1", "UA100", START + 300, START + HOUR)
+        self.manager.add_arrival(register_arrival("ABC123", "UA100", "JFK", self.clock))
+        
+        self.manager.terminals.release("Gate_1")
+        
+        assert len(self.calendar.timelines["Gate_1"]) == 0
+        assert self.manager.terminals.assignable_count() == 2
+    
+    def test_close_stops_conversion(self):
+        """Prueba que close() deja de escuchar las llegadas"""
+        self.calendar.reserve("Gate_1", "UA100", START, START + HOUR)
+        self.calendar.close()
+        arrival = register_arrival("ABC123", "UA100", "JFK", self.clock)
+        self.manager.add_arrival(arrival)
+        
+        assert arrival.status is ArrivalStatus.WAITING
+    
+    def test_prune(self):
+        """Prueba que se descartan las reservas terminadas"""
+        self.calendar.reserve("Gate_1", "UA100", START, START + HOUR)
+        self.calendar.reserve("Gate_2", "AA200", START + HOUR, START + 2 * HOUR)
+        self.clock.advance(HOUR)
+        
+        assert self.calendar.prune() == 1
+        assert self.calendar.find("UA100") is None
+        assert len(self.calendar) == 1
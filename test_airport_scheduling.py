@@ -0,0 +1,257 @@
+"""
+Test Suite para las estrategias y el optimizador de asignación del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_scheduling.py -v
+"""
+
+import itertools
+import pytest
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import airport_scheduling
+from airport_core import AirportTrafficManager, FacilityPool, VirtualClock, register_arrival
+from airport_reservations import ReservationCalendar
+from airport_scheduling import (
+    BatchOptimizer,
+    FirstAvailable,
+    LeastRecentlyUsed,
+    PlannedAssignment,
+    ShortestExpectedDwell,
+    plan_by_facility,
+    plan_min_cost,
+    solve_assignment
+)
+
+
+START = 1_750_000_000.0
+
+
+@pytest.fixture(params=["scipy", "python"])
+def backend(request, monkeypatch):
+    """Ejecuta cada prueba con SciPy (si está instalado) y con el húngaro en Python puro"""
+    if request.param == "scipy":
+        if airport_scheduling.linear_sum_assignment is None:
+            pytest.skip("SciPy no está instalado")
+    else:
+        monkeypatch.setattr(airport_scheduling, "linear_sum_assignment", None)
+    return request.param
+
+
+def total_wait(plan):
+    """Suma de las horas de inicio del plan (todas las aeronaves esperan desde 0)"""
+    return sum(planned.start_ts for planned in plan)
+
+
+class TestStrategies:
+    """Tests para las estrategias de asignación del pool"""
+    
+    def test_first_available_keeps_registration_order(self):
+        """Prueba que FirstAvailable asigna igual que el pool sin estrategia"""
+        pool = FacilityPool(["Gate_1", "Gate_2", "Gate_3"], "terminal", strategy=FirstAvailable())
+        pool.occupy("Gate_1", "ABC123")
+        pool.release("Gate_1")
+        
+        assert pool.available() == ["Gate_1", "Gate_2", "Gate_3"]
+    
+    def test_least_recently_used(self):
+        """Prueba que LRU asigna primero las nunca usadas y después la liberada hace más tiempo"""
+        clock = VirtualClock(START)
+        pool = FacilityPool(["Gate_1", "Gate_2", "Gate_3"], "terminal", clock=clock, strategy=LeastRecentlyUsed())
+        pool.occupy("Gate_1", "ABC123")
+        pool.occupy("Gate_2", "DEF456")
+        clock.advance(60)
+        pool.release("Gate_2")
+        clock.advance(60)
+        pool.release("Gate_1")
+        
+        assert pool.available() == ["Gate_3", "Gate_2", "Gate_1"]
+        assert pool.first_available() == "Gate_3"
+    
+    def test_shortest_expected_dwell(self):
+        """Prueba que se asigna la de menor ocupación esperada y que la media se actualiza"""
+        clock = VirtualClock(START)
+        strategy = ShortestExpectedDwell({"Gate_1": 3600, "Gate_2": 1200}, default=1800, alpha=0.5)
+        pool = FacilityPool(["Gate_1", "Gate_2", "Gate_3"], "terminal", clock=clock, strategy=strategy)
+        
+        assert pool.available() == ["Gate_2", "Gate_3", "Gate_1"]
+        
+        pool.occupy("Gate_2", "ABC123")
+        clock.advance(4800)
+        pool.release("Gate_2")
+        
+        assert strategy.expected_dwell("Gate_2") == 3000
+        assert pool.available() == ["Gate_3", "Gate_2", "Gate_1"]
+    
+    def test_set_strategy_reorders(self):
+        """Prueba que cambiar la estrategia reordena las instalaciones libres"""
+        pool = FacilityPool(["Gate_1", "Gate_2", "Gate_3"], "terminal")
+        pool.occupy("Gate_1", "ABC123")
+        pool.set_strategy(ShortestExpectedDwell({"Gate_3": 60}))
+        
+        assert pool.available() == ["Gate_3", "Gate_2"]
+        
+        pool.set_strategy(None)
+        assert pool.available() == ["Gate_2", "Gate_3"]
+    
+    def test_assign_specific_facility(self):
+        """Prueba assign_arrival() con una instalación concreta"""
+        manager = AirportTrafficManager(terminals=["Gate_1", "Gate_2"])
+        first = register_arrival("ABC123", "UA100", "JFK")
+        second = register_arrival("DEF456", "AA200", "MIA")
+        manager.add_arrivals([first, second])
+        
+        assert manager.assign_arrival(first, "terminal", facility_name="Gate_2") == (True, "Gate_2")
+        success, message = manager.assign_arrival(second, "terminal", facility_name="Gate_2")
+        
+        assert not success
+        assert "Gate_2" in message
+
+
+class TestPlans:
+    """Tests para los planes de espera mínima"""
+    
+    def test_plan_by_facility(self):
+        """Prueba que se toman los turnos más tempranos de cada instalación"""
+        plan = plan_by_facility(["A", "B", "C", "D"], {"Fast": 0.0, "Slow": 0.0}, {"Fast": 10.0, "Slow": 25.0})
+        
+        assert plan == [PlannedAssignment("A", "Fast", 0.0), PlannedAssignment("B", "Slow", 0.0),
+                        PlannedAssignment("C", "Fast", 10.0), PlannedAssignment("D", "Fast", 20.0)]
+    
+    def test_plan_by_facility_respects_free_at(self):
+        """Prueba que una instalación ocupada entra al plan cuando se libera"""
+        plan = plan_by_facility(["A", "B"], {"Busy": 30.0, "Free": 0.0}, {"Busy": 5.0, "Free": 20.0})
+        
+        assert [(planned.facility, planned.start_ts) for planned in plan] == [("Free", 0.0), ("Free", 20.0)]
+    
+    def test_solve_assignment(self, backend):
+        """Prueba que la asignación coincide con la fuerza bruta"""
+        cost = [[4, 1, 3, 7], [2, 0, 5, 1], [3, 2, 2, 6]]
+        best = min(itertools.permutations(range(4), 3), key=lambda columns: sum(
+            cost[row][column] for row, column in enumerate(columns)))
+        pairs = solve_assignment(cost)
+        
+        assert [row for row, _ in pairs] == [0, 1, 2]
+        assert sum(cost[row][column] for row, column in pairs) == sum(
+            cost[row][column] for row, column in enumerate(best))
+    
+    def test_solve_assignment_rejects_more_rows(self, backend):
+        """Prueba que no se aceptan más filas que columnas"""
+        with pytest.raises(ValueError):
+            solve_assignment([[1], [2]])
+    
+    def test_plan_min_cost(self, backend):
+        """Prueba que el plan coincide con la fuerza bruta sobre todas las secuencias"""
+        aircraft_ids = ["Big", "Small", "Medium"]
+        free_at = {"Fast": 0.0, "Slow": 5.0}
+        dwell = [[20.0, 60.0], [5.0, 15.0], [10.0, 30.0]]
+        
+        def sequence_wait(order, split):
+            # Las primeras `split` aeronaves de `order` van a Fast y el resto a Slow
+            wait = 0.0
+            for facility_index, rows in enumerate((order[:split], order[split:])):
+                start = list(free_at.values())[facility_index]
+                for row in rows:
+                    wait += start
+                    start += dwell[row][facility_index]
+            return wait
+        
+        best = min(sequence_wait(order, split) for order in itertools.permutations(range(3)) for split in range(4))
+        plan = plan_min_cost(aircraft_ids, free_at, dwell, max_per_facility=3)
+        
+        assert sorted(planned.aircraft_id for planned in plan) == sorted(aircraft_ids)
+        assert total_wait(plan) == best
+        assert plan[0] == PlannedAssignment("Small", "Fast", 0.0)
+    
+    def test_plan_min_cost_matches_plan_by_facility(self, backend):
+        """Prueba que con ocupación por instalación ambos planes esperan lo mismo"""
+        free_at = {"Gate_1": 0.0, "Gate_2": 12.0, "Gate_3": 3.0}
+        dwell = {"Gate_1": 30.0, "Gate_2": 10.0, "Gate_3": 20.0}
+        aircraft_ids = [f"AC{number}" for number in range(7)]
+        rows = [[dwell[facility_name] for facility_name in free_at] for _ in aircraft_ids]
+        
+        assert total_wait(plan_min_cost(aircraft_ids, free_at, rows)) == total_wait(
+            plan_by_facility(aircraft_ids, free_at, dwell))
+    
+    def test_plan_min_cost_pruned_columns(self, backend):
+        """Prueba que podar las posiciones no empeora el plan frente a ofrecerlas todas"""
+        randomizer = random.Random(11)
+        speeds = [randomizer.uniform(0.6, 1.8) for _ in range(6)]
+        free_at = {f"Gate_{number}": randomizer.uniform(0, 60) for number in range(6)}
+        aircraft_ids = [f"AC{number:02d}" for number in range(30)]
+        dwell = [[40 * speed * size for speed in speeds]
+                 for size in (randomizer.uniform(0.7, 1.5) for _ in aircraft_ids)]
+        
+        starts = list(free_at.values())
+        every_column = [[start + row[index] * step for index, start in enumerate(starts) for step in range(30)]
+                        for row in dwell]
+        best = sum(every_column[row][column] for row, column in solve_assignment(every_column))
+        
+        plan = plan_min_cost(aircraft_ids, free_at, dwell)
+        assert len(plan) == 30
+        assert total_wait(plan) == pytest.approx(best)
+
+
+class TestBatchOptimizer:
+    """Tests para el optimizador por lotes sobre el manager"""
+    
+    def setup_method(self):
+        self.clock = VirtualClock(START)
+        self.manager = AirportTrafficManager(terminals=["Gate_1", "Gate_2", "Gate_3"], clock=self.clock)
+        self.arrivals = [register_arrival(f"AC{number}", f"UA{number}", "JFK", self.clock) for number in range(4)]
+        self.manager.add_arrivals(self.arrivals)
+    
+    def test_plan_uses_busy_facilities(self):
+        """Prueba que las instalaciones ocupadas se planifican desde su liberación estimada"""
+        self.manager.assign_arrival(self.arrivals[0], "terminal", facility_name="Gate_1")
+        dwell = {"Gate_1": 600.0, "Gate_2": 3600.0, "Gate_3": 3600.0}
+        optimizer = BatchOptimizer(self.manager, "terminal", dwell.__getitem__)
+        
+        plan = optimizer.plan()
+        
+        assert [planned.aircraft_id for planned in plan] == ["AC1", "AC2", "AC3"]
+        assert [planned.facility for planned in plan] == ["Gate_2", "Gate_3", "Gate_1"]
+        assert plan[2].start_ts == START + 600
+    
+    def test_dispatch_assigns_free_facilities(self):
+        """Prueba que dispatch() asigna solo lo que puede empezar ahora"""
+        dwell = {"Gate_1": 600.0, "Gate_2": 3600.0, "Gate_3": 3600.0}
+        optimizer = BatchOptimizer(self.manager, "terminal", dwell.__getitem__)
+        
+        applied = optimizer.dispatch()
+        
+        assert len(applied) == 3
+        assert self.manager.terminals.available_count() == 0
+        assert self.manager.next_waiting().aircraft_id == "AC3"
+    
+    def test_dispatch_skips_held_facilities(self):
+        """Prueba que dispatch() no ocupa por nombre una instalación retenida por una reserva"""
+        ReservationCalendar(self.manager, "terminal").reserve("Gate_1", "ZZ999", START + 600, START + 3600)
+        dwell = {"Gate_1": 600.0, "Gate_2": 3600.0, "Gate_3": 3600.0}
+        optimizer = BatchOptimizer(self.manager, "terminal", dwell.__getitem__)
+        
+        applied = optimizer.dispatch()
+        
+        assert [planned.facility for planned in applied] == ["Gate_2", "Gate_3"]
+        assert self.manager.terminals.is_available("Gate_1")
+    
+    def test_dispatch_with_aircraft_dwell(self, backend):
+        """Prueba que con ocupación por aeronave se puede dejar esperar a una aeronave grande"""
+        self.manager.terminals.occupy("Gate_2", "XYZ999", START)
+        self.manager.terminals.occupy("Gate_3", "XYZ998", START)
+        dwell = {"Gate_1": 700.0, "Gate_2": 600.0, "Gate_3": 600.0}
+        
+        def aircraft_dwell(arrival_data, facility_name):
+            return dwell[facility_name] * (10 if arrival_data.aircraft_id == "AC0" else 1)
+        
+        optimizer = BatchOptimizer(self.manager, "terminal", dwell.__getitem__, aircraft_dwell)
+        applied = optimizer.dispatch()
+        
+        # AC0 bloquearía Gate_1 casi dos horas: conviene que espere una puerta rápida
+        assert len(applied) == 1
+        assert applied[0].facility == "Gate_1"
+        assert applied[0].aircraft_id != "AC0"
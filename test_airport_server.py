@@ -0,0 +1,201 @@
+"""
+Test Suite para el servidor asyncio del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_server.py -v
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import AirportTrafficManager
+from airport_server import AirportClient, AirportServer, RequestError
+
+
+def run_with_server(scenario, manager=None):
+    """Arranca un servidor en un puerto libre y ejecuta el escenario con un cliente"""
+    async def runner():
+        server = AirportServer(manager)
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            async with await AirportClient.connect(host, port) as client:
+                return await scenario(server, client, (host, port))
+        finally:
+            await server.close()
+    
+    return asyncio.run(runner())
+
+
+class TestHandleLine:
+    """Tests del protocolo sin sockets"""
+    
+    def test_single_request(self):
+        """Prueba una petición y su respuesta"""
+        server = AirportServer()
+        response = json.loads(server.handle_line(b'{"id": 7, "op": "available", "args": {"facility_type": "runway"}}'))
+        assert response == {"id": 7, "ok": True, "result": ["Runway_01", "Runway_02", "Runway_03"]}
+    
+    def test_batch_request(self):
+        """Prueba que un lote se responde con una lista en una línea"""
+        server = AirportServer()
+        line = json.dumps([
+            {"id": 1, "op": "register", "args": {"aircraft_id": "abc123", "flight_number": "ua100", "origin": "jfk"}},
+            {"id": 2, "op": "assign", "args": {"facility_type": "terminal"}},
+            {"id": 3, "op": "assign", "args": {"facility_type": "terminal"}}
+        ]).encode()
+        
+        raw = server.handle_line(line)
+        responses = json.loads(raw)
+        
+        assert raw.count(b"\n") == 1
+        assert responses[0]["result"]["aircraft_id"] == "ABC123"
+        assert responses[1] == {"id": 2, "ok": True, "result": "Terminal_A"}
+        assert responses[2]["ok"] is False
+    
+    def test_errors(self):
+        """Prueba JSON inválido, operación desconocida y argumentos inválidos"""
+        server = AirportServer()
+        assert json.loads(server.handle_line(b"{no"))["error"] == "JSON inválido"
+        assert "desconocida" in json.loads(server.handle_line(b'{"id": 1, "op": "volar"}'))["error"]
+        assert json.loads(server.handle_line(b'{"id": 2, "op": "available", "args": {"x": 1}}'))["ok"] is False
+        assert "desconocido" in json.loads(
+            server.handle_line(b'{"id": 3, "op": "available", "args": {"facility_type": "hangar"}}'))["error"]
+    
+    def test_unexpected_argument_types(self):
+        """Prueba que argumentos de tipo inesperado se rechazan sin cortar el lote"""
+        server = AirportServer()
+        line = json.dumps([
+            {"id": 1, "op": "find", "args": {"aircraft_id": 5}},
+            {"id": 2, "op": "register", "args": {"aircraft_id": 123, "flight_number": "UA100", "origin": "JFK"}},
+            {"id": 3, "op": "ping"}
+        ]).encode()
+        
+        responses = json.loads(server.handle_line(line))
+        
+        assert [response["ok"] for response in responses] == [False, False, True]
+        assert responses[0]["error"] == "aircraft_id debe ser str, no int"
+        assert server.manager.arrivals_log == []
+    
+    def test_arguments_checked_against_signature(self):
+        """Prueba los errores de argumentos desconocidos, faltantes y opcionales"""
+        server = AirportServer()
+        
+        def error(op, **args):
+            return server.handle_request({"id": 1, "op": op, "args": args}).get("error")
+        
+        assert error("release", facility_type="runway") == "Faltan argumentos para release: facility"
+        assert error("ping", verbose=True) == "Argumento desconocido para ping: verbose"
+        assert error("assign", facility_type="runway", aircraft_id=7) == "aircraft_id debe ser str o null, no int"
+        assert error("assign", facility_type="runway", aircraft_id=None) == "No hay aeronaves esperando asignación"
+
+
+class TestClientServer:
+    """Tests de extremo a extremo por TCP"""
+    
+    def test_register_assign_release(self):
+        """Prueba el flujo completo desde el cliente"""
+        async def scenario(server, client, address):
+            await client.register("ABC123", "UA100", "JFK")
+            runway = await client.assign("runway", "abc123")
+            state = await client.state()
+            released = await client.release("runway", runway)
+            return runway, state, released, await client.find("ABC123")
+        
+        runway, state, released, arrival = run_with_server(scenario)
+        
+        assert runway == "Runway_01"
+        assert state["runway"]["Runway_01"]["aircraft"] == "ABC123"
+        assert released is True
+        assert arrival["status"] == "assigned_runway"
+    
+    def test_request_error(self):
+        """Prueba que un error del servidor llega como RequestError"""
+        async def scenario(server, client, address):
+            with pytest.raises(RequestError, match="Todos los campos"):
+                await client.register("", "UA100", "JFK")
+            return await client.ping()
+        
+        assert run_with_server(scenario) == "pong"
+    
+    def test_bad_arguments_keep_connection(self):
+        """Prueba que una petición con argumentos inválidos no corta la conexión"""
+        async def scenario(server, client, address):
+            with pytest.raises(RequestError):
+                await client.find(5)
+            return await client.ping()
+        
+        assert run_with_server(scenario) == "pong"
+    
+    def test_pipelining(self):
+        """Prueba muchas peticiones en vuelo a la vez, respondidas en orden"""
+        async def scenario(server, client, address):
+            futures = [client.send("register", aircraft_id=f"ID{number}", flight_number="UA1", origin="JFK")
+                       for number in range(500)]
+            return await asyncio.gather(*futures)
+        
+        results = run_with_server(scenario)
+        assert [result["aircraft_id"] for result in results] == [f"ID{number}" for number in range(500)]
+    
+    def test_batch(self):
+        """Prueba el envío de un lote desde el cliente"""
+        async def scenario(server, client, address):
+            return await client.batch([
+                ("register", {"aircraft_id": "ABC123", "flight_number": "UA100", "origin": "JFK"}),
+                ("assign", {"facility_type": "runway", "aircraft_id": "XYZ999"})
+            ])
+        
+        results = run_with_server(scenario)
+        assert results[0].success is True
+        assert results[1].success is False
+        assert "XYZ999" in results[1].value
+    
+    def test_push_events(self):
+        """Prueba que los suscriptores reciben los cambios hechos por otros clientes"""
+        async def scenario(server, client, address):
+            await client.subscribe()
+            async with await AirportClient.connect(*address) as other:
+                await other.register("ABC123", "UA100", "JFK")
+                await other.assign("terminal")
+            
+            events = [await asyncio.wait_for(client.events.get(), 1) for _ in range(2)]
+            return events, other.events.empty()
+        
+        events, other_empty = run_with_server(scenario)
+        
+        assert events[0]["op"] == "arrival"
+        assert events[1] == {"op": "assign", "type": "terminal", "facility": "Terminal_A",
+                             "aircraft_id": "ABC123", "ts": events[1]["ts"]}
+        assert other_empty
+    
+    def test_shared_manager(self):
+        """Prueba que el servidor opera sobre el manager recibido"""
+        manager = AirportTrafficManager(["Pista_11"], [])
+        
+        async def scenario(server, client, address):
+            await client.register("ABC123", "UA100", "JFK")
+            return await client.assign("runway")
+        
+        assert run_with_server(scenario, manager) == "Pista_11"
+        assert manager.airstrips["Pista_11"]["aircraft"] == "ABC123"
+
+
+@pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="Sin sockets Unix")
+def test_unix_socket(tmp_path):
+    """Prueba el servidor sobre un socket Unix"""
+    path = str(tmp_path / "airport.sock")
+    
+    async def runner():
+        server = AirportServer()
+        await server.start_unix(path)
+        try:
+            async with await AirportClient.connect(path=path) as client:
+                return await client.ping()
+        finally:
+            await server.close()
+    
+    assert asyncio.run(runner()) == "pong"
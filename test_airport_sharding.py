@@ -0,0 +1,150 @@
+"""
+Test Suite para el motor particionado del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_sharding.py -v
+"""
+
+import json
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_sharding import ALL_AIRPORTS, Shard, ShardedEngine, shard_for
+
+
+AIRPORTS = {
+    code: {"runways": [f"{code}_R1"], "terminals": [f"{code}_T1", f"{code}_T2"]}
+    for code in ("ASU", "EZE", "GRU", "SCL", "LIM", "BOG")
+}
+
+
+@pytest.fixture(params=[0, 2], ids=["en_proceso", "procesos"])
+def engine(request):
+    """Fixture con el motor en el proceso actual y con dos procesos de trabajo"""
+    engine = ShardedEngine(AIRPORTS, workers=request.param)
+    yield engine
+    engine.close()
+
+
+class TestShardFor:
+    """Tests para el enrutamiento por aeropuerto"""
+    
+    def test_stable_and_in_range(self):
+        """Prueba que el shard es estable y está en rango"""
+        assert shard_for("ASU", 4) == shard_for("ASU", 4)
+        assert all(0 <= shard_for(code, 3) < 3 for code in AIRPORTS)
+
+
+class TestShardedEngine:
+    """Tests para ShardedEngine"""
+    
+    def test_route_by_airport(self, engine):
+        """Prueba que cada llegada queda en su aeropuerto de destino"""
+        assert engine.register_arrival("ASU", "ABC123", "UA100", "JFK") == (True, "ABC123")
+        assert engine.assign("ASU", "runway") == (True, "ASU_R1")
+        
+        success, message = engine.assign("EZE", "runway")
+        assert success is False
+        assert "espera" in message
+    
+    def test_execute_keeps_order(self, engine):
+        """Prueba que execute devuelve los resultados en el orden de los comandos"""
+        commands = []
+        for code in AIRPORTS:
+            commands.append((code, "register", {"aircraft_id": f"{code}1", "flight_number": "UA1", "origin": "JFK"}))
+            commands.append((code, "assign", {"facility_type": "terminal"}))
+        
+        results = engine.execute(commands)
+        
+        assert [result.index for result in results] == list(range(len(commands)))
+        assert [result.value for result in results[1::2]] == [f"{code}_T1" for code in AIRPORTS]
+    
+    def test_network_availability(self, engine):
+        """Prueba la consulta de toda la red por scatter/gather"""
+        engine.register_arrival("GRU", "ABC123", "UA100", "JFK")
+        engine.assign("GRU", "terminal")
+        
+        available = engine.available("terminal")
+        
+        assert set(available) == set(AIRPORTS)
+        assert available["GRU"] == ["GRU_T2"]
+        assert available["LIM"] == ["LIM_T1", "LIM_T2"]
+    
+    def test_summary_and_release(self, engine):
+        """Prueba el resumen por aeropuerto después de asignar y liberar"""
+        engine.register_arrival("SCL", "ABC123", "UA100", "JFK")
+        engine.register_arrival("SCL", "DEF456", "AA200", "MIA")
+        engine.assign("SCL", "runway")
+        engine.release("SCL", "runway", "SCL_R1")
+        
+        summary = engine.summary()["SCL"]
+        assert summary == {"waiting": 1, "arrivals": 2, "runways_free": 1, "terminals_free": 2}
+    
+    def test_errors(self, engine):
+        """Prueba aeropuertos, operaciones y datos inválidos"""
+        assert engine.register_arrival("XXX", "ABC123", "UA100", "JFK")[0] is False
+        assert engine.register_arrival("ASU", "", "UA100", "JFK") == (False, "Todos los campos son obligatorios")
+        assert engine.execute([("ASU", "volar", {})])[0].success is False
+        with pytest.raises(ValueError):
+            engine.broadcast("available", facility_type="hangar")
+    
+    def test_bad_arguments_keep_shard(self, engine):
+        """Prueba que un comando con argumentos de tipo inesperado no tira el shard"""
+        results = engine.execute([("ASU", "register", {"aircraft_id": 123, "flight_number": "UA100", "origin": "JFK"}),
+                                  ("ASU", "register", {"aircraft_id": "ABC123", "flight_number": "UA100",
+                                                       "origin": "JFK"})])
+        
+        assert results[0].success is False
+        assert results[0].value == "aircraft_id debe ser str, no int"
+        assert results[1].success is True
+        assert engine.register_arrival("ASU", "DEF456", "AA200", "MIA")[0] is True
+    
+    def test_argument_validation(self):
+        """Prueba los mensajes de argumentos desconocidos, faltantes o inválidos"""
+        shard = Shard({"ASU": AIRPORTS["ASU"]})
+        
+        assert shard.run("ASU", "assign", {"facility_type": "runway", "gate": "G1"}) == \
+            (False, "Argumento desconocido para assign: gate")
+        assert shard.run("ASU", "release", {"facility_type": "runway"}) == \
+            (False, "Faltan argumentos para release: facility")
+        assert shard.run("ASU", "summary", ["runway"]) == (False, "Los argumentos deben ser un diccionario")
+        assert shard.run("ASU", "available", {"facility_type": "gate"})[0] is False
+    
+    def test_all_airports_in_execute(self, engine):
+        """Prueba que un comando de todos los aeropuertos llega a cada shard"""
+        results = engine.execute([("ASU", "register", {"aircraft_id": "ABC123", "flight_number": "UA100",
+                                                       "origin": "JFK"}),
+                                  (ALL_AIRPORTS, "summary", {}),
+                                  (ALL_AIRPORTS, "available", {"facility_type": "gate"})])
+        
+        assert results[1].success is True
+        assert set(results[1].value) == set(AIRPORTS)
+        assert results[1].value["ASU"]["waiting"] == 1
+        assert results[2].success is False
+    
+    def test_dead_worker(self):
+        """Prueba que un proceso de trabajo caído no bloquea ni rompe el lote"""
+        with ShardedEngine(AIRPORTS, workers=2) as engine:
+            dead = shard_for("ASU", 2)
+            engine._processes[dead].terminate()
+            engine._processes[dead].join()
+            alive = next(code for code in AIRPORTS if shard_for(code, 2) != dead)
+            
+            results = engine.execute([("ASU", "summary", {}), (alive, "summary", {})])
+            
+            assert results[0].success is False
+            assert "terminó" in results[0].value
+            assert results[1].success is True
+            with pytest.raises(ValueError):
+                engine.summary()
+    
+    def test_from_config(self, tmp_path):
+        """Prueba la creación desde una configuración JSON"""
+        path = tmp_path / "red.json"
+        path.write_text(json.dumps({"airports": AIRPORTS}), encoding="utf-8")
+        
+        with ShardedEngine.from_config(str(path), workers=0) as engine:
+            assert len(engine.available("runway")) == len(AIRPORTS)
@@ -0,0 +1,152 @@
+"""
+Test Suite para el reloj virtual y el simulador del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_simulation.py -v
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import (
+    AirportTrafficManager,
+    FacilityAssigned,
+    VirtualClock,
+    assign_to,
+    check_time_used,
+    register_arrival
+)
+from airport_reservations import ReservationCalendar
+from airport_simulation import Simulation, constant, exponential, hourly_poisson, poisson
+
+
+START = 1_750_000_000.0
+
+
+class TestVirtualClock:
+    """Tests para el reloj inyectable"""
+    
+    def test_advance(self):
+        """Prueba que el reloj solo avanza cuando se le pide"""
+        clock = VirtualClock(START)
+        clock.advance(90)
+        
+        assert clock.time() == START + 90
+        assert clock.now().timestamp() == START + 90
+        with pytest.raises(ValueError):
+            clock.set(START)
+    
+    def test_manager_uses_clock(self):
+        """Prueba que llegadas, asignaciones y minutos de uso siguen al reloj"""
+        clock = VirtualClock(START)
+        manager = AirportTrafficManager(clock=clock)
+        arrival = register_arrival("ABC123", "UA100", "JFK", clock)
+        manager.add_arrival(arrival)
+        
+        clock.advance(120)
+        manager.assign_arrival(arrival, "runway")
+        clock.advance(45 * 60)
+        
+        assert arrival.arrival_ts == START
+        assert arrival.assigned_ts == START + 120
+        assert check_time_used(manager.airstrips, "Runway_01") == 45
+    
+    def test_plain_dict_path(self):
+        """Prueba el reloj con diccionarios simples"""
+        clock = VirtualClock(START)
+        facilities = {"Gate_1": {"status": "available", "aircraft": None, "start_time": None}}
+        
+        assign_to(facilities, {"aircraft_id": "ABC123"}, "terminal", clock)
+        clock.advance(10 * 60)
+        
+        assert check_time_used(facilities, "Gate_1", clock) == 10
+
+
+class TestSimulation:
+    """Tests para el simulador de eventos discretos"""
+    
+    def test_requires_virtual_clock(self):
+        """Prueba que no se puede simular sobre el reloj del sistema"""
+        with pytest.raises(ValueError):
+            Simulation(AirportTrafficManager())
+    
+    def test_deterministic_utilization(self):
+        """Prueba métricas exactas con llegadas y duraciones fijas"""
+        manager = AirportTrafficManager(["Runway_01"], ["Gate_1"], clock=VirtualClock(START))
+        simulation = Simulation(manager)
+        simulation.add_arrivals(constant(10), constant(5), constant(2))
+        
+        report = simulation.run(10 * 3600)
+        
+        # Llegadas en los minutos 10, 20, ..., 600: la última recién aterriza
+        assert report.arrivals == 60
+        assert report.completed == 59
+        assert report.utilization["runway"] == pytest.approx(59 * 5 / 600)
+        assert report.utilization["terminal"] == pytest.approx(59 * 2 / 600)
+        assert report.max_queue == {"runway": 1, "terminal": 1}
+        assert report.mean_wait == {"runway": 0.0, "terminal": 0.0}
+    
+    def test_queue_builds_when_overloaded(self):
+        """Prueba que la cola crece si llegan más aeronaves de las que se atienden"""
+        manager = AirportTrafficManager(["Runway_01"], ["Gate_1"], clock=VirtualClock(START))
+        simulation = Simulation(manager)
+        simulation.add_arrivals(constant(5), constant(10), constant(1))
+        
+        report = simulation.run(3600)
+        
+        # La pista solo está libre antes de la primera llegada (minuto 5)
+        assert report.utilization["runway"] == pytest.approx(55 / 60)
+        assert report.max_queue["runway"] > 5
+        assert report.mean_wait["runway"] > 0
+    
+    def test_active_reservations(self):
+        """Prueba que la simulación no asigna las instalaciones retenidas por reservas"""
+        manager = AirportTrafficManager(["R1", "R2"], ["G1", "G2"], clock=VirtualClock(START))
+        for facility_type, facility_name in (("runway", "R2"), ("terminal", "G2")):
+            ReservationCalendar(manager, facility_type).reserve(facility_name, "XX1", START + 600, START + 7200)
+        used = set()
+        manager.events.subscribe(lambda event: used.add(event.facility_name), FacilityAssigned)
+        simulation = Simulation(manager, seed=5)
+        simulation.add_arrivals(poisson(20), exponential(15), exponential(20))
+        
+        report = simulation.run(3600)
+        
+        assert used == {"R1", "G1"}
+        assert report.completed > 0
+        assert report.max_queue["runway"] > 1
+    
+    def test_seed_reproducible(self):
+        """Prueba que la misma semilla da el mismo resultado"""
+        def run():
+            simulation = Simulation(seed=42)
+            simulation.add_arrivals(poisson(20), exponential(3), exponential(30))
+            return simulation.run(24 * 3600)
+        
+        assert run() == run()
+    
+    def test_run_continues(self):
+        """Prueba que run puede llamarse por tramos"""
+        simulation = Simulation(seed=1)
+        simulation.add_arrivals(poisson(20), exponential(3), exponential(30))
+        
+        first = simulation.run(3600)
+        second = simulation.run(7200)
+        
+        assert second.duration == 7200
+        assert second.arrivals >= first.arrivals
+    
+    def test_hourly_poisson(self):
+        """Prueba que las horas sin tasa no reciben llegadas"""
+        simulation = Simulation(seed=3)
+        simulation.add_arrivals(hourly_poisson([0, 60]), constant(1), constant(1))
+        simulation.run(4 * 3600)
+        
+        hours = {int((arrival.arrival_ts - simulation.start) // 3600) % 2
+                 for arrival in simulation.manager.arrivals_log}
+        assert hours == {1}
+        
+        with pytest.raises(ValueError):
+            hourly_poisson([0, 0])
@@ -0,0 +1,118 @@
+"""
+Test Suite para el snapshot binario del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_snapshot.py -v
+"""
+
+import json
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_core import AirportTrafficManager, ArrivalStatus, FacilityStatus, register_arrival
+from airport_snapshot import SnapshotFile, convert_config, write_snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Fixture con un snapshot de dos aeropuertos, uno con estado"""
+    asu = AirportTrafficManager()
+    asu.add_arrival(register_arrival("ABC123", "UA100", "JFK"))
+    asu.add_arrival(register_arrival("DEF456", "AA200", "MIA"))
+    asu.assign_arrival(asu.next_waiting(), "terminal")
+    
+    eze = AirportTrafficManager(["Pista_11", "Pista_29"], ["Gate_B", "Gate_A"])
+    
+    path = str(tmp_path / "red.snap")
+    write_snapshot(path, {"ASU": asu, "EZE": eze})
+    return path
+
+
+class TestSnapshotFile:
+    """Tests para el formato binario y su lectura perezosa"""
+    
+    def test_open_reads_only_header(self, snapshot_path):
+        """Prueba que abrir el snapshot no decodifica registros"""
+        with SnapshotFile(snapshot_path) as snapshot:
+            assert snapshot.airports() == ["ASU", "EZE"]
+            assert snapshot.facility_count == 11
+            assert snapshot.arrival_count == 2
+            assert snapshot.decoded == 0
+    
+    def test_find_decodes_a_single_record(self, snapshot_path):
+        """Prueba la búsqueda por nombre decodificando un solo registro"""
+        with SnapshotFile(snapshot_path) as snapshot:
+            record = snapshot.find("ASU", "Terminal_A")
+            
+            assert record.facility_type == "terminal"
+            assert record.status is FacilityStatus.OCCUPIED
+            assert record.aircraft == "ABC123"
+            assert record.start_ts is not None
+            assert snapshot.decoded == 1
+            
+            assert snapshot.find("EZE", "Gate_A").facility_type == "terminal"
+            assert snapshot.find("EZE", "Gate_C") is None
+            assert snapshot.find("ASU", "Gate_A") is None
+            
+            with pytest.raises(KeyError):
+                snapshot.find("GRU", "Gate_A")
+    
+    def test_load_manager_restores_state(self, snapshot_path):
+        """Prueba la reconstrucción del manager de un aeropuerto"""
+        with SnapshotFile(snapshot_path) as snapshot:
+            asu = snapshot.load_manager("ASU")
+            eze = snapshot.load_manager("EZE", with_history=False)
+        
+        assert asu.terminals["Terminal_A"]["aircraft"] == "ABC123"
+        assert asu.terminals.available_count() == 3
+        assert asu.find_arrival("ABC123").status is ArrivalStatus.ASSIGNED_TERMINAL
+        assert asu.next_waiting()["aircraft_id"] == "DEF456"
+        
+        # Se conserva el orden de alta para la asignación
+        assert list(eze.terminals) == ["Gate_B", "Gate_A"]
+        assert eze.arrivals_log == []
+    
+    def test_convert_config(self, tmp_path):
+        """Prueba la conversión de una configuración JSON"""
+        config_path = str(tmp_path / "red.json")
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump({"airports": {"AEP": {"runways": ["Pista_13"], "terminals": ["T1", "T2"]}}}, config_file)
+        
+        snapshot_path = str(tmp_path / "red.snap")
+        assert convert_config(config_path, snapshot_path) == 3
+        
+        with SnapshotFile(snapshot_path) as snapshot:
+            manager = snapshot.load_manager("AEP")
+        assert list(manager.airstrips) == ["Pista_13"]
+        assert check_all_available(manager)
+    
+    def test_invalid_files(self, tmp_path):
+        """Prueba archivos que no son snapshots"""
+        bad_path = tmp_path / "bad.snap"
+        bad_path.write_bytes(b"no es un snapshot pero tiene mas de 32 bytes")
+        with pytest.raises(ValueError):
+            SnapshotFile(str(bad_path))
+        
+        empty_path = tmp_path / "empty.snap"
+        empty_path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            SnapshotFile(str(empty_path))
+    
+    def test_name_too_long(self, tmp_path):
+        """Prueba que los nombres deben entrar en el campo fijo"""
+        manager = AirportTrafficManager(["R" * 33], [])
+        
+        with pytest.raises(ValueError):
+            write_snapshot(str(tmp_path / "x.snap"), {"ASU": manager})
+
+
+def check_all_available(manager):
+    """Indica si todas las instalaciones del manager están libres"""
+    return all(pool.available_count() == len(pool) for pool in manager.pools.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,161 @@
+"""
+Test Suite para el almacenamiento SQLite del Airport Traffic Manager
+
+Para ejecutar las pruebas:
+    pytest test_airport_storage.py -v
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from airport_journal import dump_state
+from airport_core import AirportTrafficManager, Arrival, ArrivalRegistered, VirtualClock, register_arrival
+from airport_storage import AssignmentRecord, SQLiteStore, StoredArrival, open_manager
+
+
+START = 1_750_000_000.0
+
+
+def run_shift(manager, clock):
+    """Registra tres llegadas, asigna dos y libera una"""
+    for aircraft_id, flight_number, origin in (("ABC123", "UA100", "JFK"),
+                                               ("DEF456", "AA200", "MIA"),
+                                               ("GHI789", "DL300", "JFK")):
+        manager.add_arrival(register_arrival(aircraft_id, flight_number, origin, clock))
+        clock.advance(60)
+    
+    manager.assign_arrival(manager.next_waiting(), "runway")
+    manager.assign_arrival(manager.next_waiting(), "terminal")
+    clock.advance(600)
+    manager.airstrips.release("Runway_01")
+
+
+@pytest.fixture
+def shift(tmp_path):
+    clock = VirtualClock(START)
+    manager = AirportTrafficManager(clock=clock)
+    store = SQLiteStore(str(tmp_path / "airport.db"), max_delay=0).attach(manager)
+    run_shift(manager, clock)
+    yield manager, store
+    store.close()
+
+
+class TestSQLiteStore:
+    """Tests para SQLiteStore"""
+    
+    def test_wal_mode(self, shift):
+        """Prueba que la base queda en modo WAL"""
+        _, store = shift
+        
+        assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    def test_arrival_queries(self, shift):
+        """Prueba las consultas por origen y rango, vuelo y aeronave"""
+        _, store = shift
+        
+        assert [arrival.aircraft_id for arrival in store.arrivals_from("JFK", START, START + 3600)] == \
+            ["ABC123", "GHI789"]
+        assert [arrival.aircraft_id for arrival in store.arrivals_from("JFK", START + 1, START + 3600)] == \
+            ["GHI789"]
+        assert [arrival.aircraft_id for arrival in store.arrivals_between(START, START + 120)] == \
+            ["ABC123", "DEF456"]
+        assert store.arrivals_for_flight("AA200") == [
+            StoredArrival("DEF456", "AA200", "MIA", START + 60, "assigned_terminal", START + 180)]
+        assert store.arrivals_for_aircraft("GHI789")[0].status == "waiting_assignment"
+        assert store.arrival_count() == 3
+    
+    def test_assignment_history(self, shift):
+        """Prueba el historial de ocupaciones abiertas y cerradas"""
+        _, store = shift
+        
+        assert store.assignment_history() == [
+            AssignmentRecord("runway", "Runway_01", "ABC123", START + 180, START + 780),
+            AssignmentRecord("terminal", "Terminal_A", "DEF456", START + 180, None),
+        ]
+        assert store.assignment_history(facility_name="Runway_01")[0].end_ts == START + 780
+        assert [record.facility_name for record in store.assignment_history(aircraft_id="DEF456")] == ["Terminal_A"]
+        assert store.assignment_history(start_ts=START + 200) == []
+    
+    def test_batched_commits(self, tmp_path):
+        """Prueba que las escrituras se agrupan en transacciones de batch_size registros"""
+        store = SQLiteStore(str(tmp_path / "airport.db"), batch_size=100, max_delay=0)
+        for number in range(250):
+            store.record(ArrivalRegistered(Arrival(f"AC{number:03d}", "UA100", "JFK", START + number)))
+        
+        assert store.commits == 2
+        assert store.arrival_count() == 250
+        assert store.commits == 3
+        store.close()
+    
+    def test_ignores_other_events(self, tmp_path):
+        """Prueba que los eventos desconocidos no se guardan"""
+        with SQLiteStore(str(tmp_path / "airport.db"), max_delay=0) as store:
+            store.record(object())
+            
+            assert store.arrival_count() == 0
+    
+    def test_connection_per_thread(self, shift):
+        """Prueba que cada hilo consulta con su propia conexión"""
+        _, store = shift
+        connections = []
+        counts = []
+        
+        def query():
+            connections.append(store._connection())
+            counts.append(store.arrival_count())
+        
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert counts == [3] * 4
+        assert len(set(map(id, connections))) == 4
+    
+    def test_recover(self, tmp_path):
+        """Prueba que un manager nuevo recupera llegadas y ocupaciones abiertas"""
+        path = str(tmp_path / "airport.db")
+        manager, store = open_manager(path, max_delay=0)
+        run_shift(manager, VirtualClock(START))
+        store.close()
+        
+        restored, store = open_manager(path, max_delay=0)
+        
+        assert dump_state(restored) == dump_state(manager)
+        assert restored.next_waiting()["aircraft_id"] == "GHI789"
+        
+        restored.assign_arrival(restored.next_waiting(), "runway")
+        store.close()
+        with SQLiteStore(path) as reopened:
+            assert reopened.arrivals_for_aircraft("GHI789")[0].status == "assigned_runway"
+    
+    def test_recover_runway_then_terminal(self, tmp_path):
+        """Prueba que una asignación a terminal después de la pista también se guarda"""
+        path = str(tmp_path / "airport.db")
+        manager, store = open_manager(path, max_delay=0)
+        manager.add_arrival(register_arrival("ABC123", "UA100", "JFK"))
+        manager.add_arrival(register_arrival("DEF456", "AA200", "MIA"))
+        manager.assign_next("runway")
+        runway_ts = manager.find_arrival("ABC123").assigned_ts
+        manager.assign_arrival(manager.find_arrival("ABC123"), "terminal")
+        
+        stored = store.arrivals_for_aircraft("ABC123")
+        assert [(row.status, row.assigned_ts) for row in stored] == [("assigned_terminal", runway_ts)]
+        assert store.arrivals_for_aircraft("DEF456")[0].status == "waiting_assignment"
+        store.close()
+        
+        restored, store = open_manager(path, max_delay=0)
+        assert dump_state(restored) == dump_state(manager)
+        assert restored.find_arrival("ABC123").assigned_ts == runway_ts
+        assert restored.next_waiting().aircraft_id == "DEF456"
+        store.close()
+    
+    def test_invalid_batch_size(self, tmp_path):
+        """Prueba que batch_size debe ser positivo"""
+        with pytest.raises(ValueError):
+            SQLiteStore(str(tmp_path / "airport.db"), batch_size=0)